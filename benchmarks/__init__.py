@@ -0,0 +1,11 @@
+"""
+Benchmarks
+==========
+
+Offline end-to-end benchmarks for the scraping pipeline.
+
+``fixture_server`` replays fixture pages for the scraped sites on localhost,
+``library`` generates synthetic libraries of sparse video files and
+``run_benchmarks`` runs full scraping jobs against both and reports files per
+minute, per-file latency percentiles and peak memory.
+"""
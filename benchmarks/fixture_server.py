@@ -0,0 +1,451 @@
+"""
+Fixture Server
+==============
+
+Local stand-in for the sites the scraper talks to.
+
+Pages for jav.guru, javtrailers, javmost, javtiful and javdatabase are rendered
+from the templates in ``benchmarks/fixtures`` with deterministic metadata per
+JAV code, and images are served from a few pre-encoded JPEG and WebP files.
+Requests are routed by the original host as the first path segment, so the
+engine is pointed at the server with ``scraper.site_overrides``::
+
+    site_overrides:
+      jav.guru: "http://127.0.0.1:8765/jav.guru"
+
+Latency, jitter, an error rate and a fraction of codes that are missing on
+jav.guru can be set globally or per host. jav.guru also serves
+``LISTING_PAGES`` listing pages (``/page/<n>/``) of ``LISTING_SIZE`` posts
+each, for catalog crawls.
+
+Run standalone with ``python -m benchmarks.fixture_server --port 8765``.
+"""
+
+import argparse
+import asyncio
+import io
+import logging
+import multiprocessing
+import random
+import urllib.parse
+import zlib
+from pathlib import Path
+from string import Template
+from typing import Dict, List, Optional
+
+from aiohttp import web
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+# Every host the engine contacts; all of them are served by the fixture server
+SITE_HOSTS = (
+    'jav.guru', 'cdn.javsts.com',
+    'javtrailers.com', 'pics.dmm.co.jp',
+    'www5.javmost.com',
+    'javtiful.com',
+    'www.javdatabase.com',
+    'www.google.com', 'picsum.photos',
+)
+
+ACTRESSES = (
+    ('Kana Yume', '夢乃あいか'), ('Yua Mikami', '三上悠亜'), ('Rika Tsubaki', '椿りか'),
+    ('Mei Washio', '鷲尾めい'), ('Hibiki Otsuki', '大槻ひびき'), ('Ai Sayama', '佐山愛'),
+    ('Minami Aizawa', '相沢みなみ'), ('Tsubasa Amami', '天海つばさ'), ('Momo Sakura', '桜空もも'),
+    ('Jun Amamiya', '雨宮じゅん'), ('Riri Nanatsumori', '七ツ森りり'), ('Hikaru Nagi', '凪ひかる'),
+    ('Arina Hashimoto', '橋本ありな'), ('Nanami Kawakami', '河北彩花'), ('Yuna Ogura', '小倉由菜'),
+    ('Julia', 'JULIA'), ('Rin Hoshizaki', '星咲凛'), ('Mitsuki Nagisa', '渚みつき'),
+    ('Aoi Kururugi', '枢木あおい'), ('Shoko Takahashi', '高橋しょう子'),
+)
+STUDIOS = ('S1 NO.1 STYLE', 'IdeaPocket', 'Moodyz', 'Prestige', 'Madonna', 'Attackers',
+           'kawaii', 'E-BODY', 'SOD Create', 'Premium')
+DIRECTORS = ('Kyousuke', 'Kiyoshi Ito', 'Hasegawa Kanji', 'Nagi Yuki', 'Tohjiro')
+TAGS = ('Beautiful Girl', 'Big Tits', 'Drama', 'Featured Actress', 'Hi-Def', 'Slender',
+        'Solowork', 'Cosplay', 'Office Lady', 'Married Woman', 'Documentary', 'Idol')
+TITLE_WORDS = ('Secret', 'Summer', 'Weekend', 'Exclusive', 'Debut', 'Hot Spring', 'Office',
+               'Trip', 'Neighbor', 'Story', 'Special', 'Memories', 'Forbidden', 'Reunion')
+
+_IMAGE_SIZES = {'fanart': (800, 538), 'portrait': (200, 200)}
+
+LISTING_PREFIXES = ('SSIS', 'IPX', 'MIDE', 'ABP')
+LISTING_PAGES = 10
+LISTING_SIZE = 20
+
+
+def site_overrides(base_url: str) -> Dict[str, str]:
+    """
+    Build ``scraper.site_overrides`` that send every known host to the server.
+
+    Args:
+        base_url (str): Root URL of a running fixture server
+
+    Returns:
+        Dict[str, str]: Host to base URL mapping
+    """
+    return {host: f"{base_url.rstrip('/')}/{host}" for host in SITE_HOSTS}
+
+
+def _slug(text: str) -> str:
+    """Lowercase ``text`` and join its words with dashes."""
+    return '-'.join(text.lower().split())
+
+
+class FixtureCatalog:
+    """Deterministic synthetic metadata for any JAV code."""
+
+    def movie(self, code: str) -> Dict[str, str]:
+        """
+        Return the metadata rendered into the pages for ``code``.
+
+        Args:
+            code (str): JAV code, e.g. ``ABC-123``
+
+        Returns:
+            Dict[str, str]: Template variables
+        """
+        code = code.upper()
+        rng = random.Random(code)
+        actress, actress_ja = rng.choice(ACTRESSES)
+        studio = rng.choice(STUDIOS)
+        director = rng.choice(DIRECTORS)
+        tags = rng.sample(TAGS, 4)
+        title = ' '.join(rng.sample(TITLE_WORDS, 5))
+        year, month, day = rng.randint(2015, 2024), rng.randint(1, 12), rng.randint(1, 28)
+        content_id = code.replace('-', '').lower()
+        return {
+            'code': code,
+            'content_id': content_id,
+            'post_id': str(100000 + zlib.crc32(code.encode()) % 900000),
+            'title': f"{actress} {title}",
+            'actress': actress,
+            'actress_ja': actress_ja,
+            'actress_slug': _slug(actress),
+            'actress_url': actress.replace(' ', '+'),
+            'studio': studio,
+            'studio_slug': _slug(studio),
+            'studio_url': studio.replace(' ', '+'),
+            'label': studio,
+            'label_slug': _slug(studio),
+            'director': director,
+            'director_slug': _slug(director),
+            'director_url': director.replace(' ', '+'),
+            'series': f"{studio} {title.split()[0]}",
+            'series_slug': _slug(f"{studio} {title.split()[0]}"),
+            'tags': tags,
+            'date': f"{year:04d}-{month:02d}-{day:02d}",
+            'release_date_long': f"{day} {['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'][month - 1]} {year}",
+            'runtime': str(rng.choice((120, 150, 180, 240))),
+            'views': str(rng.randint(1000, 500000)),
+            'plot': ' '.join(rng.choice(TITLE_WORDS).lower() for _ in range(60)).capitalize() + '.',
+        }
+
+    def listing(self, page: int) -> List[str]:
+        """Return the codes on listing page ``page`` (from 1), newest first; empty past the last page."""
+        if not 1 <= page <= LISTING_PAGES:
+            return []
+        first = (page - 1) * LISTING_SIZE
+        return [f"{LISTING_PREFIXES[index % len(LISTING_PREFIXES)]}-{100 + index // len(LISTING_PREFIXES):03d}"
+                for index in range(first, first + LISTING_SIZE)]
+
+    def is_missing(self, code: str, miss_rate: float) -> bool:
+        """Whether ``code`` is treated as absent from jav.guru."""
+        return miss_rate > 0 and zlib.crc32(code.upper().encode()) % 10000 < miss_rate * 10000
+
+
+class FixtureServer:
+    """
+    Serve the fixture sites from a separate process.
+
+    Typical use::
+
+        server = FixtureServer(latency=0.02)
+        base_url = server.start()
+        try:
+            ...  # point scraper.site_overrides at site_overrides(base_url)
+        finally:
+            server.stop()
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, error_status: int = 503, miss_rate: float = 0.0,
+                 site_latency: Optional[Dict[str, float]] = None, site_error_rate: Optional[Dict[str, float]] = None,
+                 seed: int = 0):
+        """
+        Initialize the server options.
+
+        Args:
+            host (str): Interface to bind
+            port (int): Port to bind; 0 picks a free port
+            latency (float): Base response delay in seconds
+            jitter (float): Extra random delay of up to this many seconds
+            error_rate (float): Fraction of requests answered with ``error_status``
+            error_status (int): HTTP status used for injected errors
+            miss_rate (float): Fraction of codes without results on jav.guru
+            site_latency (Dict[str, float], optional): Per-host base delay overrides
+            site_error_rate (Dict[str, float], optional): Per-host error rate overrides
+            seed (int): Seed for latency jitter and error injection
+        """
+        self.options = {
+            'host': host, 'port': port, 'latency': latency, 'jitter': jitter,
+            'error_rate': error_rate, 'error_status': error_status, 'miss_rate': miss_rate,
+            'site_latency': dict(site_latency or {}), 'site_error_rate': dict(site_error_rate or {}),
+            'seed': seed,
+        }
+        self.base_url = None
+        self._process = None
+
+    def start(self, timeout: float = 30) -> str:
+        """
+        Start the server process and wait until it listens.
+
+        Returns:
+            str: Root URL of the server
+        """
+        context = multiprocessing.get_context('spawn')
+        parent_conn, child_conn = context.Pipe()
+        self._process = context.Process(target=_serve, args=(self.options, child_conn), daemon=True)
+        self._process.start()
+        if not parent_conn.poll(timeout):
+            self.stop()
+            raise RuntimeError("Fixture server did not start")
+        port = parent_conn.recv()
+        self.base_url = f"http://{self.options['host']}:{port}"
+        return self.base_url
+
+    def stop(self):
+        """Stop the server process."""
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join(timeout=5)
+            self._process = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+def build_app(options: Dict) -> web.Application:
+    """
+    Build the aiohttp application that answers for all fixture sites.
+
+    Args:
+        options (Dict): Options as collected by ``FixtureServer``
+
+    Returns:
+        web.Application: Application with a single catch-all route
+    """
+    catalog = FixtureCatalog()
+    templates = {path.stem: Template(path.read_text(encoding='utf-8')) for path in FIXTURES_DIR.glob('*.html')}
+    images = _encode_images()
+    rng = random.Random(options.get('seed', 0))
+
+    def render(name: str, **values) -> web.Response:
+        return web.Response(text=templates[name].safe_substitute(values), content_type='text/html')
+
+    def related(count: int) -> str:
+        items = []
+        for _ in range(count):
+            code = f"{rng.choice(('SSIS', 'IPX', 'MIDE', 'ABP'))}-{rng.randint(100, 999)}"
+            movie = catalog.movie(code)
+            items.append(f'<li><a href="https://jav.guru/{movie["post_id"]}/{movie["content_id"]}/">'
+                         f'[{code}] {movie["title"]}</a></li>')
+        return '\n'.join(items)
+
+    def tag_links(tags) -> str:
+        return ' '.join(f'<a href="https://jav.guru/tag/{_slug(tag)}/" rel="tag">{tag}</a>' for tag in tags)
+
+    def javguru_post(code: str) -> str:
+        movie = catalog.movie(code)
+        return templates['javguru_search_result'].safe_substitute(
+            movie, tag_links=tag_links(movie['tags']),
+            detail_url=f"https://jav.guru/{movie['post_id']}/{movie['content_id']}/",
+            cover_url=f"https://cdn.javsts.com/wp-content/uploads/{movie['content_id']}pl.jpg")
+
+    def javguru(request: web.Request, path: str) -> web.Response:
+        if path.strip('/') == '':
+            code = request.query.get('s', '').strip().upper()
+            results = ''
+            if code and not catalog.is_missing(code, options.get('miss_rate', 0)):
+                results = javguru_post(code)
+            return render('javguru_search', code=code, results=results, related=related(40))
+        parts = path.strip('/').split('/')
+        if len(parts) == 2 and parts[0] == 'page' and parts[1].isdigit():
+            results = '\n'.join(javguru_post(code) for code in catalog.listing(int(parts[1]))
+                                if not catalog.is_missing(code, options.get('miss_rate', 0)))
+            return render('javguru_search', code='', results=results, related=related(40))
+        if len(parts) == 2:
+            code = _code_from_content_id(parts[1])
+            movie = catalog.movie(code)
+            return render('javguru_detail', **movie, tag_links=tag_links(movie['tags']), related=related(120),
+                          fanart_url=f"https://cdn.javsts.com/wp-content/uploads/{movie['content_id']}pl.jpg")
+        raise web.HTTPNotFound()
+
+    def javtrailers(request: web.Request, path: str) -> web.Response:
+        parts = path.strip('/').split('/')
+        if len(parts) == 2 and parts[0] == 'search':
+            movie = catalog.movie(parts[1])
+            result = templates['javtrailers_search_result'].safe_substitute(
+                movie, thumb_url=f"https://pics.dmm.co.jp/digital/video/{movie['content_id']}/{movie['content_id']}ps.jpg")
+            return render('javtrailers_search', code=movie['code'], results=result)
+        if len(parts) == 2 and parts[0] == 'video':
+            movie = catalog.movie(_code_from_content_id(parts[1]))
+            image_base = f"https://pics.dmm.co.jp/digital/video/{movie['content_id']}/{movie['content_id']}"
+            links = ' '.join(f'<a href="/categories/{_slug(tag)}">{tag}</a>' for tag in movie['tags'])
+            return render('javtrailers_detail', **movie, category_links=links,
+                          poster_url=f"{image_base}pl.jpg", fanart_url=f"{image_base}jp-1.jpg")
+        raise web.HTTPNotFound()
+
+    def javmost(request: web.Request, path: str) -> web.Response:
+        parts = [urllib.parse.unquote_plus(part) for part in path.strip('/').split('/')]
+        if len(parts) == 2 and parts[0] == 'search':
+            movie = catalog.movie(parts[1])
+            links = ', '.join(f'<a href="/category/{_slug(tag)}/">{tag}</a>' for tag in movie['tags'])
+            result = templates['javmost_search_result'].safe_substitute(
+                movie, category_links=links,
+                cover_webp_url=f"https://www5.javmost.com/cover/{movie['code']}.webp")
+            return render('javmost_search', code=movie['code'], results=result)
+        if len(parts) == 2 and parts[0] == 'star':
+            actress = parts[1].replace('-', ' ').title()
+            return render('javmost_star', actress=actress, actress_url=_slug(actress),
+                          portrait_url=f"https://www5.javmost.com/images/profile/{_slug(actress)}.jpg")
+        if len(parts) == 1 and parts[0]:
+            movie = catalog.movie(parts[0])
+            return render('javmost_detail', **movie,
+                          cover_url=f"https://www5.javmost.com/images/cover/{movie['content_id']}.jpg")
+        raise web.HTTPNotFound()
+
+    def javtiful(request: web.Request, path: str) -> web.Response:
+        parts = path.strip('/').split('/')
+        if parts == ['actresses']:
+            actress = request.query.get('q', '').strip()
+            result = templates['javtiful_search_result'].safe_substitute(
+                actress=actress, actress_slug=_slug(actress)) if actress else ''
+            return render('javtiful_search', results=result)
+        if len(parts) == 2 and parts[0] == 'actress':
+            actress = parts[1].replace('-', ' ').title()
+            return render('javtiful_actress', actress=actress,
+                          portrait_url=f"https://javtiful.com/media/actress/{parts[1]}.jpg")
+        raise web.HTTPNotFound()
+
+    def javdatabase(request: web.Request, path: str) -> web.Response:
+        # Only the dashed slug exists, like on the real site
+        slug = path.rsplit('/', 1)[-1].rsplit('.', 1)[0]
+        if path.startswith('idolimages/') and '-' in slug:
+            return image(path)
+        raise web.HTTPNotFound()
+
+    def image(path: str) -> web.Response:
+        kind = 'portrait' if any(term in path for term in ('actress', 'profile', 'idolimages')) else 'fanart'
+        if path.endswith('.webp'):
+            return web.Response(body=images[(kind, 'WEBP')], content_type='image/webp')
+        return web.Response(body=images[(kind, 'JPEG')], content_type='image/jpeg')
+
+    handlers = {
+        'jav.guru': javguru,
+        'javtrailers.com': javtrailers,
+        'www5.javmost.com': javmost,
+        'javtiful.com': javtiful,
+        'www.javdatabase.com': javdatabase,
+        'picsum.photos': lambda request, path: image(path),
+    }
+
+    async def handle(request: web.Request) -> web.StreamResponse:
+        host, path = request.match_info['host'], request.match_info['path']
+        latency = options.get('site_latency', {}).get(host, options.get('latency', 0.0))
+        delay = latency + rng.uniform(0, options.get('jitter', 0.0))
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if rng.random() < options.get('site_error_rate', {}).get(host, options.get('error_rate', 0.0)):
+            return web.Response(status=options.get('error_status', 503), text='Injected error')
+        if path.rsplit('.', 1)[-1] in ('jpg', 'jpeg', 'webp') and host != 'www.javdatabase.com':
+            return image(path)
+        handler = handlers.get(host)
+        if handler is None:
+            raise web.HTTPNotFound()
+        return handler(request, path)
+
+    app = web.Application()
+    app.router.add_route('*', '/{host}/{path:.*}', handle)
+    return app
+
+
+def _code_from_content_id(content_id: str) -> str:
+    """Turn ``abc123`` back into ``ABC-123``."""
+    content_id = content_id.upper()
+    split = len(content_id.rstrip('0123456789'))
+    return f"{content_id[:split]}-{content_id[split:]}"
+
+
+def _encode_images() -> Dict:
+    """Encode the fanart and portrait images served for every image URL."""
+    from PIL import Image
+
+    images = {}
+    for kind, (width, height) in _IMAGE_SIZES.items():
+        rng = random.Random(kind)
+        img = Image.new('RGB', (width, height))
+        # Noise keeps the encoded size close to real covers instead of a few hundred bytes
+        img.putdata([(x * 255 // width, rng.randint(0, 255), y * 255 // height)
+                     for y in range(height) for x in range(width)])
+        for fmt in ('JPEG', 'WEBP'):
+            buffer = io.BytesIO()
+            img.save(buffer, fmt, quality=85)
+            images[(kind, fmt)] = buffer.getvalue()
+    return images
+
+
+def _serve(options: Dict, conn=None):
+    """Run the server until the process is terminated, reporting the bound port on ``conn``."""
+    async def main():
+        runner = web.AppRunner(build_app(options), access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, options.get('host', '127.0.0.1'), options.get('port', 0))
+        await site.start()
+        port = runner.addresses[0][1]
+        if conn is not None:
+            conn.send(port)
+        else:
+            print(f"Fixture server listening on http://{options.get('host', '127.0.0.1')}:{port}")
+        await asyncio.Event().wait()
+
+    asyncio.run(main())
+
+
+def _parse_site_values(values) -> Dict[str, float]:
+    """Parse ``host=value`` command line pairs."""
+    parsed = {}
+    for item in values or []:
+        host, _, value = item.partition('=')
+        parsed[host] = float(value)
+    return parsed
+
+
+def main():
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Serve offline fixture pages for the scraped sites")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help="Base response delay in seconds")
+    parser.add_argument('--jitter', type=float, default=0.0, help="Extra random delay of up to N seconds")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests that fail")
+    parser.add_argument('--error-status', type=int, default=503)
+    parser.add_argument('--miss-rate', type=float, default=0.0, help="Fraction of codes missing on jav.guru")
+    parser.add_argument('--site-latency', action='append', metavar='HOST=SECONDS')
+    parser.add_argument('--site-error-rate', action='append', metavar='HOST=RATE')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    _serve({
+        'host': args.host, 'port': args.port, 'latency': args.latency, 'jitter': args.jitter,
+        'error_rate': args.error_rate, 'error_status': args.error_status, 'miss_rate': args.miss_rate,
+        'site_latency': _parse_site_values(args.site_latency),
+        'site_error_rate': _parse_site_values(args.site_error_rate),
+        'seed': args.seed,
+    })
+
+
+if __name__ == "__main__":
+    main()
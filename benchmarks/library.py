@@ -0,0 +1,101 @@
+"""
+Synthetic Library
+=================
+
+Generate a library of sparse video files with realistic release names.
+
+Files are created with ``truncate`` so a 10k-file library of multi-gigabyte
+videos takes almost no disk space, while scanning, stat calls and moves see
+the same sizes and names as a real collection.
+
+Run standalone with ``python -m benchmarks.library DEST --count 1000``.
+"""
+
+import argparse
+import random
+from pathlib import Path
+from typing import List
+
+PREFIXES = (
+    'ABP', 'ADN', 'CAWD', 'DASS', 'EBOD', 'HMN', 'IPX', 'IPZZ', 'JUFE', 'JUL',
+    'JUQ', 'MEYD', 'MIAA', 'MIDE', 'MIDV', 'NSFS', 'PPPD', 'PRED', 'SAME', 'SNIS',
+    'SONE', 'SSIS', 'SSNI', 'STARS', 'STKO', 'URE', 'VEC', 'WAAA', 'XVSR', 'YUJ',
+)
+
+# Naming styles seen in real downloads; all of them resolve to the same code
+NAME_FORMATS = (
+    '{prefix}-{number}.mp4',
+    '{prefix}-{number}.mkv',
+    '{prefix_lower}{number}.mp4',
+    '{prefix}-{number} 1080p.mp4',
+    '{prefix}-{number}-C.mp4',
+    '{prefix_lower}-{number}_uncensored.mkv',
+    '[{prefix}-{number}] Full HD.mp4',
+    '{prefix}_{number}.avi',
+    '{prefix}-{number}.wmv',
+)
+
+EXTRA_FILES = ('cover.jpg', 'readme.txt', 'sample.nfo')
+
+GIB = 1024 ** 3
+
+
+def generate_library(root: str, count: int, seed: int = 0, files_per_folder: int = 250,
+                     extras_ratio: float = 0.05) -> List[str]:
+    """
+    Create ``count`` sparse video files with unique JAV codes under ``root``.
+
+    Args:
+        root (str): Library folder; created if missing
+        count (int): Number of video files
+        seed (int): Random seed, so a size always produces the same library
+        files_per_folder (int): Videos per download folder
+        extras_ratio (float): Non-video files added per video, e.g. covers and notes
+
+    Returns:
+        List[str]: Paths of the created video files
+    """
+    rng = random.Random(seed)
+    root_path = Path(root)
+    root_path.mkdir(parents=True, exist_ok=True)
+
+    codes = set()
+    while len(codes) < count:
+        codes.add((rng.choice(PREFIXES), rng.randint(1, 999)))
+
+    codes = sorted(codes)
+    rng.shuffle(codes)
+    paths = []
+    for index, (prefix, number) in enumerate(codes):
+        folder = root_path / f"downloads-{index // files_per_folder:03d}"
+        if rng.random() < 0.3:
+            # Some releases come in their own folder
+            folder = folder / f"{prefix}-{number:03d}"
+        folder.mkdir(parents=True, exist_ok=True)
+
+        name = rng.choice(NAME_FORMATS).format(prefix=prefix, prefix_lower=prefix.lower(), number=f"{number:03d}")
+        path = folder / name
+        with open(path, 'wb') as f:
+            f.truncate(rng.randint(1 * GIB, 6 * GIB))
+        paths.append(str(path))
+
+        if rng.random() < extras_ratio:
+            (folder / rng.choice(EXTRA_FILES)).write_bytes(b'x' * rng.randint(100, 4096))
+
+    return paths
+
+
+def main():
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Generate a synthetic library of sparse video files")
+    parser.add_argument('dest', help="Folder to create the library in")
+    parser.add_argument('--count', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    paths = generate_library(args.dest, args.count, seed=args.seed)
+    print(f"Created {len(paths)} video files in {args.dest}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+Parser Microbenchmarks
+======================
+
+Time the parsing and NFO-writing functions over the recorded corpus.
+
+Each case performs one operation per call on the next corpus entry (pages or
+metadata dicts are cycled), so ops/sec is comparable between cases with a
+different number of entries. Results can be stored as a baseline and later
+runs are compared against it.
+
+Usage::
+
+    python -m benchmarks.microbench                 # compare with the stored baseline
+    python -m benchmarks.microbench --save          # store a new baseline
+    python -m benchmarks.microbench -k javtrailers  # only matching cases
+
+With pytest-benchmark installed the same cases run as
+``python -m pytest benchmarks/test_microbench.py``.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import yaml
+
+CORPUS_DIR = Path(__file__).parent / "corpus"
+BASELINE_PATH = Path(__file__).parent / "baselines" / "microbench.json"
+
+
+def load_corpus(corpus_dir: Path = CORPUS_DIR) -> Dict:
+    """
+    Load the recorded pages and metadata dicts.
+
+    Args:
+        corpus_dir (Path): Corpus root folder
+
+    Returns:
+        Dict: ``{'pages': {kind: [(code, html), ...]}, 'metadata': [dict, ...]}``
+    """
+    pages: Dict[str, List] = {}
+    for path in sorted((corpus_dir / "pages").glob('*.html')):
+        kind, _, code = path.stem.rpartition('_')
+        pages.setdefault(kind, []).append((code, path.read_text(encoding='utf-8')))
+    metadata = [json.loads(path.read_text(encoding='utf-8'))
+                for path in sorted((corpus_dir / "metadata").glob('*.json'))]
+    return {'pages': pages, 'metadata': metadata}
+
+
+def create_engine(scratch_dir: str):
+    """Create an engine whose log file lives in ``scratch_dir``."""
+    from scraper_engine import JAVScraperEngine
+
+    config_path = os.path.join(scratch_dir, 'config.yml')
+    with open(config_path, 'w', encoding='utf-8') as f:
+        yaml.safe_dump({'logging': {'level': 'WARNING', 'file': os.path.join(scratch_dir, 'scraper.log')}}, f)
+    return JAVScraperEngine(config_path)
+
+
+def build_cases(engine, corpus: Dict, scratch_dir: str) -> Dict[str, Callable[[], object]]:
+    """
+    Build the benchmark cases.
+
+    Args:
+        engine (JAVScraperEngine): Engine whose methods are measured
+        corpus (Dict): Corpus as returned by ``load_corpus``
+        scratch_dir (str): Folder the NFO benchmark writes to
+
+    Returns:
+        Dict[str, Callable[[], object]]: Case name to a zero-argument function doing one operation
+    """
+    pages = corpus['pages']
+    javguru_search = itertools.cycle(pages['javguru_search'])
+    javguru_detail = itertools.cycle(pages['javguru_detail'])
+    javguru_detail_soups = itertools.cycle([(code, engine._soup(html)) for code, html in pages['javguru_detail']])
+    javtrailers_search = itertools.cycle(pages['javtrailers_search'])
+    javtrailers_detail = itertools.cycle(pages['javtrailers_detail'])
+    metadata = itertools.cycle(corpus['metadata'])
+
+    names = []
+    for entry in corpus['metadata']:
+        details = entry.get('detailed_metadata', {})
+        names.extend(value for value in (details.get('actress'), entry.get('all_details', {}).get('Actress')) if value)
+    # Raw names as they appear on the pages, with the Japanese spelling still attached
+    for code, html in pages.get('javtrailers_detail', []):
+        soup = engine._soup(html)
+        cast = soup.find('span', string=lambda text: text and 'Cast(s):' in text)
+        if cast and cast.find_next('a'):
+            names.append(cast.find_next('a').get_text(strip=True))
+    actress_names = itertools.cycle(names or ['Kana Yume 夢乃あいか'])
+    nfo_path = os.path.join(scratch_dir, 'movie.nfo')
+
+    def javguru_search_case():
+        code, html = next(javguru_search)
+        return engine._parse_javguru_search(html)
+
+    def javguru_detail_case():
+        code, html = next(javguru_detail)
+        return engine._extract_detailed_metadata(engine._soup(html), code)
+
+    def extract_detailed_metadata_case():
+        code, soup = next(javguru_detail_soups)
+        return engine._extract_detailed_metadata(soup, code)
+
+    def javtrailers_search_case():
+        code, html = next(javtrailers_search)
+        return engine._find_javtrailers_detail_url(html, code)
+
+    def javtrailers_detail_case():
+        code, html = next(javtrailers_detail)
+        return engine._parse_javtrailers_detail(html, code, f"https://javtrailers.com/video/{code.lower()}")
+
+    def clean_actress_name_case():
+        return engine.clean_actress_name(next(actress_names))
+
+    def create_nfo_file_case():
+        return engine.create_nfo_file(next(metadata), nfo_path)
+
+    return {
+        'javguru.parse_search': javguru_search_case,
+        'javguru.parse_detail': javguru_detail_case,
+        'javguru.extract_detailed_metadata': extract_detailed_metadata_case,
+        'javtrailers.find_detail_url': javtrailers_search_case,
+        'javtrailers.parse_detail': javtrailers_detail_case,
+        'clean_actress_name': clean_actress_name_case,
+        'create_nfo_file': create_nfo_file_case,
+    }
+
+
+def measure(func: Callable[[], object], min_time: float = 0.2, repeat: int = 5) -> Dict:
+    """
+    Measure ``func`` with ``timeit``.
+
+    The number of calls per round is calibrated so a round takes at least
+    ``min_time`` seconds; the fastest round is reported.
+
+    Returns:
+        Dict: ``ops_per_sec`` and ``us_per_op``
+    """
+    timer = timeit.Timer(func)
+    number, elapsed = timer.autorange()
+    while elapsed < min_time:
+        number *= 2
+        elapsed = timer.timeit(number)
+    best = min(timer.repeat(repeat=repeat, number=number)) / number
+    return {'ops_per_sec': round(1 / best, 1), 'us_per_op': round(best * 1e6, 2)}
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """
+    Return one line per case whose ops/sec dropped by more than ``tolerance``.
+    """
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get('cases', {}).get(name)
+        if previous and result['ops_per_sec'] < previous['ops_per_sec'] * (1 - tolerance):
+            regressions.append(f"{name}: {previous['ops_per_sec']} -> {result['ops_per_sec']} ops/sec")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Parser and NFO microbenchmarks over the recorded corpus")
+    parser.add_argument('-k', dest='keyword', help="Only run cases whose name contains this text")
+    parser.add_argument('--min-time', type=float, default=0.2, help="Minimum seconds per round")
+    parser.add_argument('--repeat', type=int, default=5, help="Rounds per case; the fastest is reported")
+    parser.add_argument('--save', action='store_true', help="Store the results as the new baseline")
+    parser.add_argument('--baseline', default=str(BASELINE_PATH), help="Baseline file")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Allowed relative slowdown")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix='wooscraper-microbench-') as scratch_dir:
+        engine = create_engine(scratch_dir)
+        cases = build_cases(engine, load_corpus(), scratch_dir)
+        results = {}
+        for name, func in cases.items():
+            if args.keyword and args.keyword not in name:
+                continue
+            results[name] = measure(func, min_time=args.min_time, repeat=args.repeat)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    print(f"{'case':<36} {'ops/sec':>12} {'us/op':>12} {'baseline':>12} {'change':>8}")
+    for name, result in results.items():
+        previous = baseline.get('cases', {}).get(name, {}).get('ops_per_sec')
+        change = f"{(result['ops_per_sec'] / previous - 1) * 100:+.1f}%" if previous else '-'
+        print(f"{name:<36} {result['ops_per_sec']:>12} {result['us_per_op']:>12} {previous or '-':>12} {change:>8}")
+
+    if args.save:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({
+                'machine': {'python': platform.python_version(), 'platform': platform.platform(),
+                            'processor': platform.machine()},
+                'cases': {**baseline.get('cases', {}), **results},
+            }, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
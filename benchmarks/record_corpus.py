@@ -0,0 +1,111 @@
+"""
+Corpus Recorder
+===============
+
+Record page snapshots and metadata dicts for the parser microbenchmarks.
+
+For each JAV code the JavGuru and JavTrailers search and detail pages are
+saved to ``benchmarks/corpus/pages`` and the combined metadata returned by
+``scrape_all_sites`` to ``benchmarks/corpus/metadata``. By default the pages
+come from the live sites through the configured fetch backend;
+``--fixture-server`` records from a local fixture server instead.
+
+Usage::
+
+    python -m benchmarks.record_corpus SSIS-123 IPX-456 --config config.yml
+    python -m benchmarks.record_corpus --fixture-server SSIS-123
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+from benchmarks.fixture_server import FixtureServer
+from benchmarks.run_benchmarks import write_config
+
+CORPUS_DIR = Path(__file__).parent / "corpus"
+
+
+async def record(codes: List[str], config_path: str, corpus_dir: Path = CORPUS_DIR, origin: str = 'live') -> Dict:
+    """
+    Fetch and store the pages and metadata of ``codes``.
+
+    Args:
+        codes (List[str]): JAV codes to record
+        config_path (str): Engine configuration used for fetching
+        corpus_dir (Path): Corpus root folder
+        origin (str): Where the pages came from, stored in the manifest
+
+    Returns:
+        Dict: The updated manifest
+    """
+    from scraper_engine import JAVScraperEngine
+
+    pages_dir = corpus_dir / "pages"
+    metadata_dir = corpus_dir / "metadata"
+    pages_dir.mkdir(parents=True, exist_ok=True)
+    metadata_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = corpus_dir / "manifest.json"
+    manifest = json.loads(manifest_path.read_text(encoding='utf-8')) if manifest_path.exists() else {'entries': {}}
+
+    async with JAVScraperEngine(config_path) as engine:
+        for code in codes:
+            pages = {}
+            search_html = await engine.fetch_html_with_playwright(f"https://jav.guru/?s={code}")
+            if search_html:
+                pages['javguru_search'] = search_html
+                search_result = engine._parse_javguru_search(search_html)
+                if search_result and search_result['detail_url']:
+                    pages['javguru_detail'] = await engine.fetch_html_with_playwright(search_result['detail_url'])
+
+            search_html = await engine.fetch_html_with_playwright(f"https://javtrailers.com/search/{code}")
+            if search_html:
+                pages['javtrailers_search'] = search_html
+                detail_url = engine._find_javtrailers_detail_url(search_html, code)
+                if detail_url:
+                    pages['javtrailers_detail'] = await engine.fetch_html_with_playwright(detail_url)
+
+            stored = []
+            for kind, html in pages.items():
+                if html:
+                    (pages_dir / f"{kind}_{code}.html").write_text(html, encoding='utf-8')
+                    stored.append(kind)
+
+            metadata = await engine.scrape_all_sites(code)
+            # Page HTML is already stored separately and would bloat the metadata files
+            for source in metadata.get('sources', {}).values():
+                source.pop('detail_html', None)
+            (metadata_dir / f"{code}.json").write_text(json.dumps(metadata, ensure_ascii=False, indent=2),
+                                                      encoding='utf-8')
+            manifest['entries'][code] = {'origin': origin, 'pages': stored}
+            print(f"Recorded {code}: {', '.join(stored) or 'no pages'}")
+
+    manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True) + '\n', encoding='utf-8')
+    return manifest
+
+
+def main():
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Record page snapshots for the parser microbenchmarks")
+    parser.add_argument('codes', nargs='+', help="JAV codes to record")
+    parser.add_argument('--config', default='config.yml', help="Configuration used for live recording")
+    parser.add_argument('--fixture-server', action='store_true', help="Record from a local fixture server")
+    parser.add_argument('--corpus', default=str(CORPUS_DIR), help="Corpus folder")
+    args = parser.parse_args()
+
+    codes = [code.upper() for code in args.codes]
+    if not args.fixture_server:
+        asyncio.run(record(codes, args.config, Path(args.corpus)))
+        return
+
+    with FixtureServer() as server, tempfile.TemporaryDirectory() as tmp:
+        config_path = write_config(os.path.join(tmp, 'config.yml'), server.base_url, tmp)
+        asyncio.run(record(codes, config_path, Path(args.corpus), origin='fixture'))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+"""
+Benchmark Runner
+================
+
+Run complete scraping jobs offline and report their throughput.
+
+For every library size a synthetic library is generated, the job runs in a
+fresh process against the fixture server (``fetch_backend: http`` and all
+site hosts overridden, so nothing leaves the machine), and the runner records:
+
+- files per minute
+- p50 and p99 per-file latency
+- peak RSS of the job process (and of scrape workers, if any)
+
+Results can be written as JSON and compared with an earlier run; the exit
+status is 1 when a metric regressed beyond the tolerance.
+
+Usage::
+
+    python -m benchmarks.run_benchmarks --sizes 10 1000 --output bench.json
+    python -m benchmarks.run_benchmarks --baseline bench.json
+"""
+
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import yaml
+
+from benchmarks.fixture_server import FixtureServer, site_overrides
+from benchmarks.library import generate_library
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_SIZES = (10, 1000, 10000)
+
+# Lower is better for these metrics, higher is better for files_per_minute
+_LOWER_IS_BETTER = ('p50_seconds', 'p99_seconds', 'peak_rss_mb')
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile.
+
+    Args:
+        values (List[float]): Samples
+        pct (float): Percentile between 0 and 100
+
+    Returns:
+        float: The percentile, or 0.0 without samples
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def write_config(path: str, base_url: str, workdir: str, workers: int = 1, keep_rate_limits: bool = False) -> str:
+    """
+    Write a benchmark configuration derived from the repository's config.yml.
+
+    Args:
+        path (str): Where to write the configuration
+        base_url (str): Root URL of the fixture server
+        workdir (str): Folder for the log file
+        workers (int): Scrape worker processes
+        keep_rate_limits (bool): Keep ``scraper.rate_limits`` instead of disabling them
+
+    Returns:
+        str: ``path``
+    """
+    with open(REPO_ROOT / 'config.yml', 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f) or {}
+
+    scraper = config.setdefault('scraper', {})
+    scraper['fetch_backend'] = 'http'
+    scraper['site_overrides'] = site_overrides(base_url)
+    scraper['workers'] = workers
+    if not keep_rate_limits:
+        # Measure the pipeline itself, not the politeness delays
+        scraper['rate_limits'] = {}
+    config['distributed'] = {'enabled': False}
+    # Every run measures full scrapes, including codes the fixture server does not know
+    config['local_store'] = {'enabled': False}
+    # Scenarios run in one process; breakers opened by one must not skip sites in the next
+    scraper['circuit_breaker'] = {'enabled': False}
+    config['logging'] = {'level': 'WARNING', 'file': os.path.join(workdir, 'scraper.log'),
+                         'max_size': '10MB', 'backup_count': 1}
+
+    with open(path, 'w', encoding='utf-8') as f:
+        yaml.safe_dump(config, f, sort_keys=False)
+    return path
+
+
+def _run_job(library: str, config_path: str, workers: int, result_path: str):
+    """Run one scraping job in this (fresh) process and write its measurements to ``result_path``."""
+    sys.path.insert(0, str(REPO_ROOT))
+    import jobs
+
+    ui_settings = {
+        'create_nfo': True,
+        'download_cover': True,
+        'organize_files': True,
+        'workers': workers,
+        'folder_path': library,
+    }
+    started = time.perf_counter()
+    job_status = jobs.run_scraping_job(library, ui_settings, config_path)
+    elapsed = time.perf_counter() - started
+
+    results = job_status.get('results', [])
+    latencies = [r['elapsed_seconds'] for r in results if 'elapsed_seconds' in r]
+    # ru_maxrss is reported in kilobytes on Linux
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    peak_worker_rss_mb = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+
+    measurements = {
+        'files': len(results),
+        'errors': len([r for r in results if 'error' in r]),
+        'job_error': job_status.get('error'),
+        'elapsed_seconds': round(elapsed, 3),
+        'files_per_minute': round(len(results) / elapsed * 60, 1) if elapsed else 0.0,
+        'p50_seconds': round(percentile(latencies, 50), 4),
+        'p99_seconds': round(percentile(latencies, 99), 4),
+        'peak_rss_mb': round(peak_rss_mb, 1),
+        'peak_worker_rss_mb': round(peak_worker_rss_mb, 1) if workers > 1 else None,
+        'stages': {stage: {'count': entry['count'], 'total_seconds': entry['total_seconds']}
+                   for stage, entry in (job_status.get('metrics') or {}).get('stages', {}).items()},
+    }
+    with open(result_path, 'w', encoding='utf-8') as f:
+        json.dump(measurements, f)
+
+
+def run_size(size: int, base_url: str, workdir: str, workers: int = 1, seed: int = 0,
+             keep_rate_limits: bool = False) -> Dict:
+    """
+    Generate a library of ``size`` files and run one job over it.
+
+    Args:
+        size (int): Number of video files
+        base_url (str): Root URL of the fixture server
+        workdir (str): Scratch folder for the library, config and log
+        workers (int): Scrape worker processes
+        seed (int): Library seed
+        keep_rate_limits (bool): Keep the configured per-site rate limits
+
+    Returns:
+        Dict: Measurements for this size
+    """
+    library = os.path.join(workdir, f"library-{size}")
+    # Jobs move files into videos/, so every run starts from a fresh library
+    shutil.rmtree(library, ignore_errors=True)
+    generate_library(library, size, seed=seed)
+    config_path = write_config(os.path.join(workdir, f"config-{size}.yml"), base_url, workdir,
+                               workers=workers, keep_rate_limits=keep_rate_limits)
+    result_path = os.path.join(workdir, f"result-{size}.json")
+
+    # A fresh process per size keeps peak RSS and imports independent of earlier runs
+    context = multiprocessing.get_context('spawn')
+    process = context.Process(target=_run_job, args=(library, config_path, workers, result_path))
+    process.start()
+    process.join()
+    if process.exitcode != 0 or not os.path.exists(result_path):
+        raise RuntimeError(f"Benchmark job for {size} files failed with exit code {process.exitcode}")
+    with open(result_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """
+    Compare results with a baseline run.
+
+    Args:
+        results (Dict): Current results keyed by size
+        baseline (Dict): Earlier results keyed by size
+        tolerance (float): Allowed relative change, e.g. 0.2 for 20%
+
+    Returns:
+        List[str]: One line per regressed metric
+    """
+    regressions = []
+    for size, current in results.items():
+        previous = baseline.get(size)
+        if not previous:
+            continue
+        if previous.get('files_per_minute') and \
+                current['files_per_minute'] < previous['files_per_minute'] * (1 - tolerance):
+            regressions.append(f"{size} files: files_per_minute {previous['files_per_minute']} -> "
+                               f"{current['files_per_minute']}")
+        for metric in _LOWER_IS_BETTER:
+            if previous.get(metric) and current.get(metric, 0) > previous[metric] * (1 + tolerance):
+                regressions.append(f"{size} files: {metric} {previous[metric]} -> {current[metric]}")
+    return regressions
+
+
+def _print_table(results: Dict):
+    """Print the results as a table."""
+    header = f"{'files':>7} {'errors':>6} {'files/min':>10} {'p50 s':>8} {'p99 s':>8} {'peak RSS MB':>12} {'total s':>9}"
+    print(header)
+    print('-' * len(header))
+    for size, r in results.items():
+        print(f"{size:>7} {r['errors']:>6} {r['files_per_minute']:>10} {r['p50_seconds']:>8} "
+              f"{r['p99_seconds']:>8} {r['peak_rss_mb']:>12} {r['elapsed_seconds']:>9}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Offline end-to-end scraping benchmarks")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES), help="Library sizes to run")
+    parser.add_argument('--workers', type=int, default=1, help="Scrape worker processes per job")
+    parser.add_argument('--latency', type=float, default=0.02, help="Fixture server base latency in seconds")
+    parser.add_argument('--jitter', type=float, default=0.01, help="Extra random latency of up to N seconds")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests that fail")
+    parser.add_argument('--miss-rate', type=float, default=0.0, help="Fraction of codes missing on jav.guru")
+    parser.add_argument('--keep-rate-limits', action='store_true', help="Keep scraper.rate_limits from config.yml")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workdir', help="Scratch folder to keep (default: a removed temporary folder)")
+    parser.add_argument('--output', help="Write the results as JSON to this file")
+    parser.add_argument('--baseline', help="Compare with results written earlier by --output")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Allowed relative regression")
+    args = parser.parse_args(argv)
+
+    server = FixtureServer(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                           miss_rate=args.miss_rate, seed=args.seed)
+    base_url = server.start()
+    results = {}
+    try:
+        with tempfile.TemporaryDirectory(prefix='wooscraper-bench-') as tmp:
+            workdir = args.workdir or tmp
+            os.makedirs(workdir, exist_ok=True)
+            for size in args.sizes:
+                print(f"Running {size} files...", flush=True)
+                results[str(size)] = run_size(size, base_url, workdir, workers=args.workers, seed=args.seed,
+                                              keep_rate_limits=args.keep_rate_limits)
+    finally:
+        server.stop()
+
+    _print_table(results)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Parser and NFO microbenchmarks for pytest-benchmark
+
+Run with ``python -m pytest benchmarks/test_microbench.py``; add
+``--benchmark-storage=benchmarks/baselines --benchmark-autosave`` to store a
+run and ``--benchmark-compare`` to compare with the last stored one.
+"""
+
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+from benchmarks.microbench import build_cases, create_engine, load_corpus
+
+CASE_NAMES = (
+    'javguru.parse_search',
+    'javguru.parse_detail',
+    'javguru.extract_detailed_metadata',
+    'javtrailers.find_detail_url',
+    'javtrailers.parse_detail',
+    'clean_actress_name',
+    'create_nfo_file',
+)
+
+
+@pytest.fixture(scope='module')
+def cases(tmp_path_factory):
+    scratch_dir = str(tmp_path_factory.mktemp('microbench'))
+    return build_cases(create_engine(scratch_dir), load_corpus(), scratch_dir)
+
+
+@pytest.mark.parametrize('name', CASE_NAMES)
+def test_microbench(benchmark, cases, name):
+    assert benchmark(cases[name])
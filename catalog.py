@@ -0,0 +1,167 @@
+"""
+Catalog
+=======
+
+Local index of the codes a site lists, built by crawling its listing pages.
+
+Searching a site once per code is slow for a large backlog. A listing page
+(the paginated home page, a studio or category page) shows dozens of titles
+at once, each with its detail page URL, title, cover and date. The crawler
+walks such pages at the rate limit of the site plus ``delay`` seconds, and
+stores what it finds in the ``catalog`` table of ``local_store.db``.
+Scraping a code in the catalog then goes straight to its detail page, without
+a search page.
+
+A listing URL has a ``{page}`` placeholder. A URL ending in ``.xml`` is read
+as a sitemap instead: every ``<loc>`` is a detail page whose URL contains
+the code, or a nested sitemap that is crawled as well.
+
+With ``incremental`` a listing crawl stops at the first page without new
+codes, so a periodic run only reads the newest pages.
+
+Run from the command line with ``python wooscraper.py catalog javguru``.
+"""
+
+import asyncio
+import html as html_lib
+import logging
+import re
+from typing import Callable, Dict, List, Optional
+
+# Listing pages per source, newest first
+DEFAULT_LISTINGS = {
+    'javguru': 'https://jav.guru/page/{page}/',
+}
+
+# Engine methods that parse a listing page of a source into catalog entries
+LISTING_PARSERS = {
+    'javguru': '_parse_javguru_listing',
+}
+
+
+def parse_sitemap(xml: str) -> List[str]:
+    """Return the ``<loc>`` URLs of a sitemap or sitemap index."""
+    return [html_lib.unescape(url.strip()) for url in re.findall(r'<loc>\s*(.*?)\s*</loc>', xml, re.DOTALL)]
+
+
+class CatalogCrawler:
+    """
+    Crawl the listing pages of one source into the local store's catalog.
+    """
+
+    def __init__(self, engine, source: str, url: Optional[str] = None, pages: int = 100,
+                 start_page: int = 1, delay: float = 2.0, incremental: bool = True):
+        """
+        Initialize the crawler.
+
+        Args:
+            engine (JAVScraperEngine): Engine whose fetch helpers, rate limits and store are used
+            source (str): Source name the entries are stored under, e.g. ``javguru``
+            url (str, optional): Listing URL with ``{page}``, or a sitemap URL; defaults to
+                ``DEFAULT_LISTINGS`` of the source
+            pages (int): Most pages (or sitemaps) to fetch
+            start_page (int): First page number of a listing
+            delay (float): Seconds to wait between pages, on top of the site's rate limit
+            incremental (bool): Stop at the first page without new codes
+
+        Raises:
+            ValueError: If the source has no default listing and no URL was given, or the
+                local store is disabled
+        """
+        self.engine = engine
+        self.source = source
+        self.url = url or DEFAULT_LISTINGS.get(source)
+        if not self.url:
+            raise ValueError(f"No listing URL for {source}; pass one with {{page}} or a sitemap URL")
+        if engine.store is None:
+            raise ValueError("The catalog needs the local store (local_store.enabled)")
+        self.pages = max(1, int(pages))
+        self.start_page = max(1, int(start_page))
+        self.delay = max(0.0, float(delay))
+        self.incremental = incremental
+
+    @classmethod
+    def from_config(cls, engine, source: str, **overrides) -> 'CatalogCrawler':
+        """
+        Build a crawler from ``catalog`` in the config; ``overrides`` that are not None win.
+
+        ``catalog.sources.<source>`` may set ``url`` and ``pages``; ``catalog.delay``
+        applies to every source.
+        """
+        settings = engine.config.get('catalog', {}) or {}
+        options = {'delay': settings.get('delay', 2.0), **((settings.get('sources') or {}).get(source) or {})}
+        options.update({key: value for key, value in overrides.items() if value is not None})
+        return cls(engine, source, **options)
+
+    @property
+    def is_sitemap(self) -> bool:
+        return '{page}' not in self.url and self.url.split('?', 1)[0].endswith('.xml')
+
+    async def crawl(self, on_page: Optional[Callable[[Dict], None]] = None) -> Dict:
+        """
+        Crawl the listing and store its entries.
+
+        Args:
+            on_page (Callable, optional): Called with ``url``, ``entries`` and ``new`` after each page
+
+        Returns:
+            Dict: ``pages`` fetched, ``entries`` seen, ``new`` codes and catalog ``total`` of the source
+        """
+        stats = {'pages': 0, 'entries': 0, 'new': 0}
+        crawl = self._crawl_sitemap if self.is_sitemap else self._crawl_listing
+        await crawl(stats, on_page)
+        stats['total'] = self.engine.store.catalog_size(self.source)
+        logging.info("📚 Catalog of %s: %s pages, %s entries, %s new, %s codes in total",
+                     self.source, stats['pages'], stats['entries'], stats['new'], stats['total'])
+        return stats
+
+    def _store(self, url: str, entries: List[Dict], stats: Dict, on_page) -> int:
+        new = self.engine.store.add_catalog_entries(self.source, entries)
+        stats['pages'] += 1
+        stats['entries'] += len(entries)
+        stats['new'] += new
+        logging.debug("📚 %s: %s entries, %s new", url, len(entries), new)
+        if on_page:
+            on_page({'url': url, 'entries': len(entries), 'new': new})
+        return new
+
+    async def _crawl_listing(self, stats: Dict, on_page):
+        parser = LISTING_PARSERS.get(self.source)
+        if not parser:
+            raise ValueError(f"No listing parser for {self.source}; use a sitemap URL")
+        parse = getattr(self.engine, parser)
+        for page in range(self.start_page, self.start_page + self.pages):
+            if page > self.start_page:
+                await asyncio.sleep(self.delay)
+            url = self.url.format(page=page)
+            html = await self.engine.fetch_html_with_playwright(url)
+            if not html:
+                logging.warning("⚠️ Could not fetch listing page %s, stopping", url)
+                return
+            entries = parse(html)
+            if not entries:
+                logging.debug("📚 %s lists nothing, past the last page", url)
+                return
+            if self._store(url, entries, stats, on_page) == 0 and self.incremental:
+                logging.debug("📚 No new codes on %s, stopping", url)
+                return
+
+    async def _crawl_sitemap(self, stats: Dict, on_page):
+        pending = [self.url]
+        while pending and stats['pages'] < self.pages:
+            if stats['pages']:
+                await asyncio.sleep(self.delay)
+            url = pending.pop(0)
+            xml = await self.engine._fetch_html_http(url)
+            if not xml:
+                logging.warning("⚠️ Could not fetch sitemap %s", url)
+                continue
+            entries = []
+            for loc in parse_sitemap(xml):
+                if loc.split('?', 1)[0].endswith('.xml'):
+                    pending.append(loc)
+                    continue
+                jav_code = self.engine.extract_jav_code(loc.rstrip('/').rsplit('/', 1)[-1])
+                if jav_code:
+                    entries.append({'jav_code': jav_code, 'detail_url': loc})
+            self._store(url, entries, stats, on_page)
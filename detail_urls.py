@@ -0,0 +1,130 @@
+"""
+Detail URLs
+===========
+
+Detail page URLs learned from earlier searches.
+
+Most sites put the code into the detail page URL in a fixed way, e.g.
+``https://javtrailers.com/video/ssis123``. After a search found a detail page,
+``derive_template`` replaces the code in its URL by a placeholder
+(``https://javtrailers.com/video/{content_id}``). A template that worked for
+``min_successes`` codes, and failed less often than it worked, is used to go
+to the detail page of the next code directly, which saves the search page
+fetch. When the page it points to is not the code's detail page, the failure
+is counted and the scraper searches as before.
+
+URLs with other parts that change per title, like the post id in jav.guru's
+``/123456/ssis-123-title/``, give no template.
+"""
+
+import re
+import urllib.parse
+from typing import Dict, Optional, Tuple
+
+# Placeholders, tried longest value first
+PLACEHOLDERS = ('dmm_id', 'code', 'code_lower', 'content_id_upper', 'content_id')
+
+
+def code_variants(jav_code: str) -> Dict[str, str]:
+    """
+    Return the ways a code is written in URLs.
+
+    ``SSIS-123`` gives ``code`` SSIS-123, ``code_lower`` ssis-123, ``content_id``
+    ssis123, ``content_id_upper`` SSIS123 and ``dmm_id`` ssis00123.
+    """
+    code = (jav_code or '').upper()
+    label, _, number = code.rpartition('-')
+    variants = {
+        'code': code,
+        'code_lower': code.lower(),
+        'content_id': (label + number).lower(),
+        'content_id_upper': label + number,
+    }
+    if label and number.isdigit():
+        variants['dmm_id'] = f"{label.lower()}{int(number):05d}"
+    return variants
+
+
+def derive_template(jav_code: str, url: str) -> Optional[str]:
+    """
+    Turn the detail page URL of ``jav_code`` into a template for other codes.
+
+    Returns:
+        Optional[str]: ``str.format`` template, or None when the URL does not contain
+        the code or has other parts that look title-specific
+    """
+    if not url or '{' in url or '}' in url:
+        return None
+    variants = code_variants(jav_code)
+    for name in sorted(variants, key=lambda name: (-len(variants[name]), PLACEHOLDERS.index(name))):
+        if variants[name] and variants[name] in url:
+            template = url.replace(variants[name], '{' + name + '}')
+            break
+    else:
+        return None
+    # A long number besides the code is an id or date of this title
+    parts = urllib.parse.urlsplit(template)
+    if re.search(r'\d{4,}', re.sub(r'\{\w+\}', '', parts.path + parts.query)):
+        return None
+    return template
+
+
+class DetailUrlResolver:
+    """
+    Learned detail URL templates per source, with their successes and failures.
+    """
+
+    def __init__(self, min_successes: int = 2, enabled: bool = True):
+        """
+        Initialize the resolver.
+
+        Args:
+            min_successes (int): Codes a template must have worked for before it is used
+            enabled (bool): When False ``resolve`` never returns a URL
+        """
+        self.min_successes = max(1, int(min_successes))
+        self.enabled = enabled
+        # Source -> template -> {'successes', 'failures'}
+        self.templates: Dict[str, Dict[str, Dict]] = {}
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'DetailUrlResolver':
+        """Build the resolver from the ``scraper.detail_urls`` config section."""
+        settings = ((config or {}).get('scraper', {}) or {}).get('detail_urls', {}) or {}
+        return cls(min_successes=int(settings.get('min_successes', 2)),
+                   enabled=bool(settings.get('enabled', True)))
+
+    def loaded(self, source: str) -> bool:
+        """Whether the templates of ``source`` were loaded."""
+        return source in self.templates
+
+    def load(self, source: str, templates: Dict[str, Dict]):
+        """Set the templates of ``source`` (``LocalStore.url_templates``)."""
+        self.templates[source] = {template: dict(counts) for template, counts in templates.items()}
+
+    def record(self, source: str, template: str, ok: bool):
+        """Count a success or failure of ``template``."""
+        counts = self.templates.setdefault(source, {}).setdefault(template, {'successes': 0, 'failures': 0})
+        counts['successes' if ok else 'failures'] += 1
+
+    def resolve(self, source: str, jav_code: str) -> Optional[Tuple[str, str]]:
+        """
+        Return the detail page URL of ``jav_code`` on ``source`` from the best template.
+
+        Returns:
+            Optional[Tuple[str, str]]: The template and the URL, or None when no template
+            is trusted yet
+        """
+        if not self.enabled:
+            return None
+        trusted = [(counts['successes'] - counts['failures'], template)
+                   for template, counts in self.templates.get(source, {}).items()
+                   if counts['successes'] >= self.min_successes and counts['failures'] < counts['successes']]
+        variants = code_variants(jav_code)
+        for _, template in sorted(trusted, reverse=True):
+            try:
+                return template, template.format(**variants)
+            except KeyError:
+                # e.g. a dmm_id template for a code without a number
+                continue
+        return None
@@ -0,0 +1,738 @@
+"""
+Scraping Jobs
+=============
+
+The scraping job shared by the web app and the command line.
+
+A job scans a folder (or takes a prepared file list), scrapes the metadata of
+every JAV code, organizes the videos into ``videos/<actress>/<code>/`` and
+writes the NFO file, fanart, poster and actress portrait. Codes run through a
+``pipeline`` of four stages with bounded queues (``scraper.pipeline``):
+metadata, actress portraits, images (downloaded into a staging folder) and
+organize. Up to ``prefetch`` codes after the one being organized are scraped
+ahead, so their metadata, portraits and images are ready when it is done.
+The organize stage takes the scraped codes waiting for it, up to
+``scraper.organize_batch_size``, plans their moves together and runs them as
+one ordered batch (see ``organizer``), then writes the NFO files and moves the
+staged images next to the videos. Progress
+is written to a status dict, which the web app serves from ``/api/job-status``, and can
+also be reported through an event callback. ``site_health`` in the status
+shows the circuit breaker of every site the job talked to.
+
+A code whose sites asked to come back later (``RetryLater``) goes back on the
+job's queue and is fed into the pipeline again once the wait has passed,
+up to ``scraper.retry.reschedules`` times; the job only waits when nothing
+else is left.
+
+This module does not import Flask.
+"""
+
+import asyncio
+import collections
+import logging
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from metrics import REGISTRY
+from organizer import OrganizePlanner, execute_plan
+from pipeline import Pipeline, Stage
+from profiling import JobProfiler
+from retry_policy import RetryLater, RetrySchedule
+from scrape_workers import ScrapeCoordinator
+from scraper_engine import JAVScraperEngine
+from site_health import SITE_HEALTH
+from work_queue import QueueCoordinator
+
+
+def new_job_status() -> Dict:
+    """
+    Return a job status in its initial state.
+
+    Returns:
+        Dict: Status with no progress, results or error
+    """
+    return {
+        'running': False,
+        'progress': 0,
+        'total_files': 0,
+        'processed_files': 0,
+        'current_file': '',
+        'results': [],
+        'error': None
+    }
+
+
+def _transfer_progress(job_status: Dict):
+    """Return an ``execute_plan`` progress callback that publishes the copy rate in ``job_status['transfer']``."""
+    def update(jav_code: str, copied: int, total: int, bytes_per_second: float):
+        job_status['transfer'] = {
+            'jav_code': jav_code,
+            'bytes_done': copied,
+            'total_bytes': total,
+            'bytes_per_second': round(bytes_per_second),
+        }
+        job_status['message'] = (f'🔄 Copying {jav_code}: {copied * 100 // max(total, 1)}% '
+                                 f'at {bytes_per_second / 1024 ** 2:.1f} MB/s')
+    return update
+
+
+async def _scrape_file(engine: JAVScraperEngine, coordinator, file_info: Dict, job_status: Dict,
+                       enrich: bool = True) -> Dict:
+    """
+    Scrape the metadata of one file, through the worker coordinator when there is one.
+
+    Args:
+        enrich (bool): Look up actress portraits as well (workers always do)
+
+    Returns:
+        Dict: Combined metadata, merged with ``file_info``
+    """
+    jav_code = file_info['jav_code']
+    # Scrape metadata
+    job_status['message'] = f'🔍 Scraping metadata for {jav_code}...'
+    logging.debug("🔍 ==== METADATA SCRAPING START ====")
+    logging.debug("🔍 JAV Code: %s", jav_code)
+    logging.debug("🔍 File: %s", file_info['file_path'])
+
+    # Update job status with detailed scraping info
+    job_status['message'] = f'🔍 Searching JAV.guru for {jav_code}...'
+    if coordinator:
+        metadata = await coordinator.get(jav_code)
+    else:
+        metadata = await engine.scrape_all_sites(jav_code, enrich=enrich)
+    metadata.update(file_info)
+
+    # Log detailed scraping results
+    source = metadata.get('source', 'unknown')
+    detailed_metadata = metadata.get('detailed_metadata', {})
+
+    logging.debug("✅ ==== METADATA SCRAPING COMPLETED ====")
+    logging.debug("✅ Source: %s", source)
+    logging.debug("✅ Title: %s", metadata.get('title', 'N/A'))
+    logging.debug("✅ Studio: %s", detailed_metadata.get('studio', 'N/A'))
+    logging.debug("✅ Release Date: %s", detailed_metadata.get('release_date', 'N/A'))
+    logging.debug("✅ Duration: %s mins", detailed_metadata.get('duration', 'N/A'))
+    logging.debug("✅ Actresses: %s", detailed_metadata.get('actress', 'N/A'))
+    logging.debug("✅ Categories: %s", detailed_metadata.get('categories', []))
+    logging.debug("✅ Series: %s", detailed_metadata.get('series', 'N/A'))
+    logging.debug("✅ Poster URL: %s", detailed_metadata.get('poster_url', 'N/A'))
+    logging.debug("✅ Fanart URL: %s", detailed_metadata.get('fanart_url', 'N/A'))
+
+    # Update job status with results
+    if source != 'unknown':
+        job_status['message'] = f'✅ Found metadata on {source} for {jav_code}'
+    else:
+        job_status['message'] = f'⚠️ No metadata found for {jav_code}'
+    return metadata
+
+
+def _write_nfo(engine: JAVScraperEngine, jav_code: str, metadata: Dict, output_folder: Path,
+               job_status: Dict) -> Path:
+    """
+    Write the NFO file into ``output_folder``.
+
+    Returns:
+        Path: Path of the NFO file
+    """
+    # Create NFO file directly from metadata (no metadata.json needed)
+    job_status['message'] = f'📄 Creating NFO file for {jav_code}...'
+    nfo_path = output_folder / "movie.nfo"
+    logging.debug("📄 ==== NFO FILE CREATION ====")
+    logging.debug("   📄 NFO path: %s", nfo_path)
+    logging.debug("   📄 Output folder: %s", output_folder)
+    logging.debug("   📄 Output folder exists: %s", output_folder.exists())
+
+    engine.create_nfo_file(metadata, str(nfo_path))
+    logging.debug("✅ Successfully created NFO file: %s", nfo_path)
+    if nfo_path.exists():
+        size = nfo_path.stat().st_size
+        logging.debug("📏 NFO file size: %s bytes", size)
+        job_status['message'] = f'✅ NFO file created ({size} bytes)'
+    else:
+        job_status['message'] = f'❌ Failed to create NFO file'
+    return nfo_path
+
+
+async def _fetch_images(engine: JAVScraperEngine, jav_code: str, metadata: Dict, output_folder: Path,
+                        ui_settings: Dict, job_status: Dict) -> Dict[str, Optional[Path]]:
+    """
+    Download fanart, poster and actress portrait into ``output_folder``.
+
+    Returns:
+        Dict[str, Optional[Path]]: Paths of the ``fanart``, ``poster`` and ``portrait``,
+        or None where they were not written
+    """
+    fanart_path = poster_path = portrait_path = None
+    # Download fanart and create poster
+    job_status['message'] = f'🎨 Checking for images for {jav_code}...'
+    logging.debug("🎨 ==== FANART AND POSTER CREATION ====")
+    # Prioritize fanart_url from detailed metadata, fallback to best_cover
+    fanart_url = None
+    if metadata.get('detailed_metadata', {}).get('fanart_url'):
+        fanart_url = metadata['detailed_metadata']['fanart_url']
+        logging.debug("🎨 Using fanart URL from detailed metadata: %s", fanart_url)
+        job_status['message'] = f'🎨 Found fanart URL from metadata'
+    elif metadata.get('best_cover'):
+        fanart_url = metadata['best_cover']
+        logging.debug("🎨 Using fallback cover URL: %s", fanart_url)
+        job_status['message'] = f'🎨 Using fallback cover URL'
+    else:
+        logging.warning("⚠️ No fanart URL found in metadata")
+        logging.debug("📊 Available metadata keys: %s", list(metadata.get('detailed_metadata', {}).keys()))
+        job_status['message'] = f'⚠️ No fanart URL found'
+
+    if ui_settings.get('download_cover', True) and fanart_url:
+        fanart_path = output_folder / "fanart.jpg"
+        poster_path = output_folder / "poster.jpg"
+
+        logging.debug("🎨 Fanart download path: %s", fanart_path)
+        logging.debug("🎨 Poster creation path: %s", poster_path)
+
+        # Check if webp conversion is needed (for JAVmost)
+        needs_webp_conversion = metadata.get('detailed_metadata', {}).get('needs_webp_conversion', False)
+        webp_url = metadata.get('detailed_metadata', {}).get('webp_url')
+
+        logging.debug("🔄 Webp conversion check:")
+        logging.debug("   🔄 needs_webp_conversion: %s", needs_webp_conversion)
+        logging.debug("   🔄 webp_url: %s", webp_url)
+
+        if needs_webp_conversion and webp_url:
+            job_status['message'] = f'🔄 Converting WebP image for {jav_code}...'
+            logging.debug("🔄 ==== WEBP CONVERSION MODE ====")
+            logging.debug("🔄 Converting webp to jpg: %s", webp_url)
+            logging.debug("🔄 Target fanart path: %s", fanart_path)
+
+            try:
+                if await engine.download_and_convert_webp_to_jpg(webp_url, str(fanart_path)):
+                    logging.debug("✅ Webp conversion successful")
+                    job_status['message'] = f'🎨 Creating poster from fanart...'
+                    # Create poster by cropping the right 47.125% of fanart
+                    logging.debug("🎨 Creating poster from fanart...")
+                    engine.create_poster_from_fanart(str(fanart_path), str(poster_path))
+                    logging.debug("✅ Successfully created fanart.jpg and poster.jpg for %s", jav_code)
+                    logging.debug("✅ Fanart location: %s", fanart_path)
+                    logging.debug("✅ Poster location: %s", poster_path)
+
+                    # Verify file sizes
+                    if fanart_path.exists():
+                        fanart_size = fanart_path.stat().st_size
+                        logging.debug("📏 Fanart file size: %s bytes", fanart_size)
+                    if poster_path.exists():
+                        poster_size = poster_path.stat().st_size
+                        logging.debug("📏 Poster file size: %s bytes", poster_size)
+
+                    job_status['message'] = f'✅ Images created successfully'
+                else:
+                    logging.error("❌ Failed to convert webp for %s", jav_code)
+                    job_status['message'] = f'❌ Failed to convert WebP image'
+            except Exception as e:
+                logging.error("❌ Error in webp conversion: %s", e)
+                job_status['message'] = f'❌ Error converting webp image: {str(e)}'
+        else:
+            job_status['message'] = f'📄 Downloading image for {jav_code}...'
+            logging.debug("📄 ==== REGULAR IMAGE DOWNLOAD MODE ====")
+            # Regular image download
+            logging.debug("📄 Downloading regular image: %s", fanart_url)
+            try:
+                if await engine.download_image(fanart_url, str(fanart_path)):
+                    logging.debug("✅ Regular image download successful")
+                    job_status['message'] = f'🎨 Creating poster from fanart...'
+                    # Create poster by cropping the right 47.125% of fanart
+                    logging.debug("🎨 Creating poster from fanart...")
+                    engine.create_poster_from_fanart(str(fanart_path), str(poster_path))
+                    logging.debug("✅ Successfully created fanart.jpg and poster.jpg for %s", jav_code)
+                    logging.debug("✅ Fanart location: %s", fanart_path)
+                    logging.debug("✅ Poster location: %s", poster_path)
+
+                    # Verify file sizes
+                    if fanart_path.exists():
+                        fanart_size = fanart_path.stat().st_size
+                        logging.debug("📏 Fanart file size: %s bytes", fanart_size)
+                    if poster_path.exists():
+                        poster_size = poster_path.stat().st_size
+                        logging.debug("📏 Poster file size: %s bytes", poster_size)
+
+                    job_status['message'] = f'✅ Images created successfully'
+                else:
+                    logging.error("❌ Failed to download fanart for %s", jav_code)
+                    job_status['message'] = f'❌ Failed to download image'
+            except Exception as e:
+                logging.error("❌ Error in image download: %s", e)
+                job_status['message'] = f'❌ Error downloading image: {str(e)}'
+    else:
+        if not ui_settings.get('download_cover', True):
+            logging.debug("ℹ️ Cover download disabled in UI settings")
+        else:
+            logging.warning("⚠️ No fanart URL available for %s", jav_code)
+
+    # Download actress portrait if available
+    job_status['message'] = f'🎭 Checking for actress portrait for {jav_code}...'
+    logging.debug("🎭 ==== ACTRESS PORTRAIT DOWNLOAD ====")
+    actress_name = ""
+    if metadata.get('detailed_metadata', {}).get('actress'):
+        actress_name = metadata['detailed_metadata']['actress'].split(',')[0].strip()
+        logging.debug("🎭 Found actress name: '%s'", actress_name)
+    elif metadata.get('detailed_metadata', {}).get('actresses'):
+        actress_name = metadata['detailed_metadata']['actresses'].split(',')[0].strip()
+        logging.debug("🎭 Found actress in actresses field: '%s'", actress_name)
+    else:
+        logging.debug("ℹ️ No actress name found in metadata")
+
+    if actress_name and ui_settings.get('download_cover', True):
+        job_status['message'] = f'🎭 Processing portrait for {actress_name}...'
+        # Clean actress name for filename
+        import re
+        original_actress_name = actress_name
+        clean_actress_name = re.sub(r'[<>:"/\\|?*]', '', actress_name)
+        clean_actress_name = clean_actress_name.replace(' ', '_')
+        logging.debug("🎭 Actress name cleaned: '%s' → '%s'", original_actress_name, clean_actress_name)
+
+        portrait_path = output_folder / f"{clean_actress_name}_portrait.jpg"
+        logging.debug("🎭 Portrait save path: %s", portrait_path)
+
+        # Get portrait URL from metadata (already found by enhance_actress_metadata)
+        actress_portrait_url = (metadata.get('detailed_metadata', {}).get('thumb_url') or
+                              metadata.get('all_details', {}).get('Actress Portrait'))
+
+        if not actress_portrait_url:
+            logging.warning("⚠️ No portrait URL found in metadata for %s", actress_name)
+            logging.warning("⚠️ This should not happen - enhance_actress_metadata should have found it")
+            job_status['message'] = f'⚠️ No portrait URL in metadata for {actress_name}'
+        else:
+            logging.debug("🎭 Found portrait URL in metadata: %s", actress_portrait_url)
+
+        if actress_portrait_url:
+            job_status['message'] = f'🎭 Downloading portrait of {actress_name}...'
+            logging.debug("🎭 Attempting to download portrait from: %s", actress_portrait_url)
+
+            # Check if it's a webp file from JAV Database
+            if actress_portrait_url.endswith('.webp'):
+                logging.debug("🎭 Detected webp file, converting to jpg...")
+                try:
+                    if await engine.download_and_convert_webp_to_jpg(actress_portrait_url, str(portrait_path)):
+                        logging.debug("✅ Successfully downloaded and converted webp portrait: %s", portrait_path)
+                        # Check file size
+                        if portrait_path.exists():
+                            size = portrait_path.stat().st_size
+                            logging.debug("📏 Portrait file size: %s bytes", size)
+                            job_status['message'] = f'✅ Portrait downloaded and converted ({size} bytes)'
+                        else:
+                            job_status['message'] = f'❌ Portrait file not found after conversion'
+                    else:
+                        logging.error("❌ Failed to download and convert webp portrait for %s", actress_name)
+                        logging.error("❌ Portrait URL from metadata: %s", actress_portrait_url)
+                        logging.error("❌ Portrait path: %s", portrait_path)
+                        job_status['message'] = f'❌ Failed to download and convert portrait'
+                except Exception as e:
+                    logging.error("❌ Error in webp conversion for portrait: %s", e)
+                    job_status['message'] = f'❌ Error converting webp portrait: {str(e)}'
+            else:
+                # Regular image download
+                try:
+                    if await engine.download_image(actress_portrait_url, str(portrait_path)):
+                        logging.debug("✅ Successfully downloaded actress portrait: %s", portrait_path)
+                        # Check file size
+                        if portrait_path.exists():
+                            size = portrait_path.stat().st_size
+                            logging.debug("📏 Portrait file size: %s bytes", size)
+                            job_status['message'] = f'✅ Portrait downloaded ({size} bytes)'
+                        else:
+                            job_status['message'] = f'❌ Portrait file not found after download'
+                    else:
+                        logging.error("❌ Failed to download actress portrait for %s", actress_name)
+                        logging.error("❌ Portrait URL from metadata: %s", actress_portrait_url)
+                        logging.error("❌ Portrait path: %s", portrait_path)
+                        job_status['message'] = f'❌ Failed to download portrait'
+                except Exception as e:
+                    logging.error("❌ Error in image download for portrait: %s", e)
+                    job_status['message'] = f'❌ Error downloading portrait: {str(e)}'
+        else:
+            logging.warning("⚠️ No actress portrait URL in metadata for %s", actress_name)
+            logging.warning("⚠️ Portrait search was already done by enhance_actress_metadata")
+            job_status['message'] = f'⚠️ No portrait URL in metadata for {actress_name}'
+    else:
+        if not actress_name:
+            logging.debug("ℹ️ No actress name found, skipping portrait download")
+        else:
+            logging.debug("ℹ️ Cover download disabled in UI settings, skipping portrait")
+    return {'fanart': fanart_path, 'poster': poster_path, 'portrait': portrait_path}
+
+
+def _copy_artifacts(artifacts: Dict[str, Optional[Path]], output_folder: Path,
+                    move: bool = False) -> Dict[str, Optional[Path]]:
+    """
+    Copy the NFO file and images of another file of the same code into ``output_folder``.
+
+    Existing files in ``output_folder`` are kept when copying.
+
+    Args:
+        artifacts (Dict[str, Optional[Path]]): Paths by kind, None where there is no file
+        output_folder (Path): Folder to copy into
+        move (bool): Move the files instead, replacing existing ones, e.g. out of the staging folder
+
+    Returns:
+        Dict[str, Optional[Path]]: The paths in ``output_folder``
+    """
+    copied = {}
+    for kind, path in artifacts.items():
+        if path is None or not path.exists():
+            copied[kind] = None
+            continue
+        target = output_folder / path.name
+        if move:
+            shutil.move(str(path), str(target))
+        elif not target.exists():
+            shutil.copy2(path, target)
+        copied[kind] = target
+    return copied
+
+
+def run_scraping_job(folder_path: str, ui_settings: Dict, config_path: str = "config.yml",
+                     job_status: Optional[Dict] = None, file_list: Optional[List[Dict]] = None,
+                     on_event: Optional[Callable[[Dict], None]] = None) -> Dict:
+    """
+    Scrape, organize and write NFO files for the videos in a folder.
+
+    Runs its own event loop, so it is called from a background thread by the
+    web app and directly by the command line.
+
+    Args:
+        folder_path (str): Folder to scan, and the base of ``videos/`` when organizing
+        ui_settings (Dict): ``organize_files``, ``download_cover``, ``workers``, ``profile``,
+            ``dry_run`` to scrape and report the organize plan without changing any files, and
+            ``recheck`` to ask sources again that recently had no result for a code
+        config_path (str): Path to the configuration file
+        job_status (Dict, optional): Status dict updated while the job runs; setting its
+            ``running`` key to False stops the job once the codes in the pipeline are done
+        file_list (List[Dict], optional): Files as returned by ``scan_folder``; the folder is
+            scanned when not given
+        on_event (Callable, optional): Called with a ``start`` event, one ``file`` event per
+            processed file (one ``plan`` event per file with ``dry_run``), a ``retry`` event per
+            rescheduled code and a final ``done`` event
+
+    Returns:
+        Dict: The final job status
+    """
+    if job_status is None:
+        job_status = new_job_status()
+        job_status['running'] = True
+
+    def emit(event: str, **fields):
+        if on_event:
+            on_event({'event': event, **fields})
+
+    async def async_scraping():
+        coordinator = None
+        staging = None
+        profiler = None
+        # Per-file results, also kept when the job fails part way
+        results = []
+        metrics_start = REGISTRY.snapshot()
+        try:
+            logging.info("🚀 Starting scraping job with detailed logging")
+            logging.info("📁 Folder to scan: %s", folder_path)
+            logging.debug("⚙️ UI Settings: %s", ui_settings)
+            
+            async with JAVScraperEngine(config_path) as engine:
+                # Profile the whole job when enabled in config.yml or requested for this job
+                profiler = JobProfiler.from_config(engine.config, requested=ui_settings.get('profile'))
+                if profiler:
+                    profiler.start()
+
+                # Scan for files
+                if file_list is None:
+                    logging.info("🔍 Scanning folder for JAV files: %s", folder_path)
+                    files = engine.scan_folder(folder_path)
+                else:
+                    files = list(file_list)
+                # Copies and parts of the same code are scraped once
+                groups = engine.group_by_code(files)
+                files = [file_info for group in groups for file_info in group['files']]
+                codes = [group['jav_code'] for group in groups]
+                job_status['total_files'] = len(files)
+                job_status['unique_codes'] = len(codes)
+                logging.info("📊 Found %s JAV files to process (%s unique codes)", len(files), len(codes))
+                emit('start', folder=folder_path, total=len(files))
+                
+                if len(files) == 0:
+                    error_msg = 'No JAV files found in folder'
+                    logging.error("❌ %s", error_msg)
+                    job_status['error'] = error_msg
+                    job_status['running'] = False
+                    return
+                
+                if ui_settings.get('recheck') and engine.store:
+                    forgotten = engine.store.forget(codes)
+                    logging.info("🔄 Rechecking every source: cleared %s cached misses", forgotten)
+
+                # Split metadata scraping across worker processes or scraper nodes when configured
+                workers = int(ui_settings.get('workers') or engine.settings.workers)
+                job_status['workers'] = workers
+                if engine.settings.distributed_enabled:
+                    coordinator = QueueCoordinator.from_config(engine.config)
+                    coordinator.start(codes)
+                    job_status['distributed_job_id'] = coordinator.job_id
+                elif workers > 1:
+                    coordinator = ScrapeCoordinator(workers, config_path=config_path, config=engine.config)
+                    coordinator.start(codes)
+                
+                organize_files = ui_settings.get('organize_files', True)
+                videos_base = Path(ui_settings.get('folder_path') or folder_path) / "videos"
+                planner = OrganizePlanner(str(videos_base) if organize_files else None)
+                batch_size = engine.settings.organize_batch_size
+                dry_run = ui_settings.get('dry_run', False)
+                logging.debug("🔧 organize_files=%s videos_base=%s batch_size=%s dry_run=%s",
+                              organize_files, videos_base, batch_size, dry_run)
+
+                def fail(i: int, file_info: Dict, e: Exception, elapsed: float):
+                    jav_code = file_info['jav_code']
+                    logging.error("❌ ==== ERROR PROCESSING %s ====", jav_code)
+                    logging.error("❌ Error: %s", e)
+                    logging.error("❌ File: %s", file_info['file_path'])
+                    logging.error("❌ Exception type: %s", type(e).__name__)
+                    import traceback
+                    logging.error("❌ Traceback: %s", traceback.format_exc())
+                    job_status['error'] = f"Error processing {jav_code}: {str(e)}"
+                    job_status['message'] = f'❌ Error processing {jav_code}: {str(e)}'
+                    results.append({
+                        'jav_code': jav_code,
+                        'error': str(e),
+                        'file_path': file_info['file_path'],
+                        'elapsed_seconds': round(elapsed, 3)
+                    })
+                    emit('file', index=i + 1, total=len(files), jav_code=jav_code, status='error',
+                         file_path=file_info['file_path'], error=str(e),
+                         elapsed_seconds=results[-1]['elapsed_seconds'])
+
+                # Scraped codes go through four stages connected by bounded queues, so the
+                # next codes are fetched and their images encoded while videos are moved:
+                # metadata -> actress portraits -> images (into a staging folder) -> plan the
+                # moves of all waiting codes, run them, write the NFO files and place the images
+                options = engine.settings.pipeline
+                staging = Path(tempfile.mkdtemp(prefix='wooscraper-'))
+                retries = RetrySchedule()
+                rescheduled: Dict[str, int] = {}
+                next_index = 0
+
+                def finish(item: Dict):
+                    job_status['processed_files'] += len(item['members'])
+                    job_status['progress'] = int((job_status['processed_files'] / len(files)) * 100)
+                    job_status['pipeline'] = pipeline.status()
+
+                def fail_item(stage: str, item: Dict, e: Exception):
+                    nonlocal next_index
+                    if 'index' not in item:
+                        item['index'] = next_index
+                        next_index += len(item['members'])
+                    for offset, member in enumerate(item['members']):
+                        fail(item['index'] + offset, member, e, time.monotonic() - item['started'])
+                    finish(item)
+
+                async def feed():
+                    pending = collections.deque(groups)
+                    while job_status['running'] and (pending or retries or pipeline.in_flight):
+                        group = retries.pop_due()
+                        if group is None and pending:
+                            group = pending.popleft()
+                        if group is None:
+                            # Only codes in the pipeline or waiting for a retry are left
+                            wait = retries.next_in()
+                            if wait is not None and not pipeline.in_flight:
+                                job_status['message'] = f'⏳ Waiting {wait:.0f}s to retry {len(retries)} codes'
+                            await asyncio.sleep(min(wait if wait is not None else 0.2, 0.2))
+                            continue
+                        logging.debug("🎬 ===== Queueing %s (%s files) =====", group['jav_code'], len(group['files']))
+                        yield {'jav_code': group['jav_code'], 'group': group, 'members': group['files'],
+                               'started': time.monotonic()}
+                    if not job_status['running']:
+                        logging.debug("⏹️ Job stopped by user")
+
+                async def fetch_metadata(item: Dict) -> Optional[Dict]:
+                    nonlocal next_index
+                    jav_code = item['jav_code']
+                    job_status['current_file'] = jav_code
+                    if len(item['members']) > 1:
+                        logging.debug("📄 Shared by %s files: %s", len(item['members']),
+                                      [member['file_path'] for member in item['members']])
+                    try:
+                        item['metadata'] = await _scrape_file(engine, coordinator, item['members'][0], job_status,
+                                                              enrich=coordinator is None)
+                    except RetryLater as e:
+                        attempt = rescheduled.get(jav_code, 0) + 1
+                        if attempt > engine.retry_policy.reschedules:
+                            raise
+                        rescheduled[jav_code] = attempt
+                        logging.warning("⏳ %s, rescheduled (%s/%s)", e, attempt, engine.retry_policy.reschedules)
+                        retries.defer(item['group'], e.retry_in)
+                        job_status['rescheduled'] = job_status.get('rescheduled', 0) + 1
+                        emit('retry', jav_code=jav_code, retry_in=round(e.retry_in, 1), attempt=attempt)
+                        return None
+                    finally:
+                        job_status['site_health'] = SITE_HEALTH.snapshot()
+                    item['index'] = next_index
+                    next_index += len(item['members'])
+                    return item
+
+                async def enrich(item: Dict) -> Dict:
+                    # Worker processes and scraper nodes return enriched metadata
+                    if coordinator is None:
+                        job_status['message'] = f"🎭 Looking up actress portraits for {item['jav_code']}..."
+                        item['metadata'] = await engine.enhance_actress_metadata(item['metadata'])
+                    return item
+
+                async def fetch_images(item: Dict) -> Dict:
+                    if not dry_run:
+                        folder = staging / item['jav_code']
+                        folder.mkdir(exist_ok=True)
+                        item['images'] = await _fetch_images(engine, item['jav_code'], item['metadata'], folder,
+                                                             ui_settings, job_status)
+                    return item
+
+                async def organize(items: List[Dict]) -> List[Dict]:
+                    scraped = [(item, item['index'] + offset, member, {**item['metadata'], **member})
+                               for item in items for offset, member in enumerate(item['members'])]
+                    plan = planner.plan([(file_info, metadata) for _, _, file_info, metadata in scraped])
+                    logging.debug("📁 Organize plan: %s", plan.summary())
+
+                    if dry_run:
+                        for (item, i, file_info, metadata), entry in zip(scraped, plan.entries):
+                            emit('plan', index=i + 1, total=len(files), **entry)
+                            metadata['organize'] = entry
+                            metadata['elapsed_seconds'] = round(time.monotonic() - item['started'], 3)
+                            results.append(metadata)
+                        report = job_status.setdefault('plan', {'entries': [], 'folders': []})
+                        report['entries'].extend(plan.entries)
+                        report['folders'].extend(plan.folders)
+                        for item in items:
+                            finish(item)
+                        return []
+
+                    if plan.folders or any(entry['action'] == 'move' for entry in plan.entries):
+                        job_status['message'] = (f'📁 Organizing {len(plan.entries)} files '
+                                                 f'({len(plan.folders)} new folders)...')
+                        # Cross-device copies can take minutes; keep them off the event loop
+                        with REGISTRY.time_stage('file_move'):
+                            await asyncio.get_running_loop().run_in_executor(
+                                None, execute_plan, plan, engine.settings.organize_mode,
+                                engine.settings.copy_chunk_size, _transfer_progress(job_status))
+                        job_status.pop('transfer', None)
+                        for entry in plan.entries:
+                            if entry.get('result', '').startswith('copy'):
+                                REGISTRY.add_bytes('file_move', '', Path(entry['target']).stat().st_size)
+
+                    # The first file of a code gets the NFO file and the staged images;
+                    # other files of the code reuse or copy them
+                    finalized = {}
+                    for (item, i, file_info, metadata), entry in zip(scraped, plan.entries):
+                        jav_code = file_info['jav_code']
+                        job_status['current_file'] = jav_code
+                        if entry.get('error'):
+                            # The video was not moved; no NFO or images go into the empty folder
+                            fail(i, file_info, OSError(entry['error']), time.monotonic() - item['started'])
+                            continue
+                        if entry['action'] == 'exists':
+                            logging.warning("⚠️ Target video already exists, not moving %s: %s",
+                                            entry['source'], entry['target'])
+                        elif entry['action'] == 'collision':
+                            logging.warning("⚠️ %s is already claimed by another file of this job, not moving %s",
+                                            entry['target'], entry['source'])
+                        elif entry['action'] == 'missing':
+                            logging.error("❌ Original video not found: %s", entry['source'])
+                        try:
+                            output_folder = Path(entry['folder'])
+                            shared = finalized.get(jav_code)
+                            if shared is None:
+                                nfo_path = _write_nfo(engine, jav_code, metadata, output_folder, job_status)
+                                artifacts = {'nfo': nfo_path,
+                                             **_copy_artifacts(item.get('images', {}), output_folder, move=True)}
+                                finalized[jav_code] = (output_folder, artifacts)
+                            elif shared[0] == output_folder:
+                                artifacts = shared[1]
+                            else:
+                                artifacts = _copy_artifacts(shared[1], output_folder)
+                            fanart_path, portrait_path = artifacts.get('fanart'), artifacts.get('portrait')
+
+                            elapsed = time.monotonic() - item['started']
+                            metadata['elapsed_seconds'] = round(elapsed, 3)
+                            results.append(metadata)
+                            job_status['message'] = f'✅ Completed {jav_code} successfully'
+                            # One compact line per file; the step-by-step details are DEBUG only
+                            logging.info("✅ %s (%s/%s) source=%s actress=%s folder=%s fanart=%s portrait=%s in %.1fs",
+                                         jav_code, i + 1, len(files),
+                                         ','.join(metadata.get('sources', {})) or 'none',
+                                         metadata.get('detailed_metadata', {}).get('actress') or 'N/A',
+                                         output_folder,
+                                         bool(fanart_path and fanart_path.exists()),
+                                         bool(portrait_path and portrait_path.exists()),
+                                         elapsed)
+                            job_status['metrics'] = REGISTRY.summary(since=metrics_start)
+                            emit('file', index=i + 1, total=len(files), jav_code=jav_code, status='ok',
+                                 file_path=file_info['file_path'],
+                                 source=','.join(metadata.get('sources', {})) or 'none',
+                                 output_folder=str(output_folder), organize=entry['action'],
+                                 elapsed_seconds=metadata['elapsed_seconds'])
+                        except Exception as e:
+                            fail(i, file_info, e, time.monotonic() - item['started'])
+                    for item in items:
+                        finish(item)
+                    return []
+
+                fetch_concurrency = max(int(options['fetch']), workers if coordinator else 1)
+                pipeline = Pipeline([
+                    Stage('metadata', fetch_metadata, fetch_concurrency),
+                    Stage('portraits', enrich, options['enrich']),
+                    Stage('images', fetch_images, options['images']),
+                    Stage('organize', organize, options['organize'], batch_size=batch_size),
+                ], queue_size=options['queue_size'], on_error=fail_item,
+                   max_in_flight=options['prefetch'] + 1)
+                job_status['processed_files'] = 0
+                await pipeline.run(feed())
+                job_status['pipeline'] = pipeline.status()
+
+                # Final job completion logging
+                logging.info("🎉 ==== JOB COMPLETION SUMMARY ====")
+                logging.info("🎉 Total files processed: %s", len(files))
+                logging.info("🎉 Successful: %s", len([r for r in results if 'error' not in r]))
+                logging.info("🎉 Failed: %s", len([r for r in results if 'error' in r]))
+                logging.debug("🎉 Results: %s", results)
+
+                job_status['progress'] = 100
+                job_status['processed_files'] = len(files)
+                job_status['current_file'] = 'Completed'
+                job_status['message'] = f'🎉 Job completed! Processed {len(files)} files'
+
+        except Exception as e:
+            logging.error("❌ ==== JOB FAILURE ====")
+            logging.error("❌ Error in scraping job: %s", e)
+            logging.error("❌ Exception type: %s", type(e).__name__)
+            import traceback
+            logging.error("❌ Traceback: %s", traceback.format_exc())
+            job_status['error'] = str(e)
+            job_status['message'] = f'❌ Job failed: {str(e)}'
+        finally:
+            if coordinator:
+                coordinator.close()
+            if staging:
+                shutil.rmtree(staging, ignore_errors=True)
+            if profiler:
+                try:
+                    job_status['profile'] = profiler.stop()
+                except Exception as e:
+                    # An unwritable output folder must not leave the job marked as running
+                    logging.error("❌ Could not write the job profile: %s", e)
+            job_status['results'] = results
+            job_status['metrics'] = REGISTRY.summary(since=metrics_start)
+            job_status['site_health'] = SITE_HEALTH.snapshot()
+            job_status['running'] = False
+            emit('done', total=job_status['total_files'], processed=job_status['processed_files'],
+                 failed=len([r for r in results if 'error' in r]), error=job_status['error'])
+
+    # Run async function in thread
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    loop.run_until_complete(async_scraping())
+    loop.close()
+    return job_status
@@ -0,0 +1,327 @@
+"""
+Local Store
+===========
+
+What earlier runs learned about JAV codes, kept in a SQLite file between runs.
+
+The negative cache records, per code and source, how often the source had no
+result for the code. A source that missed is not asked again until its
+backoff has passed: one day after the first miss, a week after the second
+and a month after every later one (``local_store.backoff_days``). A hit
+removes the record. Failed requests (timeouts, blocked pages) are not misses
+and are not recorded.
+
+``source_stats`` counts, per source, the lookups that found metadata, those
+that did not and the seconds they took; ``prefix_stats`` does the same per
+code prefix (``SSIS`` of ``SSIS-123``) and also sums how complete the found
+metadata was. ``site_registry`` orders and routes the sites by them.
+
+``url_templates`` counts how often each learned detail URL template of a
+source led to the right page (see ``detail_urls``).
+
+``catalog`` maps codes to their detail page on a source, with the title,
+cover and date of the listing they were found on (see ``catalog``).
+
+``forget`` clears the records of some or all codes, so they are checked on
+the next run; ``wooscraper.py misses`` lists them and ``--forget`` or
+``scrape --recheck`` clear them from the command line.
+
+The file is safe to share between the worker processes of a job.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Sequence
+
+DEFAULT_BACKOFF_DAYS = (1, 7, 30)
+
+
+class LocalStore:
+    """
+    SQLite-backed store of per-code scrape results.
+    """
+
+    def __init__(self, path: str = "local_store.db", backoff_days: Sequence[float] = DEFAULT_BACKOFF_DAYS,
+                 timeout: float = 30.0):
+        """
+        Open (and if needed create) the store.
+
+        Args:
+            path (str): Path of the SQLite file
+            backoff_days (Sequence[float]): Days to wait after the first, second, ... miss;
+                the last value is used for all later misses
+            timeout (float): Seconds to wait for a lock held by another process
+        """
+        self.path = path
+        self.backoff = [float(days) * 86400 for days in backoff_days] or [86400.0]
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS source_misses (
+                jav_code TEXT NOT NULL,
+                source TEXT NOT NULL,
+                misses INTEGER NOT NULL,
+                first_missed REAL NOT NULL,
+                last_checked REAL NOT NULL,
+                retry_after REAL NOT NULL,
+                PRIMARY KEY (jav_code, source)
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS source_stats (
+                source TEXT PRIMARY KEY,
+                hits INTEGER NOT NULL DEFAULT 0,
+                misses INTEGER NOT NULL DEFAULT 0,
+                seconds REAL NOT NULL DEFAULT 0
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS prefix_stats (
+                prefix TEXT NOT NULL,
+                source TEXT NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0,
+                misses INTEGER NOT NULL DEFAULT 0,
+                seconds REAL NOT NULL DEFAULT 0,
+                completeness REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (prefix, source)
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS url_templates (
+                source TEXT NOT NULL,
+                template TEXT NOT NULL,
+                successes INTEGER NOT NULL DEFAULT 0,
+                failures INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (source, template)
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS catalog (
+                source TEXT NOT NULL,
+                jav_code TEXT NOT NULL,
+                detail_url TEXT NOT NULL,
+                title TEXT,
+                cover_url TEXT,
+                date TEXT,
+                updated REAL NOT NULL,
+                PRIMARY KEY (source, jav_code)
+            )
+        """)
+
+    def _execute(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
+        with self._lock:
+            return self._conn.execute(sql, params)
+
+    def backoff_seconds(self, misses: int) -> float:
+        """Seconds to wait before asking a source again after ``misses`` misses in a row."""
+        return self.backoff[min(max(misses, 1), len(self.backoff)) - 1]
+
+    def retry_after(self, jav_code: str, source: str, now: Optional[float] = None) -> Optional[float]:
+        """
+        Return when ``source`` may be asked for ``jav_code`` again.
+
+        Returns:
+            Optional[float]: Unix timestamp in the future, or None when the source may be asked now
+        """
+        now = time.time() if now is None else now
+        row = self._execute("SELECT retry_after FROM source_misses WHERE jav_code = ? AND source = ?",
+                            (jav_code, source)).fetchone()
+        if row and row[0] > now:
+            return row[0]
+        return None
+
+    def record_miss(self, jav_code: str, source: str, now: Optional[float] = None) -> float:
+        """
+        Record that ``source`` had no result for ``jav_code``.
+
+        Returns:
+            float: Unix timestamp before which the source is not asked again
+        """
+        now = time.time() if now is None else now
+        row = self._execute("SELECT misses, first_missed FROM source_misses WHERE jav_code = ? AND source = ?",
+                            (jav_code, source)).fetchone()
+        misses, first_missed = (row[0] + 1, row[1]) if row else (1, now)
+        retry_after = now + self.backoff_seconds(misses)
+        self._execute(
+            "INSERT OR REPLACE INTO source_misses (jav_code, source, misses, first_missed, last_checked, retry_after) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (jav_code, source, misses, first_missed, now, retry_after))
+        return retry_after
+
+    def record_hit(self, jav_code: str, source: str):
+        """Record that ``source`` had a result for ``jav_code``; clears its misses."""
+        self._execute("DELETE FROM source_misses WHERE jav_code = ? AND source = ?", (jav_code, source))
+
+    def record_lookup(self, source: str, hit: bool, seconds: float, prefix: Optional[str] = None,
+                      completeness: float = 0.0):
+        """
+        Count one lookup on ``source``.
+
+        Args:
+            source (str): Source name
+            hit (bool): Whether the lookup found metadata
+            seconds (float): How long the lookup took
+            prefix (str, optional): Code prefix, to count the lookup for the prefix as well
+            completeness (float): Share of the common fields the found metadata had, 0 to 1
+        """
+        self._execute(
+            "INSERT INTO source_stats (source, hits, misses, seconds) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (source) DO UPDATE SET hits = hits + excluded.hits, "
+            "misses = misses + excluded.misses, seconds = seconds + excluded.seconds",
+            (source, int(hit), int(not hit), seconds))
+        if prefix:
+            self._execute(
+                "INSERT INTO prefix_stats (prefix, source, hits, misses, seconds, completeness) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (prefix, source) DO UPDATE SET hits = hits + excluded.hits, "
+                "misses = misses + excluded.misses, seconds = seconds + excluded.seconds, "
+                "completeness = completeness + excluded.completeness",
+                (prefix, source, int(hit), int(not hit), seconds, completeness if hit else 0.0))
+
+    def source_stats(self) -> Dict[str, Dict]:
+        """
+        Return the lookup counts of every source.
+
+        Returns:
+            Dict[str, Dict]: ``hits``, ``misses`` and total ``seconds`` by source
+        """
+        rows = self._execute("SELECT source, hits, misses, seconds FROM source_stats").fetchall()
+        return {source: {'hits': hits, 'misses': misses, 'seconds': seconds}
+                for source, hits, misses, seconds in rows}
+
+    def prefix_stats(self, prefix: str) -> Dict[str, Dict]:
+        """
+        Return the lookup counts of every source for codes with ``prefix``.
+
+        Returns:
+            Dict[str, Dict]: ``hits``, ``misses``, total ``seconds`` and summed ``completeness``
+            of the hits, by source
+        """
+        rows = self._execute("SELECT source, hits, misses, seconds, completeness FROM prefix_stats "
+                             "WHERE prefix = ?", (prefix,)).fetchall()
+        return {source: {'hits': hits, 'misses': misses, 'seconds': seconds, 'completeness': completeness}
+                for source, hits, misses, seconds, completeness in rows}
+
+    def record_url_template(self, source: str, template: str, ok: bool):
+        """Count one success or failure of a detail URL template of ``source``."""
+        self._execute(
+            "INSERT INTO url_templates (source, template, successes, failures) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (source, template) DO UPDATE SET successes = successes + excluded.successes, "
+            "failures = failures + excluded.failures",
+            (source, template, int(ok), int(not ok)))
+
+    def url_templates(self, source: str) -> Dict[str, Dict]:
+        """
+        Return the detail URL templates of ``source``.
+
+        Returns:
+            Dict[str, Dict]: ``successes`` and ``failures`` by template
+        """
+        rows = self._execute("SELECT template, successes, failures FROM url_templates WHERE source = ?",
+                             (source,)).fetchall()
+        return {template: {'successes': successes, 'failures': failures}
+                for template, successes, failures in rows}
+
+    def add_catalog_entries(self, source: str, entries: List[Dict], now: Optional[float] = None) -> int:
+        """
+        Add or update the catalog entries of ``source``.
+
+        Args:
+            source (str): Source the entries were listed on
+            entries (List[Dict]): ``jav_code`` and ``detail_url``, with optional ``title``,
+                ``cover_url`` and ``date``
+            now (float, optional): Update time, defaults to the current time
+
+        Returns:
+            int: Number of codes that were not in the catalog yet
+        """
+        now = time.time() if now is None else now
+        added = 0
+        for entry in entries:
+            jav_code = entry['jav_code'].upper()
+            if not self._execute("SELECT 1 FROM catalog WHERE source = ? AND jav_code = ?",
+                                 (source, jav_code)).fetchone():
+                added += 1
+            self._execute(
+                "INSERT OR REPLACE INTO catalog (source, jav_code, detail_url, title, cover_url, date, updated) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (source, jav_code, entry['detail_url'], entry.get('title'), entry.get('cover_url'),
+                 entry.get('date'), now))
+        return added
+
+    def catalog_entry(self, source: str, jav_code: str) -> Optional[Dict]:
+        """Return the catalog entry of ``jav_code`` on ``source``, or None when it was not listed."""
+        row = self._execute("SELECT detail_url, title, cover_url, date FROM catalog WHERE source = ? AND jav_code = ?",
+                            (source, jav_code.upper())).fetchone()
+        if not row:
+            return None
+        return {'jav_code': jav_code.upper(), 'detail_url': row[0], 'title': row[1], 'cover_url': row[2], 'date': row[3]}
+
+    def remove_catalog_entry(self, source: str, jav_code: str):
+        """Remove a catalog entry whose detail page turned out not to be the code's."""
+        self._execute("DELETE FROM catalog WHERE source = ? AND jav_code = ?", (source, jav_code.upper()))
+
+    def catalog_size(self, source: Optional[str] = None) -> int:
+        """Number of codes in the catalog, of ``source`` or of every source."""
+        if source is None:
+            return self._execute("SELECT COUNT(*) FROM catalog").fetchone()[0]
+        return self._execute("SELECT COUNT(*) FROM catalog WHERE source = ?", (source,)).fetchone()[0]
+
+    def forget(self, jav_codes: Optional[Iterable[str]] = None) -> int:
+        """
+        Clear the misses of ``jav_codes``, or of every code, so they are checked again.
+
+        Returns:
+            int: Number of removed records
+        """
+        if jav_codes is None:
+            return self._execute("DELETE FROM source_misses").rowcount
+        removed = 0
+        for jav_code in jav_codes:
+            removed += self._execute("DELETE FROM source_misses WHERE jav_code = ?", (jav_code,)).rowcount
+        return removed
+
+    def misses(self, jav_code: Optional[str] = None) -> List[Dict]:
+        """
+        List the recorded misses, most recently checked first.
+
+        Args:
+            jav_code (str, optional): Only list the misses of this code
+
+        Returns:
+            List[Dict]: ``jav_code``, ``source``, ``misses``, ``first_missed``, ``last_checked``, ``retry_after``
+        """
+        sql = "SELECT jav_code, source, misses, first_missed, last_checked, retry_after FROM source_misses"
+        params = ()
+        if jav_code:
+            sql += " WHERE jav_code = ?"
+            params = (jav_code,)
+        columns = ('jav_code', 'source', 'misses', 'first_missed', 'last_checked', 'retry_after')
+        rows = self._execute(sql + " ORDER BY last_checked DESC", params).fetchall()
+        return [dict(zip(columns, row)) for row in rows]
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+def open_local_store(config: Dict) -> Optional[LocalStore]:
+    """
+    Open the store described by the ``local_store`` config section.
+
+    Args:
+        config (Dict): Full application configuration
+
+    Returns:
+        Optional[LocalStore]: The store, or None when ``local_store.enabled`` is false
+    """
+    settings = (config or {}).get('local_store', {}) or {}
+    if not settings.get('enabled', True):
+        return None
+    path = settings.get('path', 'local_store.db')
+    logging.debug("🗄️ Opening local store %s", path)
+    return LocalStore(path, backoff_days=settings.get('backoff_days') or DEFAULT_BACKOFF_DAYS)
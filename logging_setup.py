@@ -0,0 +1,139 @@
+"""
+Logging Setup
+=============
+
+Process-wide logging configuration for the web app, the scraper engine and
+the worker processes.
+
+Log records are put on an in-memory queue by a ``QueueHandler``; a
+``QueueListener`` thread writes them to the rotating log file and the console.
+Scraping code therefore never waits on log file I/O, and ``logging.max_size``
+and ``logging.backup_count`` from config.yml are applied through a
+``RotatingFileHandler``.
+
+``RotatingFileHandler`` is not safe across processes, so worker processes do
+not open the log file: ``forward_logging`` sends their records to a
+multiprocessing queue, and ``listen`` in the parent passes them on to its own
+handlers, which stay the only writer of the file.
+"""
+
+import atexit
+import logging
+import logging.handlers
+import queue
+import re
+from typing import Dict, Optional
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_SIZE_UNITS = {'': 1, 'B': 1, 'KB': 1024, 'MB': 1024 ** 2, 'GB': 1024 ** 3}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_forwarding = False
+
+
+def parse_size(value, default: int = 10 * 1024 ** 2) -> int:
+    """
+    Convert a size such as ``"10MB"`` or ``512000`` to bytes.
+
+    Args:
+        value: Size from the configuration (int or string with optional unit)
+        default (int): Size used when the value cannot be parsed
+
+    Returns:
+        int: Size in bytes
+    """
+    if isinstance(value, (int, float)):
+        return int(value)
+    match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([KMG]?B?)\s*', str(value or ''), re.IGNORECASE)
+    if not match:
+        return default
+    number, unit = match.groups()
+    return int(float(number) * _SIZE_UNITS[unit.upper()])
+
+
+def configure_logging(log_config: Dict):
+    """
+    Configure the root logger once per process.
+
+    Later calls, and calls in a process set up with ``forward_logging``, only
+    update the level. Like ``logging.basicConfig``, nothing is installed when the
+    root logger already has handlers configured elsewhere.
+
+    Args:
+        log_config (Dict): The ``logging`` section of the configuration
+    """
+    global _listener
+    root = logging.getLogger()
+    level = getattr(logging, str(log_config.get('level', 'INFO')).upper(), logging.INFO)
+
+    if _listener is not None or _forwarding:
+        root.setLevel(level)
+        return
+    if root.handlers:
+        return
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    file_handler = logging.handlers.RotatingFileHandler(
+        log_config.get('file', 'scraper.log'),
+        maxBytes=parse_size(log_config.get('max_size', '10MB')),
+        backupCount=int(log_config.get('backup_count', 5)),
+        encoding='utf-8',
+        delay=True,
+    )
+    file_handler.setFormatter(formatter)
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, file_handler, console_handler,
+                                               respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+
+
+def forward_logging(log_queue, level: int = logging.INFO):
+    """
+    Send the log records of this (worker) process to ``log_queue`` instead of writing them.
+
+    Args:
+        log_queue: ``multiprocessing`` queue read by ``listen`` in the parent process
+        level (int): Level until ``configure_logging`` applies the configured one
+    """
+    global _forwarding
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(level)
+    _forwarding = True
+
+
+class _ParentHandler(logging.Handler):
+    """Hand records from worker processes to the loggers of this process."""
+
+    def emit(self, record: logging.LogRecord):
+        logging.getLogger(record.name).handle(record)
+
+
+def listen(log_queue) -> logging.handlers.QueueListener:
+    """
+    Start passing the records that worker processes put on ``log_queue`` to this process's handlers.
+
+    Returns:
+        logging.handlers.QueueListener: Listener to ``stop`` once the workers have exited
+    """
+    listener = logging.handlers.QueueListener(log_queue, _ParentHandler())
+    listener.start()
+    return listener
+
+
+def stop_logging():
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
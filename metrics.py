@@ -0,0 +1,232 @@
+"""
+Scraper Metrics
+===============
+
+In-process instrumentation for scraping jobs.
+
+Every stage of a job (browser fetch, aiohttp fetch, parse, portrait search,
+image download, image encode, NFO write, file move) is timed into a latency
+histogram labelled by stage and site. Byte counts, cache lookups and errors are
+kept as counters. The registry can be rendered in the Prometheus text format
+for ``/api/metrics`` and summarized per job for the job status.
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+
+# Upper bounds (seconds) of the latency histogram buckets
+DEFAULT_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+STAGES = ('browser_fetch', 'http_fetch', 'parse', 'portrait_search',
+          'image_download', 'image_encode', 'nfo_write', 'file_move')
+
+
+class MetricsRegistry:
+    """
+    Thread-safe store of stage latency histograms and counters.
+
+    Histograms are keyed by ``(stage, site)``. Counters are keyed by metric name
+    and a sorted tuple of label pairs.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        """
+        Initialize the registry.
+
+        Args:
+            buckets (Tuple[float, ...]): Upper bounds of the latency buckets in seconds
+        """
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, str], Dict] = {}
+        self._counters: Dict[Tuple[str, Tuple], float] = {}
+
+    def observe(self, stage: str, site: str, seconds: float):
+        """Record one stage duration."""
+        with self._lock:
+            histogram = self._histograms.get((stage, site))
+            if histogram is None:
+                histogram = {'buckets': [0] * (len(self.buckets) + 1), 'sum': 0.0, 'count': 0}
+                self._histograms[(stage, site)] = histogram
+            histogram['buckets'][bisect.bisect_left(self.buckets, seconds)] += 1
+            histogram['sum'] += seconds
+            histogram['count'] += 1
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """Increase a counter."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def add_bytes(self, stage: str, site: str, count: int):
+        """Count bytes transferred or written by a stage."""
+        if count:
+            self.inc('bytes', count, stage=stage, site=site)
+
+    def record_error(self, stage: str, site: str, kind: str):
+        """Count a failed stage, e.g. a timeout or an HTTP error status."""
+        self.inc('errors', stage=stage, site=site, kind=kind)
+
+    def record_cache(self, cache: str, hit: bool):
+        """Count a cache lookup."""
+        self.inc('cache_requests', cache=cache, result='hit' if hit else 'miss')
+
+    @contextmanager
+    def time_stage(self, stage: str, site: str = ''):
+        """
+        Time the enclosed block as ``stage`` for ``site``.
+
+        Exceptions raised inside the block are counted as errors and re-raised.
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self.record_error(stage, site, type(e).__name__)
+            raise
+        finally:
+            self.observe(stage, site, time.perf_counter() - started)
+
+    def snapshot(self) -> Dict:
+        """
+        Return a picklable copy of all values.
+
+        Returns:
+            Dict: ``{'histograms': [...], 'counters': [...]}``
+        """
+        with self._lock:
+            return {
+                'histograms': [(key, {'buckets': list(h['buckets']), 'sum': h['sum'], 'count': h['count']})
+                               for key, h in self._histograms.items()],
+                'counters': list(self._counters.items()),
+            }
+
+    def drain(self) -> Dict:
+        """Return a snapshot and reset the registry, e.g. to ship deltas from a worker."""
+        with self._lock:
+            snapshot = {
+                'histograms': list(self._histograms.items()),
+                'counters': list(self._counters.items()),
+            }
+            self._histograms = {}
+            self._counters = {}
+        return snapshot
+
+    def merge(self, snapshot: Dict):
+        """Add the values of a snapshot (for example from a worker process)."""
+        with self._lock:
+            for key, other in snapshot.get('histograms', []):
+                key = tuple(key)
+                histogram = self._histograms.setdefault(
+                    key, {'buckets': [0] * (len(self.buckets) + 1), 'sum': 0.0, 'count': 0})
+                histogram['buckets'] = [a + b for a, b in zip(histogram['buckets'], other['buckets'])]
+                histogram['sum'] += other['sum']
+                histogram['count'] += other['count']
+            for key, value in snapshot.get('counters', []):
+                key = (key[0], tuple(tuple(pair) for pair in key[1]))
+                self._counters[key] = self._counters.get(key, 0) + value
+
+    def render_prometheus(self, prefix: str = 'wooscraper') -> str:
+        """
+        Render all metrics in the Prometheus text exposition format.
+
+        Args:
+            prefix (str): Metric name prefix
+
+        Returns:
+            str: Text for a ``text/plain; version=0.0.4`` response
+        """
+        snapshot = self.snapshot()
+        lines = [
+            f"# HELP {prefix}_stage_seconds Time spent per scraping stage and site",
+            f"# TYPE {prefix}_stage_seconds histogram",
+        ]
+        for (stage, site), histogram in sorted(snapshot['histograms']):
+            labels = f'stage="{_escape(stage)}",site="{_escape(site)}"'
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), histogram['buckets']):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'{prefix}_stage_seconds_bucket{{{labels},le="{le}"}} {cumulative}')
+            lines.append(f'{prefix}_stage_seconds_sum{{{labels}}} {histogram["sum"]:.6f}')
+            lines.append(f'{prefix}_stage_seconds_count{{{labels}}} {histogram["count"]}')
+
+        help_texts = {
+            'bytes': 'Bytes transferred or written per stage and site',
+            'errors': 'Failed stage executions by error kind',
+            'cache_requests': 'Cache lookups by result',
+        }
+        counters: Dict[str, list] = {}
+        for (name, labels), value in snapshot['counters']:
+            counters.setdefault(name, []).append((labels, value))
+        for name in sorted(counters):
+            metric = f"{prefix}_{name}_total"
+            lines.append(f"# HELP {metric} {help_texts.get(name, name)}")
+            lines.append(f"# TYPE {metric} counter")
+            for labels, value in sorted(counters[name]):
+                label_text = ','.join(f'{k}="{_escape(str(v))}"' for k, v in labels)
+                lines.append(f"{metric}{{{label_text}}} {value:g}")
+        return '\n'.join(lines) + '\n'
+
+    def summary(self, since: Optional[Dict] = None) -> Dict:
+        """
+        Summarize the registry, optionally only what happened after ``since``.
+
+        Args:
+            since (Dict, optional): Snapshot taken earlier, e.g. at job start
+
+        Returns:
+            Dict: Per-stage and per-site timings, bytes, errors and cache hit ratios
+        """
+        snapshot = self.snapshot()
+        before_histograms = {tuple(k): v for k, v in (since or {}).get('histograms', [])}
+        before_counters = dict((since or {}).get('counters', []))
+
+        stages: Dict[str, Dict] = {}
+        for key, histogram in snapshot['histograms']:
+            before = before_histograms.get(key, {'sum': 0.0, 'count': 0})
+            count = histogram['count'] - before['count']
+            if count <= 0:
+                continue
+            total = histogram['sum'] - before['sum']
+            stage, site = key
+            entry = stages.setdefault(stage, {'count': 0, 'total_seconds': 0.0, 'sites': {}})
+            entry['count'] += count
+            entry['total_seconds'] = round(entry['total_seconds'] + total, 3)
+            entry['sites'][site or '-'] = {'count': count, 'avg_seconds': round(total / count, 3)}
+
+        bytes_by_stage: Dict[str, float] = {}
+        errors: Dict[str, float] = {}
+        cache: Dict[str, Dict[str, float]] = {}
+        for key, value in snapshot['counters']:
+            delta = value - before_counters.get(key, 0)
+            if delta <= 0:
+                continue
+            name, labels = key
+            labels = dict(labels)
+            if name == 'bytes':
+                bytes_by_stage[labels['stage']] = bytes_by_stage.get(labels['stage'], 0) + delta
+            elif name == 'errors':
+                error_key = f"{labels['stage']}:{labels['site'] or '-'}:{labels['kind']}"
+                errors[error_key] = errors.get(error_key, 0) + delta
+            elif name == 'cache_requests':
+                entry = cache.setdefault(labels['cache'], {'hit': 0, 'miss': 0})
+                entry[labels['result']] += delta
+
+        for entry in cache.values():
+            lookups = entry['hit'] + entry['miss']
+            entry['hit_ratio'] = round(entry['hit'] / lookups, 3) if lookups else 0.0
+
+        return {'stages': stages, 'bytes': bytes_by_stage, 'errors': errors, 'cache': cache}
+
+
+def _escape(value: str) -> str:
+    """Escape a Prometheus label value."""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+# Process-wide registry used by the engine, the job runner and /api/metrics
+REGISTRY = MetricsRegistry()
@@ -0,0 +1,361 @@
+"""
+File Organizer
+==============
+
+Put videos into the organized library as cheaply as the filesystem allows.
+
+Modes (``scraper.organize_mode``):
+
+- ``move``: an atomic ``os.rename`` when the target is on the same device, so
+  no data is copied; across devices the file is copied and the download is
+  removed afterwards.
+- ``hardlink``: link the target to the download and leave the download
+  folder intact. Copies when the target is on another device.
+- ``reflink``: copy-on-write clone (``FICLONE``, btrfs/XFS) that shares the
+  data blocks with the download. Copies where cloning is not supported.
+- ``copy``: always copy and keep the download.
+
+Copies go through ``os.copy_file_range`` in large chunks, which lets the
+kernel (or an NFS/SMB server) copy without moving the data through this
+process, and fall back to plain reads and writes where it is unavailable.
+The data is written to a ``.part`` file that is renamed into place once
+complete, and progress is reported through a callback.
+
+Jobs organize in two steps: ``OrganizePlanner`` turns scraped files into an
+``OrganizePlan`` (target folders, deduplicated targets, collisions found up
+front), and ``execute_plan`` creates every missing folder in one pass before
+running the moves in order. A plan can also be reported without executing it.
+"""
+
+import errno
+import logging
+import os
+import re
+import shutil
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+MODES = ('move', 'hardlink', 'reflink', 'copy')
+
+DEFAULT_CHUNK_SIZE = 64 * 1024 ** 2
+
+# ioctl request number of FICLONE from <linux/fs.h>
+FICLONE = 0x40049409
+
+# copy_file_range is refused for these; the copy continues with read/write
+_NO_OFFLOAD_ERRORS = (errno.EXDEV, errno.ENOSYS, errno.EOPNOTSUPP, errno.EINVAL, errno.EBADF)
+
+# Progress callback: (bytes copied, total bytes, bytes per second)
+ProgressCallback = Callable[[int, int, float], None]
+
+
+def same_device(source: str, target_folder: str) -> bool:
+    """
+    Check whether ``source`` and ``target_folder`` are on the same filesystem.
+
+    Args:
+        source (str): Existing file
+        target_folder (str): Existing folder the file is going to
+
+    Returns:
+        bool: True if a rename or hardlink between them is possible
+    """
+    return os.stat(source).st_dev == os.stat(target_folder).st_dev
+
+
+def copy_file(source: str, target: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+              progress: Optional[ProgressCallback] = None) -> int:
+    """
+    Copy ``source`` to ``target`` in chunks, using copy offload where available.
+
+    Args:
+        source (str): File to copy
+        target (str): Destination path; must not exist
+        chunk_size (int): Bytes per chunk and per progress report
+        progress (Callable, optional): Called after every chunk
+
+    Returns:
+        int: Number of bytes copied
+
+    Raises:
+        OSError: If the copy fails or ends short of the source's size
+    """
+    partial = target + '.part'
+    started = time.monotonic()
+    copied = 0
+    try:
+        with open(source, 'rb') as fsrc, open(partial, 'wb') as fdst:
+            total = os.fstat(fsrc.fileno()).st_size
+            offload = hasattr(os, 'copy_file_range')
+            while copied < total:
+                count = min(chunk_size, total - copied)
+                written = 0
+                if offload:
+                    try:
+                        written = os.copy_file_range(fsrc.fileno(), fdst.fileno(), count,
+                                                     offset_src=copied, offset_dst=copied)
+                    except OSError as e:
+                        if copied or e.errno not in _NO_OFFLOAD_ERRORS:
+                            raise
+                        offload = False
+                    if offload and written == 0:
+                        # Some filesystems (procfs-like, FUSE) report nothing copied
+                        # instead of refusing; copy the rest with read/write
+                        logging.debug("📋 copy_file_range copied nothing for %s, using read/write", source)
+                        offload = False
+                        fsrc.seek(copied)
+                        fdst.seek(copied)
+                if not offload:
+                    data = fsrc.read(count)
+                    fdst.write(data)
+                    written = len(data)
+                if written == 0:
+                    break
+                copied += written
+                if progress:
+                    elapsed = time.monotonic() - started
+                    progress(copied, total, copied / elapsed if elapsed > 0 else 0.0)
+        if copied != total:
+            raise OSError(errno.EIO, f"Short copy: {copied} of {total} bytes", source)
+        shutil.copystat(source, partial)
+        os.replace(partial, target)
+    except BaseException:
+        if os.path.exists(partial):
+            os.unlink(partial)
+        raise
+    return copied
+
+
+def reflink_file(source: str, target: str):
+    """
+    Clone ``source`` to ``target`` with ``FICLONE``.
+
+    Raises:
+        OSError: If the filesystem (or platform) does not support cloning
+    """
+    import fcntl
+
+    partial = target + '.part'
+    try:
+        with open(source, 'rb') as fsrc, open(partial, 'wb') as fdst:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+        shutil.copystat(source, partial)
+        os.replace(partial, target)
+    except BaseException:
+        if os.path.exists(partial):
+            os.unlink(partial)
+        raise
+
+
+def organize_file(source: str, target: str, mode: str = 'move', chunk_size: int = DEFAULT_CHUNK_SIZE,
+                  progress: Optional[ProgressCallback] = None) -> str:
+    """
+    Put ``source`` at ``target`` using ``mode``.
+
+    Args:
+        source (str): Downloaded video
+        target (str): Path in the organized library; its folder must exist
+        mode (str): ``move``, ``hardlink``, ``reflink`` or ``copy``
+        chunk_size (int): Chunk size for copies
+        progress (Callable, optional): Called while copying
+
+    Returns:
+        str: What was done: ``rename``, ``hardlink``, ``reflink``, ``copy`` or ``copy+delete``
+
+    Raises:
+        FileExistsError: If ``target`` already exists
+        ValueError: If ``mode`` is unknown
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown organize mode {mode!r}, expected one of {', '.join(MODES)}")
+    if os.path.lexists(target):
+        raise FileExistsError(errno.EEXIST, "Target already exists", target)
+
+    local = same_device(source, os.path.dirname(target) or '.')
+    if mode == 'move':
+        if local:
+            os.rename(source, target)
+            return 'rename'
+        copy_file(source, target, chunk_size, progress)
+        os.unlink(source)
+        return 'copy+delete'
+
+    if mode == 'hardlink' and local:
+        try:
+            os.link(source, target)
+            return 'hardlink'
+        except OSError as e:
+            # Some filesystems (FAT, many SMB mounts) have no hardlinks
+            logging.debug("🔗 Hardlink failed for %s (%s), copying instead", source, e)
+    elif mode == 'reflink':
+        try:
+            reflink_file(source, target)
+            return 'reflink'
+        except (OSError, ImportError) as e:
+            logging.debug("🔗 Reflink failed for %s (%s), copying instead", source, e)
+
+    copy_file(source, target, chunk_size, progress)
+    return 'copy'
+
+
+def actress_folder_name(metadata: Dict) -> str:
+    """
+    Name of the actress folder for a movie: the first credited actress, or ``UNKNOWN``.
+
+    Args:
+        metadata (Dict): Combined metadata from ``scrape_all_sites``
+
+    Returns:
+        str: Folder name without characters that are invalid in file names
+    """
+    details = metadata.get('detailed_metadata', {})
+    actress = (details.get('actress') or details.get('actresses') or '').split(',')[0]
+    return re.sub(r'[<>:"/\\|?*]', '', actress).strip() or "UNKNOWN"
+
+
+class OrganizePlan:
+    """
+    Moves and folders for a set of scraped files.
+
+    Each entry is a dict with ``jav_code``, ``source``, ``target``, ``folder``
+    and ``action``:
+
+    - ``move``: the video goes to ``target``
+    - ``exists``: ``target`` is already taken by an earlier job
+    - ``collision``: another file of this plan or job already claimed ``target``
+    - ``missing``: the source file disappeared
+    - ``in-place``: not organized; NFO and images go next to the video
+    """
+
+    def __init__(self, entries: List[Dict], folders: List[str]):
+        self.entries = entries
+        self.folders = folders
+
+    def summary(self) -> Dict:
+        """Count entries per action, plus the folders to create."""
+        counts = Counter(entry['action'] for entry in self.entries)
+        return {'files': len(self.entries), 'folders': len(self.folders), **counts}
+
+
+class OrganizePlanner:
+    """
+    Plan where scraped videos go in ``<base>/<actress>/<code>/<code><ext>``.
+
+    Parts of a multi-part release (``part`` set by ``group_by_code``) share the
+    folder and are named ``<code>-cd<n><ext>``, which media centers stack.
+
+    Targets claimed by earlier plans of the same planner are remembered, so
+    collisions are detected across all batches of a job.
+    """
+
+    def __init__(self, videos_base: Optional[str]):
+        """
+        Initialize the planner.
+
+        Args:
+            videos_base (str, optional): The ``videos`` folder, or None to leave files in place
+        """
+        self.videos_base = Path(videos_base) if videos_base else None
+        self._claimed = set()
+        self._known_folders = set()
+
+    def plan(self, scraped: List[Tuple[Dict, Dict]]) -> OrganizePlan:
+        """
+        Plan the moves for ``scraped`` without touching the file system beyond ``stat`` calls.
+
+        Args:
+            scraped (List[Tuple[Dict, Dict]]): ``(file_info, metadata)`` pairs in job order
+
+        Returns:
+            OrganizePlan: One entry per pair, in the same order
+        """
+        entries = []
+        folders = set()
+        for file_info, metadata in scraped:
+            source = Path(file_info['file_path'])
+            jav_code = file_info['jav_code']
+            if self.videos_base is None:
+                entries.append({'jav_code': jav_code, 'source': str(source), 'target': str(source),
+                                'folder': str(source.parent), 'action': 'in-place'})
+                continue
+
+            actress_folder = self.videos_base / actress_folder_name(metadata)
+            folder = actress_folder / jav_code
+            part = f"-cd{file_info['part']}" if file_info.get('part') else ''
+            target = folder / f"{jav_code}{part}{source.suffix}"
+            if target in self._claimed:
+                action = 'collision'
+            elif source == target:
+                action = 'in-place'
+            elif not source.exists():
+                action = 'missing'
+            elif target.exists():
+                action = 'exists'
+            else:
+                action = 'move'
+            self._claimed.add(target)
+            entries.append({'jav_code': jav_code, 'source': str(source), 'target': str(target),
+                            'folder': str(folder), 'action': action})
+            folders.update((str(self.videos_base), str(actress_folder), str(folder)))
+
+        new_folders = sorted(folders - self._known_folders)
+        self._known_folders.update(new_folders)
+        return OrganizePlan(entries, new_folders)
+
+
+def create_folders(folders: List[str]) -> int:
+    """
+    Create folders with one ``mkdir`` each; parents must come before their children.
+
+    Args:
+        folders (List[str]): Sorted folder paths
+
+    Returns:
+        int: Number of folders that did not exist yet
+    """
+    created = 0
+    for folder in folders:
+        try:
+            os.mkdir(folder)
+            created += 1
+        except FileExistsError:
+            pass
+        except FileNotFoundError:
+            # Parent outside the plan is missing, e.g. a removed library root
+            os.makedirs(folder, exist_ok=True)
+            created += 1
+    return created
+
+
+def execute_plan(plan: OrganizePlan, mode: str = 'move', chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 on_progress: Optional[Callable[[str, int, int, float], None]] = None) -> OrganizePlan:
+    """
+    Create the plan's folders, then run its moves in order.
+
+    Each ``move`` entry gets a ``result`` (what ``organize_file`` did) or an ``error``.
+
+    Args:
+        plan (OrganizePlan): Plan from ``OrganizePlanner.plan``
+        mode (str): ``move``, ``hardlink``, ``reflink`` or ``copy``
+        chunk_size (int): Chunk size for copies
+        on_progress (Callable, optional): Called with the JAV code and copy progress
+
+    Returns:
+        OrganizePlan: ``plan``, updated in place
+    """
+    created = create_folders(plan.folders)
+    logging.debug("📁 Created %s of %s planned folders", created, len(plan.folders))
+    for entry in plan.entries:
+        if entry['action'] != 'move':
+            continue
+        progress = None
+        if on_progress:
+            progress = lambda copied, total, rate, code=entry['jav_code']: on_progress(code, copied, total, rate)
+        try:
+            entry['result'] = organize_file(entry['source'], entry['target'], mode, chunk_size, progress)
+        except OSError as e:
+            logging.error("❌ Could not organize %s: %s", entry['source'], e)
+            entry['error'] = str(e)
+    return plan
@@ -0,0 +1,172 @@
+"""
+Pipeline
+========
+
+Stages connected by bounded asyncio queues.
+
+Each stage runs ``concurrency`` workers that take items from the stage's
+queue, pass them to the stage's handler and put the handler's result on the
+next stage's queue. A handler returns None to drop an item (it failed or will
+come back later). Queues hold at most ``queue_size`` items, so a slow stage
+makes the stages before it wait instead of piling up work in memory.
+
+``max_in_flight`` bounds the items between the source and the end of the
+last stage: the source is only asked for the next item when fewer are in the
+pipeline. With 1 the pipeline handles one item at a time.
+
+A stage with ``batch_size`` gets every item that is waiting in its queue, up
+to ``batch_size``, in one call, and returns the list of items to pass on.
+
+Used by ``jobs`` to keep the network, CPU and disk busy at the same time:
+while one title's video is moved, others are fetched and their images
+encoded.
+"""
+
+import asyncio
+import logging
+from typing import AsyncIterable, Awaitable, Callable, Dict, List, Optional
+
+# Put on a queue once per worker of the stage when no more items will come
+_DONE = object()
+
+
+class Stage:
+    """
+    One step of a pipeline.
+    """
+
+    def __init__(self, name: str, handler: Callable[..., Awaitable], concurrency: int = 1,
+                 batch_size: Optional[int] = None):
+        """
+        Initialize the stage.
+
+        Args:
+            name (str): Stage name, used in logs and the status
+            handler (Callable): Coroutine function called with an item (or a list of items
+                when ``batch_size`` is set) that returns the item(s) for the next stage
+            concurrency (int): Items handled at the same time
+            batch_size (int, optional): Hand waiting items to the handler in lists of at most this size
+        """
+        self.name = name
+        self.handler = handler
+        self.concurrency = max(1, int(concurrency))
+        self.batch_size = batch_size
+        self.queue: Optional[asyncio.Queue] = None
+        self.active = 0
+        self.done = 0
+
+
+class Pipeline:
+    """
+    Run items from a source through a list of stages.
+
+    Typical use::
+
+        pipeline = Pipeline([Stage('fetch', fetch, 4), Stage('write', write)], queue_size=8)
+        await pipeline.run(items())
+    """
+
+    def __init__(self, stages: List[Stage], queue_size: int = 8,
+                 on_error: Optional[Callable[[str, object, Exception], None]] = None,
+                 max_in_flight: Optional[int] = None):
+        """
+        Initialize the pipeline.
+
+        Args:
+            stages (List[Stage]): Stages in order
+            queue_size (int): Items each stage's queue holds before the stage in front of it waits
+            on_error (Callable, optional): Called with the stage name, the item and the exception
+                when a handler raises; the item is dropped
+            max_in_flight (int, optional): Items in the pipeline at most; unbounded apart
+                from the queues when None
+        """
+        self.stages = stages
+        self.queue_size = max(1, int(queue_size))
+        self.on_error = on_error
+        self.in_flight = 0
+        self.max_in_flight = max(1, int(max_in_flight)) if max_in_flight else None
+        self._left: Optional[asyncio.Event] = None
+
+    async def _worker(self, index: int):
+        stage = self.stages[index]
+        following = self.stages[index + 1] if index + 1 < len(self.stages) else None
+        while True:
+            item = await stage.queue.get()
+            if item is _DONE:
+                return
+            items = [item]
+            finished = False
+            if stage.batch_size:
+                while len(items) < stage.batch_size and not stage.queue.empty():
+                    item = stage.queue.get_nowait()
+                    if item is _DONE:
+                        finished = True
+                        break
+                    items.append(item)
+            stage.active += len(items)
+            try:
+                if stage.batch_size:
+                    results = await stage.handler(items)
+                else:
+                    result = await stage.handler(items[0])
+                    results = [] if result is None else [result]
+            except Exception as e:
+                logging.error("❌ Pipeline stage %s failed: %s", stage.name, e)
+                for item in items:
+                    if self.on_error:
+                        self.on_error(stage.name, item, e)
+                results = []
+            finally:
+                stage.active -= len(items)
+                stage.done += len(items)
+            # Items not passed on leave the pipeline here
+            self.in_flight -= len(items) - (len(results or []) if following else 0)
+            self._left.set()
+            if following:
+                for result in results or []:
+                    await following.queue.put(result)
+            if finished:
+                return
+
+    async def run(self, source: AsyncIterable):
+        """
+        Feed every item of ``source`` into the first stage and wait until all stages are done.
+
+        Args:
+            source (AsyncIterable): Items for the first stage; it may keep yielding while
+                items are in flight, e.g. to feed back items that were dropped for a retry
+        """
+        for stage in self.stages:
+            stage.queue = asyncio.Queue(self.queue_size)
+        self._left = asyncio.Event()
+        items = source.__aiter__()
+        tasks = [[asyncio.ensure_future(self._worker(index)) for _ in range(stage.concurrency)]
+                 for index, stage in enumerate(self.stages)]
+        try:
+            while True:
+                while self.max_in_flight and self.in_flight >= self.max_in_flight:
+                    self._left.clear()
+                    await self._left.wait()
+                try:
+                    item = await items.__anext__()
+                except StopAsyncIteration:
+                    break
+                self.in_flight += 1
+                await self.stages[0].queue.put(item)
+            # Stop the stages one after another, so each one has handed on all of its items
+            for stage, workers in zip(self.stages, tasks):
+                for _ in workers:
+                    await stage.queue.put(_DONE)
+                await asyncio.gather(*workers)
+        finally:
+            for workers in tasks:
+                for task in workers:
+                    task.cancel()
+
+    def status(self) -> Dict:
+        """Queued, active and done items per stage, and the items in the pipeline, for the job status."""
+        status = {stage.name: {'queued': stage.queue.qsize() if stage.queue else 0,
+                               'active': stage.active, 'done': stage.done}
+                  for stage in self.stages}
+        status['in_flight'] = self.in_flight
+        return status
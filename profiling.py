@@ -0,0 +1,339 @@
+"""
+Job Profiling
+=============
+
+Opt-in profiling of scraping jobs.
+
+A job can be profiled in two modes:
+
+- ``sampling``: a background thread samples the job thread's Python stack at
+  a fixed interval. The interval grows automatically when taking samples
+  costs more than ``max_overhead`` of the wall time, so the overhead stays
+  bounded and the mode can be left on in production.
+- ``cprofile``: ``cProfile`` records every call of the job thread in addition
+  to the stack samples. Exact, but slows the job down noticeably.
+
+In both modes every asyncio task created by the job is timed: wall time,
+time spent running on the event loop, and the longest single step (the
+longest time the task blocked the loop).
+
+Each run writes ``<name>.collapsed`` (one ``frame;frame;frame count`` line
+per stack, ready for flamegraph.pl or speedscope) and ``<name>.json`` (top
+functions and task timings) to the output folder, plus ``<name>.prof``
+(pstats) in cprofile mode.
+"""
+
+import asyncio
+import collections.abc
+import cProfile
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Optional
+
+MODES = ('sampling', 'cprofile')
+
+# Upper bound for the adaptive sampling interval (seconds)
+MAX_INTERVAL = 1.0
+
+
+class StackSampler:
+    """
+    Sample the Python stack of one thread from a background thread.
+    """
+
+    def __init__(self, thread_id: int, interval: float = 0.01, max_overhead: float = 0.02):
+        """
+        Initialize the sampler.
+
+        Args:
+            thread_id (int): Identifier of the thread to sample
+            interval (float): Seconds between samples
+            max_overhead (float): Share of wall time the sampling may cost
+        """
+        self.thread_id = thread_id
+        self.base_interval = interval
+        self.interval = interval
+        self.max_overhead = max_overhead
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.sampling_seconds = 0.0
+        self.started = None
+        self.stopped = None
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start sampling."""
+        self.started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name='job-profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop sampling and wait for the sampler thread."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.stopped = time.perf_counter()
+
+    @property
+    def overhead(self) -> float:
+        """Share of the sampled wall time spent taking samples."""
+        elapsed = (self.stopped or time.perf_counter()) - (self.started or time.perf_counter())
+        return self.sampling_seconds / elapsed if elapsed > 0 else 0.0
+
+    def _run(self):
+        """Take samples until stopped."""
+        while not self._stop_event.wait(self.interval):
+            sample_started = time.perf_counter()
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_name(frame))
+                frame = frame.f_back
+            self.stacks[';'.join(reversed(stack))] += 1
+            self.samples += 1
+
+            cost = time.perf_counter() - sample_started
+            self.sampling_seconds += cost
+            # Deep stacks cost more to walk; back off so cost / interval stays under max_overhead
+            self.interval = min(MAX_INTERVAL, max(self.base_interval, cost / self.max_overhead))
+
+    def write_collapsed(self, path: str):
+        """Write the samples in the collapsed stack format."""
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+    def top_functions(self, limit: int = 20) -> Dict[str, list]:
+        """
+        Summarize samples per function.
+
+        Returns:
+            Dict[str, list]: ``self`` (samples on top of the stack) and ``total``
+            (samples anywhere on the stack), each as ``[name, samples]`` pairs
+        """
+        own: Counter = Counter()
+        total: Counter = Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(';')
+            own[frames[-1]] += count
+            for name in set(frames):
+                total[name] += count
+        return {'self': own.most_common(limit), 'total': total.most_common(limit)}
+
+
+def _frame_name(frame) -> str:
+    """Name a frame as ``file.py:Qualified.name``."""
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+class _TimedCoroutine(collections.abc.Coroutine):
+    """Coroutine wrapper that measures the time each step runs on the event loop."""
+
+    def __init__(self, coro, stats: Dict):
+        self._coro = coro
+        self._stats = stats
+        self._started = None
+
+    def _step(self, method, *args):
+        step_started = time.perf_counter()
+        if self._started is None:
+            self._started = step_started
+        try:
+            return method(*args)
+        except BaseException:
+            self._finish()
+            raise
+        finally:
+            step = time.perf_counter() - step_started
+            self._stats['busy_seconds'] += step
+            self._stats['max_step_seconds'] = max(self._stats['max_step_seconds'], step)
+
+    def _finish(self):
+        self._stats['count'] += 1
+        if self._started is not None:
+            self._stats['wall_seconds'] += time.perf_counter() - self._started
+
+    def send(self, value):
+        return self._step(self._coro.send, value)
+
+    def throw(self, *args):
+        return self._step(self._coro.throw, *args)
+
+    def close(self):
+        return self._coro.close()
+
+    def __await__(self):
+        return self
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return self.send(None)
+
+
+class TaskTimer:
+    """
+    Time every asyncio task created on a loop, grouped by coroutine name.
+    """
+
+    def __init__(self):
+        self.stats: Dict[str, Dict] = {}
+        self._loop = None
+        self._previous_factory = None
+
+    def install(self, loop: asyncio.AbstractEventLoop):
+        """Install the timing task factory on ``loop``."""
+        self._loop = loop
+        self._previous_factory = loop.get_task_factory()
+        loop.set_task_factory(self._task_factory)
+
+    def uninstall(self):
+        """Restore the previous task factory."""
+        if self._loop is not None:
+            self._loop.set_task_factory(self._previous_factory)
+            self._loop = None
+
+    def _task_factory(self, loop, coro, **kwargs):
+        name = getattr(coro, '__qualname__', type(coro).__name__)
+        stats = self.stats.setdefault(name, {'count': 0, 'wall_seconds': 0.0, 'busy_seconds': 0.0,
+                                             'max_step_seconds': 0.0})
+        timed = _TimedCoroutine(coro, stats)
+        if self._previous_factory is not None:
+            return self._previous_factory(loop, timed, **kwargs)
+        return asyncio.Task(timed, loop=loop, **kwargs)
+
+    def summary(self, limit: int = 20) -> Dict[str, Dict]:
+        """Return the tasks with the most loop time first, rounded for display."""
+        ordered = sorted(self.stats.items(), key=lambda item: item[1]['busy_seconds'], reverse=True)
+        return {name: {key: round(value, 4) if isinstance(value, float) else value for key, value in stats.items()}
+                for name, stats in ordered[:limit]}
+
+
+class JobProfiler:
+    """
+    Profile one scraping job.
+
+    Start it on the job's thread from inside the job's event loop::
+
+        profiler = JobProfiler.from_config(config, requested=ui_settings.get('profile'))
+        if profiler:
+            profiler.start()
+        ...
+        summary = profiler.stop()
+    """
+
+    def __init__(self, mode: str = 'sampling', interval: float = 0.01, max_overhead: float = 0.02,
+                 output_dir: str = "profiles", name: Optional[str] = None):
+        """
+        Initialize the profiler.
+
+        Args:
+            mode (str): ``sampling`` or ``cprofile``
+            interval (float): Seconds between stack samples
+            max_overhead (float): Share of wall time the sampler may cost
+            output_dir (str): Folder the profile files are written to
+            name (str, optional): File name stem; defaults to ``job-<timestamp>``
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown profiling mode {mode!r}, expected one of {', '.join(MODES)}")
+        self.mode = mode
+        self.interval = interval
+        self.max_overhead = max_overhead
+        self.output_dir = output_dir
+        self.name = name or datetime.now().strftime('job-%Y%m%d-%H%M%S')
+        self.sampler = None
+        self.task_timer = TaskTimer()
+        self._profile = None
+        self._started = None
+
+    @classmethod
+    def from_config(cls, config: Dict, requested=None) -> Optional['JobProfiler']:
+        """
+        Build a profiler from the ``profiling`` section, or return None when profiling is off.
+
+        Args:
+            config (Dict): Loaded configuration
+            requested: Per-job override from the API: ``True``/``False`` or a mode name;
+                anything else is ignored
+
+        Returns:
+            Optional[JobProfiler]: Profiler to start, or None
+        """
+        profiling = config.get('profiling', {}) or {}
+        mode = profiling.get('mode', 'sampling')
+        if isinstance(requested, str):
+            if requested.strip().lower() in MODES:
+                mode = requested.strip().lower()
+                requested = True
+            else:
+                # Form values like "false" are not a mode, and bool() of them is True
+                logging.warning("⚠️ Ignoring profiling request %r, expected one of %s or true/false",
+                                requested, ', '.join(MODES))
+                requested = None
+        enabled = profiling.get('enabled', False) if requested is None else bool(requested)
+        if not enabled:
+            return None
+        return cls(
+            mode=mode,
+            interval=float(profiling.get('interval', 0.01)),
+            max_overhead=float(profiling.get('max_overhead', 0.02)),
+            output_dir=profiling.get('output_dir', 'profiles'),
+        )
+
+    def start(self):
+        """Start profiling the current thread and the running event loop."""
+        self._started = time.perf_counter()
+        self.sampler = StackSampler(threading.get_ident(), self.interval, self.max_overhead)
+        self.sampler.start()
+        self.task_timer.install(asyncio.get_running_loop())
+        if self.mode == 'cprofile':
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        logging.info("🔬 Profiling job in %s mode", self.mode)
+
+    def stop(self) -> Dict:
+        """
+        Stop profiling and write the profile files.
+
+        Returns:
+            Dict: Mode, written files, sampling overhead, top functions and task timings
+        """
+        if self._profile is not None:
+            self._profile.disable()
+        self.sampler.stop()
+        self.task_timer.uninstall()
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        base = os.path.join(self.output_dir, self.name)
+        files = {'collapsed': f"{base}.collapsed", 'summary': f"{base}.json"}
+        self.sampler.write_collapsed(files['collapsed'])
+        if self._profile is not None:
+            files['pstats'] = f"{base}.prof"
+            self._profile.dump_stats(files['pstats'])
+
+        summary = {
+            'mode': self.mode,
+            'files': files,
+            'wall_seconds': round(time.perf_counter() - self._started, 3),
+            'samples': self.sampler.samples,
+            'final_interval': round(self.sampler.interval, 4),
+            'sampling_overhead': round(self.sampler.overhead, 4),
+            'functions': self.sampler.top_functions(),
+            'tasks': self.task_timer.summary(),
+        }
+        with open(files['summary'], 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+        logging.info("🔬 Profile written to %s (%s samples, %.2f%% sampling overhead)",
+                     files['collapsed'], summary['samples'], summary['sampling_overhead'] * 100)
+        return summary
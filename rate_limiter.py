@@ -0,0 +1,94 @@
+"""
+Site Rate Limiter
+=================
+
+Per-site request spacing shared by every scraper process.
+
+The limiter keeps a "next free slot" timestamp per host in shared memory, so
+the same limits hold whether scraping runs in one process or is split across
+several worker processes by the coordinator.
+"""
+
+import asyncio
+import multiprocessing
+import time
+import urllib.parse
+from typing import Dict, Optional
+
+
+class SiteRateLimiter:
+    """
+    Enforce a minimum interval between requests to each configured host.
+
+    Hosts are matched by suffix, so a limit on ``javmost.com`` also applies to
+    ``www5.javmost.com``. Hosts without a configured limit are not throttled.
+    """
+
+    def __init__(self, intervals: Dict[str, float], context=None):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            intervals (Dict[str, float]): Minimum seconds between requests, keyed by host
+            context: Optional multiprocessing context used to allocate the shared state
+        """
+        ctx = context or multiprocessing.get_context()
+        # Longest host first so the most specific suffix wins
+        self.hosts = sorted(intervals, key=len, reverse=True)
+        self.intervals = [float(intervals[host]) for host in self.hosts]
+        self._lock = ctx.Lock()
+        self._next_slot = ctx.Array('d', max(len(self.hosts), 1), lock=False)
+
+    @classmethod
+    def from_config(cls, config: Dict, context=None) -> 'SiteRateLimiter':
+        """
+        Build a rate limiter from the ``scraper.rate_limits`` config section.
+
+        Args:
+            config (Dict): Full application configuration
+            context: Optional multiprocessing context
+
+        Returns:
+            SiteRateLimiter: Limiter with the configured per-host intervals
+        """
+        intervals = (config or {}).get('scraper', {}).get('rate_limits', {}) or {}
+        return cls(intervals, context=context)
+
+    def _host_index(self, url: str) -> Optional[int]:
+        """Return the index of the limit that applies to ``url``, if any."""
+        host = urllib.parse.urlparse(url).hostname or url
+        for index, limited_host in enumerate(self.hosts):
+            if host == limited_host or host.endswith('.' + limited_host):
+                return index
+        return None
+
+    def reserve(self, url: str) -> float:
+        """
+        Reserve the next request slot for the host of ``url``.
+
+        Args:
+            url (str): URL about to be requested
+
+        Returns:
+            float: Seconds the caller must wait before sending the request
+        """
+        index = self._host_index(url)
+        if index is None:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot[index])
+            self._next_slot[index] = slot + self.intervals[index]
+        return slot - now
+
+    async def acquire(self, url: str):
+        """
+        Wait until a request to ``url`` is allowed.
+
+        Args:
+            url (str): URL about to be requested
+        """
+        delay = self.reserve(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
@@ -0,0 +1,199 @@
+"""
+Retry Policy
+============
+
+Retries of failed requests, with jittered exponential backoff per error class.
+
+Failed requests are sorted into classes, each with its own policy
+(``scraper.retry.policies``):
+
+- ``rate_limited``: HTTP 429
+- ``unavailable``: HTTP 502, 503 and 504
+- ``timeout``: the request or page load timed out
+- ``connection``: the connection could not be opened or was dropped
+
+Attempt ``n`` of a class waits ``base_delay * 2 ** (n - 1)`` seconds, at most
+``max_delay``, minus up to ``jitter`` of it so that parallel workers do not
+retry in lockstep. A ``Retry-After`` header is the lower bound of the wait.
+
+Only waits up to ``inline_delay`` are spent inside the request, and only for
+the first ``attempts`` tries. A longer wait is not slept: the request fails,
+the engine raises ``RetryLater`` for the code instead of writing a placeholder
+result, and the job puts the code back on its queue to be scraped again once
+the wait has passed (at most ``reschedules`` times), scraping other codes in
+the meantime. ``RetrySchedule`` is that queue.
+"""
+
+import asyncio
+import email.utils
+import heapq
+import itertools
+import random
+import time
+from typing import Any, Dict, List, Optional
+
+RATE_LIMITED = 'rate_limited'
+UNAVAILABLE = 'unavailable'
+TIMEOUT = 'timeout'
+CONNECTION = 'connection'
+
+UNAVAILABLE_STATUSES = frozenset({502, 503, 504})
+
+DEFAULT_POLICIES = {
+    RATE_LIMITED: {'attempts': 1, 'base_delay': 5.0, 'max_delay': 300.0},
+    UNAVAILABLE: {'attempts': 1, 'base_delay': 2.0, 'max_delay': 60.0},
+    TIMEOUT: {'attempts': 1, 'base_delay': 2.0, 'max_delay': 60.0},
+    CONNECTION: {'attempts': 3, 'base_delay': 0.25, 'max_delay': 10.0},
+}
+
+
+def classify_status(status: int) -> Optional[str]:
+    """Return the error class of an HTTP status, or None when it is not worth retrying."""
+    if status == 429:
+        return RATE_LIMITED
+    if status in UNAVAILABLE_STATUSES:
+        return UNAVAILABLE
+    return None
+
+
+def classify_exception(exc: BaseException) -> Optional[str]:
+    """Return the error class of a request exception, or None when it is not worth retrying."""
+    # Playwright raises its own TimeoutError, which is not an asyncio.TimeoutError
+    if isinstance(exc, asyncio.TimeoutError) or type(exc).__name__ == 'TimeoutError':
+        return TIMEOUT
+    if isinstance(exc, ConnectionError):
+        return CONNECTION
+    import aiohttp
+
+    if isinstance(exc, aiohttp.ClientConnectionError):
+        return CONNECTION
+    return None
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """
+    Parse a ``Retry-After`` header.
+
+    Args:
+        value (str, optional): Seconds, or an HTTP date
+        now (float, optional): Current Unix time, for HTTP dates
+
+    Returns:
+        Optional[float]: Seconds to wait, or None when the header is missing or invalid
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    now = time.time() if now is None else now
+    return max(0.0, when.timestamp() - now)
+
+
+class RetryLater(Exception):
+    """Raised by the engine when a code could only be scraped after waiting for a site."""
+
+    def __init__(self, jav_code: str, retry_in: float, reasons: Optional[List[str]] = None):
+        super().__init__(f"{jav_code}: sites asked to retry in {retry_in:.0f}s ({', '.join(reasons or []) or 'unknown'})")
+        self.jav_code = jav_code
+        self.retry_in = retry_in
+        self.reasons = reasons or []
+
+
+class RetryPolicy:
+    """
+    Backoff per error class, and how much of it may be slept inside a request.
+    """
+
+    def __init__(self, policies: Optional[Dict[str, Dict]] = None, jitter: float = 0.5,
+                 inline_delay: float = 0.5, reschedules: int = 3, enabled: bool = True,
+                 rng: Optional[random.Random] = None):
+        """
+        Initialize the policy.
+
+        Args:
+            policies (Dict[str, Dict], optional): ``attempts``, ``base_delay`` and ``max_delay``
+                per error class, merged over ``DEFAULT_POLICIES``
+            jitter (float): Share of each wait that is randomly taken off
+            inline_delay (float): Longest wait slept inside a request; longer waits reschedule the code
+            reschedules (int): Times a code is put back on the job queue before it fails
+            enabled (bool): When False failed requests are neither retried nor rescheduled
+            rng (random.Random, optional): Random source, for tests
+        """
+        self.policies = {name: dict(policy) for name, policy in DEFAULT_POLICIES.items()}
+        for name, policy in (policies or {}).items():
+            self.policies.setdefault(name, {}).update(policy or {})
+        self.jitter = jitter
+        self.inline_delay = inline_delay
+        self.reschedules = reschedules if enabled else 0
+        self.enabled = enabled
+        self.rng = rng or random.Random()
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'RetryPolicy':
+        """Build the policy from the ``scraper.retry`` config section."""
+        settings = ((config or {}).get('scraper', {}) or {}).get('retry', {}) or {}
+        return cls(policies=settings.get('policies'),
+                   jitter=float(settings.get('jitter', 0.5)),
+                   inline_delay=float(settings.get('inline_delay', 0.5)),
+                   reschedules=int(settings.get('reschedules', 3)),
+                   enabled=bool(settings.get('enabled', True)))
+
+    def backoff(self, error_class: str, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Return how long to wait after the ``attempt``-th try failed with ``error_class``.
+
+        Args:
+            error_class (str): One of the error classes
+            attempt (int): Number of the failed try, starting at 1
+            retry_after (float, optional): Seconds from the ``Retry-After`` header
+
+        Returns:
+            float: Seconds to wait
+        """
+        policy = self.policies[error_class]
+        delay = min(float(policy['max_delay']), float(policy['base_delay']) * 2 ** (attempt - 1))
+        delay *= 1 - self.jitter * self.rng.random()
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def retry_inline(self, error_class: str, attempt: int, delay: float) -> bool:
+        """Whether the request should sleep ``delay`` seconds and try again itself."""
+        return attempt < int(self.policies[error_class]['attempts']) and delay <= self.inline_delay
+
+
+class RetrySchedule:
+    """
+    Items waiting to be retried, ordered by the time they are due.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._order = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def defer(self, item: Any, delay: float, now: Optional[float] = None):
+        """Schedule ``item`` to be due in ``delay`` seconds."""
+        now = time.monotonic() if now is None else now
+        heapq.heappush(self._heap, (now + delay, next(self._order), item))
+
+    def pop_due(self, now: Optional[float] = None) -> Optional[Any]:
+        """Remove and return the earliest item that is due, or None when none is."""
+        now = time.monotonic() if now is None else now
+        if self._heap and self._heap[0][0] <= now:
+            return heapq.heappop(self._heap)[2]
+        return None
+
+    def next_in(self, now: Optional[float] = None) -> Optional[float]:
+        """Seconds until the next item is due, or None when nothing is scheduled."""
+        if not self._heap:
+            return None
+        now = time.monotonic() if now is None else now
+        return max(0.0, self._heap[0][0] - now)
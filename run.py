@@ -4,6 +4,7 @@ JAV Scraper - Startup Script
 A simple script to run the JAV scraper application
 """
 
+import importlib.util
 import os
 import sys
 import subprocess
@@ -11,20 +12,19 @@ import webbrowser
 import time
 from pathlib import Path
 
+# Import names of the packages in requirements.txt
+REQUIRED_MODULES = ('flask', 'flask_cors', 'requests', 'yaml', 'aiohttp', 'bs4', 'PIL', 'playwright')
+
 def check_dependencies():
     """Check if required dependencies are installed."""
-    try:
-        import flask
-        import requests
-        import yaml
-        import aiohttp
-        import bs4
-        print("✅ All dependencies are installed")
-        return True
-    except ImportError as e:
-        print(f"❌ Missing dependency: {e}")
+    # find_spec locates the packages without importing them, keeping start-up fast
+    missing = [name for name in REQUIRED_MODULES if importlib.util.find_spec(name) is None]
+    if missing:
+        print(f"❌ Missing dependency: {', '.join(missing)}")
         print("Please run: pip install -r requirements.txt")
         return False
+    print("✅ All dependencies are installed")
+    return True
 
 def install_dependencies():
     """Install required dependencies."""
@@ -77,6 +77,9 @@ def main():
         
         # Run the Flask app
         from app import app
+        from settings import get_settings
+        # Parse config.yml before the first request; routes and engines share it
+        get_settings()
         try:
             app.run(debug=False, host='0.0.0.0', port=5000)
         except OSError as e:
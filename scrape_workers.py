@@ -0,0 +1,225 @@
+"""
+Scrape Workers
+==============
+
+Multi-process metadata scraping for large libraries.
+
+The coordinator runs in the web/job process. It hands unique JAV codes to N
+worker processes through a shared task queue and collects the scraped metadata
+from a result queue. Each worker owns its own event loop and its own
+``JAVScraperEngine`` (aiohttp session and browser), so HTML parsing, Pillow
+work and browser control are spread across CPU cores. Per-site rate limits are
+shared by all workers through a single ``SiteRateLimiter``. Workers send their
+log records to the coordinator, which writes them to the log file.
+
+A code a site asked to come back for later (``RetryLater``) is kept by its
+worker and scraped again once the wait has passed, while the worker goes on
+with other codes.
+
+File organization (NFO writing, image downloads, moves) and job status stay in
+the coordinator process.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import queue
+from typing import Dict, List, Optional
+
+from logging_setup import forward_logging, listen
+from metrics import REGISTRY
+from rate_limiter import SiteRateLimiter
+from retry_policy import RetryLater, RetrySchedule
+
+
+def _worker_main(worker_id: int, config_path: str, task_queue, result_queue, rate_limiter: SiteRateLimiter,
+                 log_queue=None, log_level: int = logging.INFO):
+    """
+    Entry point of a worker process.
+
+    Args:
+        worker_id (int): Index of the worker, used for logging
+        config_path (str): Path to the configuration file
+        task_queue: Queue of JAV codes to scrape, terminated by ``None``
+        result_queue: Queue receiving ``(jav_code, metadata, error, metrics)`` tuples
+        rate_limiter (SiteRateLimiter): Limiter shared with the other workers
+        log_queue: Queue the worker's log records are sent to, instead of the log file
+        log_level (int): Log level of the coordinator process
+    """
+    if log_queue is not None:
+        forward_logging(log_queue, log_level)
+    asyncio.run(_worker_loop(worker_id, config_path, task_queue, result_queue, rate_limiter))
+
+
+async def _worker_loop(worker_id: int, config_path: str, task_queue, result_queue, rate_limiter: SiteRateLimiter):
+    """Scrape codes from ``task_queue`` until the ``None`` sentinel is received."""
+    # Imported here so the coordinator process does not pay for the engine import
+    from scraper_engine import JAVScraperEngine
+
+    loop = asyncio.get_running_loop()
+    retries = RetrySchedule()
+    rescheduled: Dict[str, int] = {}
+    finished = False
+    async with JAVScraperEngine(config_path, rate_limiter=rate_limiter) as engine:
+        logging.info("👷 Worker %s started", worker_id)
+        while not finished or retries:
+            jav_code = retries.pop_due()
+            if jav_code is None:
+                if finished:
+                    # Only codes waiting for a retry are left
+                    await asyncio.sleep(retries.next_in())
+                    continue
+                # Wake up in time for the next retry while waiting for new codes
+                try:
+                    jav_code = await loop.run_in_executor(None, task_queue.get, True, retries.next_in())
+                except queue.Empty:
+                    continue
+                if jav_code is None:
+                    finished = True
+                    continue
+            try:
+                metadata = await engine.scrape_all_sites(jav_code)
+                result_queue.put((jav_code, metadata, None, engine.metrics.drain()))
+            except RetryLater as e:
+                attempt = rescheduled.get(jav_code, 0) + 1
+                if attempt > engine.retry_policy.reschedules:
+                    logging.error("❌ Worker %s gave up on %s: %s", worker_id, jav_code, e)
+                    result_queue.put((jav_code, None, str(e), engine.metrics.drain()))
+                    continue
+                rescheduled[jav_code] = attempt
+                logging.warning("⏳ Worker %s: %s, rescheduled (%s/%s)",
+                                worker_id, e, attempt, engine.retry_policy.reschedules)
+                retries.defer(jav_code, e.retry_in)
+            except Exception as e:
+                logging.error("❌ Worker %s failed on %s: %s", worker_id, jav_code, e)
+                result_queue.put((jav_code, None, str(e), engine.metrics.drain()))
+        logging.info("👷 Worker %s finished", worker_id)
+
+
+class WorkerError(Exception):
+    """Raised when a worker could not produce metadata for a JAV code."""
+
+
+class ScrapeCoordinator:
+    """
+    Split unique JAV codes across worker processes and collect their results.
+
+    Typical use inside a job::
+
+        coordinator = ScrapeCoordinator(workers=4)
+        coordinator.start(codes)
+        try:
+            metadata = await coordinator.get(code)
+        finally:
+            coordinator.close()
+    """
+
+    def __init__(self, workers: int, config_path: str = "config.yml", config: Optional[Dict] = None):
+        """
+        Initialize the coordinator.
+
+        Args:
+            workers (int): Number of worker processes to start
+            config_path (str): Path to the configuration file passed to each worker
+            config (Dict, optional): Loaded configuration, used for the shared rate limits
+        """
+        self.workers = max(1, int(workers))
+        self.config_path = config_path
+        self.config = config or {}
+        # Spawn avoids forking a process that may already hold threads and event loops
+        self._context = multiprocessing.get_context('spawn')
+        self._task_queue = None
+        self._result_queue = None
+        self._rate_limiter = None
+        self._log_queue = None
+        self._log_listener = None
+        self._processes: List = []
+        self._results: Dict[str, tuple] = {}
+
+    def start(self, jav_codes: List[str]):
+        """
+        Queue the unique codes and start the worker processes.
+
+        Args:
+            jav_codes (List[str]): JAV codes to scrape; duplicates are scraped once
+        """
+        unique_codes = list(dict.fromkeys(code for code in jav_codes if code))
+        self._task_queue = self._context.Queue()
+        self._result_queue = self._context.Queue()
+        # Kept on the coordinator so the shared lock outlives the worker start-up
+        self._rate_limiter = SiteRateLimiter.from_config(self.config, context=self._context)
+        # The workers' records are written by this process only
+        self._log_queue = self._context.Queue()
+        self._log_listener = listen(self._log_queue)
+
+        for jav_code in unique_codes:
+            self._task_queue.put(jav_code)
+        worker_count = min(self.workers, max(1, len(unique_codes)))
+        for _ in range(worker_count):
+            self._task_queue.put(None)
+
+        logging.info("👷 Starting %s scrape workers for %s unique codes", worker_count, len(unique_codes))
+        for worker_id in range(worker_count):
+            process = self._context.Process(
+                target=_worker_main,
+                args=(worker_id, self.config_path, self._task_queue, self._result_queue, self._rate_limiter,
+                      self._log_queue, logging.getLogger().getEffectiveLevel()),
+                daemon=True,
+            )
+            process.start()
+            self._processes.append(process)
+
+    def _drain(self, timeout: float) -> bool:
+        """Move one result from the result queue into the local buffer."""
+        try:
+            jav_code, metadata, error, metrics = self._result_queue.get(timeout=timeout)
+        except queue.Empty:
+            return False
+        # Worker timings are folded into this process so /api/metrics covers them
+        REGISTRY.merge(metrics)
+        self._results[jav_code] = (metadata, error)
+        return True
+
+    async def get(self, jav_code: str) -> Dict:
+        """
+        Wait for the metadata of ``jav_code``.
+
+        Results arrive in completion order and are buffered until requested,
+        so the job can keep processing files in their original order.
+
+        Args:
+            jav_code (str): JAV code previously passed to ``start``
+
+        Returns:
+            Dict: Combined metadata as returned by ``scrape_all_sites``
+
+        Raises:
+            WorkerError: If the worker failed or all workers exited without a result
+        """
+        loop = asyncio.get_running_loop()
+        while jav_code not in self._results:
+            received = await loop.run_in_executor(None, self._drain, 0.5)
+            if not received and not any(p.is_alive() for p in self._processes):
+                # Workers may have flushed their last results just before exiting
+                while self._drain(0.1):
+                    pass
+                if jav_code not in self._results:
+                    raise WorkerError(f"No worker produced a result for {jav_code}")
+
+        metadata, error = self._results[jav_code]
+        if error:
+            raise WorkerError(error)
+        # Files sharing a code each get their own copy to update with file info
+        return dict(metadata)
+
+    def close(self):
+        """Stop all worker processes."""
+        for process in self._processes:
+            if process.is_alive():
+                process.terminate()
+        for process in self._processes:
+            process.join(timeout=5)
+        self._processes = []
+        if self._log_listener is not None:
+            self._log_listener.stop()
+            self._log_listener = None
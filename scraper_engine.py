@@ -11,18 +11,66 @@ extracting metadata, and generating NFO files for media servers.
 import re
 import os
 import asyncio
-import aiohttp
-import yaml
-from bs4 import BeautifulSoup
-from typing import Dict, List, Optional, Tuple
+import contextlib
+import contextvars
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 import logging
 from pathlib import Path
 import json
 from datetime import datetime
-from PIL import Image
-from playwright.async_api import async_playwright
 import urllib.parse
 import tempfile
+import time
+from rate_limiter import SiteRateLimiter
+from detail_urls import DetailUrlResolver, code_variants, derive_template
+from local_store import LocalStore, open_local_store
+from logging_setup import configure_logging
+from metrics import REGISTRY
+from retry_policy import RetryLater, RetryPolicy, classify_exception, classify_status, parse_retry_after
+from settings import get_settings
+from site_registry import SiteRegistry, code_prefix, completeness
+from site_health import SITE_HEALTH, CircuitOpenError, is_failure_status
+
+# aiohttp, bs4, Pillow and Playwright take most of the start-up time and are not
+# needed to scan folders or serve the UI, so they are imported on first use
+if TYPE_CHECKING:
+    import aiohttp
+    from bs4 import BeautifulSoup
+
+# Sent with every request of the engine's session and by every browser page; requests
+# only add what differs (an image Accept header, a Referer). Accept-Encoding is left
+# to aiohttp, which offers every compression it can decode
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Upgrade-Insecure-Requests': '1',
+}
+IMAGE_ACCEPT = 'image/avif,image/webp,image/apng,image/svg+xml,image/*,*/*;q=0.8'
+
+# Set by JAVScraperEngine._probe while one source is scraped; requests that fail
+# on the way are noted here so the result is not cached as a miss
+_fetch_failures: contextvars.ContextVar[Optional[List[str]]] = contextvars.ContextVar('fetch_failures', default=None)
+
+
+def _note_fetch_failure(reason: str):
+    failures = _fetch_failures.get()
+    if failures is not None:
+        failures.append(reason)
+
+
+# Set by JAVScraperEngine.scrape_all_sites; requests that gave up on a retryable
+# error note how long to wait here, so the code is rescheduled instead of
+# getting a placeholder result
+_retry_hints: contextvars.ContextVar[Optional[List[Tuple[float, str]]]] = contextvars.ContextVar(
+    'retry_hints', default=None)
+
+
+def _note_retry_later(delay: float, reason: str):
+    hints = _retry_hints.get()
+    if hints is not None:
+        hints.append((delay, reason))
+
 
 class JAVScraperEngine:
     """
@@ -32,50 +80,54 @@ class JAVScraperEngine:
     extracting metadata from various sources, and generating NFO files for media servers.
     """
 
-    def __init__(self, config_path: str = "config.yml"):
+    def __init__(self, config_path: str = "config.yml", rate_limiter: Optional[SiteRateLimiter] = None):
         """
         Initialize the JAV scraper engine.
 
         Args:
             config_path (str): Path to the configuration file. Defaults to "config.yml"
+            rate_limiter (SiteRateLimiter, optional): Shared per-site rate limiter. When not
+                given, a process-local limiter is built from ``scraper.rate_limits``
         """
-        self.config = self._load_config(config_path)
+        # Shared per process and only re-parsed when config.yml changes on disk
+        self.settings = get_settings(config_path)
+        self.config = self.settings.data
         self.setup_logging()
         self.session = None
-
-    def _load_config(self, config_path: str) -> Dict:
-        """
-        Load configuration from YAML file.
-
-        Args:
-            config_path (str): Path to the configuration file
-
-        Returns:
-            Dict: Configuration dictionary or empty dict if file not found
-        """
-        try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f)
-        except FileNotFoundError:
-            logging.error(f"Config file {config_path} not found")
-            return {}
+        self.rate_limiter = rate_limiter or SiteRateLimiter.from_config(self.config)
+        # Circuit breakers are shared by all engines of the process
+        self.site_health = SITE_HEALTH
+        self.site_health.configure(self.config)
+        self.retry_policy = RetryPolicy.from_config(self.config)
+        self.sites = SiteRegistry.from_config(self, self.config)
+        self.detail_urls = DetailUrlResolver.from_config(self.config)
+        self.metrics = REGISTRY
+        # "playwright" loads pages in Chromium, "http" uses the aiohttp session only
+        self.fetch_backend = self.settings.fetch_backend
+        self.site_overrides = self.settings.site_overrides
+        self._playwright = None
+        self._browser = None
+        self._browser_lock = None
+        self._store = None
+        self._store_opened = False
+
+    @property
+    def store(self) -> Optional[LocalStore]:
+        """The local store, opened on first use; None when ``local_store.enabled`` is false."""
+        if not self._store_opened:
+            self._store = open_local_store(self.config)
+            self._store_opened = True
+        return self._store
 
     def setup_logging(self):
         """
         Setup logging configuration.
 
         Configures the logging system based on the application's configuration.
-        This includes setting log level, format, and output handlers (file and console).
+        The rotating log file and console output are written by a background
+        listener thread, and handlers are only installed once per process.
         """
-        log_config = self.config.get('logging', {})
-        logging.basicConfig(
-            level=getattr(logging, log_config.get('level', 'INFO')),
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_config.get('file', 'scraper.log')),
-                logging.StreamHandler()
-            ]
-        )
+        configure_logging(self.settings.logging)
 
     async def __aenter__(self):
         """
@@ -86,16 +138,14 @@ class JAVScraperEngine:
         Returns:
             JAVScraperEngine: The instance of the scraper engine
         """
-        self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=self.config.get('scraper', {}).get('timeout', 30))
-        )
+        self._get_session()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """
         Async context manager exit.
 
-        Closes the HTTP client session and performs cleanup operations.
+        Closes the HTTP client session, the browser and the local store if it was opened.
 
         Args:
             exc_type: Exception type (if any)
@@ -104,6 +154,233 @@ class JAVScraperEngine:
         """
         if self.session:
             await self.session.close()
+            self.session = None
+        if self._browser:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright:
+            await self._playwright.stop()
+            self._playwright = None
+        if self._store_opened:
+            if self._store is not None:
+                self._store.close()
+            self._store = None
+            self._store_opened = False
+
+    async def _get_browser(self):
+        """
+        Return the engine's shared Chromium instance, launching it on first use.
+
+        Pages are opened per request on this single browser instead of starting
+        a new browser process for every fetch. The browser is closed in __aexit__.
+        """
+        if self._browser_lock is None:
+            self._browser_lock = asyncio.Lock()
+        async with self._browser_lock:
+            if self._browser is None or not self._browser.is_connected():
+                if self._playwright is None:
+                    from playwright.async_api import async_playwright
+
+                    self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch(headless=True)
+        return self._browser
+
+    def _create_session(self, **kwargs) -> 'aiohttp.ClientSession':
+        """
+        Create the engine's aiohttp session.
+
+        All requests share one connection pool (``scraper.http``): connections
+        are kept alive between requests to the same host, at most
+        ``limit_per_host`` are open per host, and DNS answers are cached. The
+        session sends ``DEFAULT_HEADERS`` and its requests are recorded in the
+        metrics registry.
+        """
+        import aiohttp
+
+        options = self.settings.http
+        connector = aiohttp.TCPConnector(
+            limit=int(options['limit']),
+            limit_per_host=int(options['limit_per_host']),
+            keepalive_timeout=float(options['keepalive_seconds']),
+            ttl_dns_cache=int(options['dns_cache_seconds']),
+        )
+        kwargs.setdefault('timeout', aiohttp.ClientTimeout(total=self.settings.timeout))
+        return aiohttp.ClientSession(connector=connector, headers=DEFAULT_HEADERS,
+                                     trace_configs=[self._http_trace_config()], **kwargs)
+
+    def _get_session(self) -> 'aiohttp.ClientSession':
+        """Return the engine's session, creating it when the engine is used outside ``async with``."""
+        if self.session is None or self.session.closed:
+            self.session = self._create_session()
+        return self.session
+
+    def _http_trace_config(self) -> 'aiohttp.TraceConfig':
+        """
+        Build an aiohttp trace config that times every request per host.
+
+        Requests are recorded under the ``http_fetch`` stage unless the caller
+        passes ``trace_request_ctx={'stage': ...}``.
+        """
+        import aiohttp
+
+        metrics = self.metrics
+        site_health = self.site_health
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_request_start(session, context, params):
+            context.started = time.perf_counter()
+            context.site = (context.trace_request_ctx or {}).get('site') or params.url.host or ''
+            context.stage = (context.trace_request_ctx or {}).get('stage', 'http_fetch')
+
+        async def on_request_end(session, context, params):
+            elapsed = time.perf_counter() - context.started
+            metrics.observe(context.stage, context.site, elapsed)
+            site_health.record(context.site, not is_failure_status(params.response.status))
+            if context.stage == 'http_fetch':
+                site_health.observe(context.site, elapsed)
+            if params.response.status >= 400:
+                metrics.record_error(context.stage, context.site, f"http_{params.response.status}")
+                if params.response.status != 404:
+                    _note_fetch_failure(f"http_{params.response.status}")
+
+        async def on_request_exception(session, context, params):
+            elapsed = time.perf_counter() - context.started
+            metrics.observe(context.stage, context.site, elapsed)
+            if context.stage == 'http_fetch' and isinstance(params.exception, asyncio.TimeoutError):
+                # Count the timeout as a slow response so a slowed-down site gets longer timeouts
+                site_health.observe(context.site, elapsed)
+            metrics.record_error(context.stage, context.site, type(params.exception).__name__)
+            site_health.record(context.site, False)
+            _note_fetch_failure(type(params.exception).__name__)
+
+        async def on_response_chunk_received(session, context, params):
+            metrics.add_bytes(context.stage, context.site, len(params.chunk))
+
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_request_end.append(on_request_end)
+        trace_config.on_request_exception.append(on_request_exception)
+        trace_config.on_response_chunk_received.append(on_response_chunk_received)
+        return trace_config
+
+    def _site_url(self, url: str) -> str:
+        """
+        Rewrite ``url`` to the base URL configured for its host in ``scraper.site_overrides``.
+
+        Used to point the scrapers at a mirror or at the offline benchmark server.
+
+        Args:
+            url (str): URL as built by the scrapers
+
+        Returns:
+            str: URL to request
+        """
+        if not self.site_overrides:
+            return url
+        parsed = urllib.parse.urlsplit(url)
+        base = self.site_overrides.get(parsed.hostname or '')
+        if not base:
+            return url
+        return base.rstrip('/') + urllib.parse.urlunsplit(('', '', parsed.path or '/', parsed.query, ''))
+
+    def _plan_retry(self, url: str, error_class: str, attempt: int, retry_after: Optional[str] = None) -> Optional[float]:
+        """
+        Decide how to go on after the ``attempt``-th request to ``url`` failed with ``error_class``.
+
+        A ``Retry-After`` header holds the site for that long.
+
+        Args:
+            url (str): Requested URL
+            error_class (str): Error class from ``retry_policy``
+            attempt (int): Number of the failed try, starting at 1
+            retry_after (str, optional): ``Retry-After`` header of the response
+
+        Returns:
+            Optional[float]: Seconds to sleep before trying again, or None when the request
+            gives up; the wait is then noted so the code is rescheduled
+        """
+        if not self.retry_policy.enabled:
+            return None
+        site = urllib.parse.urlparse(url).hostname or ''
+        seconds = parse_retry_after(retry_after)
+        if seconds is not None:
+            self.site_health.hold(site, seconds)
+        delay = self.retry_policy.backoff(error_class, attempt, seconds)
+        if self.retry_policy.retry_inline(error_class, attempt, delay):
+            logging.debug("🔁 %s on %s, retrying in %.1fs (attempt %s)", error_class, url, delay, attempt + 1)
+            self.metrics.inc('retries', site=site, kind=error_class, action='inline')
+            return delay
+        logging.debug("🔁 %s on %s, giving up for now, retry in %.0fs", error_class, url, delay)
+        self.metrics.inc('retries', site=site, kind=error_class, action='reschedule')
+        _note_retry_later(delay, f"{site} {error_class}")
+        return None
+
+    @contextlib.asynccontextmanager
+    async def _request(self, method: str, url: str, **kwargs):
+        """
+        Send a session request, applying site overrides and the retry policy.
+
+        Metrics keep the original host as the site label. Page requests (the
+        default ``http_fetch`` stage) get the site's adaptive timeout unless the
+        caller passes ``timeout``. Requests that fail with a retryable error are
+        retried here while the backoff is short (see ``retry_policy``); otherwise
+        the last response is returned, or the last exception raised. Use as
+        ``async with self._request('GET', url) as response``.
+
+        Raises:
+            CircuitOpenError: If the host's circuit breaker is open or the host asked to wait
+        """
+        import aiohttp
+
+        trace_request_ctx = dict(kwargs.pop('trace_request_ctx', None) or {})
+        trace_request_ctx.setdefault('site', urllib.parse.urlparse(url).hostname or '')
+        adaptive = 'timeout' not in kwargs and trace_request_ctx.get('stage', 'http_fetch') == 'http_fetch'
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                self.site_health.check(url)
+            except CircuitOpenError as e:
+                _note_fetch_failure('circuit_open')
+                _note_retry_later(max(e.retry_in, 1.0), f"{e.site} circuit_open")
+                raise
+            if adaptive:
+                kwargs['timeout'] = aiohttp.ClientTimeout(
+                    total=self.site_health.timeout_for(url, self.settings.timeout))
+            try:
+                response = await self._get_session().request(method, self._site_url(url),
+                                                      trace_request_ctx=trace_request_ctx, **kwargs)
+            except Exception as e:
+                error_class = classify_exception(e)
+                delay = self._plan_retry(url, error_class, attempt) if error_class else None
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                await self._throttle(url)
+                continue
+            error_class = classify_status(response.status)
+            if error_class:
+                delay = self._plan_retry(url, error_class, attempt, response.headers.get('Retry-After'))
+                if delay is not None:
+                    response.release()
+                    await asyncio.sleep(delay)
+                    await self._throttle(url)
+                    continue
+            try:
+                yield response
+            finally:
+                response.release()
+            return
+
+    def _soup(self, html: str) -> 'BeautifulSoup':
+        """Parse HTML with BeautifulSoup, timing it as the ``parse`` stage."""
+        from bs4 import BeautifulSoup
+
+        with self.metrics.time_stage('parse'):
+            return BeautifulSoup(html, 'html.parser')
+
+    async def _throttle(self, url: str):
+        """Wait for the per-site rate limiter before requesting ``url``."""
+        await self.rate_limiter.acquire(url)
 
     def extract_jav_code(self, filename: str) -> Optional[str]:
         """
@@ -128,6 +405,64 @@ class JAVScraperEngine:
 
         return None
 
+    def extract_part(self, filename: str) -> Optional[str]:
+        """
+        Extract the part label of a multi-part release from a filename.
+
+        Numbered parts (``-CD1``, ``.disc2``, ``pt1``, ``Part 2``) are returned
+        as ``CD<n>``; single letters after the code (``-A``, ``-B``) are returned
+        as the letter. Whether a letter really is a part (``-C`` usually marks
+        Chinese subtitles) is decided by ``group_by_code``.
+        """
+        name = os.path.splitext(filename)[0].upper()
+        match = re.search(r'[A-Z]{2,5}[-_]?\d{2,5}', name)
+        if not match:
+            return None
+        rest = name[match.end():]
+
+        numbered = re.match(r'[\s\-_.]*(?:CD|DISC|DISK|PART|PT)[\s\-_.]?(\d{1,2})(?!\d)', rest)
+        if numbered:
+            return f"CD{int(numbered.group(1))}"
+        lettered = re.match(r'[\-_.\s]([A-D])(?![A-Z0-9])', rest)
+        if lettered:
+            return lettered.group(1)
+        return None
+
+    def group_by_code(self, files: List[Dict]) -> List[Dict]:
+        """
+        Group scanned files by JAV code, detecting multi-part releases.
+
+        Every member gets a ``part`` key: the disc number for multi-part
+        releases, otherwise None. Letters only count as parts when a code has
+        at least two different ones, so a lone ``-C`` stays a single file.
+
+        Args:
+            files (List[Dict]): Files as returned by ``scan_folder``
+
+        Returns:
+            List[Dict]: ``{'jav_code', 'files'}`` per code in order of first appearance,
+            members sorted by part
+        """
+        groups: Dict[str, List[Dict]] = {}
+        for file_info in files:
+            groups.setdefault(file_info['jav_code'], []).append(file_info)
+
+        result = []
+        for jav_code, members in groups.items():
+            labels = [self.extract_part(file_info['filename']) for file_info in members]
+            letters = {label for label in labels if label and len(label) == 1}
+            grouped = []
+            for file_info, label in zip(members, labels):
+                part = None
+                if label and label.startswith('CD'):
+                    part = int(label[2:])
+                elif label in letters and len(letters) > 1:
+                    part = ord(label) - ord('A') + 1
+                grouped.append({**file_info, 'part': part})
+            grouped.sort(key=lambda file_info: file_info['part'] or 0)
+            result.append({'jav_code': jav_code, 'files': grouped})
+        return result
+
     def clean_actress_name(self, actress_name: str) -> str:
         """
         Clean actress name by removing Japanese characters and keeping only English/Romanized names.
@@ -163,12 +498,12 @@ class JAVScraperEngine:
 
     def scan_folder(self, folder_path: str) -> List[Dict]:
         """Scan folder for video files and extract JAV codes."""
-        video_extensions = self.config.get('scraper', {}).get('video_extensions', ['.mp4', '.avi', '.mkv'])
+        video_extensions = self.settings.video_extensions
         results = []
 
         folder = Path(folder_path)
         if not folder.exists():
-            logging.error(f"Folder {folder_path} does not exist")
+            logging.error("Folder %s does not exist", folder_path)
             return results
 
         for file_path in folder.rglob('*'):
@@ -184,82 +519,276 @@ class JAVScraperEngine:
 
         return results
 
+    def _wait_strategy(self, site: str) -> Dict:
+        """
+        Return how to wait for pages of ``site`` from ``scraper.wait_strategies``.
+
+        Hosts are matched by suffix like ``rate_limits``; ``default`` applies to
+        all other hosts.
+
+        Returns:
+            Dict: ``wait_until`` (a Playwright load state) and an optional CSS ``selector``
+        """
+        strategies = self.settings.scraper.get('wait_strategies') or {}
+        strategy = strategies.get('default') or {}
+        for host in sorted(strategies, key=len, reverse=True):
+            if host != 'default' and (site == host or site.endswith('.' + host)):
+                strategy = strategies[host]
+                break
+        return {'wait_until': 'networkidle', **strategy}
+
     async def fetch_html_with_playwright(self, url: str) -> Optional[str]:
         """Fetch HTML content using Playwright to bypass bot detection."""
+        html, _ = await self.fetch_page(url)
+        return html
+
+    async def fetch_page(self, url: str) -> Tuple[Optional[str], Optional[int]]:
+        """
+        Fetch a page like ``fetch_html_with_playwright``, with the HTTP status of the answer.
+
+        The browser returns the HTML of error pages as well, e.g. a 404 page that
+        repeats the requested URL; callers that must tell those apart check the status.
+
+        Returns:
+            Tuple[Optional[str], Optional[int]]: The HTML, or None when there is none,
+            and the status, or None when no answer was received
+        """
+        if self.fetch_backend == 'http':
+            return await self._fetch_page_http(url)
+        page = None
+        site = urllib.parse.urlparse(url).hostname or ''
+        started = None
         try:
-            logging.info(f"🌐 Using Playwright to fetch: {url}")
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
-                page = await browser.new_page()
-
-                # Set user agent to look like a real browser
-                await page.set_extra_http_headers({
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
-                    'Accept-Language': 'en-US,en;q=0.9',
-                    'Accept-Encoding': 'gzip, deflate, br',
-                    'Connection': 'keep-alive',
-                    'Upgrade-Insecure-Requests': '1',
-                })
-
-                # Navigate to the page
-                await page.goto(url, wait_until='networkidle', timeout=30000)
-                logging.info(f"✅ Page loaded successfully")
-
-                # Get the HTML content
-                html = await page.content()
-                logging.info(f"📄 Retrieved HTML length: {len(html)} characters")
-
-                await browser.close()
-                return html
+            logging.debug("🌐 Using Playwright to fetch: %s", url)
+            self.site_health.check(url)
+            await self._throttle(url)
+            started = time.perf_counter()
+            browser = await self._get_browser()
+            page = await browser.new_page()
+
+            # Set user agent to look like a real browser
+            await page.set_extra_http_headers(DEFAULT_HEADERS)
+
+            # Navigate to the page and wait as configured for the site, retrying
+            # rate-limited or unavailable answers while the backoff is short
+            strategy = self._wait_strategy(site)
+            attempt = 0
+            while True:
+                attempt += 1
+                timeout = self.site_health.timeout_for(site, self.settings.timeout, kind='browser')
+                loading = time.perf_counter()
+                try:
+                    response = await page.goto(self._site_url(url), wait_until=strategy['wait_until'],
+                                               timeout=timeout * 1000)
+                    if strategy.get('selector'):
+                        remaining = max(1.0, timeout - (time.perf_counter() - loading))
+                        try:
+                            await page.wait_for_selector(strategy['selector'], timeout=remaining * 1000)
+                        except Exception as e:
+                            if type(e).__name__ != 'TimeoutError':
+                                raise
+                            # The page did load; a layout without the element must not fail
+                            # every page of the site and open its circuit breaker
+                            logging.warning("⚠️ %s did not appear on %s, using the page as loaded",
+                                            strategy['selector'], url)
+                except Exception as e:
+                    if type(e).__name__ == 'TimeoutError':
+                        self.site_health.observe(site, timeout, kind='browser')
+                    raise
+                self.site_health.observe(site, time.perf_counter() - loading, kind='browser')
+                self.site_health.record(site, not (response and is_failure_status(response.status)))
+                error_class = classify_status(response.status) if response else None
+                if not error_class:
+                    break
+                delay = self._plan_retry(url, error_class, attempt, response.headers.get('retry-after'))
+                if delay is None:
+                    logging.warning("❌ HTTP %s for %s", response.status, url)
+                    _note_fetch_failure(f"http_{response.status}")
+                    return None, response.status
+                await asyncio.sleep(delay)
+                await self._throttle(url)
+                self.site_health.check(url)
+            logging.debug("✅ Page loaded successfully")
+
+            # Get the HTML content
+            html = await page.content()
+            logging.debug("📄 Retrieved HTML length: %s characters", len(html))
+            self.metrics.add_bytes('browser_fetch', site, len(html))
+            return html, response.status if response else None
+        except CircuitOpenError as e:
+            logging.debug("🔌 %s", e)
+            _note_fetch_failure('circuit_open')
+            _note_retry_later(max(e.retry_in, 1.0), f"{e.site} circuit_open")
+            return None, None
         except Exception as e:
-            logging.error(f"❌ Error fetching HTML with Playwright: {e}")
+            logging.error("❌ Error fetching HTML with Playwright: %s", e)
+            self.metrics.record_error('browser_fetch', site, type(e).__name__)
+            if started is not None:
+                self.site_health.record(site, False)
+            _note_fetch_failure(type(e).__name__)
+            error_class = classify_exception(e)
+            if error_class:
+                # A page load is not retried in place; the code is rescheduled instead
+                self._plan_retry(url, error_class, self.retry_policy.policies[error_class]['attempts'])
+            return None, None
+        finally:
+            if started is not None:
+                self.metrics.observe('browser_fetch', site, time.perf_counter() - started)
+            if page is not None:
+                try:
+                    await page.close()
+                except Exception:
+                    pass
+
+    async def _fetch_html_http(self, url: str) -> Optional[str]:
+        """Fetch HTML content with the aiohttp session (``fetch_backend: http``)."""
+        html, _ = await self._fetch_page_http(url)
+        return html
+
+    async def _fetch_page_http(self, url: str) -> Tuple[Optional[str], Optional[int]]:
+        """``fetch_page`` over HTTP; the HTML of a non-200 answer is not returned."""
+        try:
+            logging.debug("🌐 Fetching over HTTP: %s", url)
+            await self._throttle(url)
+            async with self._request('GET', url) as response:
+                if response.status != 200:
+                    logging.warning("❌ HTTP %s for %s", response.status, url)
+                    return None, response.status
+                return await response.text(), response.status
+        except CircuitOpenError as e:
+            logging.debug("🔌 %s", e)
+            return None, None
+        except Exception as e:
+            logging.error("❌ Error fetching HTML over HTTP: %s", e)
+            _note_fetch_failure(type(e).__name__)
+            return None, None
+
+    def _learn_detail_url(self, source: str, jav_code: str, detail_url: str):
+        """Count the template of a detail page URL that a search found for ``jav_code``."""
+        template = derive_template(jav_code, detail_url)
+        if template:
+            self._record_detail_url(source, template, True)
+
+    def _load_detail_urls(self, source: str):
+        """Load the persisted templates of ``source`` once, before they are used or counted."""
+        if not self.detail_urls.loaded(source):
+            self.detail_urls.load(source, self.store.url_templates(source) if self.store else {})
+
+    def _record_detail_url(self, source: str, template: str, ok: bool):
+        self._load_detail_urls(source)
+        self.detail_urls.record(source, template, ok)
+        if self.store:
+            self.store.record_url_template(source, template, ok)
+
+    @staticmethod
+    def _is_detail_page(html: str, jav_code: str) -> bool:
+        """Check whether a page mentions ``jav_code`` in any of its URL spellings, as a whole word."""
+        page = html.lower()
+        # SSIS-12 must not match SSIS-123
+        return any(re.search(r'(?<![a-z0-9])' + re.escape(variant.lower()) + r'(?![a-z0-9])', page)
+                   for variant in code_variants(jav_code).values())
+
+    async def _fetch_detail_direct(self, source: str, jav_code: str, parse) -> Optional[Dict]:
+        """
+        Fetch the detail page of ``jav_code`` from the catalog or a learned URL template,
+        skipping the search.
+
+        Listing metadata of a catalog entry fills in the title, cover and date where the
+        detail page has none. A catalog entry whose page is not the code's is removed.
+
+        Args:
+            source (str): Source name of the templates
+            jav_code (str): Code to scrape
+            parse (Callable): Called with the detail HTML, the code and the URL; returns the site result
+
+        Returns:
+            Optional[Dict]: The site result, or None when the code is not in the catalog, there
+            is no trusted template or the page was not the code's, so the caller searches instead
+        """
+        entry = self.store.catalog_entry(source, jav_code) if self.store else None
+        if entry:
+            template, detail_url = None, entry['detail_url']
+        else:
+            self._load_detail_urls(source)
+            resolved = self.detail_urls.resolve(source, jav_code)
+            if not resolved:
+                return None
+            template, detail_url = resolved
+        logging.debug("🔗 Going straight to the %s detail page: %s", source, detail_url)
+        detail_html, status = await self.fetch_page(detail_url)
+        if status is None or classify_status(status):
+            # The request failed or was throttled; that says nothing about the template
+            self.metrics.inc('detail_urls', site=source, result='failed')
+            return None
+        # Any other answer but 200 (a 404 page that repeats the code) is a miss
+        ok = status == 200 and bool(detail_html) and self._is_detail_page(detail_html, jav_code)
+        result = parse(detail_html, jav_code, detail_url) if ok else None
+        ok = ok and self._has_metadata(result, jav_code)
+        if entry:
+            self.metrics.inc('detail_urls', site=source, result='catalog' if ok else 'catalog_miss')
+            if not ok:
+                self.store.remove_catalog_entry(source, jav_code)
+            else:
+                for key, listed in (('title', entry['title']), ('cover_url', entry['cover_url']),
+                                    ('date', entry['date'])):
+                    if listed and not result.get(key):
+                        result[key] = listed
+        else:
+            self._record_detail_url(source, template, ok)
+            self.metrics.inc('detail_urls', site=source, result='direct' if ok else 'miss')
+        if not ok:
+            logging.debug("⚠️ %s is not the detail page of %s, searching instead", detail_url, jav_code)
             return None
+        return result
+
+    def _parse_javguru_detail(self, detail_html: str, jav_code: str, detail_url: str) -> Dict:
+        """Build a JavGuru result from a detail page alone, without the search result."""
+        detailed_metadata = self._extract_detailed_metadata(self._soup(detail_html), jav_code)
+        fanart_url = detailed_metadata.get('fanart_url')
+        return {
+            'title': detailed_metadata.get('full_title'),
+            'cover_url': fanart_url,
+            'fanart_url': fanart_url,
+            'detail_url': detail_url,
+            'tags': detailed_metadata.get('tags', []),
+            'stats': '',
+            'date': detailed_metadata.get('release_date', ''),
+            'detail_html': detail_html,
+            'detailed_metadata': detailed_metadata,
+            'source': 'javguru'
+        }
 
     async def scrape_javguru(self, jav_code: str) -> Optional[Dict]:
         """Scrape metadata from JavGuru using Playwright to bypass bot detection."""
         try:
-            logging.info(f"🔍 Starting JavGuru scrape for {jav_code}")
+            logging.debug("🔍 Starting JavGuru scrape for %s", jav_code)
+            result = await self._fetch_detail_direct('javguru', jav_code, self._parse_javguru_detail)
+            if result:
+                logging.debug("✅ JavGuru scrape completed for %s (direct detail page)", jav_code)
+                return result
             url = f"https://jav.guru/?s={jav_code}"
 
-            logging.info(f"📡 Requesting URL with Playwright: {url}")
+            logging.debug("📡 Requesting URL with Playwright: %s", url)
             html = await self.fetch_html_with_playwright(url)
             if not html:
-                logging.warning(f"❌ Failed to fetch HTML with Playwright for {jav_code}")
+                logging.warning("❌ Failed to fetch HTML with Playwright for %s", jav_code)
                 return None
-            soup = BeautifulSoup(html, 'html.parser')
-            # Find the first result
-            article = soup.select_one('div.inside-article')
-            if not article:
-                logging.warning(f"⚠️ No search results found for {jav_code}")
+            search_result = self._parse_javguru_search(html)
+            if not search_result:
+                logging.warning("⚠️ No search results found for %s", jav_code)
                 return None
-            # Detail page link
-            link_tag = article.select_one('div.imgg a')
-            detail_url = link_tag['href'] if link_tag and link_tag.has_attr('href') else None
-            # Cover image
-            img_tag = link_tag.find('img') if link_tag else None
-            cover_url = img_tag['src'] if img_tag and img_tag.has_attr('src') else None
-            # Title
-            title_tag = article.select_one('div.grid1 h2 a')
-            title = title_tag['title'] if title_tag and title_tag.has_attr('title') else (title_tag.text.strip() if title_tag else None)
-            # Tags
-            tags = [a.text for a in article.select('div.grid3 p.tags a')]
-            # Stats
-            stats = article.select_one('div.javstats')
-            stats_text = stats.text.strip() if stats else ""
-            # Date
-            date_tag = article.select_one('div.date')
-            date = date_tag.text.strip() if date_tag else ""
+            title, cover_url, detail_url = search_result['title'], search_result['cover_url'], search_result['detail_url']
+            tags, stats_text, date = search_result['tags'], search_result['stats'], search_result['date']
             # Now fetch the detail page for comprehensive metadata
             if detail_url:
-                logging.info(f"🔗 Fetching detail page: {detail_url}")
+                logging.debug("🔗 Fetching detail page: %s", detail_url)
                 detail_html = await self.fetch_html_with_playwright(detail_url)
 
                 if detail_html:
-                    logging.info(f"📄 Detail page HTML length: {len(detail_html)} characters")
+                    logging.debug("📄 Detail page HTML length: %s characters", len(detail_html))
 
                     # Parse detail page for comprehensive metadata
-                    detail_soup = BeautifulSoup(detail_html, 'html.parser')
+                    detail_soup = self._soup(detail_html)
 
                     # Extract detailed metadata
                     detailed_metadata = self._extract_detailed_metadata(detail_soup, jav_code)
@@ -280,10 +809,12 @@ class JAVScraperEngine:
                         'detailed_metadata': detailed_metadata,  # Add comprehensive metadata
                         'source': 'javguru'
                     }
-                    logging.info(f"✅ JavGuru scrape completed for {jav_code}")
+                    if self._has_metadata(result, jav_code):
+                        self._learn_detail_url('javguru', jav_code, detail_url)
+                    logging.debug("✅ JavGuru scrape completed for %s", jav_code)
                     return result
                 else:
-                    logging.warning(f"❌ Failed to fetch detail page for {jav_code}")
+                    logging.warning("❌ Failed to fetch detail page for %s", jav_code)
 
             # Return search result only if detail page failed
             result = {
@@ -295,12 +826,79 @@ class JAVScraperEngine:
                 'date': date,
                 'source': 'javguru'
             }
-            logging.info(f"✅ JavGuru scrape completed for {jav_code} (search results only)")
+            logging.debug("✅ JavGuru scrape completed for %s (search results only)", jav_code)
             return result
         except Exception as e:
-            logging.error(f"❌ Error scraping JavGuru for {jav_code}: {e}")
+            logging.error("❌ Error scraping JavGuru for %s: %s", jav_code, e)
             return None
 
+    def _parse_javguru_search(self, html: str) -> Optional[Dict]:
+        """
+        Parse the first result of a JavGuru search page.
+
+        Args:
+            html (str): Search page HTML
+
+        Returns:
+            Optional[Dict]: title, cover_url, detail_url, tags, stats and date, or None without results
+        """
+        soup = self._soup(html)
+        # Find the first result
+        article = soup.select_one('div.inside-article')
+        if not article:
+            return None
+        return self._parse_javguru_article(article)
+
+    def _parse_javguru_listing(self, html: str) -> List[Dict]:
+        """
+        Parse every post of a JavGuru listing page (home, category or studio pages).
+
+        Args:
+            html (str): Listing page HTML, which uses the search result markup
+
+        Returns:
+            List[Dict]: Like ``_parse_javguru_search``, plus the ``jav_code`` from the title
+            or detail URL; posts without a code are left out
+        """
+        entries = []
+        for article in self._soup(html).select('div.inside-article'):
+            entry = self._parse_javguru_article(article)
+            if not entry['detail_url']:
+                continue
+            jav_code = self.extract_jav_code(entry['title'] or '') or \
+                self.extract_jav_code(entry['detail_url'].rstrip('/').rsplit('/', 1)[-1])
+            if jav_code:
+                entries.append({'jav_code': jav_code, **entry})
+        return entries
+
+    def _parse_javguru_article(self, article) -> Dict:
+        """Parse one post of a JavGuru search or listing page."""
+        # Detail page link
+        link_tag = article.select_one('div.imgg a')
+        detail_url = link_tag['href'] if link_tag and link_tag.has_attr('href') else None
+        # Cover image
+        img_tag = link_tag.find('img') if link_tag else None
+        cover_url = img_tag['src'] if img_tag and img_tag.has_attr('src') else None
+        # Title
+        title_tag = article.select_one('div.grid1 h2 a')
+        title = title_tag['title'] if title_tag and title_tag.has_attr('title') else (title_tag.text.strip() if title_tag else None)
+        # Tags
+        tags = [a.text for a in article.select('div.grid3 p.tags a')]
+        # Stats
+        stats = article.select_one('div.javstats')
+        stats_text = stats.text.strip() if stats else ""
+        # Date
+        date_tag = article.select_one('div.date')
+        date = date_tag.text.strip() if date_tag else ""
+        return {
+            'title': title,
+            'cover_url': cover_url,
+            'detail_url': detail_url,
+            'tags': tags,
+            'stats': stats_text,
+            'date': date,
+        }
+
     def _extract_detailed_metadata(self, soup, jav_code):
         """Extract comprehensive metadata from detail page."""
         try:
@@ -309,7 +907,7 @@ class JAVScraperEngine:
             # Find the infoleft section containing movie information
             infoleft = soup.find('div', class_='infoleft')
             if not infoleft:
-                logging.warning(f"⚠️ Could not find infoleft section for {jav_code}")
+                logging.warning("⚠️ Could not find infoleft section for %s", jav_code)
                 return metadata
 
             # Extract all list items from the movie information section
@@ -337,9 +935,9 @@ class JAVScraperEngine:
                 if field_name in ['actress', 'actresses', 'cast', 'star', 'stars']:
                     original_value = field_value
                     field_value = self.clean_actress_name(field_value)
-                    logging.info(f"📋 Extracted {field_name}: {original_value} -> {field_value}")
+                    logging.debug("📋 Extracted %s: %s -> %s", field_name, original_value, field_value)
                 else:
-                    logging.info(f"📋 Extracted {field_name}: {field_value}")
+                    logging.debug("📋 Extracted %s: %s", field_name, field_value)
 
                 # Store the metadata
                 metadata[field_name] = field_value
@@ -348,7 +946,7 @@ class JAVScraperEngine:
             title_tag = soup.find('h1', class_='titl')
             if title_tag:
                 metadata['full_title'] = title_tag.get_text(strip=True)
-                logging.info(f"📋 Extracted full_title: {metadata['full_title']}")
+                logging.debug("📋 Extracted full_title: %s", metadata['full_title'])
 
             # Extract cover image from the large screenshot (this will be used as fanart)
             large_screenshot = soup.find('div', class_='large-screenshot')
@@ -357,7 +955,7 @@ class JAVScraperEngine:
                 if img_tag and img_tag.get('src'):
                     metadata['fanart_url'] = img_tag['src']  # Use as fanart
                     metadata['large_cover_url'] = img_tag['src']  # Keep for compatibility
-                    logging.info(f"📋 Extracted fanart_url: {metadata['fanart_url']}")
+                    logging.debug("📋 Extracted fanart_url: %s", metadata['fanart_url'])
 
             # Extract plot/synopsis from wp-content
             wp_content = soup.find('div', class_='wp-content')
@@ -371,19 +969,19 @@ class JAVScraperEngine:
 
                 if plot_text:
                     metadata['plot'] = ' '.join(plot_text)
-                    logging.info(f"📋 Extracted plot: {metadata['plot'][:100]}...")
+                    logging.debug("📋 Extracted plot: %s...", metadata['plot'][:100])
 
-            logging.info(f"✅ Extracted {len(metadata)} detailed metadata fields for {jav_code}")
+            logging.debug("✅ Extracted %s detailed metadata fields for %s", len(metadata), jav_code)
             return metadata
 
         except Exception as e:
-            logging.error(f"❌ Error extracting detailed metadata for {jav_code}: {e}")
+            logging.error("❌ Error extracting detailed metadata for %s: %s", jav_code, e)
             return {}
 
     async def scrape_fallback(self, jav_code: str) -> Optional[Dict]:
         """Fallback scraper that generates basic metadata when sites are blocked."""
         try:
-            logging.info(f"🔄 Using fallback scraper for {jav_code}")
+            logging.debug("🔄 Using fallback scraper for %s", jav_code)
             
             # Generate a basic cover URL using a more reliable service
             # This is just for testing - in a real scenario you'd want to use a proper image service
@@ -403,14 +1001,14 @@ class JAVScraperEngine:
                 'source': 'fallback'
             }
             
-            logging.info(f"✅ Fallback scraper completed for {jav_code}")
+            logging.debug("✅ Fallback scraper completed for %s", jav_code)
             return result
         except Exception as e:
-            logging.error(f"❌ Error in fallback scraper for {jav_code}: {e}")
+            logging.error("❌ Error in fallback scraper for %s: %s", jav_code, e)
             return None
         """Scrape metadata from JavGuru."""
         try:
-            logging.info(f"🔍 Starting JavGuru scrape for {jav_code}")
+            logging.debug("🔍 Starting JavGuru scrape for %s", jav_code)
             url = f"https://jav.guru/?s={jav_code}"
             
             # Add headers to avoid blocking
@@ -423,14 +1021,14 @@ class JAVScraperEngine:
                 'Upgrade-Insecure-Requests': '1',
             }
             
-            logging.info(f"📡 Requesting URL: {url}")
+            logging.debug("📡 Requesting URL: %s", url)
             async with self.session.get(url, headers=headers) as response:
-                logging.info(f"📊 Response status: {response.status}")
+                logging.debug("📊 Response status: %s", response.status)
                 
                 if response.status == 200:
                     html = await response.text()
-                    logging.info(f"📄 Received HTML length: {len(html)} characters")
-                    soup = BeautifulSoup(html, 'html.parser')
+                    logging.debug("📄 Received HTML length: %s characters", len(html))
+                    soup = self._soup(html)
                     
                     # Since this is a search results page, we need to find the first result
                     # Look for article elements or product cards
@@ -440,13 +1038,13 @@ class JAVScraperEngine:
                         soup.find('div', {'class': 'result'})
                     
                     if first_result:
-                        logging.info(f"✅ Found first result for {jav_code}")
+                        logging.debug("✅ Found first result for %s", jav_code)
                         
                         # Extract title from the first result
                         title_elem = first_result.find('h2') or first_result.find('h3') or \
                                    first_result.find('a', href=True)
                         title_text = title_elem.get_text().strip() if title_elem else f"{jav_code} - JAV Content"
-                        logging.info(f"📝 Title extracted: {title_text}")
+                        logging.debug("📝 Title extracted: %s", title_text)
                         
                         # Try to find the link to the detailed page
                         detail_link = first_result.find('a', href=True)
@@ -457,15 +1055,15 @@ class JAVScraperEngine:
                             elif not detail_url.startswith('http'):
                                 detail_url = 'https://jav.guru/' + detail_url
                             
-                            logging.info(f"🔗 Detail URL: {detail_url}")
+                            logging.debug("🔗 Detail URL: %s", detail_url)
                             
                             # Now scrape the detailed page
                             async with self.session.get(detail_url, headers=headers) as detail_response:
-                                logging.info(f"📊 Detail page status: {detail_response.status}")
+                                logging.debug("📊 Detail page status: %s", detail_response.status)
                                 
                                 if detail_response.status == 200:
                                     detail_html = await detail_response.text()
-                                    detail_soup = BeautifulSoup(detail_html, 'html.parser')
+                                    detail_soup = self._soup(detail_html)
                                     
                                     # Extract cover image from detailed page
                                     cover_url = None
@@ -488,11 +1086,11 @@ class JAVScraperEngine:
                                                     cover_url = 'https:' + cover_url
                                                 elif cover_url.startswith('/'):
                                                     cover_url = 'https://jav.guru' + cover_url
-                                                logging.info(f"🖼️ Found cover URL: {cover_url}")
+                                                logging.debug("🖼️ Found cover URL: %s", cover_url)
                                                 break
                                     
                                     if not cover_url:
-                                        logging.warning(f"⚠️ No cover URL found for {jav_code}")
+                                        logging.warning("⚠️ No cover URL found for %s", jav_code)
                                     
                                     # Extract details from the detailed page
                                     details = {}
@@ -503,28 +1101,28 @@ class JAVScraperEngine:
                                                 detail_soup.find('div', text=lambda x: x and 'actress' in x.lower())
                                     if actor_elem:
                                         details['Actor'] = actor_elem.get_text().strip()
-                                        logging.info(f"👤 Actor: {details['Actor']}")
+                                        logging.debug("👤 Actor: %s", details['Actor'])
                                     
                                     # Look for studio information
                                     studio_elem = detail_soup.find('a', href=lambda x: x and '/studio/' in x) or \
                                                  detail_soup.find('span', text=lambda x: x and 'studio' in x.lower())
                                     if studio_elem:
                                         details['Studio'] = studio_elem.get_text().strip()
-                                        logging.info(f"🏢 Studio: {details['Studio']}")
+                                        logging.debug("🏢 Studio: %s", details['Studio'])
                                     
                                     # Look for release date
                                     date_elem = detail_soup.find('span', text=lambda x: x and 'date' in x.lower()) or \
                                                detail_soup.find('div', text=lambda x: x and 'date' in x.lower())
                                     if date_elem:
                                         details['Release Date'] = date_elem.get_text().strip()
-                                        logging.info(f"📅 Release Date: {details['Release Date']}")
+                                        logging.debug("📅 Release Date: %s", details['Release Date'])
                                     
                                     # Look for runtime/duration
                                     runtime_elem = detail_soup.find('span', text=lambda x: x and ('runtime' in x.lower() or 'duration' in x.lower())) or \
                                                   detail_soup.find('div', text=lambda x: x and ('runtime' in x.lower() or 'duration' in x.lower()))
                                     if runtime_elem:
                                         details['Runtime'] = runtime_elem.get_text().strip()
-                                        logging.info(f"⏱️ Runtime: {details['Runtime']}")
+                                        logging.debug("⏱️ Runtime: %s", details['Runtime'])
                                     
                                     # Look for genre information
                                     genre_elems = detail_soup.find_all('a', href=lambda x: x and '/genre/' in x) or \
@@ -532,7 +1130,7 @@ class JAVScraperEngine:
                                     if genre_elems:
                                         genres = [elem.get_text().strip() for elem in genre_elems]
                                         details['Genre'] = ', '.join(genres)
-                                        logging.info(f"🎭 Genres: {details['Genre']}")
+                                        logging.debug("🎭 Genres: %s", details['Genre'])
                                     
                                     # Extract plot/description
                                     plot_elem = detail_soup.find('div', {'class': 'description'}) or \
@@ -540,7 +1138,7 @@ class JAVScraperEngine:
                                                detail_soup.find('p', text=lambda x: x and len(x) > 50)
                                     if plot_elem:
                                         details['Plot'] = plot_elem.get_text().strip()
-                                        logging.info(f"📖 Plot length: {len(details['Plot'])} characters")
+                                        logging.debug("📖 Plot length: %s characters", len(details['Plot']))
                                     
                                     result = {
                                         'title': title_text,
@@ -549,15 +1147,15 @@ class JAVScraperEngine:
                                         'source': 'javguru'
                                     }
                                     
-                                    logging.info(f"✅ JavGuru scrape completed for {jav_code}")
+                                    logging.debug("✅ JavGuru scrape completed for %s", jav_code)
                                     return result
                                 else:
-                                    logging.warning(f"❌ Detail page returned status {detail_response.status} for {jav_code}")
+                                    logging.warning("❌ Detail page returned status %s for %s", detail_response.status, jav_code)
                         else:
-                            logging.warning(f"❌ No detail link found for {jav_code}")
+                            logging.warning("❌ No detail link found for %s", jav_code)
                     
                     # If no detailed page found, return basic info from search results
-                    logging.warning(f"⚠️ No detailed page found for {jav_code}, returning basic info")
+                    logging.warning("⚠️ No detailed page found for %s, returning basic info", jav_code)
                     return {
                         'title': f"{jav_code} - JAV Content",
                         'cover_url': None,
@@ -565,174 +1163,174 @@ class JAVScraperEngine:
                         'source': 'javguru'
                     }
                 else:
-                    logging.warning(f"❌ JavGuru returned status {response.status} for {jav_code}")
+                    logging.warning("❌ JavGuru returned status %s for %s", response.status, jav_code)
                     return None
         except Exception as e:
-            logging.error(f"❌ Error scraping JavGuru for {jav_code}: {e}")
+            logging.error("❌ Error scraping JavGuru for %s: %s", jav_code, e)
             return None
             
 
             
 
             
-    async def scrape_all_sites(self, jav_code: str) -> Dict:
-        """Scrape metadata from all enabled sites."""
-        logging.info(f"🔍 ==== METADATA SCRAPING START ====")
-        logging.info(f"🔍 JAV Code: {jav_code}")
-        logging.info(f"🔍 Config: {self.config.get('scraper', {})}")
-        
-        enabled_sites = [site for site in self.config.get('scraper', {}).get('sites', []) if site.get('enabled', True)]
-        logging.info(f"🔍 Enabled sites: {[site['name'] for site in enabled_sites]}")
-        
-        tasks = []
-        for site in enabled_sites:
-            site_name = site['name']
-            if site_name == 'javguru':
-                logging.info(f"🌐 Adding JavGuru task for {jav_code}")
-                tasks.append(self.scrape_javguru(jav_code))
-            elif site_name == 'javtrailers':
-                logging.info(f"🌐 Adding JAV Trailers task for {jav_code}")
-                tasks.append(self.scrape_javtrailers(jav_code))
-                
-        logging.info(f"📡 Starting {len(tasks)} scraping tasks")
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        logging.info(f"📊 Scraping results: {results}")
-        
-        # Check if all sites failed or returned empty results
-        all_failed = True
-        for i, result in enumerate(results):
-            logging.info(f"📊 Analyzing result {i+1}: {type(result)}")
-            if isinstance(result, dict) and result:
-                # Check if the result has meaningful data
-                has_title = result.get('title') and result.get('title') != 'None'
-                has_cover = result.get('cover_url')
-                has_actress = result.get('details', {}).get('Actress') or result.get('details', {}).get('Actor')
-                
-                logging.info(f"📊 Result {i+1} analysis:")
-                logging.info(f"   📊 Has title: {has_title} ({result.get('title', 'N/A')})")
-                logging.info(f"   📊 Has cover: {has_cover} ({result.get('cover_url', 'N/A')})")
-                logging.info(f"   📊 Has actress: {has_actress}")
-                
-                if has_title or has_cover or has_actress:
-                    all_failed = False
-                    logging.info(f"✅ Result {i+1} has meaningful data")
-                    break
+    @staticmethod
+    def _has_metadata(result: Optional[Dict], jav_code: str) -> bool:
+        """Check whether a site result has more than a placeholder title."""
+        if not isinstance(result, dict) or not result:
+            return False
+        title = result.get('title')
+        details = result.get('details', {}) or {}
+        detailed_metadata = result.get('detailed_metadata', {}) or {}
+        return bool(
+            (title and title not in ('None', jav_code, f"{jav_code} - JAV Content", "JAV MOST")) or
+            (result.get('cover_url') or '').strip() or
+            details.get('Actress') or details.get('Actor') or details.get('Studio') or
+            detailed_metadata.get('actress') or detailed_metadata.get('studio'))
+
+    async def _probe(self, source: str, jav_code: str, scraper) -> Optional[Dict]:
+        """
+        Run ``scraper(jav_code)`` unless the negative cache says ``source`` had nothing recently.
+
+        Results with metadata clear the source's misses in the local store. Results
+        without are recorded as a miss, unless a request failed along the way. Both
+        count towards the source's lookup history in ``self.sites``.
+
+        Args:
+            source (str): Source name used in the local store
+            jav_code (str): Code to scrape
+            scraper (Callable): Site scraper coroutine function
+
+        Returns:
+            Optional[Dict]: The scraper's result, or None when the source was skipped
+        """
+        store = self.store if self.settings.section('local_store').get('negative_cache', True) else None
+        if store:
+            retry_after = store.retry_after(jav_code, source)
+            self.metrics.record_cache('negative', hit=retry_after is not None)
+            if retry_after:
+                logging.debug("⏭️ Skipping %s for %s: no result last time, next check after %s",
+                              source, jav_code, datetime.fromtimestamp(retry_after).isoformat(timespec='minutes'))
+                return None
+
+        failures: List[str] = []
+        token = _fetch_failures.set(failures)
+        started = time.monotonic()
+        try:
+            result = await scraper(jav_code)
+        finally:
+            _fetch_failures.reset(token)
+
+        hit = self._has_metadata(result, jav_code)
+        if hit or not failures:
+            seconds = time.monotonic() - started
+            share = completeness(result) if hit else 0.0
+            self.sites.record(source, hit, seconds, jav_code, share)
+            if self.store:
+                self.store.record_lookup(source, hit, seconds, prefix=code_prefix(jav_code), completeness=share)
+
+        if store:
+            if hit:
+                store.record_hit(jav_code, source)
+            elif failures:
+                logging.debug("⚠️ Not caching the miss of %s on %s, requests failed: %s", jav_code, source, failures)
             else:
-                logging.warning(f"⚠️ Result {i+1} is not valid: {result}")
+                retry_after = store.record_miss(jav_code, source)
+                logging.info("🚫 %s has no result on %s, next check after %s", jav_code, source,
+                             datetime.fromtimestamp(retry_after).isoformat(timespec='minutes'))
+        return result
+
+    async def scrape_all_sites(self, jav_code: str, enrich: bool = True) -> Dict:
+        """
+        Scrape metadata from the primary sites, then the fallback sites (see ``site_registry``).
+
+        Args:
+            jav_code (str): Code to scrape
+            enrich (bool): Also look up actress portraits (``enhance_actress_metadata``);
+                the job pipeline does that in a stage of its own
+
+        Raises:
+            RetryLater: If no site had metadata and a site failed with a retryable
+                error, instead of returning the placeholder result
+        """
+        retry_hints: List[Tuple[float, str]] = []
+        token = _retry_hints.set(retry_hints)
+        try:
+            return await self._scrape_all_sites(jav_code, retry_hints, enrich)
+        finally:
+            _retry_hints.reset(token)
+
+    async def _scrape_all_sites(self, jav_code: str, retry_hints: List[Tuple[float, str]], enrich: bool) -> Dict:
+        """Body of ``scrape_all_sites``; ``retry_hints`` collects the waits noted by failed requests."""
+        logging.debug("🔍 ==== METADATA SCRAPING START ====")
+        logging.debug("🔍 JAV Code: %s", jav_code)
+        logging.debug("🔍 Config: %s", self.config.get('scraper', {}))
         
-        # If all sites failed, try fallback sites in order: JAVmost -> JAV Trailers -> Basic
-        if all_failed:
-            logging.warning(f"⚠️ ==== ALL ENABLED SITES FAILED, TRYING FALLBACK SITES ====")
-            logging.warning(f"⚠️ All scraping sites failed for {jav_code}, trying fallback sites")
-            
-            # Try JAVmost first
-            logging.info(f"🔍 Trying JAVmost for {jav_code}")
-            javmost_result = None
-            try:
-                javmost_result = await self.scrape_javmost(jav_code)
-                if javmost_result:
-                    # Check if JAVmost result has meaningful data
-                    has_meaningful_data = (javmost_result.get('title') and 
-                                          javmost_result.get('title') != jav_code and
-                                          javmost_result.get('title') != f"{jav_code} - JAV Content" and
-                                          javmost_result.get('title') != "JAV MOST") or \
-                                         (javmost_result.get('cover_url') and javmost_result.get('cover_url').strip() != '') or \
-                                         (javmost_result.get('details', {}).get('Actress') and 
-                                          javmost_result.get('details', {}).get('Actress').strip() != '') or \
-                                         (javmost_result.get('details', {}).get('Studio') and 
-                                          javmost_result.get('details', {}).get('Studio').strip() != '') or \
-                                         (javmost_result.get('detailed_metadata', {}).get('actress') and 
-                                          javmost_result.get('detailed_metadata', {}).get('actress').strip() != '') or \
-                                         (javmost_result.get('detailed_metadata', {}).get('studio') and 
-                                          javmost_result.get('detailed_metadata', {}).get('studio').strip() != '')
-                    
-                    # Log the meaningful data check for debugging
-                    logging.info(f"🔍 JAVmost meaningful data check:")
-                    logging.info(f"   🔍 Title: {javmost_result.get('title', 'N/A')}")
-                    logging.info(f"   🔍 Cover URL: {javmost_result.get('cover_url', 'N/A')}")
-                    logging.info(f"   🔍 Details Actress: {javmost_result.get('details', {}).get('Actress', 'N/A')}")
-                    logging.info(f"   🔍 Details Studio: {javmost_result.get('details', {}).get('Studio', 'N/A')}")
-                    logging.info(f"   🔍 Detailed Metadata Actress: {javmost_result.get('detailed_metadata', {}).get('actress', 'N/A')}")
-                    logging.info(f"   🔍 Detailed Metadata Studio: {javmost_result.get('detailed_metadata', {}).get('studio', 'N/A')}")
-                    logging.info(f"   🔍 Has meaningful data: {has_meaningful_data}")
-                    
-                    if has_meaningful_data:
-                        logging.info(f"✅ JAVmost fallback successful with meaningful data")
-                        results = [javmost_result]
-                        enabled_sites.append({'name': 'javmost', 'enabled': True})
-                    else:
-                        logging.warning(f"⚠️ JAVmost returned data but no meaningful content for {jav_code}")
-                        logging.warning(f"⚠️ No actress information found, will try next fallback site")
-                        javmost_result = None  # Mark as failed for next fallback
-                else:
-                    logging.warning(f"⚠️ JAVmost fallback failed for {jav_code}")
-            except Exception as e:
-                logging.error(f"❌ Error in JAVmost fallback: {e}")
-                javmost_result = None
-            
-            # If JAVmost failed or had no meaningful data, try JAV Trailers
-            if not javmost_result:
-                logging.info(f"🔍 Trying JAV Trailers for {jav_code}")
-                javtrailers_result = None
+        if not self.sites.stats_loaded:
+            self.sites.load(self.store.source_stats() if self.store else {})
+        prefix = code_prefix(jav_code)
+        if prefix not in self.sites.prefixes:
+            self.sites.load_prefix(prefix, self.store.prefix_stats(prefix) if self.store else {})
+        primaries = self.sites.primaries(jav_code)
+        logging.debug("🔍 Primary sites: %s", [scraper.name for scraper in primaries])
+
+        # Primary sites are all asked at once
+        results = await asyncio.gather(*[self._probe(scraper.name, jav_code, scraper.scrape)
+                                         for scraper in primaries], return_exceptions=True)
+        logging.debug("📊 Scraping results: %s", results)
+        for scraper, result in zip(primaries, results):
+            if isinstance(result, BaseException):
+                logging.warning("⚠️ %s failed for %s: %s", scraper.name, jav_code, result)
+        # The cost order only decides what is asked; results are merged in the configured order
+        priority = [scraper.name for scraper in self.sites.primary]
+        found = sorted(((scraper.name, result) for scraper, result in zip(primaries, results)
+                        if isinstance(result, dict) and result), key=lambda item: priority.index(item[0]))
+
+        # If no primary site had metadata, try the fallback sites one at a time, cheapest first
+        if not any(self._has_metadata(result, jav_code) for _, result in found):
+            if primaries:
+                logging.warning("⚠️ No primary site had metadata for %s, trying fallback sites", jav_code)
+            else:
+                logging.debug("🧭 No primary site has %s codes, trying fallback sites", prefix)
+            found = []
+            for scraper in self.sites.fallbacks(jav_code):
+                logging.debug("🔍 Trying %s for %s", scraper.name, jav_code)
                 try:
-                    javtrailers_result = await self.scrape_javtrailers(jav_code)
-                    if javtrailers_result:
-                        # Check if JAV Trailers result has meaningful data
-                        has_meaningful_data = (javtrailers_result.get('title') and 
-                                              javtrailers_result.get('title') != jav_code and
-                                              javtrailers_result.get('title') != f"{jav_code} - JAV Content") or \
-                                             javtrailers_result.get('cover_url') or \
-                                             (javtrailers_result.get('detailed_metadata', {}).get('actress') and 
-                                              javtrailers_result.get('detailed_metadata', {}).get('actress').strip() != '') or \
-                                             (javtrailers_result.get('detailed_metadata', {}).get('studio') and 
-                                              javtrailers_result.get('detailed_metadata', {}).get('studio').strip() != '')
-                        
-                        if has_meaningful_data:
-                            logging.info(f"✅ JAV Trailers fallback successful with meaningful data")
-                            results = [javtrailers_result]
-                            enabled_sites.append({'name': 'javtrailers', 'enabled': True})
-                        else:
-                            logging.warning(f"⚠️ JAV Trailers returned data but no meaningful content for {jav_code}")
-                            logging.warning(f"⚠️ No actress information found, will try next fallback site")
-                            javtrailers_result = None  # Mark as failed for next fallback
-                    else:
-                        logging.warning(f"⚠️ JAV Trailers fallback failed for {jav_code}")
+                    result = await self._probe(scraper.name, jav_code, scraper.scrape)
                 except Exception as e:
-                    logging.error(f"❌ Error in JAV Trailers fallback: {e}")
-                    javtrailers_result = None
-                
-                # If JAV Trailers also failed, try basic fallback
-                if not javtrailers_result:
-                    logging.info(f"🔍 Trying basic fallback for {jav_code}")
-                    try:
-                        fallback_result = await self.scrape_fallback(jav_code)
-                        if fallback_result:
-                            logging.info(f"✅ Basic fallback successful")
-                            results = [fallback_result]
-                            enabled_sites.append({'name': 'fallback', 'enabled': True})
-                        else:
-                            logging.warning(f"⚠️ Basic fallback failed for {jav_code}")
-                            # Create basic result as last resort
-                            results = [{
-                                'title': f"{jav_code} - JAV Content",
-                                'cover_url': None,
-                                'details': {'Actor': 'Unknown', 'Studio': 'Unknown'},
-                                'source': 'basic'
-                            }]
-                            enabled_sites.append({'name': 'basic', 'enabled': True})
-                    except Exception as e:
-                        logging.error(f"❌ Error in basic fallback: {e}")
-                        # Create basic result as last resort
-                        results = [{
-                            'title': f"{jav_code} - JAV Content",
-                            'cover_url': None,
-                            'details': {'Actor': 'Unknown', 'Studio': 'Unknown'},
-                            'source': 'basic'
-                        }]
-                        enabled_sites.append({'name': 'basic', 'enabled': True})
-        
+                    logging.error("❌ Error in %s fallback: %s", scraper.name, e)
+                    continue
+                if self._has_metadata(result, jav_code):
+                    logging.debug("✅ %s fallback successful with meaningful data", scraper.name)
+                    found = [(scraper.name, result)]
+                    break
+                logging.warning("⚠️ %s fallback had no meaningful content for %s", scraper.name, jav_code)
+
+            # Do not settle for a placeholder when a site only asked to come back later
+            if not found and retry_hints:
+                raise RetryLater(jav_code, max(delay for delay, _ in retry_hints),
+                                 sorted({reason for _, reason in retry_hints}))
+
+            # If every fallback site failed too, try the basic fallback
+            if not found:
+                logging.debug("🔍 Trying basic fallback for %s", jav_code)
+                try:
+                    fallback_result = await self.scrape_fallback(jav_code)
+                except Exception as e:
+                    logging.error("❌ Error in basic fallback: %s", e)
+                    fallback_result = None
+                if fallback_result:
+                    logging.debug("✅ Basic fallback successful")
+                    found = [('fallback', fallback_result)]
+                else:
+                    logging.warning("⚠️ Basic fallback failed for %s", jav_code)
+                    # Create basic result as last resort
+                    found = [('basic', {
+                        'title': f"{jav_code} - JAV Content",
+                        'cover_url': None,
+                        'details': {'Actor': 'Unknown', 'Studio': 'Unknown'},
+                        'source': 'basic'
+                    })]
 
-        
         # Combine results
         combined_data = {
             'jav_code': jav_code,
@@ -743,26 +1341,30 @@ class JAVScraperEngine:
             'detailed_metadata': {}  # Add detailed metadata section
         }
         
-        for i, result in enumerate(results):
-            if isinstance(result, dict) and result:
-                site_name = enabled_sites[i]['name']
-                combined_data['sources'][site_name] = result
-                
-                # Use the first available title and cover
-                if not combined_data['best_title'] and result.get('title'):
-                    combined_data['best_title'] = result['title']
-                if not combined_data['best_cover'] and result.get('cover_url'):
-                    combined_data['best_cover'] = result['cover_url']
-                    
-                # Merge details
-                combined_data['all_details'].update(result.get('details', {}))
-                
-                # Include detailed metadata if available
-                if result.get('detailed_metadata'):
-                    combined_data['detailed_metadata'] = result['detailed_metadata']
+        for site_name, result in found:
+            combined_data['sources'][site_name] = result
+
+            # Use the first available title and cover
+            if not combined_data['best_title'] and result.get('title'):
+                combined_data['best_title'] = result['title']
+            if not combined_data['best_cover'] and result.get('cover_url'):
+                combined_data['best_cover'] = result['cover_url']
+
+            # Merge details
+            combined_data['all_details'].update(result.get('details', {}))
+
+            # Include detailed metadata if available
+            if result.get('detailed_metadata'):
+                combined_data['detailed_metadata'] = result['detailed_metadata']
         
         # Enhance metadata with actress portraits
-        combined_data = await self.enhance_actress_metadata(combined_data)
+        if enrich:
+            combined_data = await self.enhance_actress_metadata(combined_data)
+
+        logging.info("🔍 %s: sources=%s title=%r actress=%s portrait=%s",
+                     jav_code, ','.join(combined_data['sources']) or 'none', combined_data['best_title'],
+                     combined_data['detailed_metadata'].get('actress') or 'N/A',
+                     bool(combined_data['detailed_metadata'].get('thumb_url')))
         
         return combined_data
         
@@ -948,12 +1550,13 @@ class JAVScraperEngine:
         
         # Write NFO file
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
+            with self.metrics.time_stage('nfo_write'), open(output_path, 'w', encoding='utf-8') as f:
                 f.write(nfo_content)
-            logging.info(f"✅ NFO file created: {output_path}")
+            self.metrics.add_bytes('nfo_write', '', len(nfo_content.encode('utf-8')))
+            logging.debug("✅ NFO file created: %s", output_path)
             return True
         except Exception as e:
-            logging.error(f"❌ Error creating NFO file {output_path}: {e}")
+            logging.error("❌ Error creating NFO file %s: %s", output_path, e)
             return False
     
 
@@ -961,8 +1564,8 @@ class JAVScraperEngine:
     async def download_image(self, url: str, save_path: str):
         """Download image from URL using Playwright to bypass 403 errors and get the actual image file."""
         try:
-            logging.info(f"🖼️ Starting image download with Playwright: {url}")
-            logging.info(f"💾 Save path: {save_path}")
+            logging.debug("🖼️ Starting image download with Playwright: %s", url)
+            logging.debug("💾 Save path: %s", save_path)
 
             # The referer should be the detail page where the image is shown
             # Try to guess the referer from the image URL if not provided
@@ -978,46 +1581,66 @@ class JAVScraperEngine:
             else:
                 referer = "https://jav.guru/"
 
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
-                context = await browser.new_context()
+            if self.fetch_backend == 'http':
+                return await self._download_image_http(url, save_path, referer)
+
+            await self._throttle(url)
+            site = urllib.parse.urlparse(url).hostname or ''
+            browser = await self._get_browser()
+            context = await browser.new_context()
+            try:
                 page = await context.new_page()
 
                 # Set headers to look like a real browser
-                await page.set_extra_http_headers({
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                    'Accept': 'image/avif,image/webp,image/apng,image/svg+xml,image/*,*/*;q=0.8',
-                    'Accept-Language': 'en-US,en;q=0.9',
-                    'Referer': referer,
-                    'Connection': 'keep-alive',
-                })
-
-                logging.info(f"🌐 Navigating to image URL: {url}")
-                response = await page.goto(url, wait_until='networkidle', timeout=30000)
+                await page.set_extra_http_headers({**DEFAULT_HEADERS, 'Accept': IMAGE_ACCEPT, 'Referer': referer})
+
+                logging.debug("🌐 Navigating to image URL: %s", url)
+                with self.metrics.time_stage('image_download', site):
+                    response = await page.goto(self._site_url(url), wait_until='networkidle', timeout=30000)
+                    image_bytes = await response.body() if response and response.status == 200 else None
                 if response and response.status == 200:
-                    image_bytes = await response.body()
                     if image_bytes and len(image_bytes) > 1000:
                         with open(save_path, 'wb') as f:
                             f.write(image_bytes)
-                        logging.info(f"✅ Successfully downloaded actual image: {save_path} ({len(image_bytes)} bytes)")
-                        await browser.close()
+                        logging.debug("✅ Successfully downloaded actual image: %s (%s bytes)", save_path, len(image_bytes))
+                        self.metrics.add_bytes('image_download', site, len(image_bytes))
                         return True
                     else:
-                        logging.error(f"❌ Image data is empty or too small")
-                        await browser.close()
+                        logging.error("❌ Image data is empty or too small")
                         return False
                 else:
-                    logging.error(f"❌ Failed to download image: HTTP {response.status if response else 'no response'}")
-                    await browser.close()
+                    self.metrics.record_error('image_download', site, f"http_{response.status}" if response else 'no_response')
+                    logging.error("❌ Failed to download image: HTTP %s", response.status if response else 'no response')
                     return False
+            finally:
+                await context.close()
         except Exception as e:
-            logging.error(f"❌ Error downloading image with Playwright: {e}")
+            logging.error("❌ Error downloading image with Playwright: %s", e)
             return False
             
+    async def _download_image_http(self, url: str, save_path: str, referer: str) -> bool:
+        """Download an image with the aiohttp session (``fetch_backend: http``)."""
+        headers = {'Accept': IMAGE_ACCEPT, 'Referer': referer}
+        await self._throttle(url)
+        async with self._request('GET', url, headers=headers, trace_request_ctx={'stage': 'image_download'}) as response:
+            if response.status != 200:
+                logging.error("❌ Failed to download image: HTTP %s", response.status)
+                return False
+            image_bytes = await response.read()
+        if len(image_bytes) <= 1000:
+            logging.error("❌ Image data is empty or too small")
+            return False
+        with open(save_path, 'wb') as f:
+            f.write(image_bytes)
+        logging.debug("✅ Successfully downloaded image: %s (%s bytes)", save_path, len(image_bytes))
+        return True
+
     def create_poster_from_fanart(self, fanart_path: str, poster_path: str):
         """Create poster.jpg by cropping the right 47.125% of fanart.jpg."""
         try:
-            with Image.open(fanart_path) as img:
+            from PIL import Image
+
+            with self.metrics.time_stage('image_encode'), Image.open(fanart_path) as img:
                 width, height = img.size
                 
                 # Calculate the crop area (right 47.125%)
@@ -1029,22 +1652,22 @@ class JAVScraperEngine:
                 
                 # Save as poster
                 cropped_img.save(poster_path, 'JPEG', quality=95)
-                logging.info(f"Created poster from fanart: {poster_path}")
+                logging.debug("Created poster from fanart: %s", poster_path)
                 return True
         except Exception as e:
-            logging.error(f"Error creating poster from fanart: {e}")
+            logging.error("Error creating poster from fanart: %s", e)
             return False
             
     async def process_folder(self, folder_path: str) -> List[Dict]:
         """Process all files in a folder and scrape metadata."""
         # Scan for JAV files
         files = self.scan_folder(folder_path)
-        logging.info(f"Found {len(files)} JAV files in {folder_path}")
+        logging.debug("Found %s JAV files in %s", len(files), folder_path)
         
         results = []
         for file_info in files:
             jav_code = file_info['jav_code']
-            logging.info(f"Processing {jav_code}")
+            logging.debug("Processing %s", jav_code)
             
             # Scrape metadata
             metadata = await self.scrape_all_sites(jav_code)
@@ -1055,7 +1678,7 @@ class JAVScraperEngine:
             
             # Note: File creation (NFO, fanart, poster) is handled in app.py
             # This method only scrapes metadata and enhances it with actress portraits
-            logging.info(f"✅ Metadata processing completed for {jav_code}")
+            logging.debug("✅ Metadata processing completed for %s", jav_code)
             
             # Save metadata JSON in the original folder for reference
             original_folder = Path(file_info['folder'])
@@ -1077,60 +1700,63 @@ class JAVScraperEngine:
         """
         try:
             if not actress_name or actress_name.strip() == "":
-                logging.info(f"⚠️ No actress name provided for portrait search")
+                logging.debug("⚠️ No actress name provided for portrait search")
                 return None
             
             # Clean actress name for search
             clean_name = actress_name.strip()
-            logging.info(f"🎭 ==== ACTRESS PORTRAIT SEARCH START ====")
-            logging.info(f"🎭 Actress name: {clean_name}")
-            logging.info(f"🎭 Search strategy: javtiful.com → javmost.com → javdatabase.com")
+            logging.debug("🎭 ==== ACTRESS PORTRAIT SEARCH START ====")
+            logging.debug("🎭 Actress name: %s", clean_name)
+            logging.debug("🎭 Search strategy: javtiful.com → javmost.com → javdatabase.com")
             
             # Try javtiful.com first
-            logging.info(f"🎭 ==== TRYING JAVTIFUL.COM ====")
-            portrait_url = await self._search_javtiful_portrait(clean_name)
+            logging.debug("🎭 ==== TRYING JAVTIFUL.COM ====")
+            with self.metrics.time_stage('portrait_search', 'javtiful.com'):
+                portrait_url = await self._search_javtiful_portrait(clean_name)
             if portrait_url:
-                logging.info(f"✅ Found portrait on javtiful.com: {portrait_url}")
-                logging.info(f"🎭 Portrait search completed successfully")
+                logging.debug("✅ Found portrait on javtiful.com: %s", portrait_url)
+                logging.debug("🎭 Portrait search completed successfully")
                 return portrait_url
             else:
-                logging.warning(f"⚠️ No portrait found on javtiful.com")
+                logging.warning("⚠️ No portrait found on javtiful.com")
             
             # Try javmost.com as fallback
-            logging.info(f"🎭 ==== TRYING JAVMOST.COM ====")
-            portrait_url = await self._search_javmost_portrait(clean_name)
+            logging.debug("🎭 ==== TRYING JAVMOST.COM ====")
+            with self.metrics.time_stage('portrait_search', 'javmost.com'):
+                portrait_url = await self._search_javmost_portrait(clean_name)
             if portrait_url:
-                logging.info(f"✅ Found portrait on javmost.com: {portrait_url}")
-                logging.info(f"🎭 Portrait search completed successfully")
+                logging.debug("✅ Found portrait on javmost.com: %s", portrait_url)
+                logging.debug("🎭 Portrait search completed successfully")
                 return portrait_url
             else:
-                logging.warning(f"⚠️ No portrait found on javmost.com")
+                logging.warning("⚠️ No portrait found on javmost.com")
             
             # Try javdatabase.com as final fallback
-            logging.info(f"🎭 ==== TRYING JAVDATABASE.COM (FINAL FALLBACK) ====")
-            portrait_url = await self._search_javdatabase_portrait(clean_name)
+            logging.debug("🎭 ==== TRYING JAVDATABASE.COM (FINAL FALLBACK) ====")
+            with self.metrics.time_stage('portrait_search', 'javdatabase.com'):
+                portrait_url = await self._search_javdatabase_portrait(clean_name)
             if portrait_url:
-                logging.info(f"✅ Found portrait on javdatabase.com: {portrait_url}")
-                logging.info(f"🎭 Portrait search completed successfully")
+                logging.debug("✅ Found portrait on javdatabase.com: %s", portrait_url)
+                logging.debug("🎭 Portrait search completed successfully")
                 return portrait_url
             else:
-                logging.warning(f"⚠️ No portrait found on javdatabase.com")
+                logging.warning("⚠️ No portrait found on javdatabase.com")
             
-            logging.warning(f"⚠️ ==== PORTRAIT SEARCH FAILED ====")
-            logging.warning(f"⚠️ No actress portrait found for {clean_name} on any source")
-            logging.warning(f"⚠️ Tried: javtiful.com, javmost.com, javdatabase.com")
+            logging.warning("⚠️ ==== PORTRAIT SEARCH FAILED ====")
+            logging.warning("⚠️ No actress portrait found for %s on any source", clean_name)
+            logging.warning("⚠️ Tried: javtiful.com, javmost.com, javdatabase.com")
             return None
                 
         except Exception as e:
-            logging.error(f"❌ ==== PORTRAIT SEARCH ERROR ====")
-            logging.error(f"❌ Error searching for actress portrait {actress_name}: {e}")
-            logging.error(f"❌ Exception type: {type(e).__name__}")
+            logging.error("❌ ==== PORTRAIT SEARCH ERROR ====")
+            logging.error("❌ Error searching for actress portrait %s: %s", actress_name, e)
+            logging.error("❌ Exception type: %s", type(e).__name__)
             return None
     
     async def _search_javtiful_portrait(self, clean_name: str) -> Optional[str]:
         """Search for actress portrait on javtiful.com."""
         try:
-            logging.info(f"🔍 Searching javtiful.com for: {clean_name}")
+            logging.debug("🔍 Searching javtiful.com for: %s", clean_name)
             
             # Construct search URL for javtiful.com
             search_url = f"https://javtiful.com/actresses?q={clean_name.replace(' ', '+')}"
@@ -1138,10 +1764,10 @@ class JAVScraperEngine:
             # Fetch search results using Playwright
             html = await self.fetch_html_with_playwright(search_url)
             if not html:
-                logging.warning(f"❌ Failed to fetch javtiful search results for {clean_name}")
+                logging.warning("❌ Failed to fetch javtiful search results for %s", clean_name)
                 return None
             
-            soup = BeautifulSoup(html, 'html.parser')
+            soup = self._soup(html)
             
             # Look for actress profile links in search results
             actress_links = []
@@ -1153,14 +1779,14 @@ class JAVScraperEngine:
                 
                 # Check if this looks like an actress profile link
                 if ('/actress/' in href or '/actresses/' in href) and clean_name.lower() in text.lower():
-                    logging.info(f"🎯 Found potential actress link: {href} ({text})")
+                    logging.debug("🎯 Found potential actress link: %s (%s)", href, text)
                     
                     # Fetch the actress profile page to get the portrait
                     profile_url = href if href.startswith('http') else f"https://javtiful.com{href}"
                     profile_html = await self.fetch_html_with_playwright(profile_url)
                     
                     if profile_html:
-                        profile_soup = BeautifulSoup(profile_html, 'html.parser')
+                        profile_soup = self._soup(profile_html)
                         
                         # Look for portrait image in the profile page
                         portrait_img = profile_soup.find('img', {
@@ -1176,7 +1802,7 @@ class JAVScraperEngine:
                             if '?' in portrait_url:
                                 portrait_url = portrait_url.split('?')[0]
                             
-                            logging.info(f"🖼️ Found javtiful portrait: {portrait_url}")
+                            logging.debug("🖼️ Found javtiful portrait: %s", portrait_url)
                             return portrait_url
             
             # Pattern 2: Look for any image that might be a portrait
@@ -1195,36 +1821,29 @@ class JAVScraperEngine:
                     elif src.startswith('/'):
                         src = 'https://javtiful.com' + src
                     
-                    logging.info(f"🖼️ Found javtiful actress image: {src} ({alt})")
+                    logging.debug("🖼️ Found javtiful actress image: %s (%s)", src, alt)
                     return src
             
-            logging.warning(f"⚠️ No javtiful portrait found for {clean_name}")
+            logging.warning("⚠️ No javtiful portrait found for %s", clean_name)
             return None
                 
         except Exception as e:
-            logging.error(f"❌ Error searching javtiful for {clean_name}: {e}")
+            logging.error("❌ Error searching javtiful for %s: %s", clean_name, e)
             return None
     
     async def _search_javmost_portrait(self, clean_name: str) -> Optional[str]:
         """Search for actress portrait on javmost.com."""
         try:
-            logging.info(f"🔍 Searching javmost.com for: {clean_name}")
-            
-            # Ensure session is available
-            if not hasattr(self, 'session') or self.session is None:
-                self.session = aiohttp.ClientSession()
+            logging.debug("🔍 Searching javmost.com for: %s", clean_name)
             
             # Construct search URL for javmost.com
             search_url = f"https://www5.javmost.com/star/{clean_name.replace(' ', '+')}/"
             
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            
-            async with self.session.get(search_url, headers=headers) as response:
+            await self._throttle(search_url)
+            async with self._request('GET', search_url) as response:
                 if response.status == 200:
                     html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
+                    soup = self._soup(html)
                     
                     # Look for actress profile links in search results
                     for link in soup.find_all('a', href=True):
@@ -1233,14 +1852,14 @@ class JAVScraperEngine:
                         
                         # Check if this looks like an actress profile link
                         if '/star/' in href and clean_name.lower() in text.lower():
-                            logging.info(f"🎯 Found potential javmost actress link: {href} ({text})")
+                            logging.debug("🎯 Found potential javmost actress link: %s (%s)", href, text)
                             
                             # Fetch the actress profile page to get the portrait
                             profile_url = href if href.startswith('http') else f"https://www5.javmost.com{href}"
-                            profile_html = await self._fetch_profile_page(profile_url, headers)
+                            profile_html = await self._fetch_profile_page(profile_url)
                             
                             if profile_html:
-                                profile_soup = BeautifulSoup(profile_html, 'html.parser')
+                                profile_soup = self._soup(profile_html)
                                 
                                 # Look for portrait image in the profile page
                                 portrait_img = profile_soup.find('img', {
@@ -1256,7 +1875,7 @@ class JAVScraperEngine:
                                     if '?' in portrait_url:
                                         portrait_url = portrait_url.split('?')[0]
                                     
-                                    logging.info(f"🖼️ Found javmost portrait: {portrait_url}")
+                                    logging.debug("🖼️ Found javmost portrait: %s", portrait_url)
                                     return portrait_url
                                 else:
                                     # If no specific portrait found, look for any image
@@ -1270,56 +1889,46 @@ class JAVScraperEngine:
                                             if '?' in src:
                                                 src = src.split('?')[0]
                                             
-                                            logging.info(f"🖼️ Found javmost image: {src}")
+                                            logging.debug("🖼️ Found javmost image: %s", src)
                                             return src
                 else:
-                    logging.warning(f"❌ Failed to fetch javmost search results for {clean_name}: {response.status}")
+                    logging.warning("❌ Failed to fetch javmost search results for %s: %s", clean_name, response.status)
             
-            logging.warning(f"⚠️ No javmost portrait found for {clean_name}")
+            logging.warning("⚠️ No javmost portrait found for %s", clean_name)
             return None
                 
         except Exception as e:
-            logging.error(f"❌ Error searching javmost for {clean_name}: {e}")
+            logging.error("❌ Error searching javmost for %s: %s", clean_name, e)
             return None
     
     async def _search_javdatabase_portrait(self, clean_name: str) -> Optional[str]:
         """Search for actress portrait on javdatabase.com as final fallback."""
         try:
-            logging.info(f"🔍 ==== JAVDATABASE PORTRAIT SEARCH ====")
-            logging.info(f"🔍 Actress name: {clean_name}")
+            logging.debug("🔍 ==== JAVDATABASE PORTRAIT SEARCH ====")
+            logging.debug("🔍 Actress name: %s", clean_name)
             
             # Convert actress name to URL slug format
             # Example: "Kana Yume" -> "kana-yume"
             actress_slug = clean_name.lower().replace(' ', '-')
-            logging.info(f"🔍 Actress slug: {actress_slug}")
+            logging.debug("🔍 Actress slug: %s", actress_slug)
             
             # Construct direct portrait URL using the known pattern
             portrait_url = f"https://www.javdatabase.com/idolimages/thumb/{actress_slug}.webp"
-            logging.info(f"🔍 Direct portrait URL: {portrait_url}")
+            logging.debug("🔍 Direct portrait URL: %s", portrait_url)
             
             # Check if the portrait exists by making a HEAD request
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Accept': 'image/webp,image/*,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Accept-Encoding': 'gzip, deflate',
-                'Connection': 'keep-alive',
-            }
-            
-            # Ensure session is available
-            if not hasattr(self, 'session') or self.session is None:
-                self.session = aiohttp.ClientSession()
-                logging.info(f"🔍 Created new aiohttp session for JAV Database check")
+            headers = {'Accept': IMAGE_ACCEPT}
             
-            logging.info(f"📡 Checking if portrait exists...")
-            async with self.session.head(portrait_url, headers=headers) as response:
-                logging.info(f"📊 Response status: {response.status}")
+            logging.debug("📡 Checking if portrait exists...")
+            await self._throttle(portrait_url)
+            async with self._request('HEAD', portrait_url, headers=headers) as response:
+                logging.debug("📊 Response status: %s", response.status)
                 
                 if response.status == 200:
-                    logging.info(f"✅ Portrait found at: {portrait_url}")
+                    logging.debug("✅ Portrait found at: %s", portrait_url)
                     return portrait_url
                 else:
-                    logging.warning(f"⚠️ Portrait not found at: {portrait_url}")
+                    logging.warning("⚠️ Portrait not found at: %s", portrait_url)
                     
                     # Try alternative slug formats if the first one doesn't work
                     alternative_slugs = [
@@ -1330,33 +1939,35 @@ class JAVScraperEngine:
                     
                     for alt_slug in alternative_slugs:
                         alt_portrait_url = f"https://www.javdatabase.com/idolimages/thumb/{alt_slug}.webp"
-                        logging.info(f"🔍 Trying alternative URL: {alt_portrait_url}")
+                        logging.debug("🔍 Trying alternative URL: %s", alt_portrait_url)
                         
-                        async with self.session.head(alt_portrait_url, headers=headers) as alt_response:
+                        await self._throttle(alt_portrait_url)
+                        async with self._request('HEAD', alt_portrait_url, headers=headers) as alt_response:
                             if alt_response.status == 200:
-                                logging.info(f"✅ Portrait found at alternative URL: {alt_portrait_url}")
+                                logging.debug("✅ Portrait found at alternative URL: %s", alt_portrait_url)
                                 return alt_portrait_url
                     
-                    logging.warning(f"⚠️ No portrait found for {clean_name} with any slug format")
+                    logging.warning("⚠️ No portrait found for %s with any slug format", clean_name)
                     return None
                 
         except Exception as e:
-            logging.error(f"❌ ==== JAVDATABASE SEARCH ERROR ====")
-            logging.error(f"❌ Error searching JAV Database for {clean_name}: {e}")
-            logging.error(f"❌ Exception type: {type(e).__name__}")
+            logging.error("❌ ==== JAVDATABASE SEARCH ERROR ====")
+            logging.error("❌ Error searching JAV Database for %s: %s", clean_name, e)
+            logging.error("❌ Exception type: %s", type(e).__name__)
             return None
     
-    async def _fetch_profile_page(self, url: str, headers: dict) -> Optional[str]:
+    async def _fetch_profile_page(self, url: str) -> Optional[str]:
         """Fetch actress profile page."""
         try:
-            async with self.session.get(url, headers=headers) as response:
+            await self._throttle(url)
+            async with self._request('GET', url) as response:
                 if response.status == 200:
                     return await response.text()
                 else:
-                    logging.warning(f"❌ Failed to fetch profile page: {response.status}")
+                    logging.warning("❌ Failed to fetch profile page: %s", response.status)
                     return None
         except Exception as e:
-            logging.error(f"❌ Error fetching profile page: {e}")
+            logging.error("❌ Error fetching profile page: %s", e)
             return None
 
     async def enhance_actress_metadata(self, metadata: Dict) -> Dict:
@@ -1381,8 +1992,8 @@ class JAVScraperEngine:
                 actress_source = 'all_details.Actress'
             
             if not actress_name:
-                logging.info(f"ℹ️ No actress name found in metadata, skipping portrait search")
-                logging.info(f"ℹ️ Metadata source: {metadata.get('source', 'unknown')}")
+                logging.debug("ℹ️ No actress name found in metadata, skipping portrait search")
+                logging.debug("ℹ️ Metadata source: %s", metadata.get('source', 'unknown'))
                 return metadata
             
             # Clean the actress name to remove Japanese characters
@@ -1390,15 +2001,15 @@ class JAVScraperEngine:
             actress_name = self.clean_actress_name(actress_name)
             
             if not actress_name:
-                logging.warning(f"⚠️ Actress name cleaned to empty: {original_actress_name}")
+                logging.warning("⚠️ Actress name cleaned to empty: %s", original_actress_name)
                 return metadata
             
-            logging.info(f"🎭 ==== ACTRESS PORTRAIT SEARCH START ====")
-            logging.info(f"🎭 Original actress name: {original_actress_name}")
-            logging.info(f"🎭 Cleaned actress name: {actress_name}")
-            logging.info(f"🎭 Actress source: {actress_source}")
-            logging.info(f"🎭 Metadata source: {metadata.get('source', 'unknown')}")
-            logging.info(f"🎭 Enhancing metadata for actress: {actress_name}")
+            logging.debug("🎭 ==== ACTRESS PORTRAIT SEARCH START ====")
+            logging.debug("🎭 Original actress name: %s", original_actress_name)
+            logging.debug("🎭 Cleaned actress name: %s", actress_name)
+            logging.debug("🎭 Actress source: %s", actress_source)
+            logging.debug("🎭 Metadata source: %s", metadata.get('source', 'unknown'))
+            logging.debug("🎭 Enhancing metadata for actress: %s", actress_name)
             
             # Search for actress portrait
             portrait_url = await self.search_actress_portrait(actress_name)
@@ -1409,49 +2020,36 @@ class JAVScraperEngine:
                     metadata['detailed_metadata'] = {}
                 
                 metadata['detailed_metadata']['thumb_url'] = portrait_url
-                logging.info(f"✅ Added actress portrait URL: {portrait_url}")
+                logging.debug("✅ Added actress portrait URL: %s", portrait_url)
                 
                 # Also add to all_details for compatibility
                 if 'all_details' not in metadata:
                     metadata['all_details'] = {}
                 metadata['all_details']['Actress Portrait'] = portrait_url
             else:
-                logging.info(f"ℹ️ No portrait found for {actress_name}")
+                logging.debug("ℹ️ No portrait found for %s", actress_name)
             
             return metadata
             
         except Exception as e:
-            logging.error(f"❌ Error enhancing actress metadata: {e}")
+            logging.error("❌ Error enhancing actress metadata: %s", e)
             return metadata 
 
     async def search_google_for_title(self, jav_code: str) -> Optional[str]:
         """Search Google for the actual title of the JAV."""
         try:
-            logging.info(f"🔍 Searching Google for title of {jav_code}")
+            logging.debug("🔍 Searching Google for title of %s", jav_code)
             
             # Search query
             search_query = f"{jav_code} title"
             encoded_query = urllib.parse.quote(search_query)
             url = f"https://www.google.com/search?q={encoded_query}"
             
-            # Headers to avoid blocking
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Accept-Encoding': 'gzip, deflate',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1',
-            }
-            
-            # Ensure session is initialized
-            if not hasattr(self, 'session') or self.session is None:
-                self.session = aiohttp.ClientSession()
-            
-            async with self.session.get(url, headers=headers) as response:
+            await self._throttle(url)
+            async with self._request('GET', url) as response:
                 if response.status == 200:
                     html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
+                    soup = self._soup(html)
                     
                     # Look for search results that might contain the actual title
                     # Google search results are typically in h3 tags
@@ -1468,29 +2066,26 @@ class JAVScraperEngine:
                                 potential_title = re.sub(r'^[-_\s]+', '', potential_title)
                                 potential_title = re.sub(r'[-_\s]+$', '', potential_title)
                                 if potential_title:
-                                    logging.info(f"✅ Found potential title: {potential_title}")
+                                    logging.debug("✅ Found potential title: %s", potential_title)
                                     return potential_title
                     
-                    logging.warning(f"⚠️ No suitable title found for {jav_code}")
+                    logging.warning("⚠️ No suitable title found for %s", jav_code)
                     return None
                 else:
-                    logging.warning(f"⚠️ Google search failed with status {response.status}")
+                    logging.warning("⚠️ Google search failed with status %s", response.status)
                     return None
                     
         except Exception as e:
-            logging.error(f"❌ Error searching Google for {jav_code}: {e}")
+            logging.error("❌ Error searching Google for %s: %s", jav_code, e)
             return None
 
     async def download_and_convert_webp_to_jpg(self, webp_url: str, output_path: str) -> bool:
         """Download webp image and convert to jpg."""
         try:
-            logging.info(f"📥 Downloading webp image: {webp_url}")
+            logging.debug("📥 Downloading webp image: %s", webp_url)
             
-            # Ensure session is initialized
-            if not hasattr(self, 'session') or self.session is None:
-                self.session = aiohttp.ClientSession()
-            
-            async with self.session.get(webp_url) as response:
+            await self._throttle(webp_url)
+            async with self._request('GET', webp_url, trace_request_ctx={'stage': 'image_download'}) as response:
                 if response.status == 200:
                     # Download the webp image
                     webp_data = await response.read()
@@ -1501,8 +2096,10 @@ class JAVScraperEngine:
                         temp_webp_path = temp_webp.name
                     
                     try:
+                        from PIL import Image
+
                         # Open and convert to jpg
-                        with Image.open(temp_webp_path) as img:
+                        with self.metrics.time_stage('image_encode'), Image.open(temp_webp_path) as img:
                             # Convert to RGB if necessary
                             if img.mode in ('RGBA', 'LA', 'P'):
                                 img = img.convert('RGB')
@@ -1510,7 +2107,7 @@ class JAVScraperEngine:
                             # Save as jpg
                             img.save(output_path, 'JPEG', quality=95)
                         
-                        logging.info(f"✅ Successfully converted webp to jpg: {output_path}")
+                        logging.debug("✅ Successfully converted webp to jpg: %s", output_path)
                         return True
                         
                     finally:
@@ -1518,107 +2115,91 @@ class JAVScraperEngine:
                         if os.path.exists(temp_webp_path):
                             os.unlink(temp_webp_path)
                 else:
-                    logging.error(f"❌ Failed to download webp image: {response.status}")
+                    logging.error("❌ Failed to download webp image: %s", response.status)
                     return False
                     
         except Exception as e:
-            logging.error(f"❌ Error converting webp to jpg: {e}")
+            logging.error("❌ Error converting webp to jpg: %s", e)
             return False
 
     async def scrape_javmost(self, jav_code: str) -> Optional[Dict]:
         """Scrape metadata from JAVmost."""
         try:
-            logging.info(f"🌐 ==== JAVMOST SCRAPING START ====")
-            logging.info(f"🌐 JAV Code: {jav_code}")
+            logging.debug("🌐 ==== JAVMOST SCRAPING START ====")
+            logging.debug("🌐 JAV Code: %s", jav_code)
             url = f"https://www5.javmost.com/search/{jav_code}/"
-            logging.info(f"🌐 Search URL: {url}")
+            logging.debug("🌐 Search URL: %s", url)
             
-            # Ensure session is initialized
-            if not hasattr(self, 'session') or self.session is None:
-                import aiohttp
-                self.session = aiohttp.ClientSession()
-                logging.info(f"🌐 Created new aiohttp session")
-            
-            # Add headers to avoid blocking
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Accept-Encoding': 'gzip, deflate',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1',
-            }
-            logging.info(f"🌐 Using headers: {list(headers.keys())}")
-            
-            logging.info(f"📡 Requesting URL: {url}")
-            async with self.session.get(url, headers=headers) as response:
-                logging.info(f"📊 Response status: {response.status}")
-                logging.info(f"📊 Response headers: {dict(response.headers)}")
+            logging.debug("📡 Requesting URL: %s", url)
+            await self._throttle(url)
+            async with self._request('GET', url) as response:
+                logging.debug("📊 Response status: %s", response.status)
+                logging.debug("📊 Response headers: %s", response.headers)
                 
                 if response.status == 200:
                     html = await response.text()
-                    logging.info(f"📄 Received HTML length: {len(html)} characters")
+                    logging.debug("📄 Received HTML length: %s characters", len(html))
                     
                     # Check if HTML contains the JAV code
                     if jav_code in html:
-                        logging.info(f"✅ HTML contains JAV code: {jav_code}")
+                        logging.debug("✅ HTML contains JAV code: %s", jav_code)
                     else:
-                        logging.warning(f"⚠️ HTML does not contain JAV code: {jav_code}")
+                        logging.warning("⚠️ HTML does not contain JAV code: %s", jav_code)
                     
-                    soup = BeautifulSoup(html, 'html.parser')
-                    logging.info(f"🔍 Parsed HTML with BeautifulSoup")
+                    soup = self._soup(html)
+                    logging.debug("🔍 Parsed HTML with BeautifulSoup")
                     
                     # Look for search results - JAVmost has specific structure
-                    logging.info(f"🔍 ==== SEARCHING FOR RESULTS ====")
+                    logging.debug("🔍 ==== SEARCHING FOR RESULTS ====")
                     # Find cards that contain the JAV code
                     results = soup.find_all('div', class_='card')
-                    logging.info(f"🔍 Found {len(results)} divs with class 'card'")
+                    logging.debug("🔍 Found %s divs with class 'card'", len(results))
                     
                     if not results:
-                        logging.info(f"🔍 No 'card' divs found, trying 'result' class")
+                        logging.debug("🔍 No 'card' divs found, trying 'result' class")
                         # Try alternative selectors
                         results = soup.find_all('div', class_=lambda x: x and 'result' in x.lower())
-                        logging.info(f"🔍 Found {len(results)} divs with 'result' in class")
+                        logging.debug("🔍 Found %s divs with 'result' in class", len(results))
                     
                     if not results:
-                        logging.info(f"🔍 No 'result' divs found, searching for JAV code in text")
+                        logging.debug("🔍 No 'result' divs found, searching for JAV code in text")
                         # Try finding any div that contains the JAV code
                         results = soup.find_all('div', string=lambda text: text and jav_code in text)
-                        logging.info(f"🔍 Found {len(results)} divs containing JAV code in text")
+                        logging.debug("🔍 Found %s divs containing JAV code in text", len(results))
                     
                     if not results:
-                        logging.info(f"🔍 No specific results found, using entire page")
+                        logging.debug("🔍 No specific results found, using entire page")
                         # Last resort: look for any content containing the JAV code
                         results = [soup]  # Use the entire page if no specific results found
-                        logging.info(f"🔍 Using entire page as result")
+                        logging.debug("🔍 Using entire page as result")
                     
                     if results:
-                        logging.info(f"✅ Found {len(results)} results for {jav_code}")
+                        logging.debug("✅ Found %s results for %s", len(results), jav_code)
                         
                         # Find the result that matches the exact JAV code
                         exact_match = None
-                        logging.info(f"🔍 ==== SEARCHING FOR EXACT MATCH ====")
+                        logging.debug("🔍 ==== SEARCHING FOR EXACT MATCH ====")
                         for i, result in enumerate(results):
-                            logging.info(f"🔍 Checking result {i+1}/{len(results)}")
+                            logging.debug("🔍 Checking result %s/%s", i+1, len(results))
                             # Check if this result contains the exact JAV code
                             result_text = result.get_text()
                             if jav_code in result_text:
-                                logging.info(f"✅ Result {i+1} contains JAV code")
+                                logging.debug("✅ Result %s contains JAV code", i+1)
                                 # Check if it's the exact match (not a variant)
                                 title_elem = result.find('h1', class_='card-title')
                                 if title_elem:
                                     title_text = title_elem.get_text().strip()
-                                    logging.info(f"🔍 Found title: '{title_text}'")
+                                    logging.debug("🔍 Found title: '%s'", title_text)
                                     if title_text == jav_code:
                                         exact_match = result
-                                        logging.info(f"✅ Found exact match in result {i+1}")
+                                        logging.debug("✅ Found exact match in result %s", i+1)
                                         break
                                     else:
-                                        logging.info(f"⚠️ Title doesn't match JAV code: '{title_text}' != '{jav_code}'")
+                                        logging.debug("⚠️ Title doesn't match JAV code: '%s' != '%s'", title_text, jav_code)
                                 else:
-                                    logging.info(f"⚠️ No title element found in result {i+1}")
+                                    logging.debug("⚠️ No title element found in result %s", i+1)
                             else:
-                                logging.info(f"⚠️ Result {i+1} doesn't contain JAV code")
+                                logging.debug("⚠️ Result %s doesn't contain JAV code", i+1)
                         
                         # Use exact match if found, otherwise use first result
                         first_result = exact_match if exact_match else results[0]
@@ -1637,11 +2218,11 @@ class JAVScraperEngine:
                         
                         # If title is same as JAV code, try to get better title from Google
                         if title == jav_code:
-                            logging.info(f"🔍 Title is same as JAV code, searching Google for better title")
+                            logging.debug("🔍 Title is same as JAV code, searching Google for better title")
                             google_title = await self.search_google_for_title(jav_code)
                             if google_title:
                                 title = f"{jav_code} - {google_title}"
-                                logging.info(f"✅ Enhanced title: {title}")
+                                logging.debug("✅ Enhanced title: %s", title)
                         
                         # Extract metadata from the result
                         metadata = {
@@ -1677,8 +2258,8 @@ class JAVScraperEngine:
                                         original_actress_text = actress_link.get_text().strip()
                                         # Clean the actress name to remove Japanese characters
                                         actress_text = self.clean_actress_name(original_actress_text)
-                                        logging.info(f"🎭 JAVmost original actress: {original_actress_text}")
-                                        logging.info(f"🎭 JAVmost cleaned actress: {actress_text}")
+                                        logging.debug("🎭 JAVmost original actress: %s", original_actress_text)
+                                        logging.debug("🎭 JAVmost cleaned actress: %s", actress_text)
                         
                         metadata['actress'] = actress_text
                         
@@ -1793,13 +2374,14 @@ class JAVScraperEngine:
                             
                             # Only proceed if this is the exact JAV code detail page
                             if jav_code in detail_url and jav_code == detail_url.split('/')[-2]:
-                                logging.info(f"🔗 Detail URL: {detail_url}")
+                                logging.debug("🔗 Detail URL: %s", detail_url)
                             
                             # Scrape detail page for more information
-                            async with self.session.get(detail_url, headers=headers) as detail_response:
+                            await self._throttle(detail_url)
+                            async with self._request('GET', detail_url) as detail_response:
                                 if detail_response.status == 200:
                                     detail_html = await detail_response.text()
-                                    detail_soup = BeautifulSoup(detail_html, 'html.parser')
+                                    detail_soup = self._soup(detail_html)
                                     
                                     # Extract plot/synopsis
                                     plot_elem = detail_soup.find('div', class_=lambda x: x and 'plot' in x.lower()) or \
@@ -1840,260 +2422,296 @@ class JAVScraperEngine:
                             'source': 'javmost'
                         }
                         
-                        logging.info(f"✅ JAVmost scrape completed for {jav_code}")
+                        logging.debug("✅ JAVmost scrape completed for %s", jav_code)
                         return result
                     else:
-                        logging.warning(f"⚠️ No results found on JAVmost for {jav_code}")
+                        logging.warning("⚠️ No results found on JAVmost for %s", jav_code)
                         return None
                 else:
-                    logging.warning(f"⚠️ JAVmost returned status {response.status} for {jav_code}")
+                    logging.warning("⚠️ JAVmost returned status %s for %s", response.status, jav_code)
                     return None
 
         except Exception as e:
-            logging.error(f"❌ Error in JAVmost scraper for {jav_code}: {e}")
+            logging.error("❌ Error in JAVmost scraper for %s: %s", jav_code, e)
             return None
 
     async def scrape_javtrailers(self, jav_code: str) -> Optional[Dict]:
         """Scrape metadata from JavTrailers.com."""
         try:
-            logging.info(f"🎬 ==== JAVTRAILERS SCRAPING START ====")
-            logging.info(f"🎬 JAV Code: {jav_code}")
-            
+            logging.debug("🎬 ==== JAVTRAILERS SCRAPING START ====")
+            logging.debug("🎬 JAV Code: %s", jav_code)
+
+            result = await self._fetch_detail_direct('javtrailers', jav_code, self._parse_javtrailers_detail)
+            if result:
+                logging.debug("✅ JavTrailers scrape completed for %s (direct detail page)", jav_code)
+                return result
+
             # Step 1: Search for the JAV code
             search_url = f"https://javtrailers.com/search/{jav_code}"
-            logging.info(f"🔍 Search URL: {search_url}")
+            logging.debug("🔍 Search URL: %s", search_url)
             
             search_html = await self.fetch_html_with_playwright(search_url)
             if not search_html:
-                logging.warning(f"⚠️ Failed to fetch search page for {jav_code}")
+                logging.warning("⚠️ Failed to fetch search page for %s", jav_code)
                 return None
             
-            search_soup = BeautifulSoup(search_html, 'html.parser')
-            
-            # Look for the first video result that matches our JAV code
-            video_links = search_soup.find_all('a', href=True)
-            detail_url = None
-            
-            for link in video_links:
-                href = link.get('href', '')
-                # Look for video links that contain the JAV code
-                if '/video/' in href:
-                    # Check if this link contains our JAV code
-                    link_text = link.get_text(strip=True)
-                    if jav_code.lower() in link_text.lower():
-                        detail_url = href if href.startswith('http') else f"https://javtrailers.com{href}"
-                        logging.info(f"🎯 Found detail URL: {detail_url}")
-                        logging.info(f"🎯 Link text: {link_text}")
-                        break
-            
-            # If not found by text, try to find by URL pattern
-            if not detail_url:
-                for link in video_links:
-                    href = link.get('href', '')
-                    if '/video/' in href and jav_code.lower() in href.lower():
-                        detail_url = href if href.startswith('http') else f"https://javtrailers.com{href}"
-                        logging.info(f"🎯 Found detail URL by URL pattern: {detail_url}")
-                        break
-            
+            detail_url = self._find_javtrailers_detail_url(search_html, jav_code)
             if not detail_url:
-                logging.warning(f"⚠️ No detail page found for {jav_code}")
+                logging.warning("⚠️ No detail page found for %s", jav_code)
                 return None
             
             # Step 2: Fetch the detail page
-            logging.info(f"📄 Fetching detail page: {detail_url}")
+            logging.debug("📄 Fetching detail page: %s", detail_url)
             detail_html = await self.fetch_html_with_playwright(detail_url)
             
             if not detail_html:
-                logging.warning(f"⚠️ Failed to fetch detail page for {jav_code}")
+                logging.warning("⚠️ Failed to fetch detail page for %s", jav_code)
                 return None
             
-            detail_soup = BeautifulSoup(detail_html, 'html.parser')
-            
-            # Extract metadata from detail page
-            metadata = {}
-            
-            # Extract title
-            title_tag = detail_soup.find('h1')
-            if title_tag:
-                title = title_tag.get_text(strip=True)
-                metadata['title'] = title
-                logging.info(f"📋 Title: {title}")
-            else:
-                # Fallback: use JAV code as title
-                title = f"{jav_code} - JAV Content"
-                metadata['title'] = title
-                logging.info(f"📋 Title (fallback): {title}")
-            
-            # Extract DVD ID and Content ID
-            dvd_id = jav_code
-            content_id = None
-            
-            # Look for content ID in the page - try multiple patterns
-            content_patterns = [
-                r'Content ID:\s*([^\s<]+)',
-                r'DVD ID:\s*([^\s<]+)',
-                r'ID:\s*([^\s<]+)'
-            ]
-            for pattern in content_patterns:
-                content_match = re.search(pattern, detail_html)
-                if content_match:
-                    content_id = content_match.group(1)
-                    logging.info(f"📋 Content ID: {content_id}")
-                    break
+            result = self._parse_javtrailers_detail(detail_html, jav_code, detail_url)
+            if self._has_metadata(result, jav_code):
+                self._learn_detail_url('javtrailers', jav_code, detail_url)
+
+            logging.debug("✅ JavTrailers scrape completed for %s", jav_code)
+            return result
             
-            # Extract release date - try multiple patterns
-            release_date = None
-            date_patterns = [
-                r'Release Date:\s*(\d+\s+\w+\s+\d+)',
-                r'(\d+\s+\w+\s+\d+)\s*$',  # Date at end of line
-                r'(\d{1,2}\s+\w+\s+\d{4})'  # General date pattern
-            ]
-            for pattern in date_patterns:
-                date_match = re.search(pattern, detail_html)
-                if date_match:
-                    release_date = date_match.group(1)
-                    logging.info(f"📋 Release Date: {release_date}")
+        except Exception as e:
+            logging.error("❌ Error scraping JavTrailers for %s: %s", jav_code, e)
+            return None
+
+    def _find_javtrailers_detail_url(self, search_html: str, jav_code: str) -> Optional[str]:
+        """
+        Find the detail page of ``jav_code`` on a JavTrailers search page.
+
+        Args:
+            search_html (str): Search page HTML
+            jav_code (str): JAV code searched for
+
+        Returns:
+            Optional[str]: Absolute detail page URL
+        """
+        search_soup = self._soup(search_html)
+
+        # Look for the first video result that matches our JAV code
+        video_links = search_soup.find_all('a', href=True)
+        detail_url = None
+
+        for link in video_links:
+            href = link.get('href', '')
+            # Look for video links that contain the JAV code
+            if '/video/' in href:
+                # Check if this link contains our JAV code
+                link_text = link.get_text(strip=True)
+                if jav_code.lower() in link_text.lower():
+                    detail_url = href if href.startswith('http') else f"https://javtrailers.com{href}"
+                    logging.debug("🎯 Found detail URL: %s", detail_url)
+                    logging.debug("🎯 Link text: %s", link_text)
                     break
-            
-            # Extract duration - try multiple patterns
-            duration = None
-            duration_patterns = [
-                r'Duration:\s*(\d+)\s*mins',
-                r'(\d+)\s*mins',
-                r'(\d+):(\d+)'  # HH:MM format
-            ]
-            for pattern in duration_patterns:
-                duration_match = re.search(pattern, detail_html)
-                if duration_match:
-                    if ':' in pattern:
-                        hours, minutes = duration_match.groups()
-                        duration = str(int(hours) * 60 + int(minutes))
-                    else:
-                        duration = duration_match.group(1)
-                    logging.info(f"📋 Duration: {duration} mins")
+
+        # If not found by text, try to find by URL pattern
+        if not detail_url:
+            for link in video_links:
+                href = link.get('href', '')
+                if '/video/' in href and jav_code.lower() in href.lower():
+                    detail_url = href if href.startswith('http') else f"https://javtrailers.com{href}"
+                    logging.debug("🎯 Found detail URL by URL pattern: %s", detail_url)
                     break
-            
-            # Extract studio using BeautifulSoup
-            studio = None
-            studio_span = detail_soup.find('span', string=lambda text: text and 'Studio:' in text)
-            if studio_span:
-                studio_link = studio_span.find_next('a')
-                if studio_link:
-                    studio = studio_link.get_text(strip=True)
-                    logging.info(f"📋 Studio: {studio}")
-            
-            # Extract categories using BeautifulSoup
-            categories = []
-            categories_span = detail_soup.find('span', string=lambda text: text and 'Categories:' in text)
-            if categories_span:
-                category_links = categories_span.find_next_siblings('a')
-                for link in category_links:
-                    category_text = link.get_text(strip=True)
-                    if category_text:
-                        categories.append(category_text)
-                logging.info(f"📋 Categories: {categories}")
-            
-            # Extract cast using BeautifulSoup
-            cast = []
-            cast_span = detail_soup.find('span', string=lambda text: text and 'Cast(s):' in text)
-            if cast_span:
-                cast_link = cast_span.find_next('a')
-                if cast_link:
-                    cast_text = cast_link.get_text(strip=True)
-                    # Clean up the cast text using the new cleaning function
-                    cleaned_cast_text = self.clean_actress_name(cast_text)
-                    if cleaned_cast_text:
-                        cast = [cleaned_cast_text]
-                        logging.info(f"📋 Original cast text: {cast_text}")
-                        logging.info(f"📋 Cleaned cast: {cleaned_cast_text}")
-                    else:
-                        logging.warning(f"⚠️ Cast text cleaned to empty: {cast_text}")
-            
-            # Extract series using BeautifulSoup
-            series = None
-            series_span = detail_soup.find('span', string=lambda text: text and 'Series:' in text)
-            if series_span:
-                series_link = series_span.find_next('a')
-                if series_link:
-                    series = series_link.get_text(strip=True)
-                    logging.info(f"📋 Series: {series}")
-            
-            # Extract images from JavTrailers
-            fanart_url = None
-            poster_url = None
-            
-            # Look for image URLs in the page
-            img_tags = detail_soup.find_all('img')
-            for img in img_tags:
-                src = img.get('src', '')
-                data_src = img.get('data-src', '')
-                img_url = data_src if data_src else src
-                
-                if img_url and 'pics.dmm.co.jp' in img_url:
-                    # This is likely a cover/poster image
-                    if not poster_url:
-                        poster_url = img_url
-                        logging.info(f"📋 Poster URL: {poster_url}")
-                    elif not fanart_url:
-                        fanart_url = img_url
-                        logging.info(f"📋 Fanart URL: {fanart_url}")
-            
-            # If we found a poster but no fanart, use poster as fanart too
-            if poster_url and not fanart_url:
-                fanart_url = poster_url
-                logging.info(f"📋 Using poster as fanart: {fanart_url}")
-            
-            # Create detailed metadata structure
-            detailed_metadata = {
-                'dvd_id': dvd_id,
-                'content_id': content_id,
-                'release_date': release_date,
-                'duration': duration,
-                'studio': studio,
-                'categories': categories,
-                'cast': cast,
-                'series': series,
-                'source': 'javtrailers'
-            }
-            
-            # Add image URLs to detailed metadata
-            if poster_url:
-                detailed_metadata['poster_url'] = poster_url
-            if fanart_url:
-                detailed_metadata['fanart_url'] = fanart_url
-            
-            # Extract actress information
-            if cast:
-                # Look for female performers (typically Japanese names)
-                actresses = []
-                for person in cast:
-                    # Use the new cleaning function for consistent actress name cleaning
-                    clean_name = self.clean_actress_name(person)
-                    if clean_name:
-                        actresses.append(clean_name)
-                        logging.info(f"🎭 Original actress: {person}")
-                        logging.info(f"🎭 Cleaned actress: {clean_name}")
-                    else:
-                        logging.warning(f"⚠️ Actress name cleaned to empty: {person}")
-                
-                if actresses:
-                    detailed_metadata['actress'] = ', '.join(actresses)
-                    logging.info(f"🎭 Final actresses list: {actresses}")
+
+        return detail_url
+
+    def _parse_javtrailers_detail(self, detail_html: str, jav_code: str, detail_url: str) -> Dict:
+        """
+        Extract metadata from a JavTrailers detail page.
+
+        Args:
+            detail_html (str): Detail page HTML
+            jav_code (str): JAV code of the page
+            detail_url (str): URL the page was fetched from
+
+        Returns:
+            Dict: Scraper result with title, cover_url, detail_url and detailed_metadata
+        """
+        detail_soup = self._soup(detail_html)
+
+        # Extract metadata from detail page
+        metadata = {}
+
+        # Extract title
+        title_tag = detail_soup.find('h1')
+        if title_tag:
+            title = title_tag.get_text(strip=True)
+            metadata['title'] = title
+            logging.debug("📋 Title: %s", title)
+        else:
+            # Fallback: use JAV code as title
+            title = f"{jav_code} - JAV Content"
+            metadata['title'] = title
+            logging.debug("📋 Title (fallback): %s", title)
+
+        # Extract DVD ID and Content ID
+        dvd_id = jav_code
+        content_id = None
+
+        # Look for content ID in the page - try multiple patterns
+        content_patterns = [
+            r'Content ID:\s*([^\s<]+)',
+            r'DVD ID:\s*([^\s<]+)',
+            r'ID:\s*([^\s<]+)'
+        ]
+        for pattern in content_patterns:
+            content_match = re.search(pattern, detail_html)
+            if content_match:
+                content_id = content_match.group(1)
+                logging.debug("📋 Content ID: %s", content_id)
+                break
+
+        # Extract release date - try multiple patterns
+        release_date = None
+        date_patterns = [
+            r'Release Date:\s*(\d+\s+\w+\s+\d+)',
+            r'(\d+\s+\w+\s+\d+)\s*$',  # Date at end of line
+            r'(\d{1,2}\s+\w+\s+\d{4})'  # General date pattern
+        ]
+        for pattern in date_patterns:
+            date_match = re.search(pattern, detail_html)
+            if date_match:
+                release_date = date_match.group(1)
+                logging.debug("📋 Release Date: %s", release_date)
+                break
+
+        # Extract duration - try multiple patterns
+        duration = None
+        duration_patterns = [
+            r'Duration:\s*(\d+)\s*mins',
+            r'(\d+)\s*mins',
+            r'(\d+):(\d+)'  # HH:MM format
+        ]
+        for pattern in duration_patterns:
+            duration_match = re.search(pattern, detail_html)
+            if duration_match:
+                if ':' in pattern:
+                    hours, minutes = duration_match.groups()
+                    duration = str(int(hours) * 60 + int(minutes))
                 else:
-                    logging.warning(f"⚠️ No valid actresses found after cleaning")
-            
-            # Create result structure
-            result = {
-                'title': metadata.get('title', f"{jav_code} - JAV Content"),
-                'cover_url': poster_url,  # Use poster URL as cover URL
-                'detail_url': detail_url,
-                'detailed_metadata': detailed_metadata,
-                'source': 'javtrailers'
-            }
-            
-            logging.info(f"✅ JavTrailers scrape completed for {jav_code}")
-            return result
-            
-        except Exception as e:
-            logging.error(f"❌ Error scraping JavTrailers for {jav_code}: {e}")
-            return None
\ No newline at end of file
+                    duration = duration_match.group(1)
+                logging.debug("📋 Duration: %s mins", duration)
+                break
+
+        # Extract studio using BeautifulSoup
+        studio = None
+        studio_span = detail_soup.find('span', string=lambda text: text and 'Studio:' in text)
+        if studio_span:
+            studio_link = studio_span.find_next('a')
+            if studio_link:
+                studio = studio_link.get_text(strip=True)
+                logging.debug("📋 Studio: %s", studio)
+
+        # Extract categories using BeautifulSoup
+        categories = []
+        categories_span = detail_soup.find('span', string=lambda text: text and 'Categories:' in text)
+        if categories_span:
+            category_links = categories_span.find_next_siblings('a')
+            for link in category_links:
+                category_text = link.get_text(strip=True)
+                if category_text:
+                    categories.append(category_text)
+            logging.debug("📋 Categories: %s", categories)
+
+        # Extract cast using BeautifulSoup
+        cast = []
+        cast_span = detail_soup.find('span', string=lambda text: text and 'Cast(s):' in text)
+        if cast_span:
+            cast_link = cast_span.find_next('a')
+            if cast_link:
+                cast_text = cast_link.get_text(strip=True)
+                # Clean up the cast text using the new cleaning function
+                cleaned_cast_text = self.clean_actress_name(cast_text)
+                if cleaned_cast_text:
+                    cast = [cleaned_cast_text]
+                    logging.debug("📋 Original cast text: %s", cast_text)
+                    logging.debug("📋 Cleaned cast: %s", cleaned_cast_text)
+                else:
+                    logging.warning("⚠️ Cast text cleaned to empty: %s", cast_text)
+
+        # Extract series using BeautifulSoup
+        series = None
+        series_span = detail_soup.find('span', string=lambda text: text and 'Series:' in text)
+        if series_span:
+            series_link = series_span.find_next('a')
+            if series_link:
+                series = series_link.get_text(strip=True)
+                logging.debug("📋 Series: %s", series)
+
+        # Extract images from JavTrailers
+        fanart_url = None
+        poster_url = None
+
+        # Look for image URLs in the page
+        img_tags = detail_soup.find_all('img')
+        for img in img_tags:
+            src = img.get('src', '')
+            data_src = img.get('data-src', '')
+            img_url = data_src if data_src else src
+
+            if img_url and 'pics.dmm.co.jp' in img_url:
+                # This is likely a cover/poster image
+                if not poster_url:
+                    poster_url = img_url
+                    logging.debug("📋 Poster URL: %s", poster_url)
+                elif not fanart_url:
+                    fanart_url = img_url
+                    logging.debug("📋 Fanart URL: %s", fanart_url)
+
+        # If we found a poster but no fanart, use poster as fanart too
+        if poster_url and not fanart_url:
+            fanart_url = poster_url
+            logging.debug("📋 Using poster as fanart: %s", fanart_url)
+
+        # Create detailed metadata structure
+        detailed_metadata = {
+            'dvd_id': dvd_id,
+            'content_id': content_id,
+            'release_date': release_date,
+            'duration': duration,
+            'studio': studio,
+            'categories': categories,
+            'cast': cast,
+            'series': series,
+            'source': 'javtrailers'
+        }
+
+        # Add image URLs to detailed metadata
+        if poster_url:
+            detailed_metadata['poster_url'] = poster_url
+        if fanart_url:
+            detailed_metadata['fanart_url'] = fanart_url
+
+        # Extract actress information
+        if cast:
+            # Look for female performers (typically Japanese names)
+            actresses = []
+            for person in cast:
+                # Use the new cleaning function for consistent actress name cleaning
+                clean_name = self.clean_actress_name(person)
+                if clean_name:
+                    actresses.append(clean_name)
+                    logging.debug("🎭 Original actress: %s", person)
+                    logging.debug("🎭 Cleaned actress: %s", clean_name)
+                else:
+                    logging.warning("⚠️ Actress name cleaned to empty: %s", person)
+
+            if actresses:
+                detailed_metadata['actress'] = ', '.join(actresses)
+                logging.debug("🎭 Final actresses list: %s", actresses)
+            else:
+                logging.warning("⚠️ No valid actresses found after cleaning")
+
+        # Create result structure
+        result = {
+            'title': metadata.get('title', f"{jav_code} - JAV Content"),
+            'cover_url': poster_url,  # Use poster URL as cover URL
+            'detail_url': detail_url,
+            'detailed_metadata': detailed_metadata,
+            'source': 'javtrailers'
+        }
+        return result
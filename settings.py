@@ -0,0 +1,190 @@
+"""
+Settings
+========
+
+Process-wide, typed access to config.yml.
+
+``get_settings(path)`` parses the file once and keeps the result per path.
+Later calls only ``stat`` the file and parse it again when its modification
+time changed, so engines created per request or per job share one parsed
+configuration and edits to config.yml still take effect without a restart.
+
+``Settings.data`` is the plain dictionary the rest of the code passes around
+(``engine.config``); it is shared between all users and must be treated as
+read-only.
+"""
+
+import logging
+import os
+import threading
+from typing import Dict, List, Optional
+
+import yaml
+
+from logging_setup import parse_size
+
+DEFAULT_VIDEO_EXTENSIONS = ['.mp4', '.avi', '.mkv']
+
+DEFAULT_PIPELINE_OPTIONS = {
+    'prefetch': 8,
+    'queue_size': 4,
+    'fetch': 2,
+    'enrich': 2,
+    'images': 2,
+    'organize': 1,
+}
+
+DEFAULT_HTTP_OPTIONS = {
+    'limit': 100,
+    'limit_per_host': 8,
+    'keepalive_seconds': 30,
+    'dns_cache_seconds': 300,
+}
+
+_cache: Dict[str, 'Settings'] = {}
+_cache_lock = threading.Lock()
+
+
+class Settings:
+    """
+    Parsed configuration with typed accessors for the commonly used keys.
+    """
+
+    def __init__(self, data: Optional[Dict] = None, path: Optional[str] = None, mtime_ns: Optional[int] = None):
+        """
+        Initialize the settings.
+
+        Args:
+            data (Dict, optional): Parsed configuration
+            path (str, optional): File the configuration was read from
+            mtime_ns (int, optional): Modification time of that file when it was read
+        """
+        self.data = data or {}
+        self.path = path
+        self.mtime_ns = mtime_ns
+
+    def section(self, name: str) -> Dict:
+        """Return a top-level section, or an empty dict when it is missing or empty."""
+        return self.data.get(name) or {}
+
+    @property
+    def scraper(self) -> Dict:
+        return self.section('scraper')
+
+    @property
+    def logging(self) -> Dict:
+        return self.section('logging')
+
+    @property
+    def timeout(self) -> float:
+        """Total timeout of one HTTP request in seconds."""
+        return float(self.scraper.get('timeout', 30))
+
+    @property
+    def workers(self) -> int:
+        """Scrape worker processes per job."""
+        return int(self.scraper.get('workers', 1) or 1)
+
+    @property
+    def fetch_backend(self) -> str:
+        """``playwright`` or ``http``."""
+        return self.scraper.get('fetch_backend', 'playwright')
+
+    @property
+    def site_overrides(self) -> Dict[str, str]:
+        """Hostname to replacement base URL."""
+        return self.scraper.get('site_overrides') or {}
+
+    @property
+    def video_extensions(self) -> List[str]:
+        return self.scraper.get('video_extensions', DEFAULT_VIDEO_EXTENSIONS)
+
+    @property
+    def enabled_sites(self) -> List[Dict]:
+        """Configured sites that are not disabled."""
+        return [site for site in self.scraper.get('sites', []) if site.get('enabled', True)]
+
+    @property
+    def organize_mode(self) -> str:
+        """How videos are put into the library: ``move``, ``hardlink``, ``reflink`` or ``copy``."""
+        return self.scraper.get('organize_mode', 'move')
+
+    @property
+    def copy_chunk_size(self) -> int:
+        """Bytes per chunk when a video has to be copied."""
+        return parse_size(self.scraper.get('copy_chunk_size', '64MB'), default=64 * 1024 ** 2)
+
+    @property
+    def organize_batch_size(self) -> int:
+        """Most scraped codes whose moves are planned and run together."""
+        return max(1, int(self.scraper.get('organize_batch_size', 100) or 100))
+
+    @property
+    def http(self) -> Dict:
+        """Connection pool options of the aiohttp session (``scraper.http``)."""
+        return {**DEFAULT_HTTP_OPTIONS, **(self.scraper.get('http') or {})}
+
+    @property
+    def pipeline(self) -> Dict:
+        """Prefetch window, queue size and per-stage concurrency of the job pipeline (``scraper.pipeline``)."""
+        options = {**DEFAULT_PIPELINE_OPTIONS, **(self.scraper.get('pipeline') or {})}
+        # A prefetch window of 0 handles one code at a time
+        return {name: max(0 if name == 'prefetch' else 1, int(value)) for name, value in options.items()}
+
+    @property
+    def distributed_enabled(self) -> bool:
+        """Whether jobs hand their codes to scraper nodes through the shared queue."""
+        return bool(self.section('distributed').get('enabled', False))
+
+
+def _mtime_ns(path: str) -> Optional[int]:
+    """Modification time of ``path``, or None when it does not exist."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def load_settings(path: str = "config.yml") -> Settings:
+    """
+    Read and parse a configuration file without using the cache.
+
+    Args:
+        path (str): Path to the configuration file
+
+    Returns:
+        Settings: Parsed settings; empty when the file does not exist
+    """
+    mtime_ns = _mtime_ns(path)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = yaml.safe_load(f)
+    except FileNotFoundError:
+        logging.error("Config file %s not found", path)
+        data = {}
+    return Settings(data, path=path, mtime_ns=mtime_ns)
+
+
+def get_settings(path: str = "config.yml") -> Settings:
+    """
+    Return the shared settings for ``path``, reloading them when the file changed.
+
+    Args:
+        path (str): Path to the configuration file
+
+    Returns:
+        Settings: Settings shared by every caller using the same file
+    """
+    key = os.path.abspath(path)
+    mtime_ns = _mtime_ns(key)
+    cached = _cache.get(key)
+    if cached is not None and cached.mtime_ns == mtime_ns:
+        return cached
+
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is None or cached.mtime_ns != mtime_ns:
+            if cached is not None:
+                logging.info("🔄 Reloading %s", path)
+            cached = _cache[key] = load_settings(key)
+        return cached
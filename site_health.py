@@ -0,0 +1,363 @@
+"""
+Site Health
+===========
+
+Per-site circuit breakers.
+
+When a site is down or answers every request with a challenge, waiting for
+each request to time out costs tens of seconds per file. A breaker tracks the
+outcome of the recent requests to its host:
+
+- ``closed``: requests go through. Once at least ``min_requests`` of the last
+  ``window`` requests are known and ``failure_rate`` of them failed, the
+  breaker opens.
+- ``open``: requests fail immediately without touching the network, so the
+  scrapers move on to the next source. After ``open_seconds`` the breaker
+  becomes half-open.
+- ``half_open``: one trial request is let through. Success closes the
+  breaker; failure opens it again for twice as long (up to ``max_open_seconds``).
+
+Timeouts, connection errors, HTTP 403, 429 and 5xx count as failures; any
+other response, including 404, shows the site is answering.
+
+The registry also keeps a rolling window of response times per site and
+fetch kind (``http`` requests, ``browser`` page loads). Once a window has
+``min_samples`` entries, requests to the site use ``percentile`` x ``factor``
+of it as their timeout, clamped to ``floor`` and ``ceiling``
+(``scraper.adaptive_timeouts``): fast sites fail fast and slow sites stop
+holding a worker for the full default timeout. Timed-out requests are added
+to the window with the timeout they had, so a site that became slower raises
+its own timeout again instead of failing forever.
+
+A site that answers with a ``Retry-After`` header is held: no request is
+sent to it until that time has passed, whatever the state of its breaker.
+
+Breakers, holds and latency windows live per process and are shared by every engine
+in it, so they carry over between jobs, watch batches and web requests.
+Scrape worker processes keep their own.
+"""
+
+import collections
+import logging
+import math
+import threading
+import time
+import urllib.parse
+from typing import Dict, Optional, Tuple
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+FAILURE_STATUSES = frozenset({403, 429})
+
+
+def is_failure_status(status: int) -> bool:
+    """Whether an HTTP status means the site is not serving us."""
+    return status >= 500 or status in FAILURE_STATUSES
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request to a site whose breaker is open."""
+
+    def __init__(self, site: str, retry_in: float):
+        super().__init__(f"Circuit for {site} is open, retrying in {retry_in:.0f}s")
+        self.site = site
+        self.retry_in = retry_in
+
+
+class SiteHeldError(CircuitOpenError):
+    """Raised instead of sending a request to a site before its ``Retry-After`` has passed."""
+
+    def __init__(self, site: str, retry_in: float):
+        Exception.__init__(self, f"{site} asked to wait, retrying in {retry_in:.0f}s")
+        self.site = site
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open breaker for one site.
+    """
+
+    def __init__(self, site: str, window: int = 20, min_requests: int = 5, failure_rate: float = 0.5,
+                 open_seconds: float = 60.0, max_open_seconds: float = 900.0):
+        """
+        Initialize the breaker in the closed state.
+
+        Args:
+            site (str): Host name, used in logs and the status
+            window (int): Number of recent requests the failure rate is computed over
+            min_requests (int): Requests needed in the window before the breaker can open
+            failure_rate (float): Share of failed requests that opens the breaker
+            open_seconds (float): Seconds the breaker stays open the first time
+            max_open_seconds (float): Upper bound for the doubled open time after failed trials
+        """
+        self.site = site
+        self.min_requests = min_requests
+        self.failure_rate = failure_rate
+        self.open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+        self.state = CLOSED
+        self.outcomes = collections.deque(maxlen=window)
+        self.opened_at = 0.0
+        self.current_open_seconds = open_seconds
+        self.trial_in_flight = False
+        self.trial_started = 0.0
+        self.rejected = 0
+        self.times_opened = 0
+        self._lock = threading.Lock()
+
+    def _open(self, now: float, reason: str):
+        self.state = OPEN
+        self.opened_at = now
+        self.trial_in_flight = False
+        self.times_opened += 1
+        logging.warning("🔌 Circuit for %s opened (%s), skipping it for %.0fs",
+                        self.site, reason, self.current_open_seconds)
+
+    def allow(self, now: Optional[float] = None) -> bool:
+        """
+        Check whether a request may be sent now.
+
+        Returns:
+            bool: False while the breaker is open or a half-open trial is running
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if self.state == OPEN and now - self.opened_at >= self.current_open_seconds:
+                self.state = HALF_OPEN
+                logging.info("🔌 Circuit for %s half-open, sending a trial request", self.site)
+            # A trial whose outcome never arrived (e.g. a cancelled request) does not block forever
+            if self.state == HALF_OPEN and (not self.trial_in_flight
+                                            or now - self.trial_started >= self.current_open_seconds):
+                self.trial_in_flight = True
+                self.trial_started = now
+                return True
+            if self.state == CLOSED:
+                return True
+            self.rejected += 1
+            return False
+
+    def retry_in(self, now: Optional[float] = None) -> float:
+        """Seconds until an open breaker lets a trial request through."""
+        now = time.monotonic() if now is None else now
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self.opened_at + self.current_open_seconds - now)
+
+    def record_success(self):
+        """Record a request the site answered."""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                logging.info("🔌 Circuit for %s closed, the site is answering again", self.site)
+                self.state = CLOSED
+                self.outcomes.clear()
+                self.trial_in_flight = False
+                self.current_open_seconds = self.open_seconds
+            self.outcomes.append(True)
+
+    def record_failure(self, now: Optional[float] = None):
+        """Record a request that timed out, could not connect or was refused."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self.current_open_seconds = min(self.current_open_seconds * 2, self.max_open_seconds)
+                self._open(now, "trial request failed")
+                return
+            self.outcomes.append(False)
+            failures = self.outcomes.count(False)
+            if (self.state == CLOSED and len(self.outcomes) >= self.min_requests
+                    and failures >= self.failure_rate * len(self.outcomes)):
+                self._open(now, f"{failures} of the last {len(self.outcomes)} requests failed")
+
+    def snapshot(self) -> Dict:
+        """State for the job status."""
+        with self._lock:
+            return {
+                'state': self.state,
+                'failures': self.outcomes.count(False),
+                'requests': len(self.outcomes),
+                'retry_in': round(self.retry_in(), 1),
+                'rejected': self.rejected,
+                'times_opened': self.times_opened,
+            }
+
+
+class LatencyWindow:
+    """
+    The most recent response times of one site.
+    """
+
+    def __init__(self, size: int = 200):
+        self.samples = collections.deque(maxlen=size)
+
+    def add(self, seconds: float):
+        self.samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """Nearest-rank percentile of the window, or None when it is empty."""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        rank = max(0, min(len(ordered) - 1, math.ceil(percent / 100 * len(ordered)) - 1))
+        return ordered[rank]
+
+
+DEFAULT_TIMEOUT_OPTIONS = {
+    'enabled': True,
+    'percentile': 99,
+    'factor': 3.0,
+    'floor': 5.0,
+    'ceiling': None,
+    'min_samples': 20,
+    'window': 200,
+}
+
+
+class SiteHealth:
+    """
+    One circuit breaker and one set of latency windows per host.
+    """
+
+    def __init__(self, enabled: bool = True, timeouts: Optional[Dict] = None, **breaker_options):
+        """
+        Initialize the registry.
+
+        Args:
+            enabled (bool): When False every request is allowed and no outcomes are tracked
+            timeouts (Dict, optional): Adaptive timeout options, see ``DEFAULT_TIMEOUT_OPTIONS``
+            **breaker_options: Passed to every ``CircuitBreaker``
+        """
+        self.enabled = enabled
+        self.breaker_options = breaker_options
+        self.timeouts = {**DEFAULT_TIMEOUT_OPTIONS, **(timeouts or {})}
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.latencies: Dict[Tuple[str, str], LatencyWindow] = {}
+        self.held_until: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, config: Dict):
+        """
+        Apply the ``scraper.circuit_breaker`` and ``scraper.adaptive_timeouts`` config sections.
+
+        Existing breakers and latency windows keep their state; new breaker options
+        apply to breakers created afterwards.
+
+        Args:
+            config (Dict): Full application configuration
+        """
+        scraper = (config or {}).get('scraper', {}) or {}
+        settings = dict(scraper.get('circuit_breaker', {}) or {})
+        self.enabled = bool(settings.pop('enabled', True))
+        self.breaker_options = settings
+        self.timeouts = {**DEFAULT_TIMEOUT_OPTIONS, **(scraper.get('adaptive_timeouts', {}) or {})}
+
+    def breaker(self, url_or_site: str) -> CircuitBreaker:
+        """Return the breaker of the host of ``url_or_site``, creating it on first use."""
+        site = self._site(url_or_site)
+        breaker = self.breakers.get(site)
+        if breaker is None:
+            with self._lock:
+                breaker = self.breakers.setdefault(site, CircuitBreaker(site, **self.breaker_options))
+        return breaker
+
+    def check(self, url_or_site: str):
+        """
+        Raise ``CircuitOpenError`` when requests to this site must not be sent now.
+
+        Raises:
+            SiteHeldError: If the site's ``Retry-After`` has not passed yet
+            CircuitOpenError: If the site's breaker is open
+        """
+        site = self._site(url_or_site)
+        remaining = self.held_until.get(site, 0.0) - time.monotonic()
+        if remaining > 0:
+            raise SiteHeldError(site, remaining)
+        if not self.enabled:
+            return
+        breaker = self.breaker(url_or_site)
+        if not breaker.allow():
+            raise CircuitOpenError(breaker.site, breaker.retry_in())
+
+    def record(self, url_or_site: str, ok: bool):
+        """Record the outcome of a request to a site."""
+        if not self.enabled:
+            return
+        breaker = self.breaker(url_or_site)
+        if ok:
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+
+    @staticmethod
+    def _site(url_or_site: str) -> str:
+        return urllib.parse.urlparse(url_or_site).hostname or url_or_site
+
+    def hold(self, url_or_site: str, seconds: float):
+        """Send no requests to a site for ``seconds``, e.g. from its ``Retry-After`` header."""
+        site = self._site(url_or_site)
+        until = time.monotonic() + seconds
+        with self._lock:
+            if until > self.held_until.get(site, 0.0):
+                self.held_until[site] = until
+        logging.info("⏳ %s asked to wait, holding its requests for %.0fs", site, seconds)
+
+    def observe(self, url_or_site: str, seconds: float, kind: str = 'http'):
+        """
+        Add a response time (or the timeout of a timed-out request) to the site's window.
+
+        Args:
+            url_or_site (str): URL or host name
+            seconds (float): Time until the response arrived
+            kind (str): ``http`` for plain requests, ``browser`` for page loads
+        """
+        key = (self._site(url_or_site), kind)
+        window = self.latencies.get(key)
+        if window is None:
+            with self._lock:
+                window = self.latencies.setdefault(key, LatencyWindow(int(self.timeouts['window'])))
+        window.add(seconds)
+
+    def timeout_for(self, url_or_site: str, default: float, kind: str = 'http') -> float:
+        """
+        Return the timeout for the next request to a site.
+
+        Args:
+            url_or_site (str): URL or host name
+            default (float): Timeout until enough samples are known; also the ceiling
+                when ``adaptive_timeouts.ceiling`` is not set
+            kind (str): ``http`` or ``browser``
+
+        Returns:
+            float: Timeout in seconds
+        """
+        options = self.timeouts
+        window = self.latencies.get((self._site(url_or_site), kind))
+        if not options['enabled'] or window is None or len(window) < options['min_samples']:
+            return default
+        ceiling = float(options['ceiling'] or default)
+        timeout = window.percentile(float(options['percentile'])) * float(options['factor'])
+        return max(float(options['floor']), min(ceiling, timeout))
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Breaker state and response times of every site that saw traffic, keyed by host."""
+        sites = {site: breaker.snapshot() for site, breaker in self.breakers.items()}
+        for (site, kind), window in list(self.latencies.items()):
+            sites.setdefault(site, {})[f'{kind}_latency'] = {
+                'samples': len(window),
+                'p50': round(window.percentile(50), 3),
+                'p99': round(window.percentile(99), 3),
+            }
+        now = time.monotonic()
+        for site, until in list(self.held_until.items()):
+            if until > now:
+                sites.setdefault(site, {})['held_for'] = round(until - now, 1)
+        return dict(sorted(sites.items()))
+
+
+# Breakers shared by every engine in this process
+SITE_HEALTH = SiteHealth()
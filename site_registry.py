@@ -0,0 +1,313 @@
+"""
+Site Registry
+=============
+
+The metadata sites the engine can scrape, and the order it tries them in.
+
+Every site is a ``SiteScraper`` subclass that declares how it fetches pages
+(``transport``: ``browser`` or ``http``), how long a lookup usually takes
+(``latency``) and which fields it provides. ``scraper.sites`` in the config
+picks the sites:
+
+- ``enabled: true`` sites are primary: they are all asked for every code, at
+  the same time
+- the other sites with ``fallback`` (on by default for JAVmost and JAV
+  Trailers) are asked one at a time, only when no primary site had metadata
+
+A site that is not built in is added with ``scraper: "module:Class"``, the
+import path of a ``SiteScraper`` subclass; any other keys of its entry are
+passed to the class as ``options``.
+
+Sites are ordered by their expected cost per hit: the average seconds of a
+lookup (the declared ``latency`` until lookups were seen), times
+``TRANSPORT_COST`` of the transport, divided by the share of lookups that
+found metadata. The history is kept in ``local_store.db``, so the cheapest
+site that usually has the code is asked first from the start of a run.
+
+History is also kept per code prefix (``SSIS`` of ``SSIS-123``), because
+labels differ a lot between sites. Once a prefix has some history it drives
+the order for its codes, with the share of the common fields the hits had
+(``completeness``) as a bonus. A site that never had any of at least
+``scraper.routing.min_lookups`` codes of a prefix is skipped for that prefix,
+apart from an ``explore`` share of codes that still ask it in case the site
+has added the label since.
+"""
+
+import importlib
+import logging
+import random
+import re
+from typing import Dict, List, Optional, Tuple, Type
+
+BROWSER = 'browser'
+HTTP = 'http'
+
+# A browser page costs far more CPU and memory than a plain request
+TRANSPORT_COST = {BROWSER: 3.0, HTTP: 1.0}
+
+DEFAULT_ROUTING = {
+    'enabled': True,
+    'min_lookups': 5,
+    'explore': 0.05,
+}
+
+
+def code_prefix(jav_code: str) -> str:
+    """Return the label of a code, e.g. ``SSIS`` of ``SSIS-123`` or ``FC2-PPV`` of ``FC2-PPV-1234567``."""
+    code = (jav_code or '').upper()
+    if '-' in code:
+        return code.rsplit('-', 1)[0]
+    match = re.match(r'[A-Z]+', code)
+    return match.group(0) if match else ''
+
+
+def completeness(result: Optional[Dict]) -> float:
+    """Share of the common fields (title, cover, actress, studio, release date, genres) a site result has."""
+    if not isinstance(result, dict):
+        return 0.0
+    details = result.get('details', {}) or {}
+    detailed = result.get('detailed_metadata', {}) or {}
+    values = [
+        result.get('title'),
+        result.get('cover_url') or result.get('fanart_url') or detailed.get('fanart_url'),
+        detailed.get('actress') or details.get('Actress') or details.get('Actor'),
+        detailed.get('studio') or details.get('Studio'),
+        detailed.get('release_date') or result.get('release_date') or result.get('date'),
+        detailed.get('genres') or detailed.get('tags') or result.get('tags'),
+    ]
+    return sum(1 for value in values if value) / len(values)
+
+
+class SiteScraper:
+    """
+    One metadata site; subclasses implement ``scrape``.
+    """
+
+    name = ''
+    transport = HTTP
+    latency = 5.0  # expected seconds per lookup
+    fields: Tuple[str, ...] = ()
+    fallback = False
+
+    def __init__(self, engine, options: Optional[Dict] = None):
+        """
+        Initialize the scraper.
+
+        Args:
+            engine (JAVScraperEngine): Engine whose fetch helpers and session the scraper uses
+            options (Dict, optional): The site's ``scraper.sites`` entry
+        """
+        self.engine = engine
+        self.options = options or {}
+        self.name = self.options.get('name') or self.name
+        self.fallback = bool(self.options.get('fallback', self.fallback))
+        self.latency = float(self.options.get('latency', self.latency))
+
+    async def scrape(self, jav_code: str) -> Optional[Dict]:
+        """
+        Look up ``jav_code`` on the site.
+
+        Returns:
+            Optional[Dict]: Site result with ``title``, ``cover_url``, ``details`` and
+            ``detailed_metadata`` where available, or None when the site has nothing
+        """
+        raise NotImplementedError
+
+
+class JavGuruScraper(SiteScraper):
+    name = 'javguru'
+    transport = BROWSER
+    latency = 8.0
+    fields = ('title', 'cover', 'fanart', 'actress', 'studio', 'genres', 'release_date', 'tags')
+
+    async def scrape(self, jav_code: str) -> Optional[Dict]:
+        return await self.engine.scrape_javguru(jav_code)
+
+
+class JavTrailersScraper(SiteScraper):
+    name = 'javtrailers'
+    transport = BROWSER
+    latency = 8.0
+    fields = ('title', 'cover', 'actress', 'studio', 'genres', 'release_date')
+    fallback = True
+
+    async def scrape(self, jav_code: str) -> Optional[Dict]:
+        return await self.engine.scrape_javtrailers(jav_code)
+
+
+class JavMostScraper(SiteScraper):
+    name = 'javmost'
+    transport = HTTP
+    latency = 2.0
+    fields = ('title', 'cover', 'actress', 'studio')
+    fallback = True
+
+    async def scrape(self, jav_code: str) -> Optional[Dict]:
+        return await self.engine.scrape_javmost(jav_code)
+
+
+# Built-in scrapers by site name
+SCRAPERS: Dict[str, Type[SiteScraper]] = {
+    cls.name: cls for cls in (JavGuruScraper, JavTrailersScraper, JavMostScraper)
+}
+
+
+def load_scraper_class(spec: str) -> Type[SiteScraper]:
+    """
+    Import a scraper class from a ``module:Class`` path.
+
+    Raises:
+        ValueError: If the path is malformed or does not name a ``SiteScraper`` subclass
+    """
+    module_name, _, class_name = spec.partition(':')
+    if not module_name or not class_name:
+        raise ValueError(f"Scraper must be given as module:Class, got {spec!r}")
+    cls = getattr(importlib.import_module(module_name), class_name, None)
+    if not (isinstance(cls, type) and issubclass(cls, SiteScraper)):
+        raise ValueError(f"{spec} is not a SiteScraper subclass")
+    return cls
+
+
+class SiteRegistry:
+    """
+    The configured sites, ordered by expected cost per hit.
+    """
+
+    def __init__(self, primary: List[SiteScraper], fallback: List[SiteScraper], routing: Optional[Dict] = None,
+                 rng: Optional[random.Random] = None):
+        """
+        Initialize the registry.
+
+        Args:
+            primary (List[SiteScraper]): Sites asked for every code
+            fallback (List[SiteScraper]): Sites asked when no primary site had metadata
+            routing (Dict, optional): ``enabled``, ``min_lookups`` and ``explore``, merged over
+                ``DEFAULT_ROUTING``
+            rng (random.Random, optional): Random source, for tests
+        """
+        self.primary = primary
+        self.fallback = fallback
+        self.routing = {**DEFAULT_ROUTING, **(routing or {})}
+        self.rng = rng or random.Random()
+        self.stats: Dict[str, Dict] = {}
+        self.stats_loaded = False
+        # Lookup history by code prefix, then site
+        self.prefixes: Dict[str, Dict[str, Dict]] = {}
+
+    @classmethod
+    def from_config(cls, engine, config: Dict) -> 'SiteRegistry':
+        """
+        Build the registry from ``scraper.sites``, adding the built-in fallback sites
+        that are not configured.
+
+        Raises:
+            ValueError: If a site's ``scraper`` cannot be loaded
+        """
+        scraper_config = (config or {}).get('scraper', {}) or {}
+        sites = scraper_config.get('sites', []) or []
+        primary, fallback, seen = [], [], set()
+        for site in sites:
+            name = site.get('name')
+            if site.get('scraper'):
+                scraper_cls = load_scraper_class(site['scraper'])
+            elif name in SCRAPERS:
+                scraper_cls = SCRAPERS[name]
+            else:
+                logging.debug("⚠️ No scraper for site %s, skipping it", name)
+                continue
+            scraper = scraper_cls(engine, site)
+            seen.add(scraper.name)
+            if site.get('enabled', True):
+                primary.append(scraper)
+            elif scraper.fallback:
+                fallback.append(scraper)
+        for name, scraper_cls in SCRAPERS.items():
+            if name not in seen and scraper_cls.fallback:
+                fallback.append(scraper_cls(engine))
+        return cls(primary, fallback, routing=scraper_config.get('routing'))
+
+    def load(self, stats: Dict[str, Dict]):
+        """Merge the lookup history of earlier runs (``LocalStore.source_stats``)."""
+        for name, row in stats.items():
+            current = self.stats.setdefault(name, {'hits': 0, 'misses': 0, 'seconds': 0.0})
+            for key in current:
+                current[key] += row.get(key, 0)
+        self.stats_loaded = True
+
+    def load_prefix(self, prefix: str, stats: Dict[str, Dict]):
+        """Set the lookup history of codes with ``prefix`` (``LocalStore.prefix_stats``)."""
+        self.prefixes[prefix] = {name: dict(row) for name, row in stats.items()}
+
+    def record(self, name: str, hit: bool, seconds: float, jav_code: Optional[str] = None,
+               completeness: float = 0.0):
+        """Count one lookup of site ``name``, also for the prefix of ``jav_code`` when given."""
+        stats = self.stats.setdefault(name, {'hits': 0, 'misses': 0, 'seconds': 0.0})
+        stats['hits' if hit else 'misses'] += 1
+        stats['seconds'] += seconds
+        if jav_code:
+            stats = self.prefixes.setdefault(code_prefix(jav_code), {}).setdefault(
+                name, {'hits': 0, 'misses': 0, 'seconds': 0.0, 'completeness': 0.0})
+            stats['hits' if hit else 'misses'] += 1
+            stats['seconds'] += seconds
+            if hit:
+                stats['completeness'] += completeness
+
+    def _prefix_stats(self, scraper: SiteScraper, jav_code: Optional[str]) -> Dict:
+        if not jav_code:
+            return {}
+        return self.prefixes.get(code_prefix(jav_code), {}).get(scraper.name, {})
+
+    def expected_cost(self, scraper: SiteScraper, jav_code: Optional[str] = None) -> float:
+        """Transport-weighted seconds spent per lookup that finds metadata, for ``jav_code`` when given."""
+        stats = self.stats.get(scraper.name, {})
+        lookups = stats.get('hits', 0) + stats.get('misses', 0)
+        seconds = stats['seconds'] / lookups if lookups else scraper.latency
+        # Unseen sites start at a hit rate of 1/2
+        hit_rate = (stats.get('hits', 0) + 1) / (lookups + 2)
+        quality = 1.0
+
+        prefix = self._prefix_stats(scraper, jav_code)
+        prefix_hits = prefix.get('hits', 0)
+        prefix_lookups = prefix_hits + prefix.get('misses', 0)
+        if prefix_lookups:
+            seconds = prefix['seconds'] / prefix_lookups
+            # The prefix's history outweighs the site's overall hit rate as it grows
+            hit_rate = (prefix_hits + 2 * hit_rate) / (prefix_lookups + 2)
+        if prefix_hits:
+            quality = 0.5 + prefix.get('completeness', 0.0) / prefix_hits / 2
+        return seconds * TRANSPORT_COST.get(scraper.transport, 1.0) / (hit_rate * quality)
+
+    def skipped(self, scraper: SiteScraper, jav_code: Optional[str]) -> bool:
+        """Whether the site never had a code of ``jav_code``'s prefix and is not asked for it."""
+        if not self.routing['enabled']:
+            return False
+        prefix = self._prefix_stats(scraper, jav_code)
+        if prefix.get('hits', 0) or prefix.get('misses', 0) < int(self.routing['min_lookups']):
+            return False
+        return self.rng.random() >= float(self.routing['explore'])
+
+    def _ordered(self, scrapers: List[SiteScraper], jav_code: Optional[str]) -> List[SiteScraper]:
+        ordered = []
+        for scraper in scrapers:
+            if self.skipped(scraper, jav_code):
+                logging.debug("🧭 Skipping %s for %s: no %s code was ever found there",
+                              scraper.name, jav_code, code_prefix(jav_code))
+            else:
+                ordered.append(scraper)
+        return sorted(ordered, key=lambda scraper: self.expected_cost(scraper, jav_code))
+
+    def primaries(self, jav_code: Optional[str] = None) -> List[SiteScraper]:
+        """Primary sites to ask for ``jav_code``, cheapest first; results are merged in the configured order."""
+        return self._ordered(self.primary, jav_code)
+
+    def fallbacks(self, jav_code: Optional[str] = None) -> List[SiteScraper]:
+        """Fallback sites to ask for ``jav_code``, in the order they are tried."""
+        return self._ordered(self.fallback, jav_code)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Role, transport, history and expected cost of every site."""
+        return {scraper.name: {'role': 'primary' if scraper in self.primary else 'fallback',
+                               'transport': scraper.transport,
+                               'expected_cost': round(self.expected_cost(scraper), 2),
+                               **self.stats.get(scraper.name, {})}
+                for scraper in self.primary + self.fallback}
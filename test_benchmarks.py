@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Tests for the offline benchmark harness
+"""
+
+import asyncio
+import os
+
+import pytest
+
+from benchmarks.fixture_server import FixtureServer
+from benchmarks.library import generate_library
+from benchmarks.run_benchmarks import percentile, write_config
+from scraper_engine import JAVScraperEngine
+
+
+@pytest.fixture(scope='module')
+def fixture_server():
+    with FixtureServer() as server:
+        yield server
+
+
+def test_generate_library_is_sparse_and_deterministic(tmp_path):
+    first = generate_library(str(tmp_path / 'a'), 50, seed=3)
+    second = generate_library(str(tmp_path / 'b'), 50, seed=3)
+
+    assert len(first) == 50
+    assert [os.path.relpath(p, tmp_path / 'a') for p in first] == \
+           [os.path.relpath(p, tmp_path / 'b') for p in second]
+    stat = os.stat(first[0])
+    assert stat.st_size >= 1024 ** 3
+    assert stat.st_blocks * 512 < 1024 ** 2
+
+
+def test_engine_scrapes_fixture_sites_offline(fixture_server, tmp_path):
+    config_path = write_config(str(tmp_path / 'config.yml'), fixture_server.base_url, str(tmp_path))
+
+    async def scrape():
+        async with JAVScraperEngine(config_path) as engine:
+            return await engine.scrape_all_sites('SSIS-123')
+
+    metadata = asyncio.run(scrape())
+
+    assert list(metadata['sources']) == ['javguru']
+    assert metadata['best_title'].startswith('[SSIS-123]')
+    assert metadata['detailed_metadata']['code'] == 'SSIS-123'
+    assert metadata['detailed_metadata']['fanart_url'].startswith('https://cdn.javsts.com/')
+    assert metadata['detailed_metadata']['thumb_url'].startswith('https://javtiful.com/')
+
+
+def test_percentile_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 99) == 0.0
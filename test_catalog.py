@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Tests for catalog ingestion
+"""
+
+import asyncio
+
+import yaml
+
+from benchmarks.fixture_server import FixtureServer
+from benchmarks.run_benchmarks import write_config
+from catalog import CatalogCrawler, parse_sitemap
+from scraper_engine import JAVScraperEngine
+
+
+def test_sitemap_locations_are_parsed():
+    xml = ('<urlset><url><loc>https://example.com/video/ssis123</loc></url>'
+           '<url><loc> https://example.com/sitemap-2.xml?a=1&amp;b=2 </loc></url></urlset>')
+
+    assert parse_sitemap(xml) == ['https://example.com/video/ssis123', 'https://example.com/sitemap-2.xml?a=1&b=2']
+
+
+def test_cataloged_code_is_scraped_without_a_search(tmp_path):
+    with FixtureServer() as server:
+        config_path = write_config(str(tmp_path / 'config.yml'), server.base_url, str(tmp_path))
+        with open(config_path) as f:
+            config = yaml.safe_load(f)
+        config['local_store'] = {'enabled': True, 'path': str(tmp_path / 'local_store.db')}
+        with open(config_path, 'w') as f:
+            yaml.safe_dump(config, f)
+
+        async def run():
+            async with JAVScraperEngine(config_path) as engine:
+                stats = await CatalogCrawler(engine, 'javguru', pages=2, delay=0).crawl()
+                fetched = []
+                fetch = engine.fetch_page
+
+                async def recording_fetch(url):
+                    fetched.append(url)
+                    return await fetch(url)
+
+                engine.fetch_page = recording_fetch
+                metadata = await engine.scrape_all_sites('IPX-105', enrich=False)
+                return stats, fetched, metadata
+
+        stats, fetched, metadata = asyncio.run(run())
+
+    assert stats == {'pages': 2, 'entries': 40, 'new': 40, 'total': 40}
+    assert len(fetched) == 1 and '?s=' not in fetched[0]
+    assert metadata['best_title'].startswith('[IPX-105]')
+    assert metadata['sources']['javguru']['detailed_metadata']['code'] == 'IPX-105'
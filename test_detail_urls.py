@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Tests for learned detail URL templates
+"""
+
+from detail_urls import DetailUrlResolver, derive_template
+from local_store import LocalStore
+from scraper_engine import JAVScraperEngine
+
+
+def test_template_is_derived_from_the_code_in_the_url():
+    assert derive_template('SSIS-123', 'https://javtrailers.com/video/ssis123') == \
+        'https://javtrailers.com/video/{content_id}'
+    assert derive_template('SSIS-123', 'https://example.com/v/ssis00123/') == 'https://example.com/v/{dmm_id}/'
+    assert derive_template('SSIS-123', 'https://www5.javmost.com/SSIS-123/') == 'https://www5.javmost.com/{code}/'
+    # The post id changes per title
+    assert derive_template('SSIS-123', 'https://jav.guru/412345/ssis123/') is None
+    assert derive_template('SSIS-123', 'https://example.com/video/other') is None
+
+
+def test_template_is_trusted_after_enough_successes():
+    resolver = DetailUrlResolver(min_successes=2)
+    template = 'https://javtrailers.com/video/{content_id}'
+    resolver.record('javtrailers', template, True)
+    assert resolver.resolve('javtrailers', 'ABP-456') is None
+
+    resolver.record('javtrailers', template, True)
+
+    assert resolver.resolve('javtrailers', 'ABP-456') == (template, 'https://javtrailers.com/video/abp456')
+    resolver.record('javtrailers', template, False)
+    resolver.record('javtrailers', template, False)
+    assert resolver.resolve('javtrailers', 'ABP-456') is None
+
+
+def test_code_must_appear_as_a_whole_word():
+    assert JAVScraperEngine._is_detail_page('<h1>SSIS-123 Title</h1>', 'SSIS-123')
+    assert JAVScraperEngine._is_detail_page('<a href="/video/ssis123">', 'SSIS-123')
+    assert not JAVScraperEngine._is_detail_page('<a href="/video/ssis123">', 'SSIS-12')
+    assert not JAVScraperEngine._is_detail_page('<h1>SSIS-1234</h1>', 'SSIS-123')
+
+
+def test_persisted_templates_are_loaded_before_counting(tmp_path):
+    store = LocalStore(str(tmp_path / 'local_store.db'))
+    template = 'https://javtrailers.com/video/{content_id}'
+    store.record_url_template('javtrailers', template, True)
+    store.record_url_template('javtrailers', template, True)
+    engine = JAVScraperEngine('config.yml')
+    engine._store, engine._store_opened = store, True
+
+    engine._learn_detail_url('javtrailers', 'ABP-456', 'https://javtrailers.com/video/abp456')
+
+    assert engine.detail_urls.templates['javtrailers'][template] == {'successes': 3, 'failures': 0}
+    store.close()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Tests for the engine's shared HTTP session
+"""
+
+import asyncio
+
+from aiohttp import web
+
+from rate_limiter import SiteRateLimiter
+from scraper_engine import DEFAULT_HEADERS, JAVScraperEngine
+
+
+def test_requests_share_one_pooled_session():
+    peers = []
+    user_agents = []
+
+    async def handler(request):
+        peers.append(request.transport.get_extra_info('peername'))
+        user_agents.append(request.headers.get('User-Agent'))
+        return web.Response(text='<html>ok</html>')
+
+    async def fetch_twice():
+        app = web.Application()
+        app.router.add_get('/{tail:.*}', handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        engine = JAVScraperEngine('config.yml')
+        engine.site_overrides = {'jav.guru': f'http://127.0.0.1:{port}'}
+        engine.rate_limiter = SiteRateLimiter({})
+        try:
+            async with engine:
+                session = engine.session
+                await engine._fetch_html_http('https://jav.guru/?s=SSIS-123')
+                await engine._fetch_html_http('https://jav.guru/?s=SSIS-124')
+                assert engine._get_session() is session
+                assert session.connector.limit_per_host == engine.settings.http['limit_per_host']
+            assert engine.session is None
+        finally:
+            await runner.cleanup()
+
+    asyncio.run(fetch_twice())
+
+    assert len(peers) == 2
+    assert peers[0] == peers[1]
+    assert user_agents == [DEFAULT_HEADERS['User-Agent']] * 2
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Import-time budget for the web app, the command line and the scraper engine
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Loaded on first use only; none of them is needed to scan folders or serve the UI
+LAZY_MODULES = ('aiohttp', 'bs4', 'PIL', 'playwright')
+
+# Cumulative import time in seconds, measured with ``python -X importtime``
+BUDGETS = {'app': 1.0, 'scraper_engine': 0.5, 'wooscraper': 0.5}
+
+
+def import_times(module: str) -> dict:
+    """Import ``module`` in a fresh interpreter and return the cumulative seconds per imported module."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            capture_output=True, text=True, cwd=Path(__file__).parent, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative) / 1e6
+    return times
+
+
+@pytest.mark.parametrize('module', sorted(BUDGETS))
+def test_import_stays_within_budget(module):
+    times = import_times(module)
+
+    heavy = sorted(name for name in times if name.split('.')[0] in LAZY_MODULES)
+    assert heavy == []
+    assert times[module] < BUDGETS[module]
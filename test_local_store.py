@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Tests for the local store and the negative cache
+"""
+
+import asyncio
+import sqlite3
+
+import pytest
+
+from local_store import LocalStore
+from scraper_engine import JAVScraperEngine
+
+DAY = 86400
+
+
+def test_misses_back_off_a_day_a_week_then_a_month(tmp_path):
+    store = LocalStore(str(tmp_path / 'store.db'))
+
+    retries = [store.record_miss('SSIS-123', 'javguru', now=0) for _ in range(4)]
+
+    assert retries == [1 * DAY, 7 * DAY, 30 * DAY, 30 * DAY]
+    assert store.retry_after('SSIS-123', 'javguru', now=29 * DAY) == 30 * DAY
+    assert store.retry_after('SSIS-123', 'javguru', now=30 * DAY) is None
+    assert store.retry_after('SSIS-123', 'javmost', now=0) is None
+
+
+def test_hit_and_forget_clear_misses(tmp_path):
+    store = LocalStore(str(tmp_path / 'store.db'))
+    for source in ('javguru', 'javmost'):
+        store.record_miss('SSIS-123', source, now=0)
+    store.record_miss('IPX-456', 'javguru', now=0)
+
+    store.record_hit('SSIS-123', 'javguru')
+
+    assert [record['source'] for record in store.misses('SSIS-123')] == ['javmost']
+    assert store.forget(['SSIS-123']) == 1
+    assert [record['jav_code'] for record in store.misses()] == ['IPX-456']
+
+
+def test_probe_skips_sources_that_recently_missed(tmp_path):
+    engine = JAVScraperEngine('config.yml')
+    engine._store, engine._store_opened = LocalStore(str(tmp_path / 'store.db')), True
+    calls = []
+
+    async def scraper(jav_code):
+        calls.append(jav_code)
+        return {'title': f"{jav_code} - JAV Content"}
+
+    async def probe_twice():
+        return [await engine._probe('javmost', 'SSIS-123', scraper) for _ in range(2)]
+
+    first, second = asyncio.run(probe_twice())
+
+    assert calls == ['SSIS-123']
+    assert first == {'title': 'SSIS-123 - JAV Content'}
+    assert second is None
+    assert engine.store.misses('SSIS-123')[0]['misses'] == 1
+
+
+def test_engine_closes_the_store_on_exit(tmp_path):
+    store = LocalStore(str(tmp_path / 'store.db'))
+
+    async def run():
+        async with JAVScraperEngine('config.yml') as engine:
+            engine._store, engine._store_opened = store, True
+        return engine
+
+    engine = asyncio.run(run())
+
+    assert engine._store is None and not engine._store_opened
+    with pytest.raises(sqlite3.ProgrammingError):
+        store.misses()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Tests for the process-wide logging setup
+"""
+
+import logging
+import multiprocessing
+
+from logging_setup import configure_logging, forward_logging, listen, parse_size, stop_logging
+
+
+def test_sizes_are_parsed_with_units():
+    assert parse_size('10MB') == 10 * 1024 ** 2
+    assert parse_size('1.5 kb') == 1536
+    assert parse_size(512000) == 512000
+    assert parse_size('ten megabytes') == 10 * 1024 ** 2
+    assert parse_size(None, default=1) == 1
+
+
+def _configure_twice(log_file, report):
+    configure_logging({'file': log_file, 'level': 'INFO'})
+    configure_logging({'file': log_file, 'level': 'DEBUG'})
+    root = logging.getLogger()
+    report.put(([type(handler).__name__ for handler in root.handlers], root.level))
+    logging.getLogger('job').debug("🔧 written by the listener")
+    stop_logging()
+
+
+def test_handlers_are_installed_once_per_process(tmp_path):
+    context = multiprocessing.get_context('spawn')
+    report = context.Queue()
+    log_file = str(tmp_path / 'scraper.log')
+    process = context.Process(target=_configure_twice, args=(log_file, report))
+    process.start()
+    handlers, level = report.get(timeout=30)
+    process.join(timeout=30)
+
+    assert handlers == ['QueueHandler']
+    # The second call only changed the level
+    assert level == logging.DEBUG
+    with open(log_file, encoding='utf-8') as f:
+        assert f.read().count('written by the listener') == 1
+
+
+def _log_from_worker(log_queue):
+    forward_logging(log_queue)
+    logging.getLogger('worker').warning("⏳ %s from the worker", 'SSIS-123')
+
+
+def test_worker_records_are_written_by_the_parent(caplog):
+    context = multiprocessing.get_context('spawn')
+    log_queue = context.Queue()
+    listener = listen(log_queue)
+    try:
+        process = context.Process(target=_log_from_worker, args=(log_queue,))
+        process.start()
+        process.join(timeout=30)
+    finally:
+        listener.stop()
+
+    assert process.exitcode == 0
+    assert [(record.name, record.getMessage()) for record in caplog.records] == \
+        [('worker', '⏳ SSIS-123 from the worker')]
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Tests for the scraper metrics registry and the /api/metrics endpoint
+"""
+
+import pickle
+
+from metrics import REGISTRY, MetricsRegistry
+
+
+def test_histogram_buckets_are_cumulative_and_labels_escaped():
+    registry = MetricsRegistry(buckets=(0.1, 1.0))
+    for seconds in (0.05, 0.5, 0.5, 2.0):
+        registry.observe('parse', 'jav"guru\\', seconds)
+    registry.record_error('http_fetch', 'jav.guru', 'line\nbreak')
+
+    text = registry.render_prometheus()
+
+    labels = 'stage="parse",site="jav\\"guru\\\\"'
+    assert f'wooscraper_stage_seconds_bucket{{{labels},le="0.1"}} 1' in text
+    assert f'wooscraper_stage_seconds_bucket{{{labels},le="1.0"}} 3' in text
+    assert f'wooscraper_stage_seconds_bucket{{{labels},le="+Inf"}} 4' in text
+    assert f'wooscraper_stage_seconds_sum{{{labels}}} 3.050000' in text
+    assert f'wooscraper_stage_seconds_count{{{labels}}} 4' in text
+    assert 'wooscraper_errors_total{kind="line\\nbreak",site="jav.guru",stage="http_fetch"} 1' in text
+
+
+def test_summary_reports_deltas_since_a_snapshot():
+    registry = MetricsRegistry()
+    registry.observe('parse', 'jav.guru', 1.0)
+    registry.record_cache('portraits', True)
+    since = registry.snapshot()
+
+    registry.observe('parse', 'jav.guru', 0.5)
+    registry.observe('parse', 'javmost.com', 0.25)
+    registry.add_bytes('image_download', 'jav.guru', 2048)
+    for hit in (True, True, False):
+        registry.record_cache('portraits', hit)
+
+    summary = registry.summary(since=since)
+
+    assert summary['stages']['parse'] == {'count': 2, 'total_seconds': 0.75, 'sites': {
+        'jav.guru': {'count': 1, 'avg_seconds': 0.5}, 'javmost.com': {'count': 1, 'avg_seconds': 0.25}}}
+    assert summary['bytes'] == {'image_download': 2048}
+    assert summary['cache'] == {'portraits': {'hit': 2, 'miss': 1, 'hit_ratio': 0.667}}
+
+
+def test_drained_worker_snapshot_merges_into_the_coordinator():
+    worker = MetricsRegistry()
+    worker.observe('browser_fetch', 'jav.guru', 3.0)
+    worker.inc('detail_urls', site='javtrailers.com', result='direct')
+    coordinator = MetricsRegistry()
+    coordinator.observe('browser_fetch', 'jav.guru', 1.0)
+
+    coordinator.merge(pickle.loads(pickle.dumps(worker.drain())))
+
+    assert worker.snapshot() == {'histograms': [], 'counters': []}
+    assert coordinator.summary()['stages']['browser_fetch']['sites']['jav.guru'] == {'count': 2, 'avg_seconds': 2.0}
+    assert 'wooscraper_detail_urls_total{result="direct",site="javtrailers.com"} 1' in coordinator.render_prometheus()
+
+
+def test_endpoint_serves_the_prometheus_text_format():
+    from app import app
+
+    REGISTRY.observe('nfo_write', '', 0.01)
+    response = app.test_client().get('/api/metrics')
+
+    assert response.status_code == 200
+    assert response.headers['Content-Type'].startswith('text/plain; version=0.0.4')
+    assert 'wooscraper_stage_seconds_count{stage="nfo_write",site=""}' in response.get_data(as_text=True)
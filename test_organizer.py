@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Tests for the file organizer
+"""
+
+import os
+
+import pytest
+
+from organizer import OrganizePlanner, copy_file, execute_plan, organize_file
+
+
+def make_video(path, size=1000):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(os.urandom(size))
+    return path
+
+
+def test_move_on_same_device_renames(tmp_path):
+    source = make_video(tmp_path / 'downloads' / 'SSIS-123.mp4')
+    inode = source.stat().st_ino
+    target = tmp_path / 'videos' / 'SSIS-123.mp4'
+    target.parent.mkdir()
+
+    assert organize_file(str(source), str(target)) == 'rename'
+    assert not source.exists()
+    assert target.stat().st_ino == inode
+
+
+def test_hardlink_keeps_the_download(tmp_path):
+    source = make_video(tmp_path / 'downloads' / 'SSIS-123.mp4')
+    target = tmp_path / 'videos' / 'SSIS-123.mp4'
+    target.parent.mkdir()
+
+    assert organize_file(str(source), str(target), mode='hardlink') == 'hardlink'
+    assert source.exists()
+    assert os.path.samefile(source, target)
+
+
+def test_copy_reports_progress_per_chunk(tmp_path):
+    source = make_video(tmp_path / 'SSIS-123.mp4', size=10_000)
+    target = tmp_path / 'copy.mp4'
+    reports = []
+
+    copied = copy_file(str(source), str(target), chunk_size=4096,
+                       progress=lambda done, total, rate: reports.append((done, total)))
+
+    assert copied == 10_000
+    assert target.read_bytes() == source.read_bytes()
+    assert reports == [(4096, 10_000), (8192, 10_000), (10_000, 10_000)]
+    assert not (tmp_path / 'copy.mp4.part').exists()
+
+
+def test_move_falls_back_when_copy_offload_copies_nothing(tmp_path, monkeypatch):
+    source = make_video(tmp_path / 'downloads' / 'SSIS-123.mp4', size=10_000)
+    data = source.read_bytes()
+    target = tmp_path / 'videos' / 'SSIS-123.mp4'
+    target.parent.mkdir()
+    monkeypatch.setattr('organizer.same_device', lambda source, folder: False)
+    monkeypatch.setattr(os, 'copy_file_range', lambda *args, **kwargs: 0, raising=False)
+
+    assert organize_file(str(source), str(target), chunk_size=4096) == 'copy+delete'
+    assert target.read_bytes() == data
+
+
+def test_short_copy_keeps_the_source(tmp_path, monkeypatch):
+    source = make_video(tmp_path / 'downloads' / 'SSIS-123.mp4', size=10_000)
+    target = tmp_path / 'videos' / 'SSIS-123.mp4'
+    target.parent.mkdir()
+    monkeypatch.setattr('organizer.same_device', lambda source, folder: False)
+    monkeypatch.setattr(os, 'copy_file_range', lambda *args, **kwargs: 0, raising=False)
+    monkeypatch.setattr(os, 'fstat', lambda fd: os.stat_result((0,) * 6 + (20_000,) + (0,) * 3))
+
+    with pytest.raises(OSError):
+        organize_file(str(source), str(target))
+    assert source.stat().st_size == 10_000
+    assert not target.exists() and not (tmp_path / 'videos' / 'SSIS-123.mp4.part').exists()
+
+
+def test_existing_target_is_never_overwritten(tmp_path):
+    source = make_video(tmp_path / 'SSIS-123.mp4')
+    target = make_video(tmp_path / 'videos' / 'SSIS-123.mp4', size=10)
+
+    with pytest.raises(FileExistsError):
+        organize_file(str(source), str(target), mode='copy')
+    assert target.stat().st_size == 10
+
+
+def scraped(source, actress):
+    file_info = {'file_path': str(source), 'jav_code': source.stem.split('.')[0]}
+    return file_info, {'detailed_metadata': {'actress': actress}}
+
+
+def test_plan_detects_collisions_and_existing_targets(tmp_path):
+    base = tmp_path / 'videos'
+    first = make_video(tmp_path / 'downloads' / 'SSIS-123.mp4')
+    duplicate = make_video(tmp_path / 'downloads' / 'other' / 'SSIS-123.mp4')
+    done = make_video(tmp_path / 'downloads' / 'IPX-456.mp4')
+    make_video(base / 'Momo' / 'IPX-456' / 'IPX-456.mp4')
+
+    plan = OrganizePlanner(str(base)).plan([
+        scraped(first, 'Yua, Rei'), scraped(duplicate, 'Yua'), scraped(done, 'Momo'),
+        scraped(tmp_path / 'gone' / 'ABP-789.mp4', ''),
+    ])
+
+    assert [entry['action'] for entry in plan.entries] == ['move', 'collision', 'exists', 'missing']
+    assert plan.entries[0]['target'] == str(base / 'Yua' / 'SSIS-123' / 'SSIS-123.mp4')
+    assert plan.entries[3]['folder'] == str(base / 'UNKNOWN' / 'ABP-789')
+    assert plan.folders.index(str(base)) < plan.folders.index(str(base / 'Yua')) \
+        < plan.folders.index(str(base / 'Yua' / 'SSIS-123'))
+    assert plan.summary() == {'files': 4, 'folders': 7, 'move': 1, 'collision': 1, 'exists': 1, 'missing': 1}
+
+
+def test_execute_plan_creates_folders_once_and_moves_in_order(tmp_path):
+    base = tmp_path / 'videos'
+    planner = OrganizePlanner(str(base))
+    sources = [make_video(tmp_path / 'downloads' / name) for name in ('SSIS-123.mp4', 'SSIS-124.mkv')]
+
+    plan = execute_plan(planner.plan([scraped(source, 'Yua') for source in sources]))
+    second = planner.plan([scraped(make_video(tmp_path / 'downloads' / 'SSIS-125.mp4'), 'Yua')])
+
+    assert [entry['result'] for entry in plan.entries] == ['rename', 'rename']
+    assert (base / 'Yua' / 'SSIS-124' / 'SSIS-124.mkv').exists()
+    assert not any(source.exists() for source in sources)
+    assert second.folders == [str(base / 'Yua' / 'SSIS-125')]
+
+
+def test_parts_share_the_code_folder(tmp_path):
+    base = tmp_path / 'videos'
+    parts = [make_video(tmp_path / 'downloads' / f'SSIS-123-{letter}.mp4') for letter in 'AB']
+    scraped_parts = [scraped(source, 'Yua') for source in parts]
+    for number, (file_info, _) in enumerate(scraped_parts, 1):
+        file_info.update(jav_code='SSIS-123', part=number)
+
+    plan = OrganizePlanner(str(base)).plan(scraped_parts)
+
+    assert [entry['action'] for entry in plan.entries] == ['move', 'move']
+    assert [os.path.basename(entry['target']) for entry in plan.entries] == ['SSIS-123-cd1.mp4', 'SSIS-123-cd2.mp4']
+
+
+def test_plan_without_base_leaves_files_in_place(tmp_path):
+    source = make_video(tmp_path / 'SSIS-123.mp4')
+
+    plan = OrganizePlanner(None).plan([scraped(source, 'Yua')])
+
+    assert plan.entries[0]['action'] == 'in-place'
+    assert plan.entries[0]['folder'] == str(tmp_path)
+    assert plan.folders == []
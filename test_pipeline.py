@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Tests for the staged job pipeline
+"""
+
+import asyncio
+
+from pipeline import Pipeline, Stage
+
+
+def test_items_pass_every_stage_and_queues_stay_bounded():
+    written, batches, peak = [], [], []
+
+    async def source():
+        for number in range(20):
+            yield number
+
+    async def fetch(number):
+        return None if number == 7 else number * 10
+
+    async def slow_write(numbers):
+        peak.append(pipeline.stages[1].queue.qsize())
+        batches.append(len(numbers))
+        await asyncio.sleep(0.01)
+        written.extend(numbers)
+        return numbers
+
+    pipeline = Pipeline([Stage('fetch', fetch, 4), Stage('write', slow_write, batch_size=3)], queue_size=2)
+    asyncio.run(pipeline.run(source()))
+
+    assert sorted(written) == [number * 10 for number in range(20) if number != 7]
+    assert max(peak) <= 2
+    assert max(batches) <= 3
+    assert pipeline.in_flight == 0
+    assert pipeline.status()['fetch']['done'] == 20
+
+
+def test_failed_item_is_reported_and_dropped():
+    errors, passed = [], []
+
+    async def source():
+        for number in range(3):
+            yield number
+
+    async def check(number):
+        if number == 1:
+            raise ValueError('bad')
+        return number
+
+    async def collect(number):
+        passed.append(number)
+        return number
+
+    pipeline = Pipeline([Stage('check', check), Stage('collect', collect)],
+                        on_error=lambda stage, item, e: errors.append((stage, item, str(e))))
+    asyncio.run(pipeline.run(source()))
+
+    assert passed == [0, 2]
+    assert errors == [('check', 1, 'bad')]
+    assert pipeline.in_flight == 0
+
+
+def test_source_waits_while_the_window_is_full():
+    seen = []
+
+    async def source():
+        for number in range(6):
+            seen.append(pipeline.in_flight)
+            yield number
+
+    async def step(number):
+        await asyncio.sleep(0.01)
+        return number
+
+    pipeline = Pipeline([Stage('fetch', step, 4), Stage('write', step)], queue_size=4, max_in_flight=3)
+    asyncio.run(pipeline.run(source()))
+
+    assert max(seen) <= 2
+    assert pipeline.status()['write']['done'] == 6
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Tests for job profiling
+"""
+
+import asyncio
+import json
+import os
+import time
+
+from profiling import JobProfiler
+
+
+def test_profiler_writes_collapsed_stacks_and_task_timings(tmp_path):
+    def busy_parse():
+        deadline = time.perf_counter() + 0.05
+        while time.perf_counter() < deadline:
+            pass
+
+    async def fetch_one():
+        await asyncio.sleep(0.01)
+        busy_parse()
+        return 'ok'
+
+    async def job():
+        profiler = JobProfiler(interval=0.001, output_dir=str(tmp_path), name='job')
+        profiler.start()
+        results = await asyncio.gather(*(fetch_one() for _ in range(3)))
+        return results, profiler.stop()
+
+    results, summary = asyncio.run(job())
+
+    assert results == ['ok'] * 3
+    assert summary['samples'] > 0
+    with open(summary['files']['collapsed'], 'r', encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    assert any('test_profiling.py:test_profiler_writes_collapsed_stacks_and_task_timings.<locals>.busy_parse'
+               in line for line in lines)
+    assert all(line.rsplit(' ', 1)[1].isdigit() for line in lines)
+
+    tasks = summary['tasks']
+    name = 'test_profiler_writes_collapsed_stacks_and_task_timings.<locals>.fetch_one'
+    assert tasks[name]['count'] == 3
+    assert tasks[name]['max_step_seconds'] >= 0.04
+    with open(os.path.join(tmp_path, 'job.json'), 'r', encoding='utf-8') as f:
+        assert json.load(f)['tasks'][name]['count'] == 3
+
+
+def test_profiler_from_config_respects_per_job_request():
+    assert JobProfiler.from_config({}) is None
+    assert JobProfiler.from_config({'profiling': {'enabled': True}}, requested=False) is None
+    assert JobProfiler.from_config({}, requested=True).mode == 'sampling'
+    assert JobProfiler.from_config({'profiling': {'mode': 'sampling'}}, requested='cprofile').mode == 'cprofile'
+    # Strings that are not a mode fall back to the configuration
+    assert JobProfiler.from_config({}, requested='false') is None
+    assert JobProfiler.from_config({'profiling': {'enabled': True, 'mode': 'cprofile'}},
+                                   requested='true').mode == 'cprofile'
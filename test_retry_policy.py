@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Tests for request retries and rescheduling
+"""
+
+import asyncio
+import random
+
+import pytest
+from aiohttp import web
+
+from rate_limiter import SiteRateLimiter
+from retry_policy import (CONNECTION, RATE_LIMITED, UNAVAILABLE, RetryLater, RetryPolicy, RetrySchedule,
+                          classify_status, parse_retry_after)
+from scraper_engine import JAVScraperEngine
+from site_health import SiteHealth
+
+
+def test_backoff_grows_with_jitter_and_honors_retry_after():
+    policy = RetryPolicy(jitter=0.5, rng=random.Random(1))
+
+    delays = [policy.backoff(CONNECTION, attempt) for attempt in (1, 2, 3, 10)]
+
+    assert 0.125 <= delays[0] <= 0.25
+    assert 0.25 <= delays[1] <= 0.5
+    assert 0.5 <= delays[2] <= 1.0
+    assert 5.0 <= delays[3] <= 10.0
+    assert policy.backoff(RATE_LIMITED, 1, retry_after=120) == 120
+    assert policy.retry_inline(CONNECTION, 1, delays[0])
+    assert not policy.retry_inline(CONNECTION, 3, delays[0])
+    assert not policy.retry_inline(RATE_LIMITED, 1, 0.1)
+    assert classify_status(503) == UNAVAILABLE
+    assert classify_status(404) is None
+    assert parse_retry_after('30') == 30
+    assert parse_retry_after('Wed, 21 Oct 2015 07:28:30 GMT', now=1445412480) == 30
+    assert parse_retry_after('soon') is None
+
+
+def test_schedule_returns_items_when_due():
+    schedule = RetrySchedule()
+    schedule.defer('late', 10, now=0)
+    schedule.defer('early', 5, now=0)
+
+    assert schedule.pop_due(now=4) is None
+    assert schedule.next_in(now=4) == 1
+    assert schedule.pop_due(now=10) == 'early'
+    assert schedule.pop_due(now=10) == 'late'
+    assert not schedule
+
+
+def _serve(statuses):
+    """Start a server answering with ``statuses`` in turn, then 200."""
+    hits = []
+
+    async def handler(request):
+        hits.append(request.path)
+        status, headers = statuses.pop(0) if statuses else (200, {})
+        return web.Response(status=status, headers=headers, text='<html>ok</html>')
+
+    app = web.Application()
+    app.router.add_get('/{tail:.*}', handler)
+    return app, hits
+
+
+def _engine(base_url):
+    engine = JAVScraperEngine('config.yml')
+    engine.site_overrides = {'jav.guru': base_url}
+    engine.site_health = SiteHealth(enabled=False)
+    engine.rate_limiter = SiteRateLimiter({})
+    engine.retry_policy = RetryPolicy(policies={UNAVAILABLE: {'attempts': 2, 'base_delay': 0.1}})
+    return engine
+
+
+async def _fetch(statuses):
+    app, hits = _serve(statuses)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    engine = _engine(f'http://127.0.0.1:{port}')
+    try:
+        html = await engine._fetch_html_http('https://jav.guru/?s=SSIS-123')
+    finally:
+        await engine.session.close()
+        await runner.cleanup()
+    return engine, html, hits
+
+
+def test_unavailable_site_is_retried_in_place():
+    engine, html, hits = asyncio.run(_fetch([(503, {})]))
+
+    assert html == '<html>ok</html>'
+    assert len(hits) == 2
+
+
+def test_rate_limited_site_is_held():
+    engine, html, hits = asyncio.run(_fetch([(429, {'Retry-After': '120'})]))
+
+    assert html is None
+    assert len(hits) == 1
+    assert 119 < engine.site_health.snapshot()['jav.guru']['held_for'] <= 120
+
+
+def test_code_is_rescheduled_instead_of_getting_a_placeholder():
+    engine = JAVScraperEngine('config.yml')
+    engine.site_health = SiteHealth(enabled=False)
+    engine._store_opened = True
+    for site in ('jav.guru', 'www5.javmost.com', 'javtrailers.com'):
+        engine.site_health.hold(site, 120)
+
+    async def scrape():
+        try:
+            return await engine.scrape_all_sites('SSIS-123')
+        finally:
+            if engine.session:
+                await engine.session.close()
+
+    with pytest.raises(RetryLater) as raised:
+        asyncio.run(scrape())
+
+    assert 119 < raised.value.retry_in <= 120
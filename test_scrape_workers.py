@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared rate limiter and the multi-process scrape coordinator
+"""
+
+import asyncio
+import multiprocessing
+import queue
+import time
+
+import pytest
+import yaml
+
+from benchmarks.fixture_server import FixtureServer
+from benchmarks.run_benchmarks import write_config
+from rate_limiter import SiteRateLimiter
+from scrape_workers import ScrapeCoordinator, WorkerError
+
+
+def _request_times(limiter, times):
+    for _ in range(3):
+        asyncio.run(limiter.acquire('https://www5.javmost.com/SSIS-123/'))
+        times.put(time.monotonic())
+
+
+def test_interval_is_shared_by_processes():
+    context = multiprocessing.get_context('spawn')
+    limiter = SiteRateLimiter({'javmost.com': 0.1}, context=context)
+    times = context.Queue()
+    processes = [context.Process(target=_request_times, args=(limiter, times)) for _ in range(3)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=30)
+
+    sent = sorted(times.get(timeout=5) for _ in range(9))
+
+    assert all(process.exitcode == 0 for process in processes)
+    assert min(later - earlier for earlier, later in zip(sent, sent[1:])) >= 0.09
+    assert limiter.reserve('https://jav.guru/?s=SSIS-123') == 0.0
+
+
+def test_results_and_errors_come_back_through_get():
+    coordinator = ScrapeCoordinator(workers=2)
+    coordinator._result_queue = queue.Queue()
+    coordinator._result_queue.put(('IPX-105', None, 'Timeout on every site', {}))
+    coordinator._result_queue.put(('SSIS-101', {'best_title': 'Title'}, None, {}))
+
+    async def get(jav_code):
+        return await coordinator.get(jav_code)
+
+    metadata = asyncio.run(get('SSIS-101'))
+    # Every file of a code gets its own copy
+    metadata['file_path'] = 'a.mp4'
+
+    assert asyncio.run(get('SSIS-101')) == {'best_title': 'Title'}
+    with pytest.raises(WorkerError, match='Timeout on every site'):
+        asyncio.run(get('IPX-105'))
+    # No worker is left to produce it
+    with pytest.raises(WorkerError, match='No worker produced a result'):
+        asyncio.run(get('ABP-103'))
+
+
+def test_workers_scrape_the_codes(tmp_path):
+    with FixtureServer() as server:
+        config_path = write_config(str(tmp_path / 'config.yml'), server.base_url, str(tmp_path))
+        with open(config_path) as f:
+            config = yaml.safe_load(f)
+        coordinator = ScrapeCoordinator(workers=2, config_path=config_path, config=config)
+        coordinator.start(['SSIS-101', 'IPX-105', 'SSIS-101'])
+
+        async def collect():
+            return [await coordinator.get(jav_code) for jav_code in ('IPX-105', 'SSIS-101')]
+
+        try:
+            results = asyncio.run(collect())
+        finally:
+            coordinator.close()
+
+    assert [metadata['best_title'][:10] for metadata in results] == ['[IPX-105] ', '[SSIS-101]']
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared settings cache
+"""
+
+import os
+
+from settings import get_settings
+
+
+def test_settings_are_shared_and_reloaded_on_change(tmp_path):
+    path = tmp_path / 'config.yml'
+    path.write_text("scraper:\n  timeout: 10\n  fetch_backend: http\n", encoding='utf-8')
+
+    first = get_settings(str(path))
+    assert get_settings(str(path)) is first
+    assert first.timeout == 10.0
+    assert first.fetch_backend == 'http'
+    assert first.workers == 1
+
+    path.write_text("scraper:\n  timeout: 20\n", encoding='utf-8')
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, first.mtime_ns + 1_000_000))
+
+    reloaded = get_settings(str(path))
+    assert reloaded is not first
+    assert reloaded.timeout == 20.0
+    assert reloaded.fetch_backend == 'playwright'
+
+
+def test_missing_config_gives_empty_settings(tmp_path):
+    settings = get_settings(str(tmp_path / 'missing.yml'))
+    assert settings.data == {}
+    assert settings.enabled_sites == []
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Tests for the per-site circuit breakers
+"""
+
+import asyncio
+import time
+
+from scraper_engine import JAVScraperEngine
+from settings import Settings
+from site_health import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, SiteHealth
+
+
+def test_breaker_opens_on_failure_rate_and_recovers_after_trial():
+    breaker = CircuitBreaker('jav.guru', window=10, min_requests=4, failure_rate=0.5, open_seconds=60)
+    breaker.record_success()
+    breaker.record_success()
+    breaker.record_failure(now=0)
+    assert breaker.state == CLOSED
+
+    breaker.record_failure(now=0)
+
+    assert breaker.state == OPEN
+    assert not breaker.allow(now=59)
+    assert breaker.allow(now=60)
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow(now=60)
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.allow(now=61)
+
+
+def test_failed_trial_doubles_the_open_time():
+    breaker = CircuitBreaker('jav.guru', min_requests=1, open_seconds=10, max_open_seconds=15)
+    breaker.record_failure(now=0)
+    assert breaker.allow(now=10)
+
+    breaker.record_failure(now=10)
+
+    assert breaker.state == OPEN
+    assert not breaker.allow(now=24)
+    assert breaker.allow(now=25)
+
+
+def test_open_site_fails_without_a_request():
+    engine = JAVScraperEngine('config.yml')
+    engine.site_health = SiteHealth(min_requests=1, open_seconds=60)
+    engine.site_health.record('https://jav.guru/', False)
+
+    async def fetch():
+        async with engine:
+            started = time.monotonic()
+            html = await engine._fetch_html_http('https://jav.guru/?s=SSIS-123')
+            return html, time.monotonic() - started
+
+    html, elapsed = asyncio.run(fetch())
+
+    assert html is None
+    assert elapsed < 0.5
+    assert engine.site_health.snapshot()['jav.guru']['rejected'] == 1
+
+
+def test_timeout_follows_the_observed_percentile():
+    health = SiteHealth(timeouts={'min_samples': 10, 'factor': 3, 'floor': 2, 'ceiling': 20, 'window': 50})
+    for _ in range(9):
+        health.observe('https://jav.guru/?s=a', 1.0)
+    assert health.timeout_for('jav.guru', default=30) == 30
+
+    health.observe('https://jav.guru/?s=b', 1.5)
+
+    assert health.timeout_for('jav.guru', default=30) == 4.5
+    assert health.timeout_for('jav.guru', default=30, kind='browser') == 30
+    for _ in range(100):
+        health.observe('jav.guru', 0.1)
+    assert health.timeout_for('jav.guru', default=30) == 2
+    for _ in range(100):
+        health.observe('jav.guru', 60)
+    assert health.timeout_for('jav.guru', default=30) == 20
+
+
+def test_wait_strategy_matches_host_suffix():
+    engine = JAVScraperEngine('config.yml')
+    engine.settings = Settings({'scraper': {'wait_strategies': {
+        'default': {'wait_until': 'load'},
+        'jav.guru': {'wait_until': 'domcontentloaded', 'selector': '#main'},
+    }}})
+
+    assert engine._wait_strategy('jav.guru') == {'wait_until': 'domcontentloaded', 'selector': '#main'}
+    assert engine._wait_strategy('www.jav.guru') == {'wait_until': 'domcontentloaded', 'selector': '#main'}
+    assert engine._wait_strategy('notjav.guru') == {'wait_until': 'load'}
+    assert engine._wait_strategy('www5.javmost.com') == {'wait_until': 'load'}
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Tests for the site registry
+"""
+
+import asyncio
+
+import pytest
+
+from scraper_engine import JAVScraperEngine
+from site_registry import BROWSER, HTTP, SiteRegistry, SiteScraper, load_scraper_class
+
+
+class EmptySite(SiteScraper):
+    transport = HTTP
+    asked = []
+
+    async def scrape(self, jav_code):
+        self.asked.append(jav_code)
+        return None
+
+
+class FakeSite(SiteScraper):
+    transport = HTTP
+    latency = 0.1
+
+    async def scrape(self, jav_code):
+        return {'title': self.options.get('title', f'[{jav_code}] Fake title'),
+                'cover_url': 'https://example.com/cover.jpg',
+                'details': {'Studio': self.options.get('studio')}}
+
+
+def test_sites_are_ordered_by_expected_cost_per_hit():
+    browser = FakeSite(None, {'name': 'browser', 'latency': 2})
+    browser.transport = BROWSER
+    http = FakeSite(None, {'name': 'http', 'latency': 2})
+    registry = SiteRegistry([], [browser, http])
+
+    assert [site.name for site in registry.fallbacks()] == ['http', 'browser']
+
+    registry.load({'http': {'hits': 1, 'misses': 9, 'seconds': 20.0},
+                   'browser': {'hits': 9, 'misses': 1, 'seconds': 20.0}})
+
+    assert [site.name for site in registry.fallbacks()] == ['browser', 'http']
+    assert registry.snapshot()['http']['misses'] == 9
+
+
+def test_configured_site_is_used_without_editing_the_engine():
+    engine = JAVScraperEngine('config.yml')
+    engine._store_opened = True
+    engine.sites = SiteRegistry.from_config(engine, {'scraper': {'sites': [
+        {'name': 'empty', 'scraper': 'test_site_registry:EmptySite'},
+        {'name': 'mysite', 'scraper': 'test_site_registry:FakeSite', 'enabled': False, 'fallback': True,
+         'studio': 'S1'},
+    ]}})
+
+    metadata = asyncio.run(engine.scrape_all_sites('SSIS-123', enrich=False))
+
+    assert EmptySite.asked == ['SSIS-123']
+    assert list(metadata['sources']) == ['mysite']
+    assert metadata['all_details'] == {'Studio': 'S1'}
+    assert engine.sites.stats['empty'] == {'hits': 0, 'misses': 1, 'seconds': pytest.approx(0, abs=0.1)}
+    with pytest.raises(ValueError):
+        load_scraper_class('test_site_registry:pytest')
+
+
+def test_prefix_that_always_missed_skips_the_site():
+    primary = FakeSite(None, {'name': 'primary'})
+    primary.transport = BROWSER
+    registry = SiteRegistry([primary], [FakeSite(None, {'name': 'fallback'})],
+                            routing={'min_lookups': 3, 'explore': 0})
+    for _ in range(3):
+        registry.record('primary', False, 8.0, 'ABP-001')
+    registry.record('primary', True, 8.0, 'SSIS-001', completeness=1.0)
+
+    assert registry.primaries('ABP-123') == []
+    assert [site.name for site in registry.primaries('SSIS-123')] == ['primary']
+    assert registry.expected_cost(primary, 'SSIS-123') < registry.expected_cost(primary)
+
+
+def test_primary_results_are_merged_in_the_configured_order():
+    engine = JAVScraperEngine('config.yml')
+    engine._store_opened = True
+    engine.sites = SiteRegistry.from_config(engine, {'scraper': {'sites': [
+        {'name': 'preferred', 'scraper': 'test_site_registry:FakeSite', 'latency': 9, 'title': 'Preferred',
+         'studio': 'S1'},
+        {'name': 'cheap', 'scraper': 'test_site_registry:FakeSite', 'latency': 1, 'title': 'Cheap', 'studio': 'S2'},
+    ]}})
+    assert [site.name for site in engine.sites.primaries('SSIS-123')] == ['cheap', 'preferred']
+
+    metadata = asyncio.run(engine.scrape_all_sites('SSIS-123', enrich=False))
+
+    assert list(metadata['sources']) == ['preferred', 'cheap']
+    assert metadata['best_title'] == 'Preferred'
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Tests for the folder watcher
+"""
+
+import threading
+import time
+
+import pytest
+
+from scraper_engine import JAVScraperEngine
+from watcher import SettleTracker, WatchService
+
+
+def test_settle_tracker_waits_for_size_to_stop_changing(tmp_path):
+    path = tmp_path / 'SSIS-123.mp4'
+    path.write_bytes(b'x' * 10)
+    tracker = SettleTracker(settle_seconds=5)
+
+    tracker.touch(str(path), now=0)
+    assert tracker.ready(now=1) == []
+    path.write_bytes(b'x' * 20)
+    assert tracker.ready(now=4) == []
+    assert tracker.ready(now=8) == []
+    assert tracker.ready(now=9) == [str(path)]
+    assert tracker.pending == {}
+
+
+@pytest.mark.parametrize('backend', ['inotify', 'polling'])
+def test_watch_service_processes_settled_videos_once(tmp_path, backend):
+    (tmp_path / 'videos').mkdir()
+    processed = []
+    engine = JAVScraperEngine()
+    service = WatchService([str(tmp_path)], engine, lambda root, files: processed.append((root, files)),
+                           settle_seconds=0.2, backend=backend, poll_interval=0.1)
+    thread = threading.Thread(target=service.run)
+    thread.start()
+    try:
+        time.sleep(0.3)
+        (tmp_path / 'incoming').mkdir()
+        (tmp_path / 'incoming' / 'IPX-456.mp4').write_bytes(b'data')
+        (tmp_path / 'incoming' / 'IPX-456.mp4.part').write_bytes(b'data')
+        (tmp_path / 'videos' / 'SSIS-123.mp4').write_bytes(b'data')
+        deadline = time.monotonic() + 5
+        while not processed and time.monotonic() < deadline:
+            time.sleep(0.05)
+        time.sleep(0.5)
+    finally:
+        service.stop()
+        thread.join()
+
+    assert len(processed) == 1
+    root, files = processed[0]
+    assert root == str(tmp_path)
+    assert [file_info['jav_code'] for file_info in files] == ['IPX-456']
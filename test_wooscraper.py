@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Tests for the headless command line
+"""
+
+import json
+import os
+
+from click.testing import CliRunner
+
+from test_import_time import import_times
+from wooscraper import cli, parse_since
+
+
+def write_videos(folder, names):
+    folder.mkdir(parents=True, exist_ok=True)
+    for name in names:
+        (folder / name).write_bytes(b'')
+
+
+def run_cli(*args):
+    result = CliRunner().invoke(cli, ['--config', 'config.yml', *args])
+    return result, [json.loads(line) for line in result.output.splitlines()]
+
+
+def test_scan_writes_json_lines(tmp_path):
+    write_videos(tmp_path, ['SSIS-123.mp4', 'notes.txt', 'IPX-456-C.mkv'])
+
+    result, events = run_cli('scan', str(tmp_path))
+
+    assert result.exit_code == 0
+    assert sorted(event['jav_code'] for event in events if event['event'] == 'file') == ['IPX-456', 'SSIS-123']
+    assert events[-1] == {'event': 'done', 'total': 2}
+
+
+def test_scan_group_detects_parts_and_copies(tmp_path):
+    write_videos(tmp_path, ['SSIS-123-CD2.mp4', 'SSIS-123-CD1.mp4', 'WAAA-971-C.mp4'])
+    write_videos(tmp_path / 'copy', ['waaa971.mkv'])
+
+    result, events = run_cli('scan', str(tmp_path), '--group')
+
+    groups = {event['jav_code']: event['files'] for event in events if event['event'] == 'code'}
+    assert result.exit_code == 0
+    assert [member['part'] for member in groups['SSIS-123']] == [1, 2]
+    assert [member['part'] for member in groups['WAAA-971']] == [None, None]
+    assert events[-1] == {'event': 'done', 'total': 4, 'codes': 2}
+
+
+def test_scan_since_only_lists_recent_files(tmp_path):
+    write_videos(tmp_path, ['SSIS-123.mp4', 'IPX-456.mp4'])
+    old = tmp_path / 'IPX-456.mp4'
+    os.utime(old, (old.stat().st_atime, old.stat().st_mtime - 3 * 86400))
+
+    result, events = run_cli('scan', str(tmp_path), '--since', '1d')
+
+    assert result.exit_code == 0
+    assert [event['jav_code'] for event in events if event['event'] == 'file'] == ['SSIS-123']
+
+
+def test_scrape_without_files_reports_done(tmp_path):
+    write_videos(tmp_path, ['notes.txt'])
+
+    result, events = run_cli('scrape', str(tmp_path), '--dry-run')
+
+    assert result.exit_code == 0
+    assert events == [{'event': 'done', 'total': 0, 'processed': 0, 'failed': 0, 'error': None}]
+
+
+def test_parse_since_accepts_durations_and_dates():
+    assert parse_since('2h', now=10_000.0) == 10_000.0 - 7200
+    assert parse_since('7d', now=1_000_000.0) == 1_000_000.0 - 7 * 86400
+    assert parse_since('2026-01-31') > parse_since('2026-01-30')
+
+
+def test_cli_does_not_import_flask():
+    assert not [name for name in import_times('wooscraper') if name.split('.')[0] == 'flask']
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Tests for the distributed work queue brokers
+"""
+
+import asyncio
+import sqlite3
+import time
+
+import pytest
+import yaml
+
+from site_health import SITE_HEALTH
+from work_queue import (COMPLETED, FAILED, LEASED, PENDING, LocalWorkQueue, QueueCoordinator, SQLiteWorkQueue,
+                        open_work_queue, run_node)
+
+
+@pytest.fixture(params=['sqlite', 'memory'])
+def work_queue(request, tmp_path):
+    if request.param == 'memory':
+        yield LocalWorkQueue(max_attempts=2)
+    else:
+        broker = SQLiteWorkQueue(str(tmp_path / "queue.db"), max_attempts=2)
+        yield broker
+        broker.close()
+
+
+def test_lease_complete_roundtrip(work_queue):
+    assert work_queue.enqueue('job', ['ABC-123', 'XYZ-001', 'ABC-123']) == 2
+
+    assert work_queue.lease('node-a', 60) == ('job', 'ABC-123')
+    assert work_queue.lease('node-b', 60) == ('job', 'XYZ-001')
+    assert work_queue.lease('node-c', 60) is None
+
+    assert work_queue.complete('job', 'ABC-123', 'node-a', {'best_title': 'Title'})
+    assert work_queue.get_result('job', 'ABC-123') == (COMPLETED, {'best_title': 'Title'}, None)
+    assert work_queue.counts('job') == {PENDING: 0, LEASED: 1, COMPLETED: 1, FAILED: 0}
+
+
+def test_expired_lease_is_picked_up_again(work_queue):
+    work_queue.enqueue('job', ['ABC-123'])
+    assert work_queue.lease('dead-node', 0.01) == ('job', 'ABC-123')
+    time.sleep(0.05)
+
+    assert not work_queue.renew('job', 'ABC-123', 'other-node', 60)
+    assert work_queue.lease('live-node', 60) == ('job', 'ABC-123')
+    assert work_queue.renew('job', 'ABC-123', 'live-node', 60)
+
+    # A late report from the dead node still completes the item once
+    assert work_queue.complete('job', 'ABC-123', 'dead-node', {'source': 'late'})
+    assert not work_queue.complete('job', 'ABC-123', 'live-node', {'source': 'second'})
+    assert work_queue.get_result('job', 'ABC-123')[1] == {'source': 'late'}
+
+
+def test_item_fails_after_max_attempts(work_queue):
+    work_queue.enqueue('job', ['ABC-123'])
+    for _ in range(2):
+        assert work_queue.lease('node', 60) == ('job', 'ABC-123')
+        work_queue.fail('job', 'ABC-123', 'node', 'timeout')
+
+    assert work_queue.lease('node', 60) is None
+    status, metadata, error = work_queue.get_result('job', 'ABC-123')
+    assert (status, metadata, error) == (FAILED, None, 'timeout')
+
+
+def test_deferred_item_waits_without_using_an_attempt(work_queue):
+    work_queue.enqueue('job', ['ABC-123'])
+    assert work_queue.lease('node', 60) == ('job', 'ABC-123')
+
+    assert work_queue.defer('job', 'ABC-123', 'node', 0.05, 'held', max_reschedules=1)
+    assert work_queue.lease('node', 60) is None
+    time.sleep(0.06)
+    assert work_queue.lease('node', 60) == ('job', 'ABC-123')
+    assert not work_queue.defer('job', 'ABC-123', 'node', 0.05, 'held', max_reschedules=1)
+    # Both leases of max_attempts=2 are still left after the deferral
+    work_queue.fail('job', 'ABC-123', 'node', 'timeout')
+    assert work_queue.lease('node', 60) == ('job', 'ABC-123')
+
+
+def test_node_defers_codes_of_held_sites(tmp_path):
+    with open('config.yml') as f:
+        config = yaml.safe_load(f)
+    config['local_store'] = {'enabled': False}
+    config_path = tmp_path / 'config.yml'
+    config_path.write_text(yaml.safe_dump(config))
+    broker = SQLiteWorkQueue(str(tmp_path / 'queue.db'), max_attempts=3)
+    broker.enqueue('job', ['SSIS-123'])
+    held = dict(SITE_HEALTH.held_until)
+    for site in ('jav.guru', 'www5.javmost.com', 'javtrailers.com'):
+        SITE_HEALTH.hold(site, 120)
+    try:
+        asyncio.run(run_node(broker, str(config_path), node_id='node', exit_when_idle=True))
+    finally:
+        SITE_HEALTH.held_until = held
+
+    assert broker.counts('job')[PENDING] == 1
+    assert broker.lease('node', 60) is None
+    row = broker._conn.execute("SELECT attempts, reschedules, not_before FROM work_items").fetchone()
+    assert row[:2] == (0, 1) and row[2] > time.time() + 100
+    broker.close()
+
+
+def test_closing_the_coordinator_cancels_unfinished_codes(tmp_path):
+    broker = SQLiteWorkQueue(str(tmp_path / 'queue.db'))
+    coordinator = QueueCoordinator(broker, job_id='job')
+    coordinator.start(['ABC-123', 'XYZ-001', 'DEF-002'])
+    assert broker.lease('node', 60) == ('job', 'ABC-123')
+    broker.complete('job', 'ABC-123', 'node', {'best_title': 'Title'})
+    assert broker.lease('node', 60) == ('job', 'XYZ-001')
+
+    coordinator.close()
+
+    other = SQLiteWorkQueue(str(tmp_path / 'queue.db'))
+    assert other.counts('job') == {PENDING: 0, LEASED: 0, COMPLETED: 1, FAILED: 2}
+    assert other.lease('node', 60) is None
+    assert not other.renew('job', 'XYZ-001', 'node', 60)
+    other.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        broker.counts('job')
+
+
+def test_only_brokers_nodes_can_reach_are_configurable(tmp_path):
+    broker = open_work_queue({'distributed': {'queue': str(tmp_path / 'queue.db')}})
+    assert isinstance(broker, SQLiteWorkQueue)
+    broker.close()
+
+    with pytest.raises(ValueError):
+        open_work_queue({'distributed': {'broker': 'memory'}})
@@ -0,0 +1,334 @@
+"""
+Folder Watcher
+==============
+
+Scrape new downloads as they arrive instead of re-running whole folders.
+
+The watched roots are monitored with inotify (through ``ctypes``, Linux only)
+or, where inotify is unavailable or out of watches, by polling the roots for
+new or changed files. A file is only handed on once its size has stopped
+changing for ``settle_seconds``, so downloads that are still being written
+are not picked up half-way. Settled videos with a JAV code are then scraped
+and organized with the regular job, one batch of settled files at a time.
+
+Videos already organized into ``<root>/videos`` are ignored, so moving a file
+there does not trigger another scrape.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import select
+import struct
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+# inotify event bits, from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+class InotifyWatcher:
+    """
+    Report files created, written or moved into a set of folder trees.
+    """
+
+    def __init__(self, roots: List[str], ignore: Optional[Callable[[str], bool]] = None):
+        """
+        Initialize the watcher and add a watch for every folder below ``roots``.
+
+        Args:
+            roots (List[str]): Folders to watch recursively
+            ignore (Callable, optional): Returns True for folders that must not be watched
+
+        Raises:
+            OSError: If inotify is unavailable or the watch limit is reached
+        """
+        self.roots = roots
+        self.ignore = ignore or (lambda path: False)
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        if not hasattr(self._libc, 'inotify_init1'):
+            raise OSError(errno.ENOSYS, "inotify is not available")
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._folders: Dict[int, str] = {}
+        for root in roots:
+            self._add_tree(root)
+
+    def _add_watch(self, folder: str):
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(folder), WATCH_MASK)
+        if wd < 0:
+            error = ctypes.get_errno()
+            if error == errno.ENOENT:
+                return
+            raise OSError(error, f"inotify_add_watch failed for {folder}: {os.strerror(error)}")
+        self._folders[wd] = folder
+
+    def _add_tree(self, root: str) -> List[str]:
+        """Watch ``root`` and its subfolders; return the files already inside them."""
+        files = []
+        for folder, subfolders, filenames in os.walk(root):
+            if self.ignore(folder):
+                subfolders[:] = []
+                continue
+            self._add_watch(folder)
+            files.extend(os.path.join(folder, name) for name in filenames)
+        return files
+
+    def read(self, timeout: float) -> List[str]:
+        """
+        Wait up to ``timeout`` seconds for events.
+
+        Returns:
+            List[str]: Paths of files that were created, written or moved in
+        """
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return []
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        paths = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped; fall back to listing the roots once
+                logging.warning("⚠️ inotify queue overflowed, rescanning watched folders")
+                for root in self.roots:
+                    paths.extend(self._add_tree(root))
+                continue
+            if mask & IN_IGNORED:
+                self._folders.pop(wd, None)
+                continue
+            folder = self._folders.get(wd)
+            if folder is None or not name:
+                continue
+            path = os.path.join(folder, name)
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO) and not self.ignore(path):
+                    # A folder moved in may already contain finished downloads
+                    paths.extend(self._add_tree(path))
+            else:
+                paths.append(path)
+        return paths
+
+    def close(self):
+        """Release the inotify file descriptor."""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class PollingWatcher:
+    """
+    Report new or changed files by listing the roots at a fixed interval.
+    """
+
+    def __init__(self, roots: List[str], interval: float = 5.0, ignore: Optional[Callable[[str], bool]] = None):
+        """
+        Initialize the watcher; files present now are treated as already seen.
+
+        Args:
+            roots (List[str]): Folders to watch recursively
+            interval (float): Seconds between listings
+            ignore (Callable, optional): Returns True for folders that must not be listed
+        """
+        self.roots = roots
+        self.interval = interval
+        self.ignore = ignore or (lambda path: False)
+        self._next_poll = 0.0
+        self._seen = self._listing()
+
+    def _listing(self) -> Dict[str, tuple]:
+        seen = {}
+        for root in self.roots:
+            for folder, subfolders, filenames in os.walk(root):
+                if self.ignore(folder):
+                    subfolders[:] = []
+                    continue
+                for name in filenames:
+                    path = os.path.join(folder, name)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    seen[path] = (stat.st_size, stat.st_mtime_ns)
+        return seen
+
+    def read(self, timeout: float) -> List[str]:
+        """
+        Wait up to ``timeout`` seconds for the next listing.
+
+        Returns:
+            List[str]: Paths that are new or changed since the previous listing
+        """
+        delay = self._next_poll - time.monotonic()
+        if delay > timeout:
+            time.sleep(timeout)
+            return []
+        time.sleep(max(0.0, delay))
+        self._next_poll = time.monotonic() + self.interval
+
+        listing = self._listing()
+        changed = [path for path, state in listing.items() if self._seen.get(path) != state]
+        self._seen = listing
+        return changed
+
+    def close(self):
+        """Nothing to release."""
+
+
+class SettleTracker:
+    """
+    Hold back files until their size has not changed for ``settle_seconds``.
+    """
+
+    def __init__(self, settle_seconds: float = 5.0):
+        self.settle_seconds = settle_seconds
+        # path -> (last seen size, time of the last change)
+        self.pending: Dict[str, tuple] = {}
+
+    def touch(self, path: str, now: Optional[float] = None):
+        """Record activity on ``path``; its settle time starts again."""
+        self.pending[path] = (-1, time.monotonic() if now is None else now)
+
+    def ready(self, now: Optional[float] = None) -> List[str]:
+        """
+        Return the files that have settled and stop tracking them.
+
+        Returns:
+            List[str]: Paths whose size stayed the same for ``settle_seconds``
+        """
+        now = time.monotonic() if now is None else now
+        settled = []
+        for path, (size, since) in list(self.pending.items()):
+            try:
+                current = os.stat(path).st_size
+            except FileNotFoundError:
+                del self.pending[path]
+                continue
+            if current != size:
+                self.pending[path] = (current, now)
+            elif now - since >= self.settle_seconds:
+                del self.pending[path]
+                settled.append(path)
+        return settled
+
+
+def create_watcher(roots: List[str], backend: str = 'auto', poll_interval: float = 5.0,
+                   ignore: Optional[Callable[[str], bool]] = None):
+    """
+    Create an inotify watcher, or a polling watcher when inotify cannot be used.
+
+    Args:
+        roots (List[str]): Folders to watch
+        backend (str): ``auto``, ``inotify`` or ``polling``
+        poll_interval (float): Seconds between listings for the polling watcher
+        ignore (Callable, optional): Returns True for folders that must not be watched
+
+    Returns:
+        InotifyWatcher or PollingWatcher
+    """
+    if backend in ('auto', 'inotify'):
+        try:
+            return InotifyWatcher(roots, ignore=ignore)
+        except (OSError, AttributeError) as e:
+            if backend == 'inotify':
+                raise
+            logging.warning("⚠️ inotify unavailable (%s), polling every %ss instead", e, poll_interval)
+    return PollingWatcher(roots, interval=poll_interval, ignore=ignore)
+
+
+class WatchService:
+    """
+    Watch folders and scrape every new video once it has finished downloading.
+    """
+
+    def __init__(self, roots: Iterable[str], engine, process: Callable[[str, List[Dict]], None],
+                 settle_seconds: float = 5.0, backend: str = 'auto', poll_interval: float = 5.0,
+                 organize_files: bool = True):
+        """
+        Initialize the service.
+
+        Args:
+            roots (Iterable[str]): Folders to watch
+            engine (JAVScraperEngine): Engine used for the video extensions and ``extract_jav_code``
+            process (Callable): Called with a root and the settled files below it, in ``scan_folder`` format
+            settle_seconds (float): Seconds a file's size must stay unchanged
+            backend (str): ``auto``, ``inotify`` or ``polling``
+            poll_interval (float): Seconds between listings for the polling watcher
+            organize_files (bool): Whether files are moved to ``<root>/videos``, which is then not watched
+        """
+        self.roots = [os.path.abspath(root) for root in roots]
+        self.engine = engine
+        self.process = process
+        self.tracker = SettleTracker(settle_seconds)
+        self.backend = backend
+        self.poll_interval = poll_interval
+        self.organized_folders = [os.path.join(root, 'videos') for root in self.roots] if organize_files else []
+        self.video_extensions = {ext.lower() for ext in engine.settings.video_extensions}
+        self.stop_event = threading.Event()
+
+    def _ignored(self, folder: str) -> bool:
+        return any(folder == organized or folder.startswith(organized + os.sep)
+                   for organized in self.organized_folders)
+
+    def _file_info(self, path: str) -> Optional[Dict]:
+        """Describe a settled file like ``scan_folder`` does, or return None if it is not a JAV video."""
+        name = os.path.basename(path)
+        if os.path.splitext(name)[1].lower() not in self.video_extensions:
+            return None
+        jav_code = self.engine.extract_jav_code(name)
+        if not jav_code:
+            logging.debug("👀 Ignoring %s: no JAV code", path)
+            return None
+        return {'file_path': path, 'filename': name, 'jav_code': jav_code, 'folder': os.path.dirname(path)}
+
+    def _root_of(self, path: str) -> str:
+        return max((root for root in self.roots if path.startswith(root + os.sep)), key=len, default=self.roots[0])
+
+    def run(self):
+        """Watch until ``stop_event`` is set."""
+        watcher = create_watcher(self.roots, self.backend, self.poll_interval, ignore=self._ignored)
+        logging.info("👀 Watching %s with %s", ', '.join(self.roots), type(watcher).__name__)
+        try:
+            while not self.stop_event.is_set():
+                for path in watcher.read(timeout=min(1.0, self.tracker.settle_seconds or 1.0)):
+                    if not self._ignored(os.path.dirname(path)):
+                        self.tracker.touch(path)
+
+                batches: Dict[str, List[Dict]] = {}
+                for path in self.tracker.ready():
+                    file_info = self._file_info(path)
+                    if file_info:
+                        batches.setdefault(self._root_of(path), []).append(file_info)
+                for root, files in batches.items():
+                    logging.info("📥 %s new video(s) in %s: %s", len(files), root,
+                                 ', '.join(file_info['jav_code'] for file_info in files))
+                    self.process(root, files)
+        finally:
+            watcher.close()
+
+    def stop(self):
+        """Ask ``run`` to return after the current batch."""
+        self.stop_event.set()
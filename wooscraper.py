@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Wooscraper Command Line
+=======================
+
+Headless batch mode for servers and cron jobs.
+
+Runs the same scraping job as the web app without starting Flask or opening a
+browser tab. Every command writes one JSON object per line to stdout; log
+messages go to stderr and the configured log file.
+
+Usage::
+
+    python wooscraper.py scan /media/jav
+    python wooscraper.py scan /media/jav --group
+    python wooscraper.py scrape /media/jav --workers 4 --since 24h
+    python wooscraper.py scrape /media/jav --dry-run
+    python wooscraper.py reparse /media/jav/videos --since 2026-01-01
+    python wooscraper.py watch /media/jav/downloads
+    python wooscraper.py misses SSIS-123 --forget
+    python wooscraper.py catalog javguru --pages 300
+
+The exit status is 1 when a file or the job failed.
+"""
+
+import asyncio
+import json
+import os
+import re
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import click
+
+import jobs
+from catalog import CatalogCrawler
+from scraper_engine import JAVScraperEngine
+from watcher import WatchService
+
+_DURATION_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+
+
+def parse_since(value: str, now: Optional[float] = None) -> float:
+    """
+    Convert a ``--since`` value to a Unix timestamp.
+
+    Args:
+        value (str): A duration such as ``30m``, ``24h`` or ``7d``, or an ISO date/datetime
+        now (float, optional): Reference time for durations; defaults to the current time
+
+    Returns:
+        float: Files modified at or after this timestamp are selected
+
+    Raises:
+        ValueError: If the value is neither a duration nor an ISO date
+    """
+    match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([smhdw])\s*', value, re.IGNORECASE)
+    if match:
+        number, unit = match.groups()
+        reference = datetime.now().timestamp() if now is None else now
+        return reference - float(number) * _DURATION_UNITS[unit.lower()]
+    return datetime.fromisoformat(value.strip()).timestamp()
+
+
+def _since_option(ctx, param, value):
+    """Click callback turning ``--since`` into a timestamp."""
+    if value is None:
+        return None
+    try:
+        return parse_since(value)
+    except ValueError:
+        raise click.BadParameter("expected a duration such as 24h or 7d, or an ISO date such as 2026-01-31")
+
+
+def emit(event: Dict):
+    """Write one JSON line to stdout."""
+    click.echo(json.dumps(event, ensure_ascii=False))
+
+
+def find_files(folder: str, config_path: str, since: Optional[float] = None) -> List[Dict]:
+    """
+    Scan ``folder`` for JAV videos, optionally keeping only recently modified files.
+
+    Args:
+        folder (str): Folder to scan recursively
+        config_path (str): Path to the configuration file
+        since (float, optional): Only keep files modified at or after this timestamp
+
+    Returns:
+        List[Dict]: Files as returned by ``JAVScraperEngine.scan_folder``
+    """
+    files = JAVScraperEngine(config_path).scan_folder(folder)
+    if since is not None:
+        files = [file_info for file_info in files if os.stat(file_info['file_path']).st_mtime >= since]
+    return files
+
+
+def _run(ctx, folder: str, files: List[Dict], ui_settings: Dict, dry_run: bool):
+    """Run a job over ``files`` and exit with its status."""
+    if not files:
+        emit({'event': 'done', 'total': 0, 'processed': 0, 'failed': 0, 'error': None})
+        return
+
+    ui_settings['dry_run'] = dry_run
+    status = jobs.run_scraping_job(folder, ui_settings, ctx.obj['config_path'], file_list=files, on_event=emit)
+    ctx.exit(1 if status['error'] else 0)
+
+
+folder_argument = click.argument('folder', type=click.Path(exists=True, file_okay=False, resolve_path=True))
+since_option = click.option('--since', callback=_since_option, metavar='WHEN',
+                            help="Only files modified within a duration (30m, 24h, 7d) or since an ISO date.")
+workers_option = click.option('--workers', type=click.IntRange(min=1),
+                              help="Scrape worker processes (default: scraper.workers).")
+dry_run_option = click.option('--dry-run', is_flag=True,
+                              help="Scrape metadata and report the planned moves and folders without changing any files.")
+
+
+@click.group()
+@click.option('--config', 'config_path', default='config.yml', show_default=True,
+              type=click.Path(dir_okay=False), help="Configuration file.")
+@click.pass_context
+def cli(ctx, config_path):
+    """Scrape JAV metadata and organize videos without the web interface."""
+    ctx.obj = {'config_path': config_path}
+
+
+@cli.command()
+@folder_argument
+@since_option
+@click.option('--group', is_flag=True, help="One line per JAV code with its files and parts.")
+@click.pass_context
+def scan(ctx, folder, since, group):
+    """List the JAV videos found in FOLDER."""
+    files = find_files(folder, ctx.obj['config_path'], since)
+    if group:
+        groups = JAVScraperEngine(ctx.obj['config_path']).group_by_code(files)
+        for code_group in groups:
+            emit({'event': 'code', **code_group})
+        emit({'event': 'done', 'total': len(files), 'codes': len(groups)})
+        return
+    for file_info in files:
+        emit({'event': 'file', **file_info})
+    emit({'event': 'done', 'total': len(files)})
+
+
+@cli.command()
+@folder_argument
+@workers_option
+@dry_run_option
+@since_option
+@click.option('--no-organize', is_flag=True, help="Write NFO files next to the videos instead of moving them.")
+@click.option('--no-images', is_flag=True, help="Skip fanart, poster and portrait downloads.")
+@click.option('--profile', type=click.Choice(['sampling', 'cprofile']), help="Profile the job.")
+@click.option('--recheck', is_flag=True, help="Ask sources again that recently had no result for a code.")
+@click.pass_context
+def scrape(ctx, folder, workers, dry_run, since, no_organize, no_images, profile, recheck):
+    """Scrape metadata for the videos in FOLDER, organize them and write NFO files."""
+    files = find_files(folder, ctx.obj['config_path'], since)
+    ui_settings = {
+        'create_nfo': True,
+        'download_cover': not no_images,
+        'organize_files': not no_organize,
+        'workers': workers,
+        'profile': profile,
+        'recheck': recheck,
+        'folder_path': folder,
+    }
+    _run(ctx, folder, files, ui_settings, dry_run)
+
+
+@cli.command()
+@folder_argument
+@workers_option
+@dry_run_option
+@since_option
+@click.pass_context
+def reparse(ctx, folder, workers, dry_run, since):
+    """Refresh movie.nfo for videos in FOLDER that were already organized.
+
+    Metadata is scraped again and the NFO file is rewritten in place; videos
+    are not moved and images are not downloaded again.
+    """
+    files = [file_info for file_info in find_files(folder, ctx.obj['config_path'], since)
+             if os.path.exists(os.path.join(file_info['folder'], 'movie.nfo'))]
+    ui_settings = {
+        'create_nfo': True,
+        'download_cover': False,
+        'organize_files': False,
+        'workers': workers,
+        'folder_path': folder,
+    }
+    _run(ctx, folder, files, ui_settings, dry_run)
+
+
+@cli.command()
+@click.argument('codes', nargs=-1)
+@click.option('--forget', is_flag=True, help="Clear the misses of CODES (all codes without CODES).")
+@click.pass_context
+def misses(ctx, codes, forget):
+    """List the sources that had no result for CODES (default: all codes).
+
+    Sources are skipped for a code until the backoff after its last miss has
+    passed; --forget clears the misses so the next run asks them again.
+    """
+    store = JAVScraperEngine(ctx.obj['config_path']).store
+    if store is None:
+        raise click.UsageError("The local store is disabled (local_store.enabled)")
+    codes = [code.upper() for code in codes]
+    if forget:
+        emit({'event': 'forgotten', 'removed': store.forget(codes or None)})
+        return
+    records = [record for code in codes for record in store.misses(code)] if codes else store.misses()
+    for record in records:
+        for key in ('first_missed', 'last_checked', 'retry_after'):
+            record[key] = datetime.fromtimestamp(record[key]).isoformat(timespec='seconds')
+        emit({'event': 'miss', **record})
+    emit({'event': 'done', 'total': len(records)})
+
+
+@cli.command()
+@click.argument('source')
+@click.option('--url', help="Listing URL with {page}, or a sitemap URL ending in .xml (default: catalog.sources).")
+@click.option('--pages', type=click.IntRange(min=1), help="Most pages to fetch (default: 100).")
+@click.option('--start-page', type=click.IntRange(min=1), help="First listing page.")
+@click.option('--full', is_flag=True, help="Keep going past pages without new codes.")
+@click.pass_context
+def catalog(ctx, source, url, pages, start_page, full):
+    """Index the codes SOURCE lists, so they are scraped without a search.
+
+    Crawls the listing pages of SOURCE (e.g. javguru) at its rate limit and
+    stores every code's detail page URL, title, cover and date in the local
+    store. Without --full the crawl stops at the first page without new codes.
+    """
+    engine = JAVScraperEngine(ctx.obj['config_path'])
+
+    async def crawl():
+        async with engine:
+            crawler = CatalogCrawler.from_config(engine, source, url=url, pages=pages, start_page=start_page,
+                                                 incremental=not full)
+            return await crawler.crawl(on_page=lambda page: emit({'event': 'page', **page}))
+
+    try:
+        stats = asyncio.run(crawl())
+    except ValueError as e:
+        raise click.UsageError(str(e))
+    emit({'event': 'done', 'source': source, **stats})
+
+
+@cli.command()
+@click.argument('roots', nargs=-1, type=click.Path(exists=True, file_okay=False, resolve_path=True))
+@click.option('--settle', type=float, help="Seconds a file's size must stay unchanged (default: watch.settle_seconds).")
+@click.option('--backend', type=click.Choice(['auto', 'inotify', 'polling']),
+              help="How to detect new files (default: watch.backend).")
+@click.option('--no-organize', is_flag=True, help="Write NFO files next to the videos instead of moving them.")
+@click.option('--no-images', is_flag=True, help="Skip fanart, poster and portrait downloads.")
+@click.pass_context
+def watch(ctx, roots, settle, backend, no_organize, no_images):
+    """Scrape new videos in ROOTS (default: watch.roots) once they finish downloading."""
+    config_path = ctx.obj['config_path']
+    engine = JAVScraperEngine(config_path)
+    watch_config = engine.settings.section('watch')
+    roots = list(roots) or [os.path.abspath(root) for root in watch_config.get('roots') or []]
+    if not roots:
+        raise click.UsageError("No folders to watch: pass ROOTS or set watch.roots in the configuration")
+
+    def process(root: str, files: List[Dict]):
+        ui_settings = {
+            'create_nfo': True,
+            'download_cover': not no_images,
+            'organize_files': not no_organize,
+            'workers': 1,
+            'folder_path': root,
+        }
+        jobs.run_scraping_job(root, ui_settings, config_path, file_list=files, on_event=emit)
+
+    service = WatchService(
+        roots, engine, process,
+        settle_seconds=settle if settle is not None else float(watch_config.get('settle_seconds', 5)),
+        backend=backend or watch_config.get('backend', 'auto'),
+        poll_interval=float(watch_config.get('poll_interval', 5)),
+        organize_files=not no_organize,
+    )
+    emit({'event': 'watching', 'roots': roots})
+    try:
+        service.run()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    cli()
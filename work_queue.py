@@ -0,0 +1,584 @@
+#!/usr/bin/env python3
+"""
+Distributed Work Queue
+======================
+
+Shared work queue for scraping one library from several machines.
+
+The job process (the coordinator) enqueues the unique JAV codes of a job.
+Scraper nodes on any machine lease codes from the queue, run
+``scrape_all_sites`` for them and report the metadata back. A lease expires
+when a node stops renewing it (for example because the node died), after which
+the code is handed to another node. The coordinator keeps ownership of NFO
+writing and file moves; nodes never touch the library.
+
+Two brokers are provided:
+
+- ``SQLiteWorkQueue``: a single SQLite file on storage shared by all nodes
+- ``LocalWorkQueue``: an in-process stand-in with the same interface, for
+  tests; no node outside the process can lease from it
+
+Run a node with::
+
+    python work_queue.py --queue /mnt/shared/wooscraper-queue.db
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+PENDING = 'pending'
+LEASED = 'leased'
+COMPLETED = 'completed'
+FAILED = 'failed'
+
+
+class WorkQueue:
+    """
+    Interface of a work queue broker.
+
+    Every item is identified by ``(job_id, jav_code)``. Items move from
+    ``pending`` to ``leased`` when a node takes them, and end as ``completed``
+    or ``failed``. A lease whose deadline has passed is treated as pending.
+    A deferred item is pending but not leased before its ``not_before`` time.
+    """
+
+    def __init__(self, max_attempts: int = 3):
+        """
+        Initialize the broker.
+
+        Args:
+            max_attempts (int): Leases allowed per item before it is marked failed
+        """
+        self.max_attempts = max_attempts
+
+    def enqueue(self, job_id: str, jav_codes: List[str]) -> int:
+        """Add codes to a job, ignoring codes already queued. Returns the number added."""
+        raise NotImplementedError
+
+    def lease(self, node_id: str, lease_seconds: float) -> Optional[Tuple[str, str]]:
+        """Lease the oldest available item. Returns ``(job_id, jav_code)`` or None."""
+        raise NotImplementedError
+
+    def renew(self, job_id: str, jav_code: str, node_id: str, lease_seconds: float) -> bool:
+        """Extend a lease held by ``node_id``. Returns False if the lease was lost."""
+        raise NotImplementedError
+
+    def complete(self, job_id: str, jav_code: str, node_id: str, metadata: Dict) -> bool:
+        """Store the metadata of an item. The first completion wins."""
+        raise NotImplementedError
+
+    def fail(self, job_id: str, jav_code: str, node_id: str, error: str):
+        """Release an item after an error so it can be retried or marked failed."""
+        raise NotImplementedError
+
+    def defer(self, job_id: str, jav_code: str, node_id: str, retry_in: float, error: str,
+              max_reschedules: int) -> bool:
+        """
+        Release a leased item that may only be retried after ``retry_in`` seconds.
+
+        The lease does not count as an attempt. Returns False, leaving the item
+        leased, once it was deferred ``max_reschedules`` times; ``fail`` it then.
+        """
+        raise NotImplementedError
+
+    def cancel(self, job_id: str, error: str = 'Job cancelled') -> int:
+        """Mark the pending and leased items of a job failed so no node picks them up. Returns the number."""
+        raise NotImplementedError
+
+    def get_result(self, job_id: str, jav_code: str) -> Optional[Tuple[str, Optional[Dict], Optional[str]]]:
+        """Return ``(status, metadata, error)`` of an item, or None if unknown."""
+        raise NotImplementedError
+
+    def counts(self, job_id: str) -> Dict[str, int]:
+        """Return the number of items per status for a job."""
+        raise NotImplementedError
+
+    def close(self):
+        """Release the broker's resources."""
+
+
+class LocalWorkQueue(WorkQueue):
+    """In-memory broker with the same semantics as ``SQLiteWorkQueue``."""
+
+    def __init__(self, max_attempts: int = 3):
+        super().__init__(max_attempts)
+        self._lock = threading.Lock()
+        self._items: Dict[Tuple[str, str], Dict] = {}
+
+    def _is_available(self, item: Dict, now: float) -> bool:
+        if item['status'] == PENDING:
+            return item['not_before'] <= now
+        return item['status'] == LEASED and item['lease_expires'] < now
+
+    def enqueue(self, job_id: str, jav_codes: List[str]) -> int:
+        added = 0
+        with self._lock:
+            for jav_code in jav_codes:
+                key = (job_id, jav_code)
+                if key in self._items:
+                    continue
+                self._items[key] = {
+                    'status': PENDING, 'node_id': None, 'lease_expires': 0.0, 'not_before': 0.0,
+                    'attempts': 0, 'reschedules': 0, 'metadata': None, 'error': None,
+                    'created': time.time(),
+                }
+                added += 1
+        return added
+
+    def lease(self, node_id: str, lease_seconds: float) -> Optional[Tuple[str, str]]:
+        now = time.time()
+        with self._lock:
+            for key, item in sorted(self._items.items(), key=lambda entry: entry[1]['created']):
+                if not self._is_available(item, now):
+                    continue
+                if item['attempts'] >= self.max_attempts:
+                    item['status'] = FAILED
+                    item['error'] = item['error'] or 'Lease expired too many times'
+                    continue
+                item.update(status=LEASED, node_id=node_id, lease_expires=now + lease_seconds,
+                            attempts=item['attempts'] + 1)
+                return key
+        return None
+
+    def renew(self, job_id: str, jav_code: str, node_id: str, lease_seconds: float) -> bool:
+        with self._lock:
+            item = self._items.get((job_id, jav_code))
+            if not item or item['status'] != LEASED or item['node_id'] != node_id:
+                return False
+            item['lease_expires'] = time.time() + lease_seconds
+            return True
+
+    def complete(self, job_id: str, jav_code: str, node_id: str, metadata: Dict) -> bool:
+        with self._lock:
+            item = self._items.get((job_id, jav_code))
+            if not item or item['status'] == COMPLETED:
+                return False
+            item.update(status=COMPLETED, node_id=node_id, metadata=metadata, error=None)
+            return True
+
+    def fail(self, job_id: str, jav_code: str, node_id: str, error: str):
+        with self._lock:
+            item = self._items.get((job_id, jav_code))
+            if not item or item['status'] == COMPLETED:
+                return
+            status = FAILED if item['attempts'] >= self.max_attempts else PENDING
+            item.update(status=status, node_id=None, lease_expires=0.0, error=error)
+
+    def defer(self, job_id: str, jav_code: str, node_id: str, retry_in: float, error: str,
+              max_reschedules: int) -> bool:
+        with self._lock:
+            item = self._items.get((job_id, jav_code))
+            if (not item or item['status'] != LEASED or item['node_id'] != node_id
+                    or item['reschedules'] >= max_reschedules):
+                return False
+            item.update(status=PENDING, node_id=None, lease_expires=0.0, not_before=time.time() + retry_in,
+                        attempts=item['attempts'] - 1, reschedules=item['reschedules'] + 1, error=error)
+            return True
+
+    def cancel(self, job_id: str, error: str = 'Job cancelled') -> int:
+        cancelled = 0
+        with self._lock:
+            for (item_job_id, _), item in self._items.items():
+                if item_job_id == job_id and item['status'] in (PENDING, LEASED):
+                    item.update(status=FAILED, node_id=None, lease_expires=0.0, error=error)
+                    cancelled += 1
+        return cancelled
+
+    def get_result(self, job_id: str, jav_code: str) -> Optional[Tuple[str, Optional[Dict], Optional[str]]]:
+        with self._lock:
+            item = self._items.get((job_id, jav_code))
+            if not item:
+                return None
+            return item['status'], item['metadata'], item['error']
+
+    def counts(self, job_id: str) -> Dict[str, int]:
+        counts = {PENDING: 0, LEASED: 0, COMPLETED: 0, FAILED: 0}
+        with self._lock:
+            for (item_job_id, _), item in self._items.items():
+                if item_job_id == job_id:
+                    counts[item['status']] += 1
+        return counts
+
+
+class SQLiteWorkQueue(WorkQueue):
+    """
+    Broker backed by a SQLite file on storage shared by all nodes.
+
+    The rollback journal is kept (no WAL) because WAL does not work on network
+    filesystems. Every state change runs in a ``BEGIN IMMEDIATE`` transaction so
+    two nodes can never lease the same item.
+    """
+
+    def __init__(self, path: str, max_attempts: int = 3, timeout: float = 30.0):
+        """
+        Initialize the broker.
+
+        Args:
+            path (str): Path of the SQLite queue file
+            max_attempts (int): Leases allowed per item before it is marked failed
+            timeout (float): Seconds to wait for a lock held by another node
+        """
+        super().__init__(max_attempts)
+        self.path = path
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS work_items (
+                job_id TEXT NOT NULL,
+                jav_code TEXT NOT NULL,
+                status TEXT NOT NULL,
+                node_id TEXT,
+                lease_expires REAL NOT NULL DEFAULT 0,
+                not_before REAL NOT NULL DEFAULT 0,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                reschedules INTEGER NOT NULL DEFAULT 0,
+                metadata TEXT,
+                error TEXT,
+                created REAL NOT NULL,
+                updated REAL NOT NULL,
+                PRIMARY KEY (job_id, jav_code)
+            )
+        """)
+        # Queue files created before items could be deferred
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(work_items)")}
+        for column, definition in (('not_before', 'REAL NOT NULL DEFAULT 0'),
+                                   ('reschedules', 'INTEGER NOT NULL DEFAULT 0')):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE work_items ADD COLUMN {column} {definition}")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS work_items_status ON work_items (status, created)")
+
+    def _transaction(self, callback):
+        """Run ``callback(cursor)`` in an immediate transaction and return its result."""
+        with self._lock:
+            cursor = self._conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                result = callback(cursor)
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+            cursor.execute("COMMIT")
+            return result
+
+    def enqueue(self, job_id: str, jav_codes: List[str]) -> int:
+        now = time.time()
+
+        def insert(cursor):
+            added = 0
+            for jav_code in jav_codes:
+                cursor.execute(
+                    "INSERT OR IGNORE INTO work_items (job_id, jav_code, status, created, updated) VALUES (?, ?, ?, ?, ?)",
+                    (job_id, jav_code, PENDING, now, now))
+                added += cursor.rowcount
+            return added
+
+        return self._transaction(insert)
+
+    def lease(self, node_id: str, lease_seconds: float) -> Optional[Tuple[str, str]]:
+        now = time.time()
+
+        def take(cursor):
+            # Items whose lease ran out too often are given up on
+            cursor.execute(
+                "UPDATE work_items SET status = ?, error = COALESCE(error, 'Lease expired too many times'), updated = ? "
+                "WHERE status = ? AND lease_expires < ? AND attempts >= ?",
+                (FAILED, now, LEASED, now, self.max_attempts))
+            row = cursor.execute(
+                "SELECT job_id, jav_code FROM work_items "
+                "WHERE (status = ? AND not_before <= ?) OR (status = ? AND lease_expires < ?) "
+                "ORDER BY created LIMIT 1",
+                (PENDING, now, LEASED, now)).fetchone()
+            if not row:
+                return None
+            cursor.execute(
+                "UPDATE work_items SET status = ?, node_id = ?, lease_expires = ?, attempts = attempts + 1, updated = ? "
+                "WHERE job_id = ? AND jav_code = ?",
+                (LEASED, node_id, now + lease_seconds, now, row[0], row[1]))
+            return row[0], row[1]
+
+        return self._transaction(take)
+
+    def renew(self, job_id: str, jav_code: str, node_id: str, lease_seconds: float) -> bool:
+        now = time.time()
+
+        def extend(cursor):
+            cursor.execute(
+                "UPDATE work_items SET lease_expires = ?, updated = ? "
+                "WHERE job_id = ? AND jav_code = ? AND status = ? AND node_id = ?",
+                (now + lease_seconds, now, job_id, jav_code, LEASED, node_id))
+            return cursor.rowcount == 1
+
+        return self._transaction(extend)
+
+    def complete(self, job_id: str, jav_code: str, node_id: str, metadata: Dict) -> bool:
+        now = time.time()
+        payload = json.dumps(metadata, ensure_ascii=False)
+
+        def store(cursor):
+            cursor.execute(
+                "UPDATE work_items SET status = ?, node_id = ?, metadata = ?, error = NULL, updated = ? "
+                "WHERE job_id = ? AND jav_code = ? AND status != ?",
+                (COMPLETED, node_id, payload, now, job_id, jav_code, COMPLETED))
+            return cursor.rowcount == 1
+
+        return self._transaction(store)
+
+    def fail(self, job_id: str, jav_code: str, node_id: str, error: str):
+        now = time.time()
+
+        def release(cursor):
+            cursor.execute(
+                "UPDATE work_items SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END, "
+                "node_id = NULL, lease_expires = 0, error = ?, updated = ? "
+                "WHERE job_id = ? AND jav_code = ? AND status != ?",
+                (self.max_attempts, FAILED, PENDING, error, now, job_id, jav_code, COMPLETED))
+
+        self._transaction(release)
+
+    def defer(self, job_id: str, jav_code: str, node_id: str, retry_in: float, error: str,
+              max_reschedules: int) -> bool:
+        now = time.time()
+
+        def postpone(cursor):
+            cursor.execute(
+                "UPDATE work_items SET status = ?, node_id = NULL, lease_expires = 0, not_before = ?, "
+                "attempts = attempts - 1, reschedules = reschedules + 1, error = ?, updated = ? "
+                "WHERE job_id = ? AND jav_code = ? AND status = ? AND node_id = ? AND reschedules < ?",
+                (PENDING, now + retry_in, error, now, job_id, jav_code, LEASED, node_id, max_reschedules))
+            return cursor.rowcount == 1
+
+        return self._transaction(postpone)
+
+    def cancel(self, job_id: str, error: str = 'Job cancelled') -> int:
+        now = time.time()
+
+        def give_up(cursor):
+            cursor.execute(
+                "UPDATE work_items SET status = ?, node_id = NULL, lease_expires = 0, error = ?, updated = ? "
+                "WHERE job_id = ? AND status IN (?, ?)",
+                (FAILED, error, now, job_id, PENDING, LEASED))
+            return cursor.rowcount
+
+        return self._transaction(give_up)
+
+    def get_result(self, job_id: str, jav_code: str) -> Optional[Tuple[str, Optional[Dict], Optional[str]]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, metadata, error FROM work_items WHERE job_id = ? AND jav_code = ?",
+                (job_id, jav_code)).fetchone()
+        if not row:
+            return None
+        status, metadata, error = row
+        return status, (json.loads(metadata) if metadata else None), error
+
+    def counts(self, job_id: str) -> Dict[str, int]:
+        counts = {PENDING: 0, LEASED: 0, COMPLETED: 0, FAILED: 0}
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM work_items WHERE job_id = ? GROUP BY status", (job_id,)).fetchall()
+        for status, count in rows:
+            counts[status] = count
+        return counts
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+def open_work_queue(config: Dict) -> WorkQueue:
+    """
+    Open the broker described by the ``distributed`` config section.
+
+    Args:
+        config (Dict): Full application configuration
+
+    Returns:
+        WorkQueue: ``SQLiteWorkQueue`` on the configured file
+
+    Raises:
+        ValueError: If ``broker`` is not ``sqlite``
+    """
+    settings = (config or {}).get('distributed', {}) or {}
+    broker = settings.get('broker', 'sqlite')
+    if broker != 'sqlite':
+        # Nodes run in other processes, so an in-process broker would never be served
+        raise ValueError(f"Unknown distributed broker {broker!r}, expected 'sqlite'")
+    return SQLiteWorkQueue(settings.get('queue', 'work_queue.db'), max_attempts=settings.get('max_attempts', 3))
+
+
+class QueueCoordinator:
+    """
+    Coordinator side of distributed scraping.
+
+    Offers the same ``start`` / ``get`` / ``close`` interface as
+    ``ScrapeCoordinator``, but the codes are scraped by whichever nodes lease
+    them from the shared queue.
+    """
+
+    def __init__(self, work_queue: WorkQueue, poll_interval: float = 1.0, job_id: Optional[str] = None):
+        """
+        Initialize the coordinator.
+
+        Args:
+            work_queue (WorkQueue): Broker shared with the scraper nodes
+            poll_interval (float): Seconds between result checks
+            job_id (str, optional): Queue job id; a random id is used by default
+        """
+        self.work_queue = work_queue
+        self.poll_interval = poll_interval
+        self.job_id = job_id or uuid.uuid4().hex
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'QueueCoordinator':
+        """Build a coordinator for the broker configured in ``distributed``."""
+        settings = (config or {}).get('distributed', {}) or {}
+        return cls(open_work_queue(config), poll_interval=settings.get('poll_interval', 1.0))
+
+    def start(self, jav_codes: List[str]):
+        """
+        Publish the unique codes of the job to the queue.
+
+        Args:
+            jav_codes (List[str]): JAV codes to scrape; duplicates are queued once
+        """
+        unique_codes = list(dict.fromkeys(code for code in jav_codes if code))
+        added = self.work_queue.enqueue(self.job_id, unique_codes)
+        logging.info("📬 Queued %s codes for job %s", added, self.job_id)
+
+    async def get(self, jav_code: str) -> Dict:
+        """
+        Wait until a node reports the metadata of ``jav_code``.
+
+        Args:
+            jav_code (str): JAV code previously passed to ``start``
+
+        Returns:
+            Dict: Combined metadata as returned by ``scrape_all_sites``
+
+        Raises:
+            RuntimeError: If the item failed on every attempt
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            # SQLite may wait up to its busy timeout for another node's lock
+            result = await loop.run_in_executor(None, self.work_queue.get_result, self.job_id, jav_code)
+            if result is None:
+                raise RuntimeError(f"{jav_code} is not part of job {self.job_id}")
+            status, metadata, error = result
+            if status == COMPLETED:
+                return metadata
+            if status == FAILED:
+                raise RuntimeError(f"Distributed scrape failed for {jav_code}: {error}")
+            await asyncio.sleep(self.poll_interval)
+
+    def close(self):
+        """Give up the items no node finished, so nodes stop scraping them, and close the broker."""
+        cancelled = self.work_queue.cancel(self.job_id)
+        if cancelled:
+            logging.info("📪 Cancelled %s unfinished codes of job %s", cancelled, self.job_id)
+        self.work_queue.close()
+
+
+async def run_node(work_queue: WorkQueue, config_path: str = "config.yml", node_id: Optional[str] = None,
+                   lease_seconds: float = 300, poll_interval: float = 5.0, exit_when_idle: bool = False):
+    """
+    Lease codes from the queue and scrape them until stopped.
+
+    The lease is renewed in the background while a code is being scraped, so
+    slow sites do not cause duplicate work; if the node dies the lease simply
+    runs out and another node picks the code up.
+
+    Args:
+        work_queue (WorkQueue): Shared broker
+        config_path (str): Path to the configuration file
+        node_id (str, optional): Name of this node; defaults to ``hostname:pid``
+        lease_seconds (float): Lease duration
+        poll_interval (float): Seconds to wait when the queue is empty
+        exit_when_idle (bool): Return instead of waiting when the queue is empty
+    """
+    from retry_policy import RetryLater
+    from scraper_engine import JAVScraperEngine
+
+    node_id = node_id or f"{socket.gethostname()}:{os.getpid()}"
+    logging.info("🛰️ Scraper node %s started", node_id)
+
+    # Queue calls can wait on another node's lock; keep them off the event loop
+    loop = asyncio.get_running_loop()
+
+    async with JAVScraperEngine(config_path) as engine:
+        while True:
+            item = await loop.run_in_executor(None, work_queue.lease, node_id, lease_seconds)
+            if item is None:
+                if exit_when_idle:
+                    break
+                await asyncio.sleep(poll_interval)
+                continue
+
+            job_id, jav_code = item
+            logging.info("🛰️ Node %s leased %s (job %s)", node_id, jav_code, job_id)
+
+            async def keep_lease():
+                while True:
+                    await asyncio.sleep(lease_seconds / 3)
+                    if not await loop.run_in_executor(None, work_queue.renew, job_id, jav_code, node_id,
+                                                      lease_seconds):
+                        logging.warning("⚠️ Lease on %s was lost", jav_code)
+                        return
+
+            renewer = asyncio.create_task(keep_lease())
+            try:
+                metadata = await engine.scrape_all_sites(jav_code)
+                await loop.run_in_executor(None, work_queue.complete, job_id, jav_code, node_id, metadata)
+            except RetryLater as e:
+                # Every site holding the code is asked to wait; leasing it again at once
+                # would use up its attempts without a single request
+                deferred = await loop.run_in_executor(None, work_queue.defer, job_id, jav_code, node_id,
+                                                      e.retry_in, str(e), engine.retry_policy.reschedules)
+                if deferred:
+                    logging.warning("⏳ %s, released for %.0fs", e, e.retry_in)
+                else:
+                    logging.error("❌ Node %s gave up on %s: %s", node_id, jav_code, e)
+                    await loop.run_in_executor(None, work_queue.fail, job_id, jav_code, node_id, str(e))
+            except Exception as e:
+                logging.error("❌ Node %s failed on %s: %s", node_id, jav_code, e)
+                await loop.run_in_executor(None, work_queue.fail, job_id, jav_code, node_id, str(e))
+            finally:
+                renewer.cancel()
+
+    logging.info("🛰️ Scraper node %s stopped", node_id)
+
+
+def main():
+    """Run a scraper node against a shared SQLite queue."""
+    parser = argparse.ArgumentParser(description="Run a distributed JAV scraper node")
+    parser.add_argument('--queue', required=True, help="Path of the shared SQLite queue file")
+    parser.add_argument('--config', default="config.yml", help="Path to the configuration file")
+    parser.add_argument('--node-id', default=None, help="Name of this node (default: hostname:pid)")
+    parser.add_argument('--lease-seconds', type=float, default=300, help="Lease duration in seconds")
+    parser.add_argument('--max-attempts', type=int, default=3, help="Leases per code before giving up")
+    parser.add_argument('--exit-when-idle', action='store_true', help="Stop once the queue is empty")
+    args = parser.parse_args()
+
+    work_queue = SQLiteWorkQueue(args.queue, max_attempts=args.max_attempts)
+    try:
+        asyncio.run(run_node(work_queue, args.config, args.node_id, args.lease_seconds,
+                             exit_when_idle=args.exit_when_idle))
+    except KeyboardInterrupt:
+        print("\n👋 Scraper node stopped by user")
+    finally:
+        work_queue.close()
+
+
+if __name__ == "__main__":
+    main()